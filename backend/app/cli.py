@@ -0,0 +1,711 @@
+"""
+Spectrum CLI - Headless batch conversion without the API server.
+
+Drives ScannerService, ConverterService and ExifService directly, so batch
+servers can convert a card dump from cron or a pipeline:
+
+    spectrum convert /mnt/cards/2024-06-01 --workers 4 --report run.json
+    python -m app.cli convert ./ARW_in --output ./JPG_out --format webp
+    spectrum watch /mnt/nas/incoming --settle 15
+    spectrum enqueue /mnt/nas/2024-06-01 --queue /mnt/nas/.spectrum/queue.db
+    spectrum worker --queue /mnt/nas/.spectrum/queue.db --workers 8
+
+`watch` keeps running and converts new files in batches as they land.
+`enqueue` adds the planned files to a queue on shared storage, and
+`worker` (run on as many machines as you like) converts them; tasks held
+by a worker that dies are picked up again once its lease expires.
+Outputs mirror the source tree under <source>/converted (or --output).
+Existing outputs are skipped, so re-running an interrupted batch resumes it;
+writes are atomic, so a killed run never leaves a truncated output behind.
+
+Exit codes:
+    0    every file converted or skipped
+    1    one or more files failed
+    2    invalid arguments or no readable source
+    130  interrupted (convert; Ctrl-C is the normal way to end a watch)
+"""
+
+from pathlib import Path
+from typing import Callable, List, NamedTuple, Optional, TextIO
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.services.encoders import ENCODERS, get_encoder
+from app.utils.resources import worker_plan
+from app.utils.timing import StageTimer, summarize_timings
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_INTERRUPTED = 130
+
+PRESETS = ("neutral", "standard", "vivid", "clean")
+
+
+class Job(NamedTuple):
+    """One planned conversion."""
+
+    src: Path
+    dst: Path
+    size: int
+    done: bool
+
+
+class Progress:
+    """Single-line progress with rate and ETA, written to stderr."""
+
+    def __init__(self, total_files: int, total_bytes: int, stream: TextIO, interval: float = 1.0):
+        self.total_files = total_files
+        self.total_bytes = total_bytes
+        self.stream = stream
+        self.interval = interval
+        self.interactive = stream.isatty()
+        self.files = 0
+        self.bytes = 0
+        self.failed = 0
+        self.started = time.monotonic()
+        self._last_draw = 0.0
+
+    def update(self, size: int, failed: bool) -> None:
+        self.files += 1
+        self.bytes += size
+        self.failed += int(failed)
+        now = time.monotonic()
+        if self.files == self.total_files or now - self._last_draw >= self.interval:
+            self._last_draw = now
+            self._draw(now)
+
+    def finish(self) -> None:
+        if self.interactive and self.total_files:
+            self.stream.write("\n")
+            self.stream.flush()
+
+    def _draw(self, now: float) -> None:
+        elapsed = max(now - self.started, 1e-6)
+        rate = self.files / elapsed
+        byte_rate = self.bytes / elapsed
+        # Byte-based once a meaningful amount has moved (sizes vary by camera
+        # and format); file-based before that
+        if self.bytes >= 64 * 1024 * 1024 and byte_rate > 0:
+            eta = (self.total_bytes - self.bytes) / byte_rate
+        else:
+            eta = (self.total_files - self.files) / rate if rate > 0 else None
+        percent = 100.0 * self.files / self.total_files if self.total_files else 100.0
+        line = (
+            f"[{self.files:>{len(str(self.total_files))}}/{self.total_files}] "
+            f"{percent:5.1f}%  {rate:.2f} files/s  {byte_rate / (1024 * 1024):.1f} MB/s  "
+            f"ETA {_format_duration(eta)}  failed {self.failed}"
+        )
+        if self.interactive:
+            self.stream.write("\r" + line)
+        else:
+            self.stream.write(line + "\n")
+        self.stream.flush()
+
+
+def _format_duration(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "--:--"
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}" if hours else f"{minutes:02d}:{secs:02d}"
+
+
+async def plan_jobs(
+    sources: List[Path],
+    output: Optional[Path],
+    output_subdir: str,
+    output_format: str,
+    recursive: bool,
+    resume: bool,
+) -> List[Job]:
+    """
+    Map sources (folders or single files) to output paths.
+
+    Folders are scanned with ScannerService; their outputs mirror the folder
+    tree under <folder>/<output_subdir>, or under --output (one subfolder per
+    source when several are given).
+    """
+    from app.services.scanner import ScannerService
+
+    scanner = ScannerService()
+    extension = get_encoder(output_format).extension
+    jobs: List[Job] = []
+
+    for source in sources:
+        if source.is_file():
+            out_dir = output or source.parent / output_subdir
+            dst = out_dir / source.with_suffix(extension).name
+            jobs.append(Job(source, dst, source.stat().st_size, resume and dst.exists()))
+            continue
+
+        files = await scanner.scan_directory(
+            str(source), recursive=recursive, output_subdir=output_subdir, output_format=output_format
+        )
+        out_root = output_root(source, sources, output, output_subdir)
+
+        for info in sorted(files, key=lambda f: f.path):
+            src = Path(info.path)
+            # Never treat our own outputs as sources
+            if output is None and out_root in src.parents:
+                continue
+            dst = out_root / src.relative_to(source).with_suffix(extension)
+            done = info.already_converted if output is None else dst.exists()
+            jobs.append(Job(src, dst, info.size, resume and done))
+
+    return jobs
+
+
+def output_root(source: Path, sources: List[Path], output: Optional[Path], output_subdir: str) -> Path:
+    """Folder that mirrors a source folder's tree."""
+    if output is None:
+        return source / output_subdir
+    return output / source.name if len(sources) > 1 else output
+
+
+def jobs_for_files(
+    files: List[Path],
+    sources: List[Path],
+    output: Optional[Path],
+    output_subdir: str,
+    output_format: str,
+    resume: bool,
+) -> List[Job]:
+    """Plan jobs for individual files found under the given source folders."""
+    extension = get_encoder(output_format).extension
+    folders = sorted((source.resolve() for source in sources), key=lambda p: len(p.parts), reverse=True)
+    jobs = []
+    for src in files:
+        src = src.resolve()
+        source = next((folder for folder in folders if folder in src.parents), None)
+        if source is None:
+            continue
+        out_root = output_root(source, folders, output, output_subdir)
+        dst = out_root / src.relative_to(source).with_suffix(extension)
+        try:
+            size = src.stat().st_size
+        except OSError:
+            continue
+        jobs.append(Job(src, dst, size, resume and dst.exists()))
+    return jobs
+
+
+async def convert_jobs(
+    jobs: List[Job],
+    workers: int,
+    preset: Optional[str],
+    quality: Optional[int],
+    output_format: str,
+    preserve_exif: bool,
+    results: List[dict],
+    on_result: Optional[Callable[[Job, dict], None]] = None,
+    converter=None,
+    exif=None,
+) -> None:
+    """
+    Convert pending jobs with up to `workers` in flight, appending to results.
+
+    converter/exif may be passed in to reuse them across calls (watch mode);
+    otherwise they are created for this call.
+    """
+    from app.services.converter import ConverterService
+    from app.services.exif import ExifService
+    from app.services.prefetch import Prefetcher
+
+    owns_converter = converter is None
+    if converter is None:
+        converter = ConverterService(ThreadPoolExecutor(max_workers=workers))
+    if exif is None and preserve_exif:
+        exif = ExifService()
+    if not preserve_exif:
+        exif = None
+    slots = asyncio.Semaphore(workers)
+    pending = [job for job in jobs if not job.done]
+    prefetcher = Prefetcher(
+        [job.src for job in pending],
+        max_files=max(workers, int(os.getenv("SPECTRUM_PREFETCH_FILES", "2"))),
+    )
+    prefetcher.start()
+
+    async def run(job: Job) -> None:
+        async with slots:
+            timer = StageTimer()
+            with timer.stage("prefetch_wait"):
+                source_data = await prefetcher.take(job.src)
+            result = await converter.convert_file(
+                job.src,
+                job.dst,
+                quality=quality,
+                preset=preset,
+                output_format=output_format,
+                source_data=source_data,
+            )
+            timer.merge(result.timings)
+            timer.bytes_read = result.bytes_read or 0
+            timer.bytes_written = result.bytes_written or 0
+
+            metadata_copied, metadata_error = False, None
+            if result.success and exif is not None:
+                metadata_copied, metadata_error = await exif.copy_exif(job.src, job.dst, timer)
+
+        payload = _payload(
+            job,
+            "converted" if result.success else "failed",
+            error=result.error,
+            size_bytes=result.size_bytes,
+            quality=result.quality,
+            metadata_copied=metadata_copied,
+            metadata_error=metadata_error,
+            timer=timer,
+        )
+        results.append(payload)
+        if on_result:
+            on_result(job, payload)
+
+    for job in jobs:
+        if job.done:
+            results.append(_payload(job, "skipped"))
+
+    try:
+        await asyncio.gather(*(run(job) for job in pending))
+    finally:
+        await prefetcher.close()
+        if owns_converter:
+            converter.executor.shutdown(wait=False)
+
+
+def _payload(
+    job: Job,
+    status: str,
+    error: Optional[str] = None,
+    size_bytes: Optional[int] = None,
+    quality: Optional[int] = None,
+    metadata_copied: bool = False,
+    metadata_error: Optional[str] = None,
+    timer: Optional[StageTimer] = None,
+) -> dict:
+    return {
+        "src": str(job.src),
+        "dst": str(job.dst),
+        "status": status,
+        "error": error,
+        "size_bytes": size_bytes,
+        "quality": quality,
+        "metadata_copied": metadata_copied,
+        "metadata_error": metadata_error,
+        "timings": timer.stages if timer else None,
+        "bytes_read": timer.bytes_read if timer else None,
+        "bytes_written": timer.bytes_written if timer else None,
+    }
+
+
+def build_report(args: argparse.Namespace, results: List[dict], elapsed_s: float, interrupted: bool) -> dict:
+    totals = {"files": len(results), "converted": 0, "skipped": 0, "failed": 0}
+    for result in results:
+        totals[result["status"]] += 1
+    return {
+        "command": args.command,
+        "sources": [str(source) for source in args.sources],
+        "output": str(args.output) if args.output else None,
+        "output_format": args.format,
+        "preset": args.preset,
+        "workers": args.workers,
+        "interrupted": interrupted,
+        "elapsed_s": round(elapsed_s, 3),
+        "totals": totals,
+        "timing_summary": summarize_timings(results, elapsed_s),
+        "results": results,
+    }
+
+
+async def convert_queued(task, converter, exif) -> dict:
+    """Convert one task claimed from a SharedTaskQueue."""
+    options = task.options
+    job = Job(Path(task.src), Path(task.dst), 0, options.get("resume", True) and Path(task.dst).exists())
+    if job.done:
+        return _payload(job, "skipped")
+    timer = StageTimer()
+    result = await converter.convert_file(
+        job.src,
+        job.dst,
+        quality=options.get("quality"),
+        preset=options.get("preset"),
+        output_format=options.get("output_format", "jpeg"),
+    )
+    timer.merge(result.timings)
+    timer.bytes_read = result.bytes_read or 0
+    timer.bytes_written = result.bytes_written or 0
+
+    metadata_copied, metadata_error = False, None
+    if result.success and exif is not None and options.get("preserve_exif", True):
+        metadata_copied, metadata_error = await exif.copy_exif(job.src, job.dst, timer)
+    return _payload(
+        job,
+        "converted" if result.success else "failed",
+        error=result.error,
+        size_bytes=result.size_bytes,
+        quality=result.quality,
+        metadata_copied=metadata_copied,
+        metadata_error=metadata_error,
+        timer=timer,
+    )
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    options = argparse.ArgumentParser(add_help=False)
+    options.add_argument("sources", nargs="+", type=Path, help="Source folders or ARW files")
+    options.add_argument("-o", "--output", type=Path, default=None,
+                         help="Output root (default: <source>/converted)")
+    options.add_argument("--output-subdir", default="converted",
+                         help="Output folder name inside each source when --output is not given")
+    options.add_argument("-w", "--workers", type=int, default=worker_plan().scheduler,
+                         help="Files converted in parallel (default: sized from CPU and memory limits)")
+    options.add_argument("-f", "--format", default=os.getenv("SPECTRUM_OUTPUT_FORMAT", "jpeg"),
+                         help=f"Output format: {', '.join(ENCODERS)}")
+    options.add_argument("-p", "--preset", default=os.getenv("SPECTRUM_PRESET", "standard"),
+                         choices=PRESETS, help="Look preset")
+    options.add_argument("-q", "--quality", type=int, default=None,
+                         help="Encoder quality 1-100 (default: SPECTRUM_JPEG_QUALITY)")
+    options.add_argument("--no-exif", dest="preserve_exif", action="store_false",
+                         help="Do not copy metadata with exiftool")
+    options.add_argument("--no-resume", dest="resume", action="store_false",
+                         help="Re-convert files whose output already exists")
+    options.add_argument("--report", type=Path, default=None,
+                         help="Write a JSON report to this path")
+    options.add_argument("--quiet", action="store_true", help="No progress output")
+
+    parser = argparse.ArgumentParser(
+        prog="spectrum",
+        description="Batch-convert Sony ARW files without the web app.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    convert = commands.add_parser(
+        "convert", parents=[options], help="Convert folders or files of ARW images"
+    )
+    convert.add_argument("--no-recursive", dest="recursive", action="store_false",
+                         help="Only convert files directly inside each source folder")
+
+    watch = commands.add_parser(
+        "watch", parents=[options], help="Keep converting new ARW files as they land"
+    )
+    watch.add_argument("--settle", type=float, default=None,
+                       help="Seconds a file's size must stay unchanged (default: SPECTRUM_WATCH_SETTLE or 10)")
+    watch.add_argument("--batch-window", type=float, default=None,
+                       help="Seconds without new stable files before a batch starts (default: 5)")
+    watch.add_argument("--poll-interval", type=float, default=None,
+                       help="Seconds between polling passes on network mounts (default: 30)")
+    watch.add_argument("--mode", choices=("auto", "inotify", "polling"), default=None,
+                       help="Change detection (default: inotify on local disks, polling otherwise)")
+    watch.add_argument("--new-only", dest="include_existing", action="store_false",
+                       help="Ignore files already present when the watch starts")
+
+    queue_path = argparse.ArgumentParser(add_help=False)
+    queue_path.add_argument("--queue", type=Path, default=os.getenv("SPECTRUM_QUEUE_PATH"),
+                            required=not os.getenv("SPECTRUM_QUEUE_PATH"),
+                            help="Queue database on shared storage (default: SPECTRUM_QUEUE_PATH)")
+
+    enqueue = commands.add_parser(
+        "enqueue", parents=[options, queue_path], help="Add files to a shared queue for workers"
+    )
+    enqueue.add_argument("--no-recursive", dest="recursive", action="store_false",
+                         help="Only queue files directly inside each source folder")
+    enqueue.add_argument("--job", default=None, help="Job id (default: generated)")
+
+    worker = commands.add_parser(
+        "worker", parents=[queue_path], help="Convert files from a shared queue"
+    )
+    worker.add_argument("-w", "--workers", type=int, default=worker_plan().scheduler,
+                        help="Files converted in parallel (default: sized from CPU and memory limits)")
+    worker.add_argument("--drain", action="store_true",
+                        help="Exit once the queue is empty instead of waiting for more")
+    worker.add_argument("--quiet", action="store_true", help="No per-file output")
+    return parser.parse_args(argv)
+
+
+def _validate(args: argparse.Namespace, stream: TextIO) -> Optional[str]:
+    """Normalized output format, or None after printing a usage error."""
+    try:
+        output_format = get_encoder(args.format).name
+    except ValueError as e:
+        print(f"spectrum: {e}", file=stream)
+        return None
+    if args.workers < 1:
+        print("spectrum: --workers must be at least 1", file=stream)
+        return None
+    if args.quality is not None and not 1 <= args.quality <= 100:
+        print("spectrum: --quality must be between 1 and 100", file=stream)
+        return None
+
+    missing = [str(source) for source in args.sources if not source.exists()]
+    if missing:
+        print(f"spectrum: not found: {', '.join(missing)}", file=stream)
+        return None
+    return output_format
+
+
+def _finish(args: argparse.Namespace, results: List[dict], started: float, interrupted: bool, stream: TextIO) -> dict:
+    report = build_report(args, results, time.perf_counter() - started, interrupted)
+    if args.report:
+        args.report.parent.mkdir(parents=True, exist_ok=True)
+        args.report.write_text(json.dumps(report, indent=2))
+    if not args.quiet:
+        totals = report["totals"]
+        print(
+            f"[CLI] Done in {report['elapsed_s']:.1f}s: {totals['converted']} converted, "
+            f"{totals['skipped']} skipped, {totals['failed']} failed",
+            file=stream,
+            flush=True,
+        )
+    return report
+
+
+def run_convert(args: argparse.Namespace, stream: TextIO = sys.stderr) -> int:
+    output_format = _validate(args, stream)
+    if output_format is None:
+        return EXIT_USAGE
+
+    started = time.perf_counter()
+    results: List[dict] = []
+    interrupted = False
+
+    async def main_async() -> None:
+        jobs = await plan_jobs(
+            args.sources, args.output, args.output_subdir, output_format,
+            args.recursive, args.resume,
+        )
+        pending = [job for job in jobs if not job.done]
+        if not args.quiet:
+            print(
+                f"[CLI] {len(jobs)} file(s): {len(pending)} to convert, "
+                f"{len(jobs) - len(pending)} already done",
+                file=stream,
+                flush=True,
+            )
+        progress = Progress(len(pending), sum(job.size for job in pending), stream)
+
+        def on_result(job: Job, payload: dict) -> None:
+            failed = payload["status"] == "failed"
+            if failed:
+                prefix = "\n" if progress.interactive and not args.quiet else ""
+                print(f"{prefix}[CLI] FAILED {job.src}: {payload['error']}", file=stream, flush=True)
+            if not args.quiet:
+                progress.update(job.size, failed)
+
+        try:
+            await convert_jobs(
+                jobs, args.workers, args.preset, args.quality, output_format,
+                args.preserve_exif, results, on_result,
+            )
+        finally:
+            if not args.quiet:
+                progress.finish()
+
+    try:
+        asyncio.run(main_async())
+    except KeyboardInterrupt:
+        interrupted = True
+        print("\n[CLI] Interrupted; re-run the same command to resume.", file=stream, flush=True)
+
+    report = _finish(args, results, started, interrupted, stream)
+    if interrupted:
+        return EXIT_INTERRUPTED
+    return EXIT_FAILED if report["totals"]["failed"] else EXIT_OK
+
+
+def run_watch(args: argparse.Namespace, stream: TextIO = sys.stderr) -> int:
+    """
+    Watch source folders and convert stable new files in batches until
+    interrupted; Ctrl-C is the normal way to stop.
+    """
+    from app.services.converter import ConverterService
+    from app.services.exif import ExifService
+    from app.services.watcher import DirectoryWatcher
+
+    output_format = _validate(args, stream)
+    if output_format is None:
+        return EXIT_USAGE
+    folders = [source for source in args.sources if source.is_dir()]
+    if len(folders) != len(args.sources):
+        print("spectrum: watch sources must be folders", file=stream)
+        return EXIT_USAGE
+
+    started = time.perf_counter()
+    results: List[dict] = []
+
+    async def main_async() -> None:
+        converter = ConverterService(ThreadPoolExecutor(max_workers=args.workers))
+        exif = ExifService() if args.preserve_exif else None
+
+        async def on_batch(files: List[Path]) -> None:
+            jobs = jobs_for_files(
+                files, folders, args.output, args.output_subdir, output_format, args.resume
+            )
+            before = len(results)
+            await convert_jobs(
+                jobs, args.workers, args.preset, args.quality, output_format,
+                args.preserve_exif, results, converter=converter, exif=exif,
+            )
+            batch = results[before:]
+            failed = [result for result in batch if result["status"] == "failed"]
+            for result in failed:
+                print(f"[CLI] FAILED {result['src']}: {result['error']}", file=stream, flush=True)
+            if not args.quiet:
+                converted = sum(result["status"] == "converted" for result in batch)
+                print(
+                    f"[CLI] Batch of {len(batch)}: {converted} converted, "
+                    f"{len(batch) - converted - len(failed)} skipped, {len(failed)} failed",
+                    file=stream,
+                    flush=True,
+                )
+
+        watcher = DirectoryWatcher(
+            folders,
+            on_batch,
+            settle_seconds=args.settle,
+            batch_window=args.batch_window,
+            poll_interval=args.poll_interval,
+            mode=args.mode,
+            exclude=[
+                output_root(folder.resolve(), folders, args.output, args.output_subdir)
+                for folder in folders
+            ],
+            include_existing=args.include_existing,
+        )
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                # Finish the batch in progress, then exit (systemd/cron send SIGTERM)
+                loop.add_signal_handler(signum, watcher.stop)
+            except (NotImplementedError, RuntimeError, ValueError):
+                pass
+        try:
+            await watcher.run()
+        finally:
+            converter.executor.shutdown(wait=False)
+
+    try:
+        asyncio.run(main_async())
+    except KeyboardInterrupt:
+        pass
+    if not args.quiet:
+        print("\n[CLI] Watch stopped.", file=stream, flush=True)
+
+    report = _finish(args, results, started, True, stream)
+    return EXIT_FAILED if report["totals"]["failed"] else EXIT_OK
+
+
+def run_enqueue(args: argparse.Namespace, stream: TextIO = sys.stderr) -> int:
+    """Plan jobs like convert, then add the pending ones to the shared queue."""
+    import uuid
+
+    from app.services.taskqueue import SharedTaskQueue
+
+    output_format = _validate(args, stream)
+    if output_format is None:
+        return EXIT_USAGE
+
+    jobs = asyncio.run(
+        plan_jobs(
+            args.sources, args.output, args.output_subdir, output_format,
+            args.recursive, args.resume,
+        )
+    )
+    pending = [job for job in jobs if not job.done]
+    job_id = args.job or uuid.uuid4().hex[:12]
+    queue = SharedTaskQueue(str(args.queue))
+    try:
+        queued = queue.enqueue(
+            job_id,
+            [(str(job.src), str(job.dst)) for job in pending],
+            {
+                "quality": args.quality,
+                "preset": args.preset,
+                "output_format": output_format,
+                "preserve_exif": args.preserve_exif,
+                "resume": args.resume,
+            },
+        )
+    finally:
+        queue.close()
+    if not args.quiet:
+        print(
+            f"[CLI] Job {job_id}: {queued} file(s) queued, {len(jobs) - len(pending)} already done",
+            file=stream,
+            flush=True,
+        )
+    print(job_id)
+    return EXIT_OK
+
+
+def run_worker(args: argparse.Namespace, stream: TextIO = sys.stderr) -> int:
+    """Convert tasks from the shared queue until interrupted (or drained)."""
+    from app.services.converter import ConverterService
+    from app.services.exif import ExifService
+    from app.services.taskqueue import QueueWorker, SharedTaskQueue
+
+    if args.workers < 1:
+        print("spectrum: --workers must be at least 1", file=stream)
+        return EXIT_USAGE
+
+    failed = 0
+
+    async def main_async() -> None:
+        nonlocal failed
+        converter = ConverterService(ThreadPoolExecutor(max_workers=args.workers))
+        exif = ExifService()
+        queue = SharedTaskQueue(str(args.queue))
+
+        async def handler(task) -> dict:
+            nonlocal failed
+            payload = await convert_queued(task, converter, exif)
+            if payload["status"] == "failed":
+                failed += 1
+                print(f"[CLI] FAILED {task.src}: {payload['error']}", file=stream, flush=True)
+            elif not args.quiet:
+                print(f"[CLI] {payload['status']} {task.src}", file=stream, flush=True)
+            return payload
+
+        worker = QueueWorker(queue, handler, concurrency=args.workers)
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                # Finish the files in flight, then exit
+                loop.add_signal_handler(signum, worker.stop)
+            except (NotImplementedError, RuntimeError, ValueError):
+                pass
+        try:
+            await worker.run(drain=args.drain)
+        finally:
+            converter.executor.shutdown(wait=False)
+            queue.close()
+
+    try:
+        asyncio.run(main_async())
+    except KeyboardInterrupt:
+        pass
+    return EXIT_FAILED if failed else EXIT_OK
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    if args.command == "convert":
+        return run_convert(args)
+    if args.command == "watch":
+        return run_watch(args)
+    if args.command == "enqueue":
+        return run_enqueue(args)
+    if args.command == "worker":
+        return run_worker(args)
+    return EXIT_USAGE
+
+
+if __name__ == "__main__":
+    sys.exit(main())
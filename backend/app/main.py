@@ -4,37 +4,107 @@ Spectrum API - Professional RAW Converter by TrueVine Insights.
 FastAPI backend providing ARW to JPEG conversion services.
 """
 
+# Imported first so the startup report covers every import below
+from app.utils import startup
+
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse, FileResponse
-from pydantic import BaseModel
-from typing import List, Optional, Callable, Awaitable
+from fastapi.responses import StreamingResponse, FileResponse, PlainTextResponse
+from pydantic import BaseModel, Field
+from typing import Dict, List, Literal, Optional, Callable, Awaitable, Tuple
 import os
-import json
 import inspect
 import asyncio
+import time
 from io import BytesIO
 import mimetypes
+import uuid
+from contextlib import asynccontextmanager
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 from app.services.scanner import ScannerService, FileInfo
 from app.services.converter import ConverterService
 from app.services.exif import ExifService
+from app.services.metadata_cache import MetadataCache
+from app.services.encoders import get_encoder, output_extension
+from app.services.dedupe import DedupeService
+from app.services.render_cache import RenderCache
+from app.services.prefetch import Prefetcher
+from app.services.writeback import WriteBackService
+from app.services.preview import PreviewCache, render_preview
+from app.services.watcher import DirectoryWatcher
+from app.services.scan_cache import ScanCache
+from app.services.scheduler import Priority, PriorityScheduler
+from app.services.jobs import JobCancelled, JobControl, JobRegistry
+from app.services.state import JobStateStore
+from app.services.taskqueue import QueuedTask, QueueWorker, SharedTaskQueue
+from app.services.volumes import ProbeTimeout, VolumeService
+from app.services.warmup import warm_up, warmup_enabled
+from app.services import metrics
+from app.utils.fileops import place_copy
+from app.utils.timing import StageTimer, summarize_timings
+from app.utils import jsonio
+from app.utils.resources import worker_plan
 from app.utils.paths import (
     resolve_path,
-    get_smart_roots,
+    existing_paths,
     is_drive_mount_root,
     normalize_input_path,
 )
 
+startup.mark("imports")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if warmup_enabled():
+        global warmup_report
+        warmup_report = await warm_up(converter_service, scheduler.executor, scheduler.workers)
+        print(
+            f"[STARTUP] Warmed {warmup_report['succeeded']}/{warmup_report['workers']} "
+            f"decode threads in {warmup_report['ms']:.0f} ms",
+            flush=True,
+        )
+        for error in warmup_report["errors"]:
+            print(f"[STARTUP] Warm-up failed: {error}", flush=True)
+        startup.mark("warmup")
+    startup.mark("ready")
+    startup.log_report()
+    worker_task = None
+    if task_queue is not None and os.getenv("SPECTRUM_QUEUE_WORKER", "0") == "1":
+        global queue_worker
+        queue_worker = QueueWorker(task_queue, _convert_queued)
+        worker_task = asyncio.create_task(queue_worker.run())
+    sync_task = asyncio.create_task(_sync_job_state()) if job_store is not None else None
+    yield
+    await _stop_all_watches()
+    if sync_task is not None:
+        sync_task.cancel()
+        # Publish final job states before this process exits
+        await asyncio.get_event_loop().run_in_executor(state_executor, job_registry.sync)
+    if worker_task is not None:
+        queue_worker.stop()
+        try:
+            await asyncio.wait_for(worker_task, CANCEL_GRACE_SECONDS)
+        except asyncio.TimeoutError:
+            # Unfinished leases are released, so other workers retry them
+            worker_task.cancel()
+
+
 app = FastAPI(
     title="Spectrum API",
     description="Professional RAW image converter by TrueVine Insights",
     version="2.0.0",
+    lifespan=lifespan,
 )
 
-ALLOWED_PREVIEW_EXTS = {".arw", ".jpg", ".jpeg", ".png", ".tif", ".tiff"}
-ALLOWED_FILE_EXTS = {".arw", ".jpg", ".jpeg", ".png", ".tif", ".tiff"}
+ALLOWED_PREVIEW_EXTS = {".arw", ".jpg", ".jpeg", ".png", ".tif", ".tiff", ".webp", ".avif"}
+ALLOWED_FILE_EXTS = {".arw", ".jpg", ".jpeg", ".png", ".tif", ".tiff", ".webp", ".avif"}
+
+# Missing from some system MIME tables. Looked up before mimetypes, whose
+# tables are only loaded (slowly) when a file is first served.
+EXTRA_MEDIA_TYPES = {".webp": "image/webp", ".avif": "image/avif"}
 
 # CORS middleware for frontend communication
 app.add_middleware(
@@ -47,8 +117,63 @@ app.add_middleware(
 
 # Initialize services
 scanner_service = ScannerService()
-converter_service = ConverterService()
+scan_cache = ScanCache(scanner_service)
+# Conversions run on the scheduler's pool so bulk work and previews share
+# one set of threads with reserved interactive capacity
+scheduler = PriorityScheduler()
+# With `uvicorn --workers N` (SPECTRUM_API_WORKERS > 1) jobs are mirrored
+# into a local SQLite file so any process can report and control them
+API_WORKERS = int(os.getenv("SPECTRUM_API_WORKERS", "1"))
+job_store = (
+    JobStateStore() if API_WORKERS > 1 or os.getenv("SPECTRUM_STATE_PATH") else None
+)
+job_registry = JobRegistry(store=job_store)
+# Seconds between job state syncs with other API processes
+STATE_SYNC_SECONDS = float(os.getenv("SPECTRUM_STATE_SYNC", "0.5"))
+state_executor = ThreadPoolExecutor(max_workers=1)
+# Seconds a cancelled stream waits for its job to reach a stage boundary
+CANCEL_GRACE_SECONDS = float(os.getenv("SPECTRUM_CANCEL_GRACE", "30"))
+converter_service = ConverterService(executor=scheduler.executor)
 exif_service = ExifService()
+metadata_cache = MetadataCache()
+dedupe_service = DedupeService()
+render_cache = RenderCache()
+prefetch_executor = ThreadPoolExecutor(max_workers=worker_plan().prefetch)
+writeback_service = WriteBackService()
+volume_service = VolumeService()
+preview_cache = PreviewCache()
+# Shared multi-machine queue (SPECTRUM_QUEUE_PATH on shared storage);
+# SPECTRUM_QUEUE_WORKER=1 also pulls tasks from it in this instance
+task_queue = SharedTaskQueue() if os.getenv("SPECTRUM_QUEUE_PATH") else None
+queue_worker: Optional[QueueWorker] = None
+# Result of the SPECTRUM_WARMUP=1 warm-up, once it has run
+warmup_report: Optional[dict] = None
+
+metrics.SCHEDULER_RUNNING.set_callback(
+    lambda: {(name,): float(entry["running"]) for name, entry in scheduler.stats().items()}
+)
+metrics.SCHEDULER_WAITING.set_callback(
+    lambda: {(name,): float(entry["waiting"]) for name, entry in scheduler.stats().items()}
+)
+
+
+def _executors() -> dict:
+    return {
+        "scanner": scanner_service.executor,
+        "converter": converter_service.executor,
+        "dedupe": dedupe_service.executor,
+        "render_cache": render_cache.executor,
+        "prefetch": prefetch_executor,
+        "writeback": writeback_service.executor,
+        "volumes": volume_service.executor,
+        "preview_cache": preview_cache.executor,
+        "metadata_cache": metadata_cache.executor,
+        "exif": exif_service.executor,
+    }
+
+
+metrics.EXECUTOR_QUEUE_DEPTH.set_callback(lambda: metrics.executor_queue_depths(_executors()))
+startup.mark("services")
 
 
 # Request/Response Models
@@ -56,6 +181,19 @@ class ScanRequest(BaseModel):
     path: str
     recursive: bool = True
     output_subdir: str = "converted"
+    output_format: str = "jpeg"
+    # Paging: omit limit to get every (filtered) file in one response
+    limit: Optional[int] = Field(default=None, gt=0)
+    cursor: Optional[str] = None
+    # name | mtime | size
+    sort: str = "name"
+    order: Literal["asc", "desc"] = "asc"
+    # converted | pending
+    status: Optional[Literal["converted", "pending"]] = None
+    # Folder relative to path, e.g. "2024-06-01/A"
+    subfolder: Optional[str] = None
+    # Re-walk the folder instead of using a recent cached scan
+    refresh: bool = False
 
 
 class ScanResponse(BaseModel):
@@ -64,6 +202,9 @@ class ScanResponse(BaseModel):
     pending_conversion: int
     total_size_mb: float
     files: List[dict]
+    # Files passing status/subfolder filters (across all pages)
+    matched_files: Optional[int] = None
+    next_cursor: Optional[str] = None
 
 
 class ConvertRequest(BaseModel):
@@ -72,6 +213,15 @@ class ConvertRequest(BaseModel):
     quality: int = 95
     preserve_exif: bool = True
     preset: str = "standard"
+    # jpeg | webp | avif | tiff16
+    output_format: str = "jpeg"
+    # Adaptive encode: pick the best quality (<= quality) meeting a target
+    target_size_mb: Optional[float] = Field(default=None, gt=0)
+    target_ssim: Optional[float] = Field(default=None, gt=0, le=1)
+    # Convert byte-identical sources once and link/copy the other outputs
+    dedupe: bool = False
+    # Caller-chosen id for pausing/cancelling via /api/jobs (default: generated)
+    job_id: Optional[str] = None
 
 
 class ConvertResponse(BaseModel):
@@ -80,18 +230,56 @@ class ConvertResponse(BaseModel):
     failed: int
     skipped: int
     results: List[dict]
+    deduplicated: int = 0
+    cached: int = 0
+    # Files not converted because the job was cancelled
+    cancelled: int = 0
+    job_id: Optional[str] = None
+    timing_summary: Optional[dict] = None
 
 
 class ReviewRequest(BaseModel):
     source_path: str
     output_dir: str
-    limit: Optional[int] = None
+    limit: Optional[int] = Field(default=None, gt=0)
+    output_format: str = "jpeg"
+    cursor: Optional[str] = None
+    sort: str = "name"
+    order: Literal["asc", "desc"] = "asc"
+    subfolder: Optional[str] = None
+    refresh: bool = False
 
 
 class ReviewResponse(BaseModel):
     total_original: int
     total_converted: int
     pairs: List[dict]
+    next_cursor: Optional[str] = None
+
+
+class MetadataBatchRequest(BaseModel):
+    # Files whose key metadata is wanted, e.g. the visible gallery page
+    paths: List[str] = Field(min_length=1, max_length=2000)
+
+
+class WatchRequest(BaseModel):
+    source_dir: str
+    # Defaults to <source_dir>/converted
+    output_dir: Optional[str] = None
+    quality: int = 95
+    preserve_exif: bool = True
+    preset: str = "standard"
+    output_format: str = "jpeg"
+    # Seconds a file's size/mtime must stay unchanged before converting
+    settle_seconds: Optional[float] = Field(default=None, ge=0)
+    # Seconds without new stable files before a batch is converted
+    batch_window: Optional[float] = Field(default=None, ge=0)
+    # Seconds between polling passes on network mounts
+    poll_interval: Optional[float] = Field(default=None, gt=0)
+    # auto | inotify | polling
+    mode: Optional[str] = None
+    # Also convert files already in the folder when the watch starts
+    include_existing: bool = True
 
 
 # API Endpoints
@@ -110,16 +298,53 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy"}
+    return {"status": "healthy", "startup": startup.report()}
+
+
+@app.get("/api/info")
+async def server_info():
+    """
+    Worker pool sizes chosen at startup and the limits they were sized from.
+
+    CPU and memory come from the container's cgroup limits when those are
+    tighter than the host's, split across SPECTRUM_API_WORKERS processes.
+    """
+    plan = worker_plan()
+    return {
+        "version": app.version,
+        "resources": {
+            "cpus": plan.cpus,
+            "memory_mb": plan.memory_mb,
+            "source": plan.source,
+            "api_workers": plan.api_workers,
+        },
+        "workers": {
+            **{
+                name: getattr(executor, "_max_workers", None)
+                for name, executor in _executors().items()
+            },
+            "scheduler": scheduler.workers,
+            "interactive_reserved": scheduler.reserved,
+        },
+        "warmup": warmup_report,
+        "startup": startup.report(),
+    }
+
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    """Prometheus text exposition of in-process counters and histograms."""
+    return PlainTextResponse(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
 
 
 @app.get("/api/browse")
-async def browse_directory(path: str = ""):
+async def browse_directory(path: str = "", refresh: bool = False):
     """
     Browse filesystem directories.
 
     Returns list of subdirectories for folder picker navigation.
-    Handles "Smart Roots" to show relevant starting points.
+    Handles "Smart Roots" to show relevant starting points. Listings are
+    cached briefly; pass refresh=true to re-read the folder.
     """
     try:
         # Smart Root: If path is empty, show top-level folders we care about
@@ -127,13 +352,17 @@ async def browse_directory(path: str = ""):
             return {
                 "current": "/",
                 "parent": None,
-                "directories": get_smart_roots(),
+                "directories": await volume_service.smart_roots(refresh),
             }
 
         resolved = resolve_path(path)
         target = resolved.path
 
-        if not target.exists():
+        try:
+            directories = await volume_service.list_directories(target, refresh)
+        except NotADirectoryError:
+            raise HTTPException(status_code=400, detail=f"Not a directory: {path}")
+        except FileNotFoundError:
             if resolved.is_unc:
                 raise HTTPException(
                     status_code=404,
@@ -153,31 +382,6 @@ async def browse_directory(path: str = ""):
                 )
             raise HTTPException(status_code=404, detail=f"Path not found: {resolved.original}")
 
-        if not target.is_dir():
-            raise HTTPException(status_code=400, detail=f"Not a directory: {path}")
-
-        # Get subdirectories only (not files)
-        directories = []
-
-        # safely iterate
-        try:
-            for item in target.iterdir():
-                try:
-                    # Filter out hidden folders and focus on directories
-                    if not item.name.startswith(".") and item.is_dir():
-                        directories.append(
-                            {
-                                "name": item.name,
-                                "path": str(item),
-                            }
-                        )
-                except (PermissionError, OSError):
-                    continue
-        except (PermissionError, OSError):
-            pass  # Entire directory is unreadable
-
-        directories.sort(key=lambda x: x["name"])
-
         # Determine parent
         parent = str(target.parent)
         if parent == str(target) or is_drive_mount_root(target):
@@ -191,6 +395,8 @@ async def browse_directory(path: str = ""):
 
     except HTTPException:
         raise
+    except ProbeTimeout as e:
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Browse error: {str(e)}")
 
@@ -214,31 +420,28 @@ async def preview_file(path: str):
     max_dim = int(os.getenv("SPECTRUM_PREVIEW_MAX", "1600"))
     quality = int(os.getenv("SPECTRUM_PREVIEW_QUALITY", "85"))
 
+    kind = "raw" if ext == ".arw" else "image"
+    started = time.perf_counter()
+    loop = asyncio.get_event_loop()
     try:
-        from PIL import Image
-        import rawpy
-
-        if ext == ".arw":
-            with rawpy.imread(str(target)) as raw:
-                rgb = raw.postprocess(
-                    use_camera_wb=True,
-                    no_auto_bright=True,
-                    output_bps=8,
-                    half_size=True,
-                    output_color=rawpy.ColorSpace.sRGB,
-                )
-            image = Image.fromarray(rgb)
-        else:
-            image = Image.open(target).convert("RGB")
-
-        image.thumbnail((max_dim, max_dim), Image.LANCZOS)
-
-        buffer = BytesIO()
-        image.save(buffer, format="JPEG", quality=quality, optimize=True)
-        buffer.seek(0)
+        data = await loop.run_in_executor(
+            preview_cache.executor, preview_cache.get, target, max_dim, quality
+        )
+        if data is not None:
+            metrics.PREVIEW_REQUESTS_TOTAL.inc(result="cached")
+            return StreamingResponse(BytesIO(data), media_type="image/jpeg")
+        data = await scheduler.run(Priority.INTERACTIVE, render_preview, target, max_dim, quality)
+        await loop.run_in_executor(
+            preview_cache.executor, preview_cache.put, target, max_dim, quality, data
+        )
+        buffer = BytesIO(data)
+        metrics.PREVIEW_REQUESTS_TOTAL.inc(result="rendered")
         return StreamingResponse(buffer, media_type="image/jpeg")
     except Exception as e:
+        metrics.PREVIEW_REQUESTS_TOTAL.inc(result="error")
         raise HTTPException(status_code=500, detail=f"Preview error: {str(e)}")
+    finally:
+        metrics.PREVIEW_SECONDS.observe(time.perf_counter() - started, kind=kind)
 
 
 @app.get("/api/file")
@@ -257,7 +460,7 @@ async def serve_file(path: str):
     if ext not in ALLOWED_FILE_EXTS:
         raise HTTPException(status_code=415, detail="File type not supported.")
 
-    media_type, _ = mimetypes.guess_type(str(target))
+    media_type = EXTRA_MEDIA_TYPES.get(ext) or mimetypes.guess_type(str(target))[0]
     return FileResponse(target, media_type=media_type or "application/octet-stream")
 
 
@@ -268,6 +471,11 @@ async def scan_directory(request: ScanRequest):
 
     Returns summary of discovered files and their conversion status.
     """
+    try:
+        output_extension(request.output_format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     try:
         # Scan directory
         resolved = resolve_path(request.path)
@@ -290,29 +498,57 @@ async def scan_directory(request: ScanRequest):
                 )
             raise HTTPException(status_code=404, detail=f"Directory not found: {resolved.original}")
 
-        files = await scanner_service.scan_directory(
-            path=str(resolved.path),
+        scan = await scan_cache.get(
+            resolved.path,
             recursive=request.recursive,
             output_subdir=request.output_subdir,
+            output_format=request.output_format,
+            refresh=request.refresh and not request.cursor,
+        )
+
+        # Summary always covers the whole folder
+        summary = scan.table.summary()
+
+        try:
+            page, next_cursor, matched = scan.page(
+                field=request.sort,
+                descending=request.order == "desc",
+                cursor=request.cursor,
+                limit=request.limit,
+                status=request.status,
+                subfolder=request.subfolder,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        # Rows are trusted internal data: encode them directly (and
+        # lazily) instead of validating a List[dict] response model
+        file_dicts = (
+            {
+                "path": f.path,
+                "size": f.size,
+                "modified_time": f.modified_time,
+                "already_converted": f.already_converted,
+            }
+            for f in page
         )
 
-        # Generate summary
-        summary = scanner_service.get_summary(files)
-
-        # Convert FileInfo objects to dicts
-        file_dicts = [
-            {"path": f.path, "size": f.size, "already_converted": f.already_converted}
-            for f in files
-        ]
-
-        return ScanResponse(
-            total_files=summary["total_files"],
-            already_converted=summary["already_converted"],
-            pending_conversion=summary["pending_conversion"],
-            total_size_mb=summary["total_size_mb"],
-            files=file_dicts,
+        return jsonio.bulk_response(
+            {
+                "total_files": summary["total_files"],
+                "already_converted": summary["already_converted"],
+                "pending_conversion": summary["pending_conversion"],
+                "total_size_mb": summary["total_size_mb"],
+                "matched_files": matched,
+                "next_cursor": next_cursor,
+            },
+            "files",
+            file_dicts,
+            len(page),
         )
 
+    except HTTPException:
+        raise
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except NotADirectoryError as e:
@@ -321,21 +557,109 @@ async def scan_directory(request: ScanRequest):
         raise HTTPException(status_code=500, detail=f"Scan error: {str(e)}")
 
 
+RESULT_STATUSES = ("converted", "skipped", "failed", "deduplicated", "cached", "cancelled")
+
+
+def _result_payload(
+    src: str,
+    dst: str,
+    success: bool,
+    skipped: bool = False,
+    error: Optional[str] = None,
+    size_bytes: Optional[int] = None,
+    metadata_copied: bool = False,
+    metadata_error: Optional[str] = None,
+    quality: Optional[int] = None,
+    output_format: Optional[str] = None,
+    status: Optional[str] = None,
+    duplicate_of: Optional[str] = None,
+    cached_from: Optional[str] = None,
+    timer: Optional[StageTimer] = None,
+) -> dict:
+    """Build the per-file result dict shared by /api/convert and the stream."""
+    if status is None:
+        if not success:
+            status = "failed"
+        elif skipped:
+            status = "skipped"
+        else:
+            status = "converted"
+    return {
+        "src": src,
+        "dst": dst,
+        "status": status,
+        "success": success,
+        "skipped": skipped,
+        "error": error,
+        "size_bytes": size_bytes,
+        "metadata_copied": metadata_copied,
+        "metadata_error": metadata_error,
+        "quality": quality,
+        "output_format": output_format,
+        "duplicate_of": duplicate_of,
+        "cached_from": cached_from,
+        "timings": timer.stages if timer else None,
+        "bytes_read": timer.bytes_read if timer else None,
+        "bytes_written": timer.bytes_written if timer else None,
+    }
+
+
+def _output_path(src: Path, output_dir: Path, extension: str) -> Path:
+    """Output for src, mirroring its folder structure relative to the output's parent."""
+    try:
+        relative_path = src.relative_to(output_dir.parent)
+    except ValueError:
+        relative_path = Path(src.name)
+    return output_dir / relative_path.with_suffix(extension)
+
+
+def _create_job(request: ConvertRequest, kind: str = "convert") -> JobControl:
+    try:
+        return job_registry.create(kind, len(request.files), request.job_id)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
 async def _run_conversion(
     request: ConvertRequest,
     progress_cb: Optional[Callable[[dict], Awaitable[None] | None]] = None,
+    control: Optional[JobControl] = None,
 ) -> ConvertResponse:
-    results = []
-    successful = 0
-    failed = 0
-    skipped = 0
+    if control is None:
+        control = _create_job(request)
+    metrics.ACTIVE_JOBS.inc()
+    state = "failed"
+    try:
+        response = await _convert_batch(request, progress_cb, control)
+        state = "cancelled" if control.cancelled else "completed"
+        return response
+    finally:
+        control.finish(state)
+        metrics.ACTIVE_JOBS.dec()
 
+
+async def _convert_batch(
+    request: ConvertRequest,
+    progress_cb: Optional[Callable[[dict], Awaitable[None] | None]],
+    control: JobControl,
+) -> ConvertResponse:
+    started = time.perf_counter()
     skip_existing = os.getenv("SPECTRUM_SKIP_EXISTING", "1") != "0"
+    target_size_bytes = (
+        int(request.target_size_mb * 1024 * 1024) if request.target_size_mb else None
+    )
+    try:
+        encoder = get_encoder(request.output_format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     # Resolve input files first to support fallback output dir selection
     resolved_files = [resolve_path(p) for p in request.files]
-    existing_files = [rf.path for rf in resolved_files if rf.path.exists()]
-    missing_files = [rf.original for rf in resolved_files if not rf.path.exists()]
+    found = await asyncio.get_event_loop().run_in_executor(
+        scanner_service.executor, existing_paths, [rf.path for rf in resolved_files]
+    )
+    existing_files = [rf.path for rf, ok in zip(resolved_files, found) if ok]
+    missing_files = [rf.original for rf, ok in zip(resolved_files, found) if not ok]
 
     if not existing_files:
         raise HTTPException(
@@ -377,102 +701,324 @@ async def _run_conversion(
                 ),
             )
 
-    async def emit(result_payload: dict):
+    counts = {status: 0 for status in RESULT_STATUSES}
+    results = []
+
+    async def record(payload: dict):
+        results.append(payload)
+        counts[payload["status"]] += 1
+        control.processed += 1
+        metrics.record_result(payload)
         if not progress_cb:
             return
         if inspect.iscoroutinefunction(progress_cb):
-            await progress_cb(result_payload)
+            await progress_cb(payload)
         else:
-            progress_cb(result_payload)
+            progress_cb(payload)
 
     for missing in missing_files:
-        payload = {
-            "src": missing,
-            "dst": str(output_dir),
-            "success": False,
-            "skipped": False,
-            "error": "File not accessible: ensure the drive is shared with Docker.",
-            "size_bytes": None,
-            "metadata_copied": False,
-            "metadata_error": "source file not accessible",
-        }
-        results.append(payload)
-        failed += 1
-        await emit(payload)
+        await record(
+            _result_payload(
+                src=missing,
+                dst=str(output_dir),
+                success=False,
+                error="File not accessible: ensure the drive is shared with Docker.",
+                metadata_error="source file not accessible",
+            )
+        )
+
+    duplicates = (
+        await dedupe_service.find_duplicates(existing_files) if request.dedupe else {}
+    )
+    # Successful payloads by source, so duplicates can reuse their primary's output
+    completed: dict = {}
+    # Outstanding write-back uploads by source
+    uploads: dict = {}
+    # Staged outputs handed to an upload task that has not reached publish()
+    # yet; publish() owns the staging slot from then on
+    handed_off: dict = {}
+    render_params = {
+        "preset": (request.preset or "").lower(),
+        "quality": request.quality,
+        "format": encoder.name,
+        "target_size_bytes": target_size_bytes,
+        "target_ssim": request.target_ssim,
+        **converter_service.render_settings(),
+    }
+    loop = asyncio.get_event_loop()
+
+    # Plan outputs up front (maintain directory structure) and look up the
+    # render cache, so the prefetcher only reads sources that will actually
+    # be decoded: existing outputs, duplicates and cache hits are left out.
+    plan = []
+    for src in existing_files:
+        dst = _output_path(src, output_dir, encoder.extension)
+        plan.append((src, dst, skip_existing and dst.exists()))
+    candidates = [src for src, _, exists in plan if not exists and src not in duplicates]
+    cache_entries = dict(
+        zip(
+            candidates,
+            await asyncio.gather(
+                *[render_cache.lookup(src, render_params) for src in candidates]
+            ),
+        )
+    )
 
-    for file_path in existing_files:
-        src = file_path
+    prefetcher = Prefetcher(
+        [src for src in candidates if cache_entries[src] is None],
+        executor=prefetch_executor,
+    )
+    prefetcher.start()
+
+    async def finish(
+        src: Path,
+        dst: Path,
+        staged: Optional[Path],
+        result,
+        metadata_copied: bool,
+        metadata_error: Optional[str],
+        timer: StageTimer,
+        source_hash: Optional[str] = None,
+    ):
+        """Upload a staged output (if any), then record the conversion."""
+        success, error = result.success, result.error
+        status = "cancelled" if result.cancelled else None
+        if staged is not None:
+            handed_off.pop(src, None)
+            upload_start = time.perf_counter()
+            try:
+                await writeback_service.publish(staged, dst)
+            except OSError as e:
+                success, error = False, f"Write-back failed: {e}"
+            timer.record("upload", time.perf_counter() - upload_start)
+
+        payload = _result_payload(
+            src=str(src),
+            dst=str(dst),
+            success=success,
+            error=error,
+            size_bytes=result.size_bytes if success else None,
+            metadata_copied=metadata_copied and success,
+            metadata_error=metadata_error,
+            quality=result.quality,
+            output_format=result.output_format or encoder.name,
+            status=status,
+            timer=timer,
+        )
+        if success:
+            completed[src] = payload
+            await render_cache.store(
+                src,
+                render_params,
+                dst,
+                quality=result.quality,
+                metadata_copied=metadata_copied,
+                content=source_hash,
+            )
+        await record(payload)
 
-        # Determine output path (maintain directory structure)
-        source_root = output_dir.parent
-        try:
-            relative_path = src.relative_to(source_root)
-        except ValueError:
-            relative_path = Path(src.name)
-        dst = output_dir / relative_path.with_suffix(".jpg")
-
-        if skip_existing and dst.exists():
-            metadata_copied = False
-            metadata_error = None
-            if request.preserve_exif:
-                metadata_copied, metadata_error = await exif_service.copy_exif(
-                    src, dst
+    try:
+        for src, dst, exists in plan:
+            # Admit the next file only while the job is running; a paused
+            # job drops its read-ahead buffers and waits without a worker
+            try:
+                await control.checkpoint(on_pause=prefetcher.suspend, on_resume=prefetcher.resume)
+            except JobCancelled:
+                break
+            timer = StageTimer()
+            if exists:
+                metadata_copied = False
+                metadata_error = None
+                if request.preserve_exif:
+                    metadata_copied, metadata_error = await exif_service.copy_exif(
+                        src, dst, timer=timer
+                    )
+                payload = _result_payload(
+                    src=str(src),
+                    dst=str(dst),
+                    success=True,
+                    skipped=True,
+                    size_bytes=dst.stat().st_size if dst.exists() else None,
+                    metadata_copied=metadata_copied,
+                    metadata_error=metadata_error,
+                    output_format=encoder.name,
+                    timer=timer,
                 )
-            payload = {
-                "src": str(src),
-                "dst": str(dst),
-                "success": True,
-                "skipped": True,
-                "error": None,
-                "size_bytes": dst.stat().st_size if dst.exists() else None,
-                "metadata_copied": metadata_copied,
-                "metadata_error": metadata_error,
-            }
-            results.append(payload)
-            skipped += 1
-            await emit(payload)
-            continue
+                completed[src] = payload
+                await record(payload)
+                continue
 
-        # Convert file
-        result = await converter_service.convert_file(
-            src=src,
-            dst=dst,
-            quality=request.quality,
-            preset=request.preset,
-        )
+            primary = duplicates.get(src)
+            if primary in uploads:
+                await uploads[primary]
+            primary_payload = completed.get(primary)
+            if primary_payload is not None:
+                try:
+                    with timer.stage("link"):
+                        await loop.run_in_executor(
+                            dedupe_service.executor,
+                            place_copy,
+                            Path(primary_payload["dst"]),
+                            dst,
+                        )
+                    await record(
+                        _result_payload(
+                            src=str(src),
+                            dst=str(dst),
+                            success=True,
+                            size_bytes=primary_payload["size_bytes"],
+                            metadata_copied=primary_payload["metadata_copied"],
+                            metadata_error=primary_payload["metadata_error"],
+                            quality=primary_payload["quality"],
+                            output_format=encoder.name,
+                            status="deduplicated",
+                            duplicate_of=primary_payload["src"],
+                            timer=timer,
+                        )
+                    )
+                    continue
+                except OSError as e:
+                    # Fall back to converting this copy on its own
+                    print(f"[DEDUPE] Could not reuse output for {src.name}: {e}", flush=True)
 
-        metadata_copied = False
-        metadata_error = None
+            if src in cache_entries:
+                cache_entry = cache_entries[src]
+            else:
+                # A duplicate whose primary's output could not be reused
+                cache_entry = await render_cache.lookup(src, render_params)
+            if cache_entry is not None:
+                try:
+                    with timer.stage("link"):
+                        await loop.run_in_executor(
+                            render_cache.executor,
+                            place_copy,
+                            Path(cache_entry["output"]),
+                            dst,
+                        )
+                    metadata_copied = cache_entry["metadata_copied"]
+                    metadata_error = None
+                    if request.preserve_exif and not metadata_copied:
+                        metadata_copied, metadata_error = await exif_service.copy_exif(
+                            src, dst, timer=timer
+                        )
+                    payload = _result_payload(
+                        src=str(src),
+                        dst=str(dst),
+                        success=True,
+                        size_bytes=cache_entry["size_bytes"],
+                        metadata_copied=metadata_copied,
+                        metadata_error=metadata_error,
+                        quality=cache_entry["quality"],
+                        output_format=encoder.name,
+                        status="cached",
+                        cached_from=cache_entry["output"],
+                        timer=timer,
+                    )
+                    completed[src] = payload
+                    await record(payload)
+                    continue
+                except OSError as e:
+                    print(f"[CACHE] Could not reuse {cache_entry['output']}: {e}", flush=True)
+
+            # Convert file, into local staging when write-back is enabled.
+            # From reserve() until the upload task takes over, this loop owns
+            # the staging slot and must give it back if it is cancelled.
+            staged = None
+            try:
+                if writeback_service.enabled:
+                    await writeback_service.reserve()
+                    staged = writeback_service.staging_path(dst)
+                wait_start = time.perf_counter()
+                source_data = await prefetcher.take(src)
+                source_hash = None
+                if source_data is not None:
+                    timer.record("prefetch_wait", time.perf_counter() - wait_start)
+                    # Hash the buffer for the render cache alongside the
+                    # conversion, so storing the render does not read the source again
+                    source_hash = asyncio.ensure_future(render_cache.content_hash(source_data))
+                wait_start = time.perf_counter()
+                async with scheduler.slot(Priority.BULK):
+                    timer.record("schedule_wait", time.perf_counter() - wait_start)
+                    result = await converter_service.convert_file(
+                        src=src,
+                        dst=staged or dst,
+                        quality=request.quality,
+                        preset=request.preset,
+                        target_size_bytes=target_size_bytes,
+                        target_ssim=request.target_ssim,
+                        output_format=encoder.name,
+                        source_data=source_data,
+                        should_abort=control.should_abort,
+                    )
+                del source_data
+                if source_hash is not None:
+                    source_hash = await source_hash
+                timer.merge(result.timings)
+                timer.bytes_read = result.bytes_read or 0
+                timer.bytes_written = result.bytes_written or 0
+
+                metadata_copied = False
+                metadata_error = None
+
+                # Preserve EXIF if requested and conversion succeeded
+                if result.success and request.preserve_exif:
+                    metadata_copied, metadata_error = await exif_service.copy_exif(
+                        src, staged or dst, timer=timer
+                    )
 
-        # Preserve EXIF if requested and conversion succeeded
-        if result.success and request.preserve_exif:
-            metadata_copied, metadata_error = await exif_service.copy_exif(src, dst)
+                if staged is not None and not result.success:
+                    writeback_service.discard(staged)
+                    staged = None
 
-        # Track results
-        if result.success:
-            successful += 1
-        else:
-            failed += 1
-
-        payload = {
-            "src": result.src_path,
-            "dst": result.dst_path,
-            "success": result.success,
-            "skipped": False,
-            "error": result.error,
-            "size_bytes": result.size_bytes,
-            "metadata_copied": metadata_copied,
-            "metadata_error": metadata_error,
-        }
-        results.append(payload)
-        await emit(payload)
+                if staged is not None:
+                    handed_off[src] = staged
+                    uploads[src] = asyncio.create_task(
+                        finish(
+                            src, dst, staged, result, metadata_copied, metadata_error, timer,
+                            source_hash,
+                        )
+                    )
+                    staged = None
+            except BaseException:
+                if staged is not None:
+                    writeback_service.discard(staged)
+                raise
+            if src not in uploads:
+                await finish(
+                    src, dst, None, result, metadata_copied, metadata_error, timer, source_hash
+                )
 
-    return ConvertResponse(
+        if uploads:
+            await asyncio.gather(*uploads.values())
+    finally:
+        for upload in uploads.values():
+            upload.cancel()
+        if uploads:
+            # Let cancelled uploads run their cleanup before returning
+            await asyncio.gather(*uploads.values(), return_exceptions=True)
+        # Uploads cancelled before they started never reach publish()
+        for staged in handed_off.values():
+            writeback_service.discard(staged)
+        handed_off.clear()
+        await prefetcher.close()
+        # Persist cache entries even if the batch was interrupted
+        await render_cache.flush()
+        # Cached scans of this folder now have stale "already converted" flags
+        scan_cache.invalidate(output_dir)
+
+    # Results are built here, so skip re-validating every row
+    return ConvertResponse.model_construct(
         total=len(request.files),
-        successful=successful,
-        failed=failed,
-        skipped=skipped,
+        successful=counts["converted"],
+        failed=counts["failed"],
+        skipped=counts["skipped"],
         results=results,
+        deduplicated=counts["deduplicated"],
+        cached=counts["cached"],
+        # Aborted mid-file plus never started
+        cancelled=counts["cancelled"] + len(request.files) - len(results),
+        job_id=control.id,
+        timing_summary=summarize_timings(results, time.perf_counter() - started),
     )
 
 
@@ -481,26 +1027,49 @@ async def convert_files(request: ConvertRequest):
     """
     Convert ARW files to JPEG.
 
-    Processes files sequentially with optional EXIF preservation.
+    Processes files sequentially with optional EXIF preservation. Pass a
+    job_id to pause, resume or cancel the job through /api/jobs.
     """
+    control = _create_job(request)
     try:
-        return await _run_conversion(request)
+        response = await _run_conversion(request, control=control)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Conversion error: {str(e)}")
+    return jsonio.bulk_response(
+        response.model_dump(exclude={"results"}), "results", response.results, len(response.results)
+    )
 
 
 @app.post("/api/convert/stream")
 async def convert_files_stream(request: ConvertRequest, fastapi_request: Request):
     """
     Stream conversion progress as NDJSON.
+
+    The start event carries the job id for /api/jobs. Closing the stream
+    cancels the job cooperatively: in-flight work stops at its next stage.
     """
+    control = _create_job(request)
 
     async def event_stream():
-        progress = {"processed": 0, "successful": 0, "failed": 0, "skipped": 0}
+        progress = {
+            "processed": 0,
+            "successful": 0,
+            "failed": 0,
+            "skipped": 0,
+            "deduplicated": 0,
+            "cached": 0,
+            "cancelled": 0,
+        }
 
         def update_counts(payload: dict):
             progress["processed"] += 1
-            if payload.get("skipped"):
+            if payload.get("status") == "deduplicated":
+                progress["deduplicated"] += 1
+            elif payload.get("status") == "cached":
+                progress["cached"] += 1
+            elif payload.get("status") == "cancelled":
+                progress["cancelled"] += 1
+            elif payload.get("skipped"):
                 progress["skipped"] += 1
             elif payload.get("success"):
                 progress["successful"] += 1
@@ -510,6 +1079,7 @@ async def convert_files_stream(request: ConvertRequest, fastapi_request: Request
         async def on_progress(payload: dict):
             update_counts(payload)
             if await fastapi_request.is_disconnected():
+                control.cancel()
                 return
             message = {
                 "type": "progress",
@@ -517,50 +1087,385 @@ async def convert_files_stream(request: ConvertRequest, fastapi_request: Request
                 "successful": progress["successful"],
                 "failed": progress["failed"],
                 "skipped": progress["skipped"],
+                "deduplicated": progress["deduplicated"],
+                "cached": progress["cached"],
+                "cancelled": progress["cancelled"],
                 "result": payload,
             }
-            yield_line = json.dumps(message) + "\n"
-            await stream_queue.put(yield_line)
+            await stream_queue.put(jsonio.ndjson_line(message))
 
-        stream_queue: asyncio.Queue[str] = asyncio.Queue()
+        # Encoded lines; None marks the end of the stream
+        stream_queue: asyncio.Queue[Optional[bytes]] = asyncio.Queue()
 
-        await stream_queue.put(json.dumps({"type": "start", "total": len(request.files)}) + "\n")
+        await stream_queue.put(
+            jsonio.ndjson_line({"type": "start", "total": len(request.files), "job_id": control.id})
+        )
 
         async def producer():
             try:
-                await _run_conversion(request, on_progress)
+                response = await _run_conversion(request, on_progress, control)
                 await stream_queue.put(
-                    json.dumps(
+                    jsonio.ndjson_line(
                         {
                             "type": "complete",
                             "processed": progress["processed"],
                             "successful": progress["successful"],
                             "failed": progress["failed"],
                             "skipped": progress["skipped"],
+                            "deduplicated": progress["deduplicated"],
+                            "cached": progress["cached"],
+                            "cancelled": response.cancelled,
+                            "state": control.state,
                             "total": len(request.files),
+                            "timing_summary": response.timing_summary,
                         }
                     )
-                    + "\n"
                 )
             except Exception as e:
-                await stream_queue.put(
-                    json.dumps({"type": "error", "message": str(e)}) + "\n"
-                )
+                await stream_queue.put(jsonio.ndjson_line({"type": "error", "message": str(e)}))
+            await stream_queue.put(None)
 
         producer_task = asyncio.create_task(producer())
 
         try:
             while True:
                 line = await stream_queue.get()
-                yield line
-                if line.startswith("{\"type\": \"complete\"") or line.startswith(
-                    "{\"type\": \"error\""
-                ):
+                if line is None:
                     break
+                yield line
         finally:
-            producer_task.cancel()
+            if not producer_task.done():
+                # Client went away: stop at the next stage boundary rather
+                # than abandoning executor work, then give up after a grace period
+                control.cancel()
+                await asyncio.wait({producer_task}, timeout=CANCEL_GRACE_SECONDS)
+                producer_task.cancel()
+
+    return StreamingResponse(event_stream(), media_type=jsonio.NDJSON_MEDIA_TYPE)
+
+
+def _require_queue() -> SharedTaskQueue:
+    if task_queue is None:
+        raise HTTPException(status_code=503, detail="Shared queue not configured (set SPECTRUM_QUEUE_PATH)")
+    return task_queue
+
+
+async def _convert_queued(task: QueuedTask) -> dict:
+    """Convert one task claimed from the shared queue."""
+    options = task.options
+    src, dst = Path(task.src), Path(task.dst)
+    output_format = options.get("output_format", "jpeg")
+    timer = StageTimer()
+
+    if os.getenv("SPECTRUM_SKIP_EXISTING", "1") != "0" and dst.exists():
+        payload = _result_payload(
+            src=task.src,
+            dst=task.dst,
+            success=True,
+            skipped=True,
+            size_bytes=dst.stat().st_size,
+            output_format=output_format,
+            timer=timer,
+        )
+        metrics.record_result(payload)
+        return payload
+
+    target_size_mb = options.get("target_size_mb")
+    wait_start = time.perf_counter()
+    async with scheduler.slot(Priority.BULK):
+        timer.record("schedule_wait", time.perf_counter() - wait_start)
+        result = await converter_service.convert_file(
+            src=src,
+            dst=dst,
+            quality=options.get("quality", 95),
+            preset=options.get("preset"),
+            target_size_bytes=int(target_size_mb * 1024 * 1024) if target_size_mb else None,
+            target_ssim=options.get("target_ssim"),
+            output_format=output_format,
+        )
+    timer.merge(result.timings)
+    timer.bytes_read = result.bytes_read or 0
+    timer.bytes_written = result.bytes_written or 0
+
+    metadata_copied, metadata_error = False, None
+    if result.success and options.get("preserve_exif", True):
+        metadata_copied, metadata_error = await exif_service.copy_exif(src, dst, timer=timer)
+
+    payload = _result_payload(
+        src=task.src,
+        dst=task.dst,
+        success=result.success,
+        error=result.error,
+        size_bytes=result.size_bytes if result.success else None,
+        metadata_copied=metadata_copied and result.success,
+        metadata_error=metadata_error,
+        quality=result.quality,
+        output_format=result.output_format or output_format,
+        timer=timer,
+    )
+    metrics.record_result(payload)
+    if "output_dir" in options:
+        scan_cache.invalidate(Path(options["output_dir"]))
+    return payload
+
+
+@app.post("/api/queue/convert")
+async def enqueue_conversion(request: ConvertRequest):
+    """
+    Queue a conversion on the shared multi-machine queue.
 
-    return StreamingResponse(event_stream(), media_type="application/x-ndjson")
+    Every worker attached to SPECTRUM_QUEUE_PATH converts files from it, so
+    paths must resolve to the same files on every machine. Poll
+    /api/queue/{job_id} for progress. Deduplication is not applied.
+    """
+    queue = _require_queue()
+    try:
+        encoder = get_encoder(request.output_format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    resolved_files = [resolve_path(p) for p in request.files]
+    loop = asyncio.get_event_loop()
+    found = await loop.run_in_executor(
+        scanner_service.executor, existing_paths, [rf.path for rf in resolved_files]
+    )
+    existing_files = [rf.path for rf, ok in zip(resolved_files, found) if ok]
+    if not existing_files:
+        raise HTTPException(status_code=404, detail="No input files are accessible.")
+
+    output_dir = resolve_path(request.output_dir).path
+    if not output_dir.exists() and not output_dir.parent.exists():
+        raise HTTPException(status_code=404, detail=f"Output path not accessible: {request.output_dir}")
+
+    job_id = request.job_id or uuid.uuid4().hex[:12]
+    options = {
+        "quality": request.quality,
+        "preset": request.preset,
+        "output_format": encoder.name,
+        "preserve_exif": request.preserve_exif,
+        "target_size_mb": request.target_size_mb,
+        "target_ssim": request.target_ssim,
+        "output_dir": str(output_dir),
+    }
+    files = [(str(src), str(_output_path(src, output_dir, encoder.extension))) for src in existing_files]
+    queued = await loop.run_in_executor(queue.executor, queue.enqueue, job_id, files, options)
+    return {
+        "job_id": job_id,
+        "queued": queued,
+        "missing": [rf.original for rf, ok in zip(resolved_files, found) if not ok],
+    }
+
+
+@app.get("/api/queue")
+async def queue_stats():
+    """Shared queue tasks per state and live workers across machines."""
+    queue = _require_queue()
+    stats = await asyncio.get_event_loop().run_in_executor(queue.executor, queue.stats)
+    stats["local_worker"] = queue_worker.worker_id if queue_worker is not None else None
+    return stats
+
+
+@app.get("/api/queue/{job_id}")
+async def queued_job_status(job_id: str, results: bool = False):
+    queue = _require_queue()
+    status = await asyncio.get_event_loop().run_in_executor(
+        queue.executor, queue.job_status, job_id, results
+    )
+    if status is None:
+        raise HTTPException(status_code=404, detail=f"Unknown queued job: {job_id}")
+    return status
+
+
+@app.post("/api/queue/{job_id}/cancel")
+async def cancel_queued_job(job_id: str):
+    """Drop the job's pending tasks; tasks already being converted finish."""
+    queue = _require_queue()
+    loop = asyncio.get_event_loop()
+    cancelled = await loop.run_in_executor(queue.executor, queue.cancel, job_id)
+    status = await loop.run_in_executor(queue.executor, queue.job_status, job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail=f"Unknown queued job: {job_id}")
+    return {**status, "cancelled_now": cancelled}
+
+
+@app.get("/api/jobs")
+async def list_jobs():
+    """Active and recently finished conversion jobs, across all API processes."""
+    loop = asyncio.get_event_loop()
+    return {"jobs": await loop.run_in_executor(state_executor, job_registry.list_info)}
+
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    loop = asyncio.get_event_loop()
+    info = await loop.run_in_executor(state_executor, job_registry.info, job_id)
+    if info is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return info
+
+
+@app.post("/api/jobs/{job_id}/pause")
+async def pause_job(job_id: str):
+    """Stop admitting files; the file in flight finishes, then the job holds no worker."""
+    return await _job_command(job_id, "pause")
+
+
+@app.post("/api/jobs/{job_id}/resume")
+async def resume_job(job_id: str):
+    return await _job_command(job_id, "resume")
+
+
+@app.post("/api/jobs/{job_id}/cancel")
+async def cancel_job(job_id: str):
+    """Stop admitting files and abort the file in flight at its next stage."""
+    return await _job_command(job_id, "cancel")
+
+
+async def _job_command(job_id: str, action: str) -> dict:
+    loop = asyncio.get_event_loop()
+    try:
+        return await loop.run_in_executor(state_executor, job_registry.command, job_id, action)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+async def _sync_job_state() -> None:
+    """Exchange job state and commands with the other API processes."""
+    loop = asyncio.get_event_loop()
+    while True:
+        await asyncio.sleep(STATE_SYNC_SECONDS)
+        try:
+            await loop.run_in_executor(state_executor, job_registry.sync)
+        except Exception as e:
+            print(f"[STATE] Job state sync failed: {e}", flush=True)
+
+
+# Active watch jobs by id. They live in the process that started them, so
+# watches are only served when the API runs as a single process.
+watch_jobs: dict = {}
+
+
+def _require_single_process() -> None:
+    if API_WORKERS > 1:
+        raise HTTPException(
+            status_code=503,
+            detail="Watches need a single API process (unset SPECTRUM_API_WORKERS or use the CLI)",
+        )
+
+
+def _watch_info(watch_id: str, job: dict) -> dict:
+    watcher = job["watcher"]
+    return {
+        "id": watch_id,
+        "source_dir": job["source_dir"],
+        "output_dir": job["output_dir"],
+        "mode": watcher.mode,
+        "running": not job["task"].done(),
+        "started_at": job["started_at"],
+        "last_batch_at": job["last_batch_at"],
+        "pending_files": watcher.pending,
+        "watcher": dict(watcher.stats),
+        "totals": dict(job["totals"]),
+    }
+
+
+async def _stop_all_watches(timeout: float = 5.0) -> None:
+    """Stop every watch, cancelling batches still converting after timeout."""
+    for watch_id in list(watch_jobs):
+        job = watch_jobs.pop(watch_id)
+        job["watcher"].stop()
+        try:
+            await asyncio.wait_for(job["task"], timeout=timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            pass
+        except Exception as e:
+            print(f"[WATCH] {watch_id} ended with error: {e}", flush=True)
+
+
+@app.post("/api/watch")
+async def start_watch(request: WatchRequest):
+    """
+    Watch a source folder and convert new ARW files as they land.
+
+    Files are converted once their size has been stable for settle_seconds,
+    in batches, with the same options and skip-existing rules as /api/convert.
+    """
+    _require_single_process()
+    try:
+        encoder = get_encoder(request.output_format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    resolved = resolve_path(request.source_dir)
+    source_dir = resolved.path
+    if not source_dir.exists() or not source_dir.is_dir():
+        raise HTTPException(status_code=404, detail=f"Folder not found: {resolved.original}")
+    output_dir = (
+        resolve_path(request.output_dir).path if request.output_dir else source_dir / "converted"
+    )
+
+    watch_id = uuid.uuid4().hex[:12]
+    job = {
+        "source_dir": str(source_dir),
+        "output_dir": str(output_dir),
+        "started_at": time.time(),
+        "last_batch_at": None,
+        "totals": {status: 0 for status in RESULT_STATUSES},
+    }
+
+    async def on_batch(files: List[Path]) -> None:
+        print(f"[WATCH] {watch_id}: converting batch of {len(files)}", flush=True)
+        batch = ConvertRequest(
+            files=[str(path) for path in files],
+            output_dir=str(output_dir),
+            quality=request.quality,
+            preserve_exif=request.preserve_exif,
+            preset=request.preset,
+            output_format=encoder.name,
+        )
+        response = await _run_conversion(batch, control=_create_job(batch, kind="watch"))
+        for result in response.results:
+            job["totals"][result["status"]] += 1
+        job["last_batch_at"] = time.time()
+
+    try:
+        watcher = DirectoryWatcher(
+            [source_dir],
+            on_batch,
+            settle_seconds=request.settle_seconds,
+            batch_window=request.batch_window,
+            poll_interval=request.poll_interval,
+            mode=request.mode,
+            exclude=[output_dir],
+            include_existing=request.include_existing,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    job["watcher"] = watcher
+    job["task"] = asyncio.create_task(watcher.run())
+    watch_jobs[watch_id] = job
+    return _watch_info(watch_id, job)
+
+
+@app.get("/api/watch")
+async def list_watches():
+    """List watch jobs with their progress."""
+    _require_single_process()
+    return {"watches": [_watch_info(watch_id, job) for watch_id, job in watch_jobs.items()]}
+
+
+@app.delete("/api/watch/{watch_id}")
+async def stop_watch(watch_id: str):
+    """Stop a watch job (a batch already converting is finished first)."""
+    _require_single_process()
+    job = watch_jobs.pop(watch_id, None)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown watch: {watch_id}")
+    job["watcher"].stop()
+    return _watch_info(watch_id, job)
 
 
 @app.post("/api/review", response_model=ReviewResponse)
@@ -589,46 +1494,51 @@ async def build_review_pairs(request: ReviewRequest):
             detail=f"Output path not found: {resolved_output.original}",
         )
 
-    total_original = 0
-    total_converted = 0
-    pairs: List[dict] = []
+    try:
+        output_suffix = output_extension(request.output_format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    for pattern in ("*.arw", "*.ARW"):
-        for arw_file in source_dir.rglob(pattern):
-            # Skip macOS resource fork files and hidden files
-            if arw_file.name.startswith("._") or arw_file.name.startswith("."):
-                continue
-            total_original += 1
-            try:
-                relative_path = arw_file.relative_to(source_dir)
-            except ValueError:
-                relative_path = Path(arw_file.name)
-            converted_path = output_dir / relative_path.with_suffix(".jpg")
-            try:
-                exists = converted_path.exists()
-            except (PermissionError, OSError):
-                continue
-            if exists:
-                total_converted += 1
-                pairs.append(
-                    {
-                        "src": str(arw_file),
-                        "dst": str(converted_path),
-                        "success": True,
-                        "skipped": True,
-                        "error": None,
-                    }
-                )
+    try:
+        scan = await scan_cache.get(
+            source_dir,
+            output_format=request.output_format,
+            output_dir=output_dir,
+            refresh=request.refresh and not request.cursor,
+        )
+        page, next_cursor, _ = scan.page(
+            field=request.sort,
+            descending=request.order == "desc",
+            cursor=request.cursor,
+            limit=request.limit,
+            status="converted",
+            subfolder=request.subfolder,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-                if request.limit and len(pairs) >= request.limit:
-                    break
-        if request.limit and len(pairs) >= request.limit:
-            break
+    total_original = len(scan.table)
+    total_converted = int(scan.table.converted.sum())
+    pairs = (
+        {
+            "src": info.path,
+            "dst": str(output_dir / Path(info.path).relative_to(source_dir).with_suffix(output_suffix)),
+            "success": True,
+            "skipped": True,
+            "error": None,
+        }
+        for info in page
+    )
 
-    return ReviewResponse(
-        total_original=total_original,
-        total_converted=total_converted,
-        pairs=pairs,
+    return jsonio.bulk_response(
+        {
+            "total_original": total_original,
+            "total_converted": total_converted,
+            "next_cursor": next_cursor,
+        },
+        "pairs",
+        pairs,
+        len(page),
     )
 
 
@@ -647,122 +1557,71 @@ async def get_file_metadata(path: str):
     if target.is_dir():
         raise HTTPException(status_code=400, detail="Path is a directory.")
 
-    metadata = await exif_service.get_key_metadata(target)
+    metadata, _ = await _key_metadata([target])
     return {
         "path": str(target),
-        "metadata": metadata,
+        "metadata": metadata[str(target)],
     }
 
 
-@app.get("/api/drives")
-async def get_available_drives():
+@app.post("/api/metadata/batch")
+async def get_batch_metadata(request: MetadataBatchRequest):
     """
-    Get all available drives/volumes for automatic detection.
+    Get key metadata for many files at once (a review gallery page).
 
-    Returns accessible drives with their status and sample contents
-    to help users find their photos without manual configuration.
+    Files not seen before (or changed since) are read in one exiftool call;
+    the rest come from the metadata cache. Per-file problems are reported
+    as {"error": ...} instead of failing the whole request.
     """
-    from app.utils.paths import detect_windows_drive_mounts
-
-    drives = []
-
-    # Check macOS/Linux mounted volumes
-    volumes_path = Path("/Volumes")
-    if volumes_path.exists():
-        try:
-            for item in volumes_path.iterdir():
-                if item.is_dir() and not item.name.startswith("."):
-                    drive_info = _get_drive_info(item, "volume")
-                    drives.append(drive_info)
-        except (PermissionError, OSError):
-            pass
-
-    # Check Windows drive mounts
-    windows_drives = detect_windows_drive_mounts()
-    for letter, mount_path in windows_drives.items():
-        drive_info = _get_drive_info(mount_path, "windows", letter.upper())
-        drives.append(drive_info)
-
-    # Check /Users for home directories
-    users_path = Path("/Users")
-    if users_path.exists():
-        try:
-            for item in users_path.iterdir():
-                if item.is_dir() and not item.name.startswith(".") and item.name not in ("Shared", "Guest"):
-                    drive_info = {
-                        "name": f"Home ({item.name})",
-                        "path": str(item),
-                        "type": "home",
-                        "accessible": True,
-                        "has_photos": _has_photo_folders(item),
-                        "photo_hint": _find_photo_hint(item),
-                    }
-                    drives.append(drive_info)
-        except (PermissionError, OSError):
-            pass
-
+    targets = [resolve_path(path).path for path in request.paths]
+    metadata, cached = await _key_metadata(targets)
     return {
-        "drives": drives,
-        "platform": _detect_platform(),
+        "files": [
+            {"path": path, "resolved": str(target), "metadata": metadata[str(target)]}
+            for path, target in zip(request.paths, targets)
+        ],
+        "cached": cached,
     }
 
 
-def _get_drive_info(path: Path, drive_type: str, letter: str = None) -> dict:
-    """Get information about a drive/volume."""
-    name = f"{letter}: Drive" if letter else path.name
-    accessible = False
-    has_photos = False
-    photo_hint = None
-
-    try:
-        # Test if we can actually read the drive
-        list(path.iterdir())
-        accessible = True
-        has_photos = _has_photo_folders(path)
-        photo_hint = _find_photo_hint(path)
-    except (PermissionError, OSError):
-        accessible = False
-
-    return {
-        "name": name,
-        "path": str(path),
-        "type": drive_type,
-        "letter": letter,
-        "accessible": accessible,
-        "has_photos": has_photos,
-        "photo_hint": photo_hint,
-    }
+async def _key_metadata(targets: List[Path]) -> Tuple[Dict[str, dict], int]:
+    """
+    Key metadata by str(path), from the cache where possible.
 
+    Returns:
+        (metadata, cache hits); unreadable files map to {"error": ...}
+    """
+    loop = asyncio.get_event_loop()
+    hits, misses, missing = await loop.run_in_executor(
+        metadata_cache.executor, metadata_cache.lookup, list(dict.fromkeys(targets))
+    )
+    results: Dict[str, dict] = dict(hits)
+    for name in missing:
+        results[name] = {"error": "File not found"}
+    if misses:
+        async with scheduler.slot(Priority.METADATA):
+            read = await exif_service.get_key_metadata_batch([Path(key[0]) for key in misses])
+        await loop.run_in_executor(
+            metadata_cache.executor,
+            metadata_cache.store,
+            {key: read[key[0]] for key in misses},
+        )
+        results.update(read)
+    failed = sum(1 for key in misses if "error" in results[key[0]])
+    metrics.METADATA_LOOKUPS_TOTAL.inc(len(hits), result="cached")
+    metrics.METADATA_LOOKUPS_TOTAL.inc(len(misses) - failed, result="read")
+    metrics.METADATA_LOOKUPS_TOTAL.inc(len(missing) + failed, result="error")
+    return results, len(hits)
 
-def _has_photo_folders(path: Path) -> bool:
-    """Check if path contains common photo folder names."""
-    photo_names = {"photos", "pictures", "dcim", "images", "camera", "lightroom", "photography"}
-    try:
-        for item in path.iterdir():
-            if item.is_dir() and item.name.lower() in photo_names:
-                return True
-    except (PermissionError, OSError):
-        pass
-    return False
 
+@app.get("/api/drives")
+async def get_available_drives(refresh: bool = False):
+    """
+    Get all available drives/volumes for automatic detection.
 
-def _find_photo_hint(path: Path) -> str | None:
-    """Find a hint about where photos might be located."""
-    photo_names = {"photos", "pictures", "dcim", "images", "camera", "lightroom", "photography"}
-    try:
-        for item in path.iterdir():
-            if item.is_dir() and item.name.lower() in photo_names:
-                return str(item)
-    except (PermissionError, OSError):
-        pass
-    return None
-
-
-def _detect_platform() -> str:
-    """Detect if running on Windows or Mac (from inside Docker)."""
-    # Check for Windows Docker mount patterns
-    if Path("/host_mnt").exists() or Path("/mnt/c").exists():
-        return "windows"
-    if Path("/Volumes").exists() and not Path("/mnt/c").exists():
-        return "macos"
-    return "linux"
+    Returns accessible drives with their status and sample contents
+    to help users find their photos without manual configuration.
+    Mounts that do not answer within SPECTRUM_PROBE_TIMEOUT are listed
+    as inaccessible with timed_out set.
+    """
+    return await volume_service.drives(refresh)
@@ -1,24 +1,26 @@
 """
 Converter Service - ARW to JPEG conversion with atomic writes.
 
-Uses rawpy for RAW decoding and imageio for JPEG encoding.
+Uses rawpy for RAW decoding and the encoder registry for JPEG, WebP,
+AVIF and 16-bit TIFF output.
 Implements atomic write pattern to prevent corruption on NAS.
 """
 
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
 import tempfile
 import shutil
+from io import BytesIO
 
-try:
-    import rawpy
-    from PIL import Image, ImageFilter, ImageEnhance
-except ImportError as e:
-    raise ImportError("Missing dependencies. Install with: uv add rawpy imageio pillow") from e
+from app.services.encoders import Encoder, get_encoder
+from app.services.quality import search_quality
+from app.services.tone import apply_tone
+from app.utils.resources import worker_plan
+from app.utils.timing import StageTimer
 
 
 @dataclass
@@ -30,6 +32,18 @@ class ConversionResult:
     success: bool
     error: Optional[str] = None
     size_bytes: Optional[int] = None
+    quality: Optional[int] = None
+    output_format: Optional[str] = None
+    # Per-stage {"wall_s", "cpu_s"} keyed by stage name
+    timings: Dict[str, Dict[str, Optional[float]]] = field(default_factory=dict)
+    bytes_read: Optional[int] = None
+    bytes_written: Optional[int] = None
+    # Stopped at a stage boundary because the job was cancelled
+    cancelled: bool = False
+
+
+class ConversionCancelled(Exception):
+    """Raised between stages when the caller asked to abort."""
 
 
 class ConverterService:
@@ -37,7 +51,7 @@ class ConverterService:
 
     def __init__(self, executor: Optional[ThreadPoolExecutor] = None):
         """Initialize converter with optional thread pool."""
-        self.executor = executor or ThreadPoolExecutor(max_workers=2)
+        self.executor = executor or ThreadPoolExecutor(max_workers=worker_plan().scheduler)
         self.jpeg_quality_default = int(os.getenv("SPECTRUM_JPEG_QUALITY", "95"))
         self.enable_sharpen = os.getenv("SPECTRUM_SHARPEN", "1") != "0"
         self.sharpen_radius = float(os.getenv("SPECTRUM_SHARPEN_RADIUS", "1.2"))
@@ -45,6 +59,11 @@ class ConverterService:
         self.sharpen_threshold = int(os.getenv("SPECTRUM_SHARPEN_THRESHOLD", "3"))
         self.auto_bright = os.getenv("SPECTRUM_AUTO_BRIGHT", "1") != "0"
         self.default_preset = os.getenv("SPECTRUM_PRESET", "standard").lower()
+        self.default_format = os.getenv("SPECTRUM_OUTPUT_FORMAT", "jpeg").lower()
+        self.adaptive_min_quality = int(os.getenv("SPECTRUM_ADAPTIVE_MIN_QUALITY", "60"))
+        self.adaptive_proxy_pixels = int(
+            os.getenv("SPECTRUM_ADAPTIVE_PROXY_PIXELS", "2000000")
+        )
 
     async def convert_file(
         self,
@@ -52,21 +71,43 @@ class ConverterService:
         dst: Path,
         quality: Optional[int] = None,
         preset: Optional[str] = None,
+        target_size_bytes: Optional[int] = None,
+        target_ssim: Optional[float] = None,
+        output_format: Optional[str] = None,
+        source_data: Optional[bytes] = None,
+        should_abort: Optional[Callable[[], bool]] = None,
     ) -> ConversionResult:
         """
-        Convert ARW file to JPEG asynchronously.
+        Convert ARW file to JPEG (or another output format) asynchronously.
 
         Args:
             src: Source ARW file path
-            dst: Destination JPEG file path
-            quality: JPEG quality (1-100)
+            dst: Destination file path
+            quality: Encoder quality (1-100), the ceiling when a target is set
+            preset: Look preset name
+            target_size_bytes: Pick the best quality whose output fits this size
+            target_ssim: Pick the lowest quality reaching this SSIM (0-1)
+            output_format: Encoder name (jpeg, webp, avif, tiff16)
+            source_data: Already-read contents of src (from the prefetcher)
+            should_abort: Checked between stages; when it returns True the
+                conversion stops and returns a cancelled result
 
         Returns:
             ConversionResult with success status and metadata
         """
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(
-            self.executor, self._convert_sync, src, dst, quality, preset
+            self.executor,
+            self._convert_sync,
+            src,
+            dst,
+            quality,
+            preset,
+            target_size_bytes,
+            target_ssim,
+            output_format,
+            source_data,
+            should_abort,
         )
 
     def _convert_sync(
@@ -75,80 +116,149 @@ class ConverterService:
         dst: Path,
         quality: Optional[int],
         preset: Optional[str],
+        target_size_bytes: Optional[int] = None,
+        target_ssim: Optional[float] = None,
+        output_format: Optional[str] = None,
+        source_data: Optional[bytes] = None,
+        should_abort: Optional[Callable[[], bool]] = None,
     ) -> ConversionResult:
-        """Synchronous implementation of ARW to JPEG conversion."""
+        """Synchronous implementation of RAW conversion."""
+        # LibRaw and Pillow load on the first conversion, not at API startup
+        rawpy = _import_rawpy()
+        from PIL import Image
+
+        timer = StageTimer()
+
+        def checkpoint() -> None:
+            if should_abort is not None and should_abort():
+                raise ConversionCancelled()
+
         try:
             final_quality = quality if quality is not None else self.jpeg_quality_default
             final_quality = max(1, min(100, int(final_quality)))
             preset_config = self._resolve_preset(preset)
+            encoder = get_encoder(output_format, self.default_format)
 
             # Ensure output directory exists
             dst.parent.mkdir(parents=True, exist_ok=True)
 
             # Create temporary file for atomic write
             temp_fd, temp_path = tempfile.mkstemp(
-                suffix=".jpg", dir=dst.parent, prefix=".tmp_"
+                suffix=encoder.extension, dir=dst.parent, prefix=".tmp_"
             )
+            os.close(temp_fd)
 
             try:
-                # Convert ARW to RGB array using rawpy
-                with rawpy.imread(str(src)) as raw:
-                    raw_kwargs = {
-                        "use_camera_wb": True,
-                        "no_auto_bright": not preset_config["auto_bright"],
-                        "output_bps": 8,
-                        "half_size": False,
-                        "output_color": rawpy.ColorSpace.sRGB,
-                        "noise_thr": preset_config["noise_thr"],
-                        "median_filter_passes": preset_config["median_filter_passes"],
-                    }
-
-                    fbdd_mode = self._fbdd_mode(preset_config["fbdd_noise_reduction"])
-                    if fbdd_mode is not None:
-                        raw_kwargs["fbdd_noise_reduction"] = fbdd_mode
-
-                    rgb = raw.postprocess(**raw_kwargs)
-
-                # Optional enhancement: tonal and color adjustments
-                image = Image.fromarray(rgb)
-                if preset_config["contrast"] != 1.0:
-                    image = ImageEnhance.Contrast(image).enhance(
-                        preset_config["contrast"]
-                    )
-                if preset_config["color"] != 1.0:
-                    image = ImageEnhance.Color(image).enhance(preset_config["color"])
-                if preset_config["brightness"] != 1.0:
-                    image = ImageEnhance.Brightness(image).enhance(
-                        preset_config["brightness"]
-                    )
+                # Prefetched data is decoded from memory, so "decode" excludes
+                # network time. Otherwise LibRaw reads the file itself, without
+                # a second full-size copy in Python, and read and decode are
+                # timed together.
+                checkpoint()
+                if source_data is not None:
+                    timer.bytes_read = len(source_data)
+                    stage, source = "decode", BytesIO(source_data)
+                else:
+                    timer.bytes_read = src.stat().st_size
+                    stage, source = "read_decode", str(src)
 
-                # Optional enhancement: light sharpening for clarity
-                if self.enable_sharpen and preset_config["sharpen"]["enabled"]:
-                    image = image.filter(
-                        ImageFilter.UnsharpMask(
-                            radius=preset_config["sharpen"]["radius"],
-                            percent=preset_config["sharpen"]["percent"],
-                            threshold=preset_config["sharpen"]["threshold"],
-                        )
+                # Convert RAW to RGB array using rawpy
+                with timer.stage(stage):
+                    with rawpy.imread(source) as raw:
+                        raw_kwargs = {
+                            "use_camera_wb": True,
+                            "no_auto_bright": not preset_config["auto_bright"],
+                            "output_bps": encoder.bits,
+                            "half_size": False,
+                            "output_color": rawpy.ColorSpace.sRGB,
+                            "noise_thr": preset_config["noise_thr"],
+                            "median_filter_passes": preset_config["median_filter_passes"],
+                        }
+
+                        fbdd_mode = self._fbdd_mode(preset_config["fbdd_noise_reduction"])
+                        if fbdd_mode is not None:
+                            raw_kwargs["fbdd_noise_reduction"] = fbdd_mode
+
+                        rgb = raw.postprocess(**raw_kwargs)
+                del source_data, source
+
+                checkpoint()
+                with timer.stage("enhance"):
+                    # Tone is applied in place on rawpy's buffer, band by band,
+                    # so no full-size float array or per-adjustment image is made
+                    apply_tone(
+                        rgb,
+                        contrast=preset_config["contrast"],
+                        color=preset_config["color"],
+                        brightness=preset_config["brightness"],
+                        in_place=True,
                     )
+                    if encoder.bits == 16:
+                        # 16-bit path stays in NumPy, without sharpening
+                        # (retouchers sharpen for their own output size)
+                        image = rgb
+                    else:
+                        # Pillow keeps RGB at 4 bytes per pixel, so it cannot wrap
+                        # the 3-byte array: this is the one copy. Release the array
+                        # now instead of holding it through sharpen and encode.
+                        image = Image.fromarray(rgb)
+                        del rgb
+                        image = self._sharpen(image, preset_config)
 
-                # Write JPEG to temporary file (highest quality, no resize)
-                image.save(
-                    temp_path,
-                    format="JPEG",
-                    quality=final_quality,
-                    subsampling=0,
-                    optimize=False,
-                )
+                checkpoint()
+                if encoder.bits == 16:
+                    # Uncompressed container: "encoding" is the file write itself
+                    with timer.stage("write"):
+                        encoder.encode(image, temp_path, final_quality)
+                else:
+                    with timer.stage("encode"):
+                        # Adaptive mode: choose quality on a proxy, then encode once
+                        if encoder.supports_quality and (target_size_bytes or target_ssim):
+                            final_quality = self._choose_quality(
+                                image, final_quality, target_size_bytes, target_ssim, encoder
+                            )
+
+                        # Encode in memory (full resolution, no resize)
+                        encoded = self._encode_buffer(image, final_quality, encoder)
+
+                        # The proxy estimate can undershoot on very detailed frames;
+                        # retry once against a budget tightened by the observed miss.
+                        if (
+                            encoder.supports_quality
+                            and target_size_bytes
+                            and encoded.getbuffer().nbytes > target_size_bytes
+                        ):
+                            tightened = int(
+                                target_size_bytes * target_size_bytes / encoded.getbuffer().nbytes
+                            )
+                            retry_quality = self._choose_quality(
+                                image, final_quality - 1, tightened, None, encoder
+                            )
+                            if retry_quality < final_quality:
+                                final_quality = retry_quality
+                                encoded = self._encode_buffer(image, final_quality, encoder)
+                    del image
+
+                    with timer.stage("write"):
+                        with open(temp_path, "wb") as handle:
+                            handle.write(encoded.getbuffer())
+                    del encoded
 
-                # Atomic rename: temp → final
-                shutil.move(temp_path, dst)
+                with timer.stage("write"):
+                    # Atomic rename: temp → final
+                    shutil.move(temp_path, dst)
+                    size_bytes = dst.stat().st_size
+                timer.bytes_written = size_bytes
 
                 return ConversionResult(
                     src_path=str(src),
                     dst_path=str(dst),
                     success=True,
-                    size_bytes=dst.stat().st_size,
+                    size_bytes=size_bytes,
+                    quality=final_quality if encoder.supports_quality else None,
+                    output_format=encoder.name,
+                    timings=timer.stages,
+                    bytes_read=timer.bytes_read,
+                    bytes_written=timer.bytes_written,
                 )
 
             finally:
@@ -158,10 +268,82 @@ class ConverterService:
                 except:
                     pass
 
+        except ConversionCancelled:
+            return ConversionResult(
+                src_path=str(src),
+                dst_path=str(dst),
+                success=False,
+                error="Cancelled",
+                timings=timer.stages,
+                bytes_read=timer.bytes_read,
+                cancelled=True,
+            )
         except Exception as e:
             return ConversionResult(
-                src_path=str(src), dst_path=str(dst), success=False, error=str(e)
+                src_path=str(src),
+                dst_path=str(dst),
+                success=False,
+                error=str(e),
+                timings=timer.stages,
+                bytes_read=timer.bytes_read,
+            )
+
+    def render_settings(self) -> Dict[str, Any]:
+        """Service-level settings that change the rendered output (for caching)."""
+        return {
+            "sharpen": self.enable_sharpen,
+            "adaptive_min_quality": self.adaptive_min_quality,
+            "adaptive_proxy_pixels": self.adaptive_proxy_pixels,
+        }
+
+    def _sharpen(self, image: "Image.Image", preset_config: Dict[str, Any]) -> "Image.Image":
+        """Apply the preset's sharpening (tone is applied to the array beforehand)."""
+        from PIL import ImageFilter
+
+        # Optional enhancement: light sharpening for clarity
+        if self.enable_sharpen and preset_config["sharpen"]["enabled"]:
+            image = image.filter(
+                ImageFilter.UnsharpMask(
+                    radius=preset_config["sharpen"]["radius"],
+                    percent=preset_config["sharpen"]["percent"],
+                    threshold=preset_config["sharpen"]["threshold"],
+                )
             )
+        return image
+
+    def _encode_buffer(
+        self, image: "Image.Image", quality: int, encoder: Optional[Encoder] = None
+    ) -> BytesIO:
+        """Encode to memory; the buffer is written out without a bytes copy."""
+        buffer = BytesIO()
+        (encoder or get_encoder(self.default_format)).encode(image, buffer, quality)
+        return buffer
+
+    def _encode_bytes(
+        self, image: "Image.Image", quality: int, encoder: Optional[Encoder] = None
+    ) -> bytes:
+        """Encode to memory (used for adaptive trial encodes)."""
+        return self._encode_buffer(image, quality, encoder).getvalue()
+
+    def _choose_quality(
+        self,
+        image: "Image.Image",
+        max_quality: int,
+        target_size_bytes: Optional[int],
+        target_ssim: Optional[float],
+        encoder: Optional[Encoder] = None,
+    ) -> int:
+        """Search the encoder quality that meets the requested target."""
+        choice = search_quality(
+            image,
+            lambda proxy, q: self._encode_bytes(proxy, q, encoder),
+            target_bytes=target_size_bytes,
+            target_ssim=target_ssim,
+            min_quality=min(self.adaptive_min_quality, max_quality),
+            max_quality=max_quality,
+            proxy_pixels=self.adaptive_proxy_pixels,
+        )
+        return choice.quality
 
     def _resolve_preset(self, preset: Optional[str]) -> Dict[str, Any]:
         presets: Dict[str, Dict[str, Any]] = {
@@ -211,6 +393,7 @@ class ConverterService:
         return presets.get(preset_key, presets["standard"])
 
     def _fbdd_mode(self, value: str) -> Optional["rawpy.FBDDNoiseReductionMode"]:
+        rawpy = _import_rawpy()
         if not hasattr(rawpy, "FBDDNoiseReductionMode"):
             return None
         mode = value.lower()
@@ -222,3 +405,12 @@ class ConverterService:
         if mode == "off" and hasattr(enum, "Off"):
             return enum.Off
         return None
+
+
+def _import_rawpy():
+    """rawpy, imported on first use (loading LibRaw is the slowest import we have)."""
+    try:
+        import rawpy
+    except ImportError as e:
+        raise ImportError("Missing dependencies. Install with: uv add rawpy imageio pillow") from e
+    return rawpy
@@ -0,0 +1,99 @@
+"""
+Dedupe Service - Content fingerprinting of source files across a batch.
+
+Byte-identical RAW files (the same card copied into several folders) only
+need to be converted once. Files are grouped by size first, then by a hash
+of their first and last megabyte, and only colliding candidates are hashed
+in full, so unique files cost a single stat.
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+
+EDGE_BYTES = 1024 * 1024
+READ_CHUNK = 4 * 1024 * 1024
+
+
+def edge_fingerprint(path: Path, size: Optional[int] = None, edge_bytes: int = EDGE_BYTES) -> str:
+    """
+    Cheap content fingerprint: size plus a hash of the first and last edge_bytes.
+    """
+    if size is None:
+        size = path.stat().st_size
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(size.to_bytes(8, "little"))
+    with open(path, "rb") as handle:
+        digest.update(handle.read(edge_bytes))
+        if size > edge_bytes:
+            handle.seek(max(edge_bytes, size - edge_bytes))
+            digest.update(handle.read(edge_bytes))
+    return f"{size}-{digest.hexdigest()}"
+
+
+def full_fingerprint(path: Path) -> str:
+    """Hash of the entire file contents."""
+    digest = hashlib.blake2b(digest_size=32)
+    with open(path, "rb") as handle:
+        while chunk := handle.read(READ_CHUNK):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def data_fingerprint(data: bytes) -> str:
+    """Hash of contents already in memory; equals full_fingerprint of the same file."""
+    return hashlib.blake2b(data, digest_size=32).hexdigest()
+
+
+class DedupeService:
+    """Finds byte-identical source files within a batch."""
+
+    def __init__(self, executor: Optional[ThreadPoolExecutor] = None):
+        """Initialize with optional thread pool for hashing I/O."""
+        self.executor = executor or ThreadPoolExecutor(max_workers=4)
+
+    async def find_duplicates(self, paths: List[Path]) -> Dict[Path, Path]:
+        """
+        Map every duplicate path to the first path with identical content.
+
+        Args:
+            paths: Source files, in processing order
+
+        Returns:
+            {duplicate: primary}; files with unique content are absent
+        """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self.executor, self._find_duplicates_sync, paths)
+
+    def _find_duplicates_sync(self, paths: List[Path]) -> Dict[Path, Path]:
+        """Synchronous implementation of duplicate detection."""
+        by_size: Dict[int, List[Path]] = {}
+        for path in paths:
+            try:
+                by_size.setdefault(path.stat().st_size, []).append(path)
+            except (PermissionError, OSError):
+                continue
+
+        duplicates: Dict[Path, Path] = {}
+        for size, same_size in by_size.items():
+            if len(same_size) < 2:
+                continue
+            for candidates in self._group(same_size, lambda p: edge_fingerprint(p, size)):
+                for group in self._group(candidates, full_fingerprint):
+                    primary = group[0]
+                    for duplicate in group[1:]:
+                        duplicates[duplicate] = primary
+        return duplicates
+
+    @staticmethod
+    def _group(paths: List[Path], key) -> List[List[Path]]:
+        """Split paths by key, keeping only groups with more than one member."""
+        groups: Dict[str, List[Path]] = {}
+        for path in paths:
+            try:
+                groups.setdefault(key(path), []).append(path)
+            except (PermissionError, OSError):
+                continue
+        return [group for group in groups.values() if len(group) > 1]
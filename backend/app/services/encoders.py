@@ -0,0 +1,186 @@
+"""
+Encoders - Output format registry for the conversion pipeline.
+
+Each encoder knows its file extension, the bit depth it wants from LibRaw
+and how to write an image to a binary file object. Adding a format means
+adding an Encoder subclass and registering it in ENCODERS.
+"""
+
+from typing import Any, BinaryIO, Dict, Optional
+import struct
+
+import numpy as np
+
+
+class Encoder:
+    """Base class for output encoders."""
+
+    name: str = ""
+    extension: str = ""
+    media_type: str = "application/octet-stream"
+    bits: int = 8
+    supports_quality: bool = True
+
+    def available(self) -> bool:
+        """Whether this encoder can run with the installed libraries."""
+        return True
+
+    def save_options(self, quality: int) -> Dict[str, Any]:
+        """Pillow save options for this format."""
+        raise NotImplementedError
+
+    def encode(self, image: Any, fp: BinaryIO, quality: int) -> None:
+        """
+        Write an image to fp.
+
+        Args:
+            image: PIL image for 8-bit encoders, uint16 RGB array for 16-bit
+            fp: Writable binary file object or path
+            quality: Encoder quality (1-100), ignored if unsupported
+        """
+        image.save(fp, **self.save_options(quality))
+
+
+class JpegEncoder(Encoder):
+    name = "jpeg"
+    extension = ".jpg"
+    media_type = "image/jpeg"
+
+    def save_options(self, quality: int) -> Dict[str, Any]:
+        # Highest quality, no chroma subsampling, no resize
+        return {"format": "JPEG", "quality": quality, "subsampling": 0, "optimize": False}
+
+
+class WebPEncoder(Encoder):
+    name = "webp"
+    extension = ".webp"
+    media_type = "image/webp"
+
+    def available(self) -> bool:
+        from PIL import features
+
+        return bool(features.check("webp"))
+
+    def save_options(self, quality: int) -> Dict[str, Any]:
+        return {"format": "WEBP", "quality": quality, "method": 4}
+
+
+class AvifEncoder(Encoder):
+    name = "avif"
+    extension = ".avif"
+    media_type = "image/avif"
+
+    def available(self) -> bool:
+        from PIL import features
+
+        try:
+            return bool(features.check("avif"))
+        except ValueError:
+            # Pillow < 11.2 does not know the feature at all
+            return False
+
+    def save_options(self, quality: int) -> Dict[str, Any]:
+        return {"format": "AVIF", "quality": quality, "subsampling": "4:4:4"}
+
+
+class Tiff16Encoder(Encoder):
+    """Uncompressed 16-bit RGB TIFF for retouching."""
+
+    name = "tiff16"
+    extension = ".tif"
+    media_type = "image/tiff"
+    bits = 16
+    supports_quality = False
+
+    def save_options(self, quality: int) -> Dict[str, Any]:
+        return {}
+
+    def encode(self, image: Any, fp: BinaryIO, quality: int) -> None:
+        if isinstance(fp, (str, bytes)) or hasattr(fp, "__fspath__"):
+            with open(fp, "wb") as handle:
+                write_tiff16(handle, image)
+        else:
+            write_tiff16(fp, image)
+
+
+def write_tiff16(fp: BinaryIO, rgb: np.ndarray) -> None:
+    """
+    Write a baseline little-endian TIFF with one uncompressed RGB16 strip.
+
+    Pillow cannot write 16-bit RGB, so the container is assembled by hand;
+    the pixel buffer is streamed straight from the array.
+    """
+    if rgb.ndim != 3 or rgb.shape[2] != 3:
+        raise ValueError("16-bit TIFF expects an (H, W, 3) array")
+    pixels = np.ascontiguousarray(rgb, dtype="<u2")
+    height, width = pixels.shape[:2]
+
+    entries = [
+        # (tag, type, count, value); type 3 = SHORT, 4 = LONG
+        (256, 4, 1, width),  # ImageWidth
+        (257, 4, 1, height),  # ImageLength
+        (258, 3, 3, None),  # BitsPerSample -> external 16,16,16
+        (259, 3, 1, 1),  # Compression: none
+        (262, 3, 1, 2),  # PhotometricInterpretation: RGB
+        (273, 4, 1, None),  # StripOffsets -> pixel data offset
+        (277, 3, 1, 3),  # SamplesPerPixel
+        (278, 4, 1, height),  # RowsPerStrip
+        (279, 4, 1, pixels.nbytes),  # StripByteCounts
+        (284, 3, 1, 1),  # PlanarConfiguration: chunky
+    ]
+
+    ifd_offset = 8
+    ifd_size = 2 + len(entries) * 12 + 4
+    bits_offset = ifd_offset + ifd_size
+    data_offset = bits_offset + 6
+    data_offset += data_offset % 2
+
+    header = bytearray(b"II*\x00" + struct.pack("<I", ifd_offset))
+    header += struct.pack("<H", len(entries))
+    for tag, field_type, count, value in entries:
+        if tag == 258:
+            value = bits_offset
+            header += struct.pack("<HHII", tag, field_type, count, value)
+        elif field_type == 3:
+            value = data_offset if value is None else value
+            header += struct.pack("<HHIHH", tag, field_type, count, value, 0)
+        else:
+            value = data_offset if value is None else value
+            header += struct.pack("<HHII", tag, field_type, count, value)
+    header += struct.pack("<I", 0)  # no next IFD
+    header += struct.pack("<HHH", 16, 16, 16)
+    header += b"\x00" * (data_offset - len(header))
+
+    fp.write(bytes(header))
+    fp.write(memoryview(pixels).cast("B"))
+
+
+ENCODERS: Dict[str, Encoder] = {
+    encoder.name: encoder
+    for encoder in (JpegEncoder(), WebPEncoder(), AvifEncoder(), Tiff16Encoder())
+}
+
+FORMAT_ALIASES = {"jpg": "jpeg", "tif": "tiff16", "tiff": "tiff16"}
+
+
+def normalize_format(name: Optional[str], default: str = "jpeg") -> str:
+    """Map a user supplied format name onto a registered encoder name."""
+    key = (name or default).strip().lower().lstrip(".")
+    key = FORMAT_ALIASES.get(key, key)
+    if key not in ENCODERS:
+        supported = ", ".join(sorted(ENCODERS))
+        raise ValueError(f"Unsupported output format: {name} (supported: {supported})")
+    return key
+
+
+def get_encoder(name: Optional[str], default: str = "jpeg") -> Encoder:
+    """Look up an encoder, failing if its codec is not available."""
+    encoder = ENCODERS[normalize_format(name, default)]
+    if not encoder.available():
+        raise ValueError(f"Output format {encoder.name} is not supported by this Pillow build")
+    return encoder
+
+
+def output_extension(name: Optional[str], default: str = "jpeg") -> str:
+    """File extension (with dot) produced for an output format."""
+    return ENCODERS[normalize_format(name, default)].extension
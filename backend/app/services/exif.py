@@ -5,24 +5,93 @@ Copies all EXIF tags from source ARW to output JPEG to maintain
 camera settings, GPS data, timestamps, and other metadata.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import asyncio
+import json
+import os
 import shutil
-from typing import Optional, Tuple
+import subprocess
+import tempfile
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.services import metrics
+from app.utils.resources import worker_plan
+from app.utils.timing import StageTimer
+
+
+# Fields shown in the review UI's metadata panel
+KEY_TAGS = (
+    "Make",
+    "Model",
+    "LensModel",
+    "DateTimeOriginal",
+    "CreateDate",
+    "GPSLatitude",
+    "GPSLongitude",
+    "GPSAltitude",
+    "ISO",
+    "ExposureTime",
+    "FNumber",
+    "FocalLength",
+)
+# Files per exiftool process in batch reads
+BATCH_FILES = 500
+
+
+def _run_measured(args: Sequence[str]) -> Tuple[int, str, str, float]:
+    """
+    Run a command to completion (blocking).
+
+    The child is reaped with os.wait4, so the CPU time is that process's
+    own, not a difference of RUSAGE_CHILDREN (which also counts every other
+    child that ended meanwhile). Output goes through temporary files, so
+    neither pipe can fill up while nothing reads it.
+
+    Returns:
+        (returncode, stdout, stderr, cpu_s)
+    """
+    with tempfile.TemporaryFile() as out, tempfile.TemporaryFile() as err:
+        process = subprocess.Popen(args, stdin=subprocess.DEVNULL, stdout=out, stderr=err)
+        _, status, usage = os.wait4(process.pid, 0)
+        # Already reaped; keeps Popen from waiting on the pid again
+        process.returncode = os.waitstatus_to_exitcode(status)
+        out.seek(0)
+        err.seek(0)
+        return (
+            process.returncode,
+            out.read().decode(errors="replace"),
+            err.read().decode(errors="replace"),
+            usage.ru_utime + usage.ru_stime,
+        )
 
 
 class ExifService:
     """EXIF metadata handler using exiftool."""
 
     def __init__(self):
-        """Initialize and verify exiftool is available."""
-        self._exiftool_path = shutil.which("exiftool")
-        if self._exiftool_path:
-            print(f"[EXIF] Found exiftool at: {self._exiftool_path}", flush=True)
-        else:
-            print("[EXIF] WARNING: exiftool not found in PATH. Metadata will not be preserved.", flush=True)
-
-    async def copy_exif(self, src: Path, dst: Path) -> Tuple[bool, Optional[str]]:
+        """Initialize; exiftool is located on first use, not at startup."""
+        self._resolved = False
+        self._path: Optional[str] = None
+        # Threads that wait on exiftool copies, one per decode thread
+        self.executor = ThreadPoolExecutor(max_workers=worker_plan().scheduler)
+
+    @property
+    def _exiftool_path(self) -> Optional[str]:
+        """Path to exiftool, searched for (and reported) once."""
+        if not self._resolved:
+            self._path = shutil.which("exiftool")
+            self._resolved = True
+            if self._path:
+                print(f"[EXIF] Found exiftool at: {self._path}", flush=True)
+            else:
+                print("[EXIF] WARNING: exiftool not found in PATH. Metadata will not be preserved.", flush=True)
+        return self._path
+
+    async def copy_exif(
+        self, src: Path, dst: Path, timer: Optional[StageTimer] = None
+    ) -> Tuple[bool, Optional[str]]:
         """
         Copy EXIF metadata from source to destination asynchronously.
 
@@ -32,14 +101,30 @@ class ExifService:
         Args:
             src: Source ARW file with EXIF data
             dst: Destination JPEG file to receive EXIF data
+            timer: Optional per-file timer; records an "exif" stage
 
         Returns:
             (success, error_message)
         """
+        wall_start = time.perf_counter()
+        cpu_s: Optional[float] = None
+        try:
+            copied, error, cpu_s = await self._copy_exif(src, dst)
+            if self._exiftool_path:
+                metrics.EXIFTOOL_PROCESSES_TOTAL.inc(operation="copy")
+                if not copied:
+                    metrics.EXIFTOOL_FAILURES_TOTAL.inc(operation="copy")
+            return copied, error
+        finally:
+            if timer is not None:
+                timer.record("exif", time.perf_counter() - wall_start, cpu_s)
+
+    async def _copy_exif(self, src: Path, dst: Path) -> Tuple[bool, Optional[str], Optional[float]]:
+        """Run exiftool to copy tags from src into dst; also returns its CPU seconds."""
         try:
             # Check if exiftool is available
             if not self._exiftool_path:
-                return False, "exiftool not installed"
+                return False, "exiftool not installed", None
 
             # Run exiftool with robust settings for RAW to JPEG metadata transfer
             #
@@ -54,7 +139,7 @@ class ExifService:
             # tags to their appropriate groups in the destination, while -all:all
             # tries to preserve source group structure which may not work for
             # cross-format copies.
-            process = await asyncio.create_subprocess_exec(
+            args = [
                 self._exiftool_path,
                 "-TagsFromFile",
                 str(src),
@@ -63,13 +148,13 @@ class ExifService:
                 "-m",  # Ignore minor errors/warnings
                 "-overwrite_original",  # Don't create backup
                 str(dst),
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
+            ]
+            loop = asyncio.get_event_loop()
+            returncode, stdout, stderr, cpu_s = await loop.run_in_executor(
+                self.executor, _run_measured, args
             )
-
-            stdout, stderr = await process.communicate()
-            stdout_text = stdout.decode().strip()
-            stderr_text = stderr.decode().strip()
+            stdout_text = stdout.strip()
+            stderr_text = stderr.strip()
 
             # Log the actual exiftool output for debugging
             if stdout_text:
@@ -79,28 +164,28 @@ class ExifService:
 
             # exiftool returns 0 on success, 1 on warnings, 2 on errors
             # We accept 0 and 1 as success (warnings are ok for cross-format copies)
-            if process.returncode <= 1:
+            if returncode <= 1:
                 # Check if it actually updated the file
                 if "image files updated" in stdout_text:
-                    return True, None
+                    return True, None, cpu_s
                 # "0 image files updated" means nothing was written - this is a problem
                 if "0 image files updated" in stdout_text:
                     print(f"[EXIF] Warning: No metadata written to {dst.name}", flush=True)
-                    return False, "No metadata was written"
+                    return False, "No metadata was written", cpu_s
                 # Other success cases
-                return True, None
+                return True, None, cpu_s
 
             error_message = stderr_text or stdout_text or "Unknown exiftool error"
-            print(f"[EXIF] Failed for {dst.name} (code {process.returncode}): {error_message}", flush=True)
-            return False, error_message
+            print(f"[EXIF] Failed for {dst.name} (code {returncode}): {error_message}", flush=True)
+            return False, error_message, cpu_s
 
         except FileNotFoundError:
             print("[EXIF] Warning: exiftool not found. EXIF data will not be preserved.", flush=True)
-            return False, "exiftool not found"
+            return False, "exiftool not found", None
         except Exception as e:
             error_message = str(e)
             print(f"[EXIF] Copy error for {dst.name}: {error_message}", flush=True)
-            return False, error_message
+            return False, error_message, None
 
     async def verify_exif(self, file_path: Path) -> dict:
         """
@@ -127,8 +212,6 @@ class ExifService:
             stdout, stderr = await process.communicate()
 
             if process.returncode == 0:
-                import json
-
                 data = json.loads(stdout.decode())
                 return data[0] if data else {}
             else:
@@ -152,31 +235,77 @@ class ExifService:
             process = await asyncio.create_subprocess_exec(
                 self._exiftool_path,
                 "-json",
-                "-Make",
-                "-Model",
-                "-LensModel",
-                "-DateTimeOriginal",
-                "-CreateDate",
-                "-GPSLatitude",
-                "-GPSLongitude",
-                "-GPSAltitude",
-                "-ISO",
-                "-ExposureTime",
-                "-FNumber",
-                "-FocalLength",
+                *(f"-{tag}" for tag in KEY_TAGS),
                 str(file_path),
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
             )
 
             stdout, stderr = await process.communicate()
+            metrics.EXIFTOOL_PROCESSES_TOTAL.inc(operation="read")
 
             if process.returncode == 0:
-                import json
                 data = json.loads(stdout.decode())
                 return data[0] if data else {}
             else:
+                metrics.EXIFTOOL_FAILURES_TOTAL.inc(operation="read")
                 return {"error": stderr.decode().strip()}
 
         except Exception as e:
             return {"error": str(e)}
+
+    async def get_key_metadata_batch(self, file_paths: Sequence[Path]) -> Dict[str, dict]:
+        """
+        Extract key metadata for many files with one exiftool process per BATCH_FILES.
+
+        The file list is passed on stdin (-@ -), so neither the command line
+        length nor per-file process start-up limits how many files a
+        gallery page asks for.
+
+        Args:
+            file_paths: Files to read
+
+        Returns:
+            Dict of str(path) -> metadata, or {"error": ...} for files
+            exiftool could not read
+        """
+        if not self._exiftool_path:
+            return {str(path): {"error": "exiftool not available"} for path in file_paths}
+
+        results: Dict[str, dict] = {}
+        for start in range(0, len(file_paths), BATCH_FILES):
+            chunk = file_paths[start:start + BATCH_FILES]
+            results.update(await self._read_batch([str(path) for path in chunk]))
+        return results
+
+    async def _read_batch(self, names: List[str]) -> Dict[str, dict]:
+        try:
+            process = await asyncio.create_subprocess_exec(
+                self._exiftool_path,
+                "-json",
+                *(f"-{tag}" for tag in KEY_TAGS),
+                "-@",
+                "-",
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            stdout, stderr = await process.communicate("\n".join(names).encode() + b"\n")
+            metrics.EXIFTOOL_PROCESSES_TOTAL.inc(operation="read_batch")
+            # Exit code 1 only means some files failed; the others are in the output
+            entries = json.loads(stdout.decode()) if stdout.strip() else []
+        except Exception as e:
+            metrics.EXIFTOOL_FAILURES_TOTAL.inc(operation="read_batch")
+            return {name: {"error": str(e)} for name in names}
+
+        if process.returncode != 0:
+            metrics.EXIFTOOL_FAILURES_TOTAL.inc(operation="read_batch")
+        results = {}
+        for entry in entries:
+            source = entry.pop("SourceFile", None)
+            if source is not None:
+                results[source] = {"error": entry["Error"]} if "Error" in entry else entry
+        error = stderr.decode().strip() or "No metadata returned"
+        for name in names:
+            results.setdefault(name, {"error": error})
+        return results
@@ -0,0 +1,258 @@
+"""
+Job Service - Pause, resume and cancel for conversion jobs.
+
+Cancelling an HTTP stream used to cancel the awaiting coroutine while the
+executor thread kept decoding. Jobs are now controlled cooperatively: the
+batch loop checks in before admitting each file, and converters check
+between stages, so a cancelled job frees its worker at the next stage
+boundary and a paused one holds no worker, slot or read-ahead buffer.
+"""
+
+from typing import TYPE_CHECKING, Awaitable, Callable, List, Optional
+from collections import OrderedDict
+import asyncio
+import threading
+import time
+import uuid
+
+if TYPE_CHECKING:
+    from app.services.state import JobStateStore
+
+ACTIVE_STATES = ("running", "paused", "cancelling")
+COMMANDS = ("pause", "resume", "cancel")
+
+
+class JobCancelled(Exception):
+    """Raised at a checkpoint once the job has been cancelled."""
+
+
+class JobControl:
+    """Control flags and progress of one job, safe to use from any thread or loop."""
+
+    def __init__(self, job_id: str, kind: str = "convert", total: int = 0):
+        self.id = job_id
+        self.kind = kind
+        self.total = total
+        self.processed = 0
+        self.state = "running"
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self._paused = False
+        self._cancelled = False
+        self._lock = threading.Lock()
+        self._waiters: List[asyncio.Future] = []
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    @property
+    def finished(self) -> bool:
+        return self.state not in ACTIVE_STATES
+
+    def should_abort(self) -> bool:
+        """Stage-boundary check for worker threads."""
+        return self._cancelled
+
+    def pause(self) -> None:
+        """Stop admitting new files; in-flight files finish first."""
+        with self._lock:
+            if self.finished or self._cancelled:
+                return
+            self._paused = True
+            self.state = "paused"
+
+    def resume(self) -> None:
+        with self._lock:
+            if self.finished or self._cancelled:
+                return
+            self._paused = False
+            self.state = "running"
+            self._wake()
+
+    def cancel(self) -> None:
+        """Stop admitting files and abort in-flight ones at their next stage."""
+        with self._lock:
+            if self.finished:
+                return
+            self._cancelled = True
+            self._paused = False
+            self.state = "cancelling"
+            self._wake()
+
+    async def checkpoint(
+        self,
+        on_pause: Optional[Callable[[], Awaitable[None]]] = None,
+        on_resume: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """
+        Return when the job may admit its next file.
+
+        Waits without a thread while paused, calling on_pause first (to free
+        buffers) and on_resume afterwards.
+
+        Raises:
+            JobCancelled: if the job was cancelled
+        """
+        if self._cancelled:
+            raise JobCancelled(self.id)
+        if not self._paused:
+            return
+        if on_pause is not None:
+            await on_pause()
+        while True:
+            with self._lock:
+                if self._cancelled:
+                    raise JobCancelled(self.id)
+                if not self._paused:
+                    break
+                waiter = asyncio.get_event_loop().create_future()
+                self._waiters.append(waiter)
+            await waiter
+        if on_resume is not None:
+            on_resume()
+
+    def finish(self, state: str) -> None:
+        with self._lock:
+            self.state = state
+            self.finished_at = time.time()
+            self._wake()
+
+    def info(self) -> dict:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "state": self.state,
+            "total": self.total,
+            "processed": self.processed,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+    def _wake(self) -> None:
+        """Release checkpoint waiters (lock held)."""
+        for waiter in self._waiters:
+            try:
+                waiter.get_loop().call_soon_threadsafe(_resolve, waiter)
+            except RuntimeError:
+                pass  # The waiter's event loop is gone
+        self._waiters.clear()
+
+
+def _resolve(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class JobRegistry:
+    """Active and recently finished jobs by id."""
+
+    def __init__(self, keep_finished: int = 50, store: Optional["JobStateStore"] = None):
+        """
+        Initialize registry.
+
+        Args:
+            keep_finished: Finished jobs remembered for status queries
+            store: Shared store when several API processes serve requests;
+                jobs are then visible and controllable from any process
+        """
+        self.keep_finished = keep_finished
+        self.store = store
+        self._jobs: "OrderedDict[str, JobControl]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(self, kind: str = "convert", total: int = 0, job_id: Optional[str] = None) -> JobControl:
+        """
+        Register a new job.
+
+        Raises:
+            ValueError: if job_id belongs to a job that is still active
+        """
+        job_id = job_id or uuid.uuid4().hex[:12]
+        with self._lock:
+            existing = self._jobs.get(job_id)
+            if (existing is not None and not existing.finished) or (
+                self.store is not None and self.store.is_active_elsewhere(job_id)
+            ):
+                raise ValueError(f"Job already running: {job_id}")
+            control = JobControl(job_id, kind, total)
+            self._jobs[job_id] = control
+            self._jobs.move_to_end(job_id)
+            self._prune()
+        if self.store is not None:
+            # One small local write; other processes see the job immediately
+            self.store.save([control.info()])
+        return control
+
+    def get(self, job_id: str) -> Optional[JobControl]:
+        """Job owned by this process."""
+        return self._jobs.get(job_id)
+
+    def list(self) -> List[JobControl]:
+        """Jobs owned by this process."""
+        with self._lock:
+            return list(self._jobs.values())
+
+    def info(self, job_id: str) -> Optional[dict]:
+        """Status of a job owned by any process (blocking when shared)."""
+        control = self._jobs.get(job_id)
+        if control is not None:
+            return control.info()
+        return self.store.get(job_id) if self.store is not None else None
+
+    def list_info(self) -> List[dict]:
+        """Status of all known jobs, this process's entries being freshest (blocking when shared)."""
+        local = {job.id: job.info() for job in self.list()}
+        if self.store is None:
+            return list(local.values())
+        shared = [local.pop(row["id"], row) for row in self.store.list()]
+        return shared + list(local.values())
+
+    def command(self, job_id: str, action: str) -> dict:
+        """
+        Pause, resume or cancel a job owned by any process (blocking when shared).
+
+        A job owned by another process gets the command on that process's
+        next sync; the returned info then carries it under "requested".
+
+        Raises:
+            KeyError: unknown job
+            ValueError: the job already finished
+        """
+        if action not in COMMANDS:
+            raise ValueError(f"Unknown command: {action}")
+        control = self._jobs.get(job_id)
+        if control is None:
+            info = self.store.get(job_id) if self.store is not None else None
+            if info is None:
+                raise KeyError(job_id)
+            if info["state"] not in ACTIVE_STATES or not self.store.request(job_id, action):
+                raise ValueError(f"Job already {info['state']}: {job_id}")
+            return {**info, "requested": action}
+        if control.finished:
+            raise ValueError(f"Job already {control.state}: {job_id}")
+        getattr(control, action)()
+        if self.store is not None:
+            self.store.save([control.info()])
+        return control.info()
+
+    def sync(self) -> None:
+        """
+        Apply commands from other processes and mirror local jobs (blocking).
+
+        Called periodically when a store is configured; the write doubles as
+        the owner's heartbeat, so jobs of a dead process expire.
+        """
+        if self.store is None:
+            return
+        for job_id, action in self.store.take_commands():
+            control = self._jobs.get(job_id)
+            if control is not None and action in COMMANDS:
+                getattr(control, action)()
+        self.store.save([job.info() for job in self.list()])
+        self.store.expire(self.keep_finished)
+
+    def _prune(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[: max(0, len(finished) - self.keep_finished)]:
+            del self._jobs[job_id]
@@ -0,0 +1,206 @@
+"""
+Metadata Cache - Key metadata per file, in memory and on local disk.
+
+Paging through the review gallery asks for the same files' metadata again
+and again, and every exiftool read costs a process start plus a parse of
+the file's headers. Results are kept in a bounded in-process LRU and in a
+SQLite file under the cache dir, shared by all API processes and kept
+across restarts. An entry is keyed by path and only valid while the file's
+size and mtime are unchanged, so edited or replaced files are read again.
+"""
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+import json
+import os
+import sqlite3
+import stat
+import threading
+import time
+
+from app.services.render_cache import default_cache_dir
+
+# Bump when KEY_TAGS or the stored format change
+METADATA_VERSION = 1
+PRUNE_EVERY = 64
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS metadata (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    version INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS metadata_updated ON metadata (updated_at);
+"""
+
+# (path, size, mtime_ns)
+FileKey = Tuple[str, int, int]
+
+
+def file_key(path: Path) -> Optional[FileKey]:
+    """Cache key for a regular file, or None if it is missing or not a file (blocking)."""
+    try:
+        info = path.stat()
+    except OSError:
+        return None
+    if not stat.S_ISREG(info.st_mode):
+        return None
+    return str(path), info.st_size, info.st_mtime_ns
+
+
+class MetadataCache:
+    """Key metadata by (path, size, mtime) in memory and in a local SQLite file."""
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        max_entries: Optional[int] = None,
+        max_rows: Optional[int] = None,
+    ):
+        """
+        Initialize cache; the database is opened on first use.
+
+        Args:
+            path: Database file on local disk (default: <cache dir>/metadata.db)
+            max_entries: Entries kept in memory (default: SPECTRUM_METADATA_CACHE_ENTRIES)
+            max_rows: Rows kept on disk; the least recently stored are
+                pruned beyond it (default: SPECTRUM_METADATA_CACHE_ROWS)
+        """
+        self.enabled = os.getenv("SPECTRUM_METADATA_CACHE", "1") != "0"
+        self.path = Path(path or default_cache_dir() / "metadata.db")
+        if max_entries is None:
+            max_entries = int(os.getenv("SPECTRUM_METADATA_CACHE_ENTRIES", "20000"))
+        if max_rows is None:
+            max_rows = int(os.getenv("SPECTRUM_METADATA_CACHE_ROWS", "500000"))
+        self.max_entries = max(0, max_entries)
+        self.max_rows = max(1, max_rows)
+        # Stats and SQLite reads, kept off the event loop
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        self._memory: "OrderedDict[FileKey, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stores = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=10, isolation_level=None)
+            # Local disk only, so WAL is safe and lets readers skip the writer lock
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def lookup(self, paths: Iterable[Path]) -> Tuple[Dict[str, dict], List[FileKey], List[str]]:
+        """
+        Split files into cached and uncached (blocking).
+
+        Returns:
+            (hits, misses, missing): metadata by str(path), keys of files
+            that need reading, and paths that are missing or not files
+        """
+        hits: Dict[str, dict] = {}
+        misses: List[FileKey] = []
+        missing: List[str] = []
+        for path in paths:
+            key = file_key(path)
+            if key is None:
+                missing.append(str(path))
+                continue
+            cached = self._memory_get(key) if self.enabled else None
+            if cached is not None:
+                hits[key[0]] = cached
+            else:
+                misses.append(key)
+        if misses and self.enabled:
+            stored = self._disk_get(misses)
+            for key, metadata in stored.items():
+                hits[key[0]] = metadata
+                self._memory_put(key, metadata)
+            misses = [key for key in misses if key not in stored]
+        return hits, misses, missing
+
+    def store(self, entries: Dict[FileKey, dict]) -> None:
+        """Remember freshly read metadata; entries with an error are skipped (blocking)."""
+        if not self.enabled:
+            return
+        entries = {key: metadata for key, metadata in entries.items() if "error" not in metadata}
+        if not entries:
+            return
+        for key, metadata in entries.items():
+            self._memory_put(key, metadata)
+        now = time.time()
+        try:
+            conn = self._connection()
+            conn.executemany(
+                "INSERT OR REPLACE INTO metadata (path, size, mtime_ns, version, data, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (path, size, mtime_ns, METADATA_VERSION, json.dumps(metadata), now)
+                    for (path, size, mtime_ns), metadata in entries.items()
+                ],
+            )
+            self._stores += 1
+            if self._stores % PRUNE_EVERY == 0:
+                self.prune()
+        except sqlite3.Error as e:
+            print(f"[METADATA] Could not cache metadata: {e}", flush=True)
+
+    def prune(self) -> int:
+        """Drop the least recently stored rows beyond max_rows. Returns rows removed."""
+        return self._connection().execute(
+            "DELETE FROM metadata WHERE path IN ("
+            "SELECT path FROM metadata ORDER BY updated_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_rows,),
+        ).rowcount
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _memory_get(self, key: FileKey) -> Optional[dict]:
+        with self._lock:
+            metadata = self._memory.get(key)
+            if metadata is not None:
+                self._memory.move_to_end(key)
+            return metadata
+
+    def _memory_put(self, key: FileKey, metadata: dict) -> None:
+        if self.max_entries == 0:
+            return
+        with self._lock:
+            self._memory[key] = metadata
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _disk_get(self, keys: List[FileKey]) -> Dict[FileKey, dict]:
+        wanted = {key[0]: key for key in keys}
+        found: Dict[FileKey, dict] = {}
+        names = list(wanted)
+        try:
+            conn = self._connection()
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(names), 500):
+                chunk = names[start:start + 500]
+                rows = conn.execute(
+                    f"SELECT path, size, mtime_ns, data FROM metadata "
+                    f"WHERE version = ? AND path IN ({', '.join('?' * len(chunk))})",
+                    (METADATA_VERSION, *chunk),
+                ).fetchall()
+                for path, size, mtime_ns, data in rows:
+                    # A changed size or mtime means the file was replaced
+                    if wanted[path] == (path, size, mtime_ns):
+                        found[wanted[path]] = json.loads(data)
+        except sqlite3.Error as e:
+            print(f"[METADATA] Could not read metadata cache: {e}", flush=True)
+        return found
@@ -0,0 +1,283 @@
+"""
+Metrics - In-process counters, gauges and histograms for /metrics.
+
+Renders the Prometheus text exposition format without any external
+dependency. Updates take one uncontended per-metric lock; gauges backed by
+callbacks are only evaluated when /metrics is scraped.
+"""
+
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+import bisect
+import math
+import threading
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing value."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            items = list(self._values.items())
+        if not items and not self.labelnames:
+            items = [((), 0.0)]
+        for key, value in items:
+            yield f"{self.name}{_label_text(self.labelnames, key)} {_format_value(value)}"
+
+
+class Gauge(_Metric):
+    """Value that can go up and down, or be computed at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        callback: Optional[Callable[[], Dict[LabelValues, float]]] = None,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._callback = callback
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def set_callback(self, callback: Callable[[], Dict[LabelValues, float]]) -> None:
+        """Compute label values -> gauge value at scrape time."""
+        self._callback = callback
+
+    def samples(self) -> Iterable[str]:
+        if self._callback is not None:
+            try:
+                items = list(self._callback().items())
+            except Exception:
+                items = []
+        else:
+            with self._lock:
+                items = list(self._values.items())
+        if not items and not self.labelnames:
+            items = [((), 0.0)]
+        for key, value in items:
+            yield f"{self.name}{_label_text(self.labelnames, key)} {_format_value(value)}"
+
+
+class Histogram(_Metric):
+    """Bucketed distribution of observed values."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            state[index] += 1
+            state[-1] += value
+
+    def count(self, **labels: str) -> int:
+        state = self._values.get(self._key(labels))
+        return int(sum(state[:-1])) if state else 0
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            items = [(key, list(state)) for key, state in self._values.items()]
+        for key, state in items:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (math.inf,), state[:-1]):
+                cumulative += count
+                labels = _label_text(self.labelnames + ("le",), key + (_format_value(bound),))
+                yield f"{self.name}_bucket{labels} {_format_value(cumulative)}"
+            labels = _label_text(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(state[-1])}"
+            yield f"{self.name}_count{labels} {_format_value(cumulative)}"
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """Prometheus text exposition (format version 0.0.4)."""
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.header())
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+registry = MetricsRegistry()
+
+FILES_TOTAL = registry.counter(
+    "spectrum_files_total", "Files processed by conversion jobs, by result status.", ["status"]
+)
+BYTES_READ_TOTAL = registry.counter(
+    "spectrum_bytes_read_total", "Source bytes read by converters."
+)
+BYTES_WRITTEN_TOTAL = registry.counter(
+    "spectrum_bytes_written_total", "Output bytes written by converters."
+)
+STAGE_SECONDS = registry.histogram(
+    "spectrum_stage_duration_seconds", "Wall time per conversion stage.", ["stage"]
+)
+ACTIVE_JOBS = registry.gauge("spectrum_active_jobs", "Conversion jobs currently running.")
+EXECUTOR_QUEUE_DEPTH = registry.gauge(
+    "spectrum_executor_queue_depth", "Work items waiting for a thread, by pool.", ["pool"]
+)
+EXIFTOOL_PROCESSES_TOTAL = registry.counter(
+    "spectrum_exiftool_processes_total", "exiftool processes started, by operation.", ["operation"]
+)
+EXIFTOOL_FAILURES_TOTAL = registry.counter(
+    "spectrum_exiftool_failures_total", "exiftool invocations that failed, by operation.", ["operation"]
+)
+SCHEDULER_RUNNING = registry.gauge(
+    "spectrum_scheduler_running", "Work items holding a scheduler slot, by priority class.", ["priority"]
+)
+SCHEDULER_WAITING = registry.gauge(
+    "spectrum_scheduler_waiting", "Work items waiting for a scheduler slot, by priority class.", ["priority"]
+)
+PREVIEW_REQUESTS_TOTAL = registry.counter(
+    "spectrum_preview_requests_total",
+    "Preview requests by outcome (rendered, error; cache hits once previews are cached).",
+    ["result"],
+)
+METADATA_LOOKUPS_TOTAL = registry.counter(
+    "spectrum_metadata_lookups_total",
+    "Files looked up by the metadata endpoints, by outcome (cached, read, error).",
+    ["result"],
+)
+PREVIEW_SECONDS = registry.histogram(
+    "spectrum_preview_duration_seconds", "Time to render a preview, by source kind.", ["kind"]
+)
+
+
+def record_result(payload: dict) -> None:
+    """Update file, byte and stage metrics from a conversion result payload."""
+    FILES_TOTAL.inc(status=payload.get("status") or "unknown")
+    if payload.get("bytes_read"):
+        BYTES_READ_TOTAL.inc(payload["bytes_read"])
+    if payload.get("bytes_written"):
+        BYTES_WRITTEN_TOTAL.inc(payload["bytes_written"])
+    for stage, entry in (payload.get("timings") or {}).items():
+        STAGE_SECONDS.observe(entry.get("wall_s") or 0.0, stage=stage)
+
+
+def executor_queue_depths(executors: Dict[str, object]) -> Dict[LabelValues, float]:
+    """Queued (not yet running) work items for each ThreadPoolExecutor."""
+    depths: Dict[LabelValues, float] = {}
+    for name, executor in executors.items():
+        queue = getattr(executor, "_work_queue", None)
+        depths[(name,)] = float(queue.qsize()) if queue is not None else 0.0
+    return depths
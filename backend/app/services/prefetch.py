@@ -0,0 +1,170 @@
+"""
+Prefetch Service - Bounded read-ahead of source files.
+
+Reading a 25-60 MB RAW over SMB inside a converter worker leaves the CPU
+idle during the transfer. The prefetcher pulls the next few sources into
+memory on I/O threads while the current file is demosaiced, within a file
+count and byte budget, so network reads and decoding overlap.
+"""
+
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import os
+
+
+class Prefetcher:
+    """Read-ahead buffer over an ordered list of source files."""
+
+    def __init__(
+        self,
+        paths: Iterable[Path],
+        max_files: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        executor: Optional[ThreadPoolExecutor] = None,
+    ):
+        """
+        Initialize prefetcher.
+
+        Args:
+            paths: Files in the order they will be consumed
+            max_files: Files buffered or in flight at once (0 disables)
+            max_bytes: Byte budget for buffered, not yet consumed data
+            executor: Thread pool for blocking reads
+        """
+        if max_files is None:
+            max_files = int(os.getenv("SPECTRUM_PREFETCH_FILES", "2"))
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv("SPECTRUM_PREFETCH_MB", "256")) * 1024 * 1024)
+        self.max_files = max(0, max_files)
+        self.max_bytes = max(0, max_bytes)
+        self.executor = executor or ThreadPoolExecutor(max_workers=max(1, self.max_files))
+        self._owns_executor = executor is None
+        self._pending = deque(paths)
+        self._tasks: Dict[Path, asyncio.Task] = {}
+        self._sizes: Dict[Path, int] = {}
+        self._buffered_bytes = 0
+        self._budget: Optional[asyncio.Condition] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_files > 0 and self.max_bytes > 0
+
+    def start(self) -> None:
+        """Begin reading ahead (must be called from the event loop)."""
+        if self.enabled:
+            self._budget = asyncio.Condition()
+            self._fill()
+
+    async def take(self, path: Path) -> Optional[bytes]:
+        """
+        Hand over the prefetched contents of path.
+
+        Returns None when the file was not prefetched or could not be read;
+        the caller then reads it directly.
+        """
+        self._pending_discard(path)
+        task = self._tasks.pop(path, None)
+        if task is None:
+            self._fill()
+            return None
+        try:
+            data = await task
+        finally:
+            await self._release(path)
+            self._fill()
+        return data
+
+    async def discard(self, path: Path) -> None:
+        """Drop a file that will not be converted after all."""
+        self._pending_discard(path)
+        task = self._tasks.pop(path, None)
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+            await self._release(path)
+        self._fill()
+
+    async def suspend(self) -> None:
+        """
+        Free all read-ahead data while the consumer is paused.
+
+        Buffered and in-flight files go back to the front of the queue and
+        are read again after resume().
+        """
+        for path in reversed(list(self._tasks)):
+            task = self._tasks.pop(path)
+            task.cancel()
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+            await self._release(path)
+            self._pending.appendleft(path)
+
+    def resume(self) -> None:
+        """Start reading ahead again after suspend()."""
+        self._fill()
+
+    async def close(self) -> None:
+        """Cancel outstanding reads and free buffered data."""
+        self._pending.clear()
+        for path in list(self._tasks):
+            await self.discard(path)
+        if self._owns_executor:
+            self.executor.shutdown(wait=False)
+
+    def _pending_discard(self, path: Path) -> None:
+        try:
+            self._pending.remove(path)
+        except ValueError:
+            pass
+
+    def _fill(self) -> None:
+        if not self.enabled:
+            return
+        while self._pending and len(self._tasks) < self.max_files:
+            path = self._pending.popleft()
+            self._tasks[path] = asyncio.create_task(self._load(path))
+
+    async def _load(self, path: Path) -> Optional[bytes]:
+        loop = asyncio.get_event_loop()
+        try:
+            size = await loop.run_in_executor(self.executor, _file_size, path)
+        except OSError:
+            return None
+
+        async with self._budget:
+            # A single file larger than the budget is still admitted alone
+            await self._budget.wait_for(
+                lambda: self._buffered_bytes == 0
+                or self._buffered_bytes + size <= self.max_bytes
+            )
+            self._buffered_bytes += size
+            self._sizes[path] = size
+
+        try:
+            return await loop.run_in_executor(self.executor, _read_file, path)
+        except OSError:
+            return None
+
+    async def _release(self, path: Path) -> None:
+        size = self._sizes.pop(path, 0)
+        if size and self._budget is not None:
+            async with self._budget:
+                self._buffered_bytes -= size
+                self._budget.notify_all()
+
+
+def _file_size(path: Path) -> int:
+    return path.stat().st_size
+
+
+def _read_file(path: Path) -> bytes:
+    with open(path, "rb") as handle:
+        return handle.read()
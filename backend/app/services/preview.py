@@ -0,0 +1,151 @@
+"""
+Preview Service - Lightweight JPEG previews for RAW and image files.
+
+RAW files are demosaiced at half size; other images are decoded directly.
+Either way the result is downscaled and encoded as a small JPEG.
+
+Rendered previews are kept in a disk cache shared by every API process,
+so a preview rendered by one uvicorn worker is served by all of them.
+"""
+
+from pathlib import Path
+from io import BytesIO
+from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import os
+import tempfile
+
+from app.services.render_cache import default_cache_dir
+
+# Bump when render_preview output changes
+PREVIEW_VERSION = 1
+# Stores between size checks of the cache folder
+EVICT_EVERY = 64
+
+
+def render_preview(target: Path, max_dim: int = 1600, quality: int = 85) -> bytes:
+    """
+    Render a JPEG preview of target (blocking).
+
+    Args:
+        target: RAW (.arw) or image file
+        max_dim: Longest edge of the preview in pixels
+        quality: JPEG quality of the preview
+
+    Returns:
+        Encoded JPEG bytes
+    """
+    from PIL import Image
+    import rawpy
+
+    if target.suffix.lower() == ".arw":
+        with rawpy.imread(str(target)) as raw:
+            rgb = raw.postprocess(
+                use_camera_wb=True,
+                no_auto_bright=True,
+                output_bps=8,
+                half_size=True,
+                output_color=rawpy.ColorSpace.sRGB,
+            )
+        image = Image.fromarray(rgb)
+    else:
+        image = Image.open(target).convert("RGB")
+
+    image.thumbnail((max_dim, max_dim), Image.LANCZOS)
+
+    buffer = BytesIO()
+    image.save(buffer, format="JPEG", quality=quality, optimize=True)
+    return buffer.getvalue()
+
+
+class PreviewCache:
+    """Rendered previews on local disk, keyed by source path, size, mtime and settings."""
+
+    def __init__(self, directory: Optional[Path] = None, max_bytes: Optional[int] = None):
+        """
+        Initialize cache.
+
+        Args:
+            directory: Cache folder (default: <cache dir>/previews)
+            max_bytes: Size budget; least recently used previews are evicted
+                beyond it (default: SPECTRUM_PREVIEW_CACHE_MB)
+        """
+        self.enabled = os.getenv("SPECTRUM_PREVIEW_CACHE", "1") != "0"
+        self.directory = directory or default_cache_dir() / "previews"
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv("SPECTRUM_PREVIEW_CACHE_MB", "512")) * 1024 * 1024)
+        self.max_bytes = max_bytes
+        # Small file reads/writes, kept off the event loop and out of render slots
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        self._stores = 0
+
+    def _entry(self, target: Path, max_dim: int, quality: int) -> Optional[Path]:
+        try:
+            stat = target.stat()
+        except OSError:
+            return None
+        key = f"{PREVIEW_VERSION}|{target}|{stat.st_size}|{stat.st_mtime_ns}|{max_dim}|{quality}"
+        digest = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+        return self.directory / digest[:2] / f"{digest}.jpg"
+
+    def get(self, target: Path, max_dim: int, quality: int) -> Optional[bytes]:
+        """Cached preview bytes, or None (blocking)."""
+        if not self.enabled:
+            return None
+        entry = self._entry(target, max_dim, quality)
+        if entry is None:
+            return None
+        try:
+            data = entry.read_bytes()
+        except OSError:
+            return None
+        try:
+            # Recency for eviction
+            os.utime(entry)
+        except OSError:
+            pass
+        return data
+
+    def put(self, target: Path, max_dim: int, quality: int, data: bytes) -> None:
+        """Store a rendered preview atomically, so other processes never read a partial file (blocking)."""
+        if not self.enabled:
+            return
+        entry = self._entry(target, max_dim, quality)
+        if entry is None:
+            return
+        try:
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=entry.parent, prefix=".tmp_", suffix=".jpg")
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(data)
+            os.replace(temp_path, entry)
+        except OSError as e:
+            print(f"[PREVIEW] Could not cache preview: {e}", flush=True)
+            return
+        self._stores += 1
+        if self._stores % EVICT_EVERY == 0:
+            self.evict()
+
+    def evict(self) -> int:
+        """Remove least recently used previews beyond the size budget. Returns files removed."""
+        entries = []
+        total = 0
+        for path in self.directory.glob("*/*.jpg"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue  # Evicted by another process
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
@@ -0,0 +1,174 @@
+"""
+Adaptive Quality - Per-image encoder quality search.
+
+Binary-searches the encoder quality on a downsampled proxy of the image so
+the final output lands under a byte budget or above a perceptual (SSIM)
+target, leaving a single full-resolution encode for the real output.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from io import BytesIO
+import math
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+# Encodes an image at the given quality and returns the encoded bytes.
+EncodeFn = Callable[["Image.Image", int], bytes]
+
+SSIM_WINDOW = 8
+SSIM_C1 = (0.01 * 255) ** 2
+SSIM_C2 = (0.03 * 255) ** 2
+
+
+@dataclass
+class QualityChoice:
+    """Outcome of an adaptive quality search."""
+
+    quality: int
+    estimated_bytes: Optional[int] = None
+    ssim: Optional[float] = None
+    trials: int = 0
+
+
+def make_proxy(image: Image.Image, max_pixels: int) -> Tuple[Image.Image, float]:
+    """
+    Downsample an image for cheap trial encodes.
+
+    Uses integer box reduction, which is much faster than a resampling
+    filter and preserves enough texture for size/SSIM estimation.
+
+    Returns:
+        (proxy, pixel_ratio) where pixel_ratio is full pixels / proxy pixels
+    """
+    width, height = image.size
+    pixels = width * height
+    if pixels <= max_pixels:
+        return image, 1.0
+
+    factor = max(2, math.ceil(math.sqrt(pixels / float(max_pixels))))
+    while (width // factor) * (height // factor) > max_pixels:
+        factor += 1
+
+    proxy = image.reduce(factor)
+    return proxy, pixels / float(proxy.size[0] * proxy.size[1])
+
+
+def _box_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Mean over every window x window block using an integral image."""
+    integral = np.pad(values.cumsum(axis=0).cumsum(axis=1), ((1, 0), (1, 0)))
+    total = (
+        integral[window:, window:]
+        - integral[:-window, window:]
+        - integral[window:, :-window]
+        + integral[:-window, :-window]
+    )
+    return total / float(window * window)
+
+
+def ssim(reference: Image.Image, candidate: Image.Image) -> float:
+    """
+    Mean structural similarity of two equally sized images (luma only).
+    """
+    x = np.asarray(reference.convert("L"), dtype=np.float64)
+    y = np.asarray(candidate.convert("L"), dtype=np.float64)
+    window = min(SSIM_WINDOW, x.shape[0], x.shape[1])
+
+    mu_x = _box_mean(x, window)
+    mu_y = _box_mean(y, window)
+    var_x = _box_mean(x * x, window) - mu_x * mu_x
+    var_y = _box_mean(y * y, window) - mu_y * mu_y
+    cov_xy = _box_mean(x * y, window) - mu_x * mu_y
+
+    numerator = (2 * mu_x * mu_y + SSIM_C1) * (2 * cov_xy + SSIM_C2)
+    denominator = (mu_x * mu_x + mu_y * mu_y + SSIM_C1) * (var_x + var_y + SSIM_C2)
+    return float(np.mean(numerator / denominator))
+
+
+def search_quality(
+    image: Image.Image,
+    encode: EncodeFn,
+    target_bytes: Optional[int] = None,
+    target_ssim: Optional[float] = None,
+    min_quality: int = 60,
+    max_quality: int = 100,
+    proxy_pixels: int = 2_000_000,
+) -> QualityChoice:
+    """
+    Find the encoder quality that meets a size or SSIM target.
+
+    Size mode picks the highest quality whose extrapolated full-resolution
+    size fits within target_bytes. SSIM mode picks the lowest quality whose
+    proxy SSIM reaches target_ssim. When both are set, the size budget wins.
+
+    Args:
+        image: Fully processed image that will be encoded
+        encode: Callable producing encoded bytes for (image, quality)
+        target_bytes: Byte budget for the full-resolution output
+        target_ssim: Minimum SSIM (0-1) against the unencoded image
+        min_quality: Lowest quality the search may return
+        max_quality: Highest quality the search may return
+        proxy_pixels: Pixel budget for the downsampled trial image
+
+    Returns:
+        QualityChoice with the selected quality and its trial estimate
+    """
+    min_quality = max(1, min(min_quality, max_quality))
+    if target_bytes is None and target_ssim is None:
+        return QualityChoice(quality=max_quality)
+
+    proxy, pixel_ratio = make_proxy(image, proxy_pixels)
+    trials: Dict[int, Tuple[int, Optional[float]]] = {}
+
+    def trial(quality: int) -> Tuple[int, Optional[float]]:
+        if quality not in trials:
+            data = encode(proxy, quality)
+            score = None
+            if target_ssim is not None and target_bytes is None:
+                from PIL import Image
+
+                with Image.open(BytesIO(data)) as decoded:
+                    score = ssim(proxy, decoded)
+            trials[quality] = (int(len(data) * pixel_ratio), score)
+        return trials[quality]
+
+    def meets_target(quality: int) -> bool:
+        estimated, score = trial(quality)
+        if target_bytes is not None:
+            return estimated <= target_bytes
+        return score is not None and score >= target_ssim
+
+    low, high = min_quality, max_quality
+    if target_bytes is not None:
+        # Size grows with quality: find the highest quality that still fits.
+        chosen = min_quality
+        while low <= high:
+            mid = (low + high) // 2
+            if meets_target(mid):
+                chosen = mid
+                low = mid + 1
+            else:
+                high = mid - 1
+    else:
+        # SSIM grows with quality: find the lowest quality that reaches it.
+        chosen = max_quality
+        while low <= high:
+            mid = (low + high) // 2
+            if meets_target(mid):
+                chosen = mid
+                high = mid - 1
+            else:
+                low = mid + 1
+
+    estimated, score = trial(chosen)
+    return QualityChoice(
+        quality=chosen,
+        estimated_bytes=estimated,
+        ssim=score,
+        trials=len(trials),
+    )
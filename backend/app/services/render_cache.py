@@ -0,0 +1,282 @@
+"""
+Render Cache - Reuse previous outputs for identical source + settings.
+
+A small JSON manifest maps (source fingerprint, render parameters) to an
+output file produced earlier, possibly in a different output folder.
+A matching request is satisfied by linking or copying that file instead
+of demosaicing again.
+
+Entries go stale on their own: source fingerprints are remembered per path
+together with size and mtime and recomputed when either changes, and an
+output is only reused while its own size and mtime are unchanged.
+
+Renders are keyed by the cheap edge fingerprint (size plus first and last
+MB), so a miss costs two small reads. A hit replaces a conversion with
+another file's output, so (as in dedupe) it only counts when the full
+contents match: each entry carries a hash of the whole source it was
+rendered from, taken from the prefetched buffer where there is one, and a
+candidate is checked against the current source's full hash before use.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Optional
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import fcntl
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+from app.services.dedupe import data_fingerprint, edge_fingerprint, full_fingerprint
+
+# Bump when the conversion pipeline changes in a way that alters outputs
+# (review previews are versioned separately by PREVIEW_VERSION)
+RENDER_VERSION = 2
+FLUSH_EVERY = 50
+
+
+def default_cache_dir() -> Path:
+    """Directory for local caches (SPECTRUM_CACHE_DIR or ~/.cache/spectrum)."""
+    configured = os.getenv("SPECTRUM_CACHE_DIR", "").strip()
+    if configured:
+        return Path(configured)
+    return Path.home() / ".cache" / "spectrum"
+
+
+class RenderCache:
+    """Manifest of previously rendered outputs."""
+
+    def __init__(
+        self,
+        manifest_path: Optional[Path] = None,
+        executor: Optional[ThreadPoolExecutor] = None,
+    ):
+        """Initialize cache; the manifest is loaded lazily on first use."""
+        self.enabled = os.getenv("SPECTRUM_RENDER_CACHE", "1") != "0"
+        self.manifest_path = manifest_path or default_cache_dir() / "render_manifest.json"
+        self.executor = executor or ThreadPoolExecutor(max_workers=2)
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._pending_writes = 0
+        self._sources: Dict[str, Dict[str, Any]] = {}
+        self._renders: Dict[str, Dict[str, Any]] = {}
+
+    @staticmethod
+    def render_key(fingerprint: str, params: Dict[str, Any]) -> str:
+        """Stable key for a source fingerprint and its render parameters."""
+        payload = json.dumps(
+            {"v": RENDER_VERSION, "source": fingerprint, "params": params},
+            sort_keys=True,
+        )
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+    async def lookup(self, src: Path, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Find a reusable output for src rendered with params.
+
+        Returns:
+            Manifest entry with "output", "size_bytes", "quality" and
+            "metadata_copied", or None on a miss
+        """
+        if not self.enabled:
+            return None
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self.executor, self._lookup_sync, src, params)
+
+    async def store(
+        self,
+        src: Path,
+        params: Dict[str, Any],
+        output: Path,
+        quality: Optional[int] = None,
+        metadata_copied: bool = False,
+        content: Optional[str] = None,
+    ) -> None:
+        """
+        Record output as the render of src with params.
+
+        Args:
+            content: Full hash of the source as rendered (see content_hash);
+                when omitted the source is hashed from disk
+        """
+        if not self.enabled:
+            return
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(
+            self.executor, self._store_sync, src, params, output, quality, metadata_copied, content
+        )
+
+    async def content_hash(self, data: bytes) -> Optional[str]:
+        """Full hash of source contents already in memory, for store()."""
+        if not self.enabled:
+            return None
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self.executor, data_fingerprint, data)
+
+    async def flush(self) -> None:
+        """Persist pending manifest changes."""
+        if not self.enabled:
+            return
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(self.executor, self._flush_sync)
+
+    def _lookup_sync(self, src: Path, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        source = self._source(src)
+        if source is None:
+            return None
+        key = self.render_key(source["edge"], params)
+
+        with self._lock:
+            entry = self._renders.get(key)
+        if entry is None:
+            return None
+
+        try:
+            stat = Path(entry["output"]).stat()
+            valid = (stat.st_size, stat.st_mtime) == (entry["size_bytes"], entry["output_mtime"])
+        except (PermissionError, OSError):
+            valid = False
+
+        if not valid:
+            with self._lock:
+                self._renders.pop(key, None)
+                self._pending_writes += 1
+            return None
+        # Only a candidate hit pays for the full hash (once per source version)
+        if entry.get("content") is None or entry["content"] != self._content(src, source):
+            return None
+        return dict(entry)
+
+    def _store_sync(
+        self,
+        src: Path,
+        params: Dict[str, Any],
+        output: Path,
+        quality: Optional[int],
+        metadata_copied: bool,
+        content: Optional[str] = None,
+    ) -> None:
+        source = self._source(src)
+        if source is None:
+            return
+        if content is None:
+            content = self._content(src, source)
+            if content is None:
+                return
+        else:
+            self._remember_content(src, source, content)
+        try:
+            stat = output.stat()
+        except (PermissionError, OSError):
+            return
+
+        entry = {
+            "output": str(output),
+            "size_bytes": stat.st_size,
+            "output_mtime": stat.st_mtime,
+            "quality": quality,
+            "metadata_copied": metadata_copied,
+            "content": content,
+        }
+        with self._lock:
+            self._renders[self.render_key(source["edge"], params)] = entry
+            self._pending_writes += 1
+            should_flush = self._pending_writes >= FLUSH_EVERY
+        if should_flush:
+            self._flush_sync()
+
+    def _source(self, src: Path) -> Optional[Dict[str, Any]]:
+        """Known fingerprints of src, edge hash recomputed only when size or mtime changed."""
+        self._ensure_loaded()
+        try:
+            stat = src.stat()
+        except (PermissionError, OSError):
+            return None
+
+        key = str(src)
+        with self._lock:
+            known = self._sources.get(key)
+        if (
+            known
+            and "edge" in known
+            and (known["size"], known["mtime"]) == (stat.st_size, stat.st_mtime)
+        ):
+            return known
+
+        try:
+            edge = edge_fingerprint(src, stat.st_size)
+        except (PermissionError, OSError):
+            return None
+        source = {"size": stat.st_size, "mtime": stat.st_mtime, "edge": edge}
+        with self._lock:
+            self._sources[key] = source
+            self._pending_writes += 1
+        return source
+
+    def _content(self, src: Path, source: Dict[str, Any]) -> Optional[str]:
+        """Full hash of src, read from disk only if not known for this size and mtime."""
+        if source.get("content") is not None:
+            return source["content"]
+        try:
+            content = full_fingerprint(src)
+        except (PermissionError, OSError):
+            return None
+        self._remember_content(src, source, content)
+        return content
+
+    def _remember_content(self, src: Path, source: Dict[str, Any], content: str) -> None:
+        with self._lock:
+            self._sources[str(src)] = {**source, "content": content}
+            self._pending_writes += 1
+
+    def _read_manifest(self) -> Optional[Dict[str, Any]]:
+        try:
+            data = json.loads(self.manifest_path.read_text())
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != RENDER_VERSION:
+            return None
+        return data
+
+    def _ensure_loaded(self) -> None:
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            data = self._read_manifest()
+            if data is None:
+                return
+            self._sources = data.get("sources", {})
+            self._renders = data.get("renders", {})
+
+    def _flush_sync(self) -> None:
+        with self._lock:
+            if not self._pending_writes:
+                return
+            self._pending_writes = 0
+
+        try:
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            lock_path = self.manifest_path.with_name(self.manifest_path.name + ".lock")
+            with open(lock_path, "a") as lock_file:
+                # Several API processes share the manifest: merge their
+                # entries under an exclusive lock instead of overwriting them
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                data = self._read_manifest()
+                with self._lock:
+                    if data is not None:
+                        self._sources = {**data.get("sources", {}), **self._sources}
+                        self._renders = {**data.get("renders", {}), **self._renders}
+                    payload = json.dumps(
+                        {"version": RENDER_VERSION, "sources": self._sources, "renders": self._renders}
+                    )
+                fd, temp_path = tempfile.mkstemp(
+                    dir=self.manifest_path.parent, prefix=".tmp_", suffix=".json"
+                )
+                with os.fdopen(fd, "w") as handle:
+                    handle.write(payload)
+                os.replace(temp_path, self.manifest_path)
+        except OSError as e:
+            print(f"[CACHE] Could not write render manifest: {e}", flush=True)
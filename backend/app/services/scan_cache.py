@@ -0,0 +1,240 @@
+"""
+Scan Cache - Reuse recent scan results for paging, sorting and filtering.
+
+Walking a 30k-file NAS folder takes seconds, so paging through it must not
+re-walk. Scans are kept for a short TTL keyed by folder and output
+settings; conversions invalidate the entries they affect, and callers can
+force a rescan.
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from collections import OrderedDict
+import asyncio
+import os
+import time
+
+import numpy as np
+
+from app.services.scanner import FileInfo, ScannerService, ScanTable
+from app.utils.pagination import SortKey, paginate, sort_key
+
+ScanKey = Tuple[str, bool, str, str]
+
+
+class ScanResult:
+    """One cached scan with lazily built sort orders."""
+
+    def __init__(self, root: Path, output_root: Path, table: ScanTable):
+        self.root = root
+        self.output_root = output_root
+        self.table = table
+        self.created = time.monotonic()
+        self._orders: Dict[str, np.ndarray] = {}
+        self._relative_folders: Optional[List[str]] = None
+
+    def key(self, field: str, index: int) -> SortKey:
+        """Sort key of one row."""
+        table = self.table
+        return sort_key(
+            field,
+            table.path(index),
+            table.names[index],
+            float(table.mtimes[index]),
+            int(table.sizes[index]),
+        )
+
+    def order(self, field: str) -> np.ndarray:
+        """Row indices sorted ascending by field."""
+        if field not in self._orders:
+            sort_key(field, "", "", 0.0, 0)  # Reject unknown fields even when empty
+            ranked = sorted(range(len(self.table)), key=lambda i: self.key(field, i))
+            self._orders[field] = np.array(ranked, dtype=np.int64)
+        return self._orders[field]
+
+    def page(
+        self,
+        field: str = "name",
+        descending: bool = False,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        status: Optional[str] = None,
+        subfolder: Optional[str] = None,
+    ) -> Tuple[List[FileInfo], Optional[str], int]:
+        """
+        One page of files, filtered server-side.
+
+        Filters are applied as masks over the columns; only the rows on
+        the returned page are materialized as FileInfo.
+
+        Args:
+            field: Sort field (name, mtime, size)
+            descending: Sort order
+            cursor: next_cursor from the previous page
+            limit: Page size (None for all remaining)
+            status: "converted" or "pending" (None for both)
+            subfolder: Only files in this folder (relative to the scan root) or below
+
+        Returns:
+            (files, next_cursor, matched) where matched counts all files
+            passing the filters
+
+        Raises:
+            ValueError: on an unknown sort, status or a bad cursor
+        """
+        if status not in (None, "converted", "pending"):
+            raise ValueError(f"Unknown status filter: {status}")
+        order = self.order(field)
+        if status is not None:
+            order = order[self.table.converted[order] == (status == "converted")]
+        if subfolder:
+            wanted = np.array(
+                [in_subfolder(folder, subfolder) for folder in self.relative_folders()],
+                dtype=bool,
+            )
+            if len(order):
+                order = order[wanted[self.table.folder_index[order]]]
+        page, next_cursor = paginate(
+            _Rows(self.table, order), _Keys(self, field, order), field, descending, cursor, limit
+        )
+        return page, next_cursor, len(order)
+
+    def relative_folders(self) -> List[str]:
+        """Each folder of the table relative to the scan root, '/'-separated ('' at the root)."""
+        if self._relative_folders is None:
+            root = str(self.root)
+            self._relative_folders = [
+                "" if folder == root else Path(os.path.relpath(folder, root)).as_posix()
+                for folder in self.table.folders
+            ]
+        return self._relative_folders
+
+
+class _Rows:
+    """Rows of a table in a given order, materialized on access."""
+
+    def __init__(self, table: ScanTable, order: np.ndarray):
+        self.table = table
+        self.order = order
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.table.row(int(i)) for i in self.order[index]]
+        return self.table.row(int(self.order[index]))
+
+
+class _Keys:
+    """Sort keys of rows in a given order, computed on access for bisecting."""
+
+    def __init__(self, result: ScanResult, field: str, order: np.ndarray):
+        self.result = result
+        self.field = field
+        self.order = order
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def __getitem__(self, index: int) -> SortKey:
+        return self.result.key(self.field, int(self.order[index]))
+
+
+def in_subfolder(folder: str, subfolder: str) -> bool:
+    """True when folder is subfolder or lies below it."""
+    subfolder = subfolder.strip("/")
+    return not subfolder or folder == subfolder or folder.startswith(subfolder + "/")
+
+
+class ScanCache:
+    """TTL cache of scan results."""
+
+    def __init__(
+        self,
+        scanner: ScannerService,
+        ttl_seconds: Optional[float] = None,
+        max_entries: Optional[int] = None,
+    ):
+        self.scanner = scanner
+        self.ttl_seconds = (
+            ttl_seconds if ttl_seconds is not None
+            else float(os.getenv("SPECTRUM_SCAN_CACHE_TTL", "60"))
+        )
+        self.max_entries = max_entries or int(os.getenv("SPECTRUM_SCAN_CACHE_ENTRIES", "8"))
+        self._entries: "OrderedDict[ScanKey, ScanResult]" = OrderedDict()
+        self._inflight: Dict[ScanKey, asyncio.Future] = {}
+
+    async def get(
+        self,
+        path: Path,
+        recursive: bool = True,
+        output_subdir: str = "converted",
+        output_format: str = "jpeg",
+        output_dir: Optional[Path] = None,
+        refresh: bool = False,
+    ) -> ScanResult:
+        """
+        Cached scan of path, scanning on a miss, expiry or refresh.
+
+        Concurrent requests for the same folder share one walk.
+        """
+        output_root = output_dir or path / output_subdir
+        key = (str(path), recursive, str(output_root), output_format)
+
+        entry = self._entries.get(key)
+        if entry is not None and not refresh and self._fresh(entry):
+            self._entries.move_to_end(key)
+            return entry
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_event_loop().create_future()
+        self._inflight[key] = future
+        try:
+            table = await self.scanner.scan_table(
+                str(path),
+                recursive=recursive,
+                output_subdir=output_subdir,
+                output_format=output_format,
+                output_dir=str(output_dir) if output_dir else None,
+            )
+            entry = ScanResult(path, output_root, table)
+            self._store(key, entry)
+            future.set_result(entry)
+            return entry
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so a scan nobody else awaited does not warn
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def invalidate(self, path: Path) -> None:
+        """Drop scans whose source or output folder contains, or lies under, path."""
+        for key, entry in list(self._entries.items()):
+            if any(_related(path, folder) for folder in (entry.root, entry.output_root)):
+                del self._entries[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def _fresh(self, entry: ScanResult) -> bool:
+        return time.monotonic() - entry.created < self.ttl_seconds
+
+    def _store(self, key: ScanKey, entry: ScanResult) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+def _related(a: Path, b: Path) -> bool:
+    return a == b or a in b.parents or b in a.parents
+
@@ -6,13 +6,20 @@ optimized for NAS environments with network latency considerations.
 """
 
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple, Union
+from array import array
 from dataclasses import dataclass
 import asyncio
+import os
 from concurrent.futures import ThreadPoolExecutor
 
+import numpy as np
 
-@dataclass
+from app.services.encoders import output_extension
+from app.utils.resources import worker_plan
+
+
+@dataclass(slots=True)
 class FileInfo:
     """Metadata for a discovered ARW file."""
 
@@ -22,15 +29,131 @@ class FileInfo:
     already_converted: bool = False
 
 
+class ScanTable:
+    """
+    Columnar scan result.
+
+    Paths are stored as a table of folder prefixes plus one name per file,
+    and sizes, mtimes and conversion flags as typed arrays, so a 100k-file
+    scan costs a few dozen bytes per file instead of a FileInfo object and
+    a dict per file. Rows are materialized as FileInfo only when indexed.
+    """
+
+    def __init__(
+        self,
+        folders: List[str],
+        folder_index: np.ndarray,
+        names: List[str],
+        sizes: np.ndarray,
+        mtimes: np.ndarray,
+        converted: np.ndarray,
+    ):
+        self.folders = folders
+        self.folder_index = folder_index
+        self.names = names
+        self.sizes = sizes
+        self.mtimes = mtimes
+        self.converted = converted
+
+    @classmethod
+    def from_files(cls, files: Sequence[FileInfo]) -> "ScanTable":
+        """Build a table from FileInfo rows."""
+        builder = ScanTableBuilder()
+        for info in files:
+            folder, name = os.path.split(info.path)
+            builder.add(folder, name, info.size, info.modified_time, info.already_converted)
+        return builder.build()
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[FileInfo, List[FileInfo]]:
+        if isinstance(index, slice):
+            return [self.row(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("scan table index out of range")
+        return self.row(index)
+
+    def __iter__(self) -> Iterator[FileInfo]:
+        for i in range(len(self)):
+            yield self.row(i)
+
+    def path(self, index: int) -> str:
+        return os.path.join(self.folders[self.folder_index[index]], self.names[index])
+
+    def row(self, index: int) -> FileInfo:
+        return FileInfo(
+            path=self.path(index),
+            size=int(self.sizes[index]),
+            modified_time=float(self.mtimes[index]),
+            already_converted=bool(self.converted[index]),
+        )
+
+    def summary(self) -> dict:
+        """Same figures as ScannerService.get_summary, computed on the arrays."""
+        total = len(self)
+        already_converted = int(np.count_nonzero(self.converted))
+        total_size = int(self.sizes[~self.converted].sum())
+
+        return {
+            "total_files": total,
+            "already_converted": already_converted,
+            "pending_conversion": total - already_converted,
+            "total_size_bytes": total_size,
+            "total_size_mb": round(total_size / (1024 * 1024), 2),
+        }
+
+
+class ScanTableBuilder:
+    """Append-only builder that keeps columns in compact arrays while walking."""
+
+    def __init__(self):
+        self._folder_ids: Dict[str, int] = {}
+        self._folders: List[str] = []
+        self._folder_index = array("I")
+        self._names: List[str] = []
+        self._sizes = array("q")
+        self._mtimes = array("d")
+        self._converted = array("b")
+
+    def add(self, folder: str, name: str, size: int, mtime: float, converted: bool) -> None:
+        folder_id = self._folder_ids.get(folder)
+        if folder_id is None:
+            folder_id = self._folder_ids[folder] = len(self._folders)
+            self._folders.append(folder)
+        self._folder_index.append(folder_id)
+        self._names.append(name)
+        self._sizes.append(size)
+        self._mtimes.append(mtime)
+        self._converted.append(converted)
+
+    def build(self) -> ScanTable:
+        return ScanTable(
+            folders=self._folders,
+            folder_index=np.frombuffer(self._folder_index, dtype=np.uint32),
+            names=self._names,
+            sizes=np.frombuffer(self._sizes, dtype=np.int64),
+            mtimes=np.frombuffer(self._mtimes, dtype=np.float64),
+            converted=np.frombuffer(self._converted, dtype=np.int8).astype(bool),
+        )
+
+
 class ScannerService:
     """Async file system scanner for ARW files."""
 
     def __init__(self, executor: Optional[ThreadPoolExecutor] = None):
         """Initialize scanner with optional thread pool for I/O operations."""
-        self.executor = executor or ThreadPoolExecutor(max_workers=4)
+        self.executor = executor or ThreadPoolExecutor(max_workers=worker_plan().scanner)
 
     async def scan_directory(
-        self, path: str, recursive: bool = True, output_subdir: str = "converted"
+        self,
+        path: str,
+        recursive: bool = True,
+        output_subdir: str = "converted",
+        output_format: str = "jpeg",
+        output_dir: Optional[str] = None,
     ) -> List[FileInfo]:
         """
         Scan directory for ARW files asynchronously.
@@ -39,19 +162,70 @@ class ScannerService:
             path: Directory path to scan
             recursive: Whether to scan subdirectories
             output_subdir: Name of the output folder to check for existing conversions
+            output_format: Output format whose extension marks a file as converted
+            output_dir: Explicit output folder mirroring the source tree
+                (overrides output_subdir)
 
         Returns:
             List of FileInfo objects for discovered ARW files
         """
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(
-            self.executor, self._scan_sync, path, recursive, output_subdir
+            self.executor,
+            self._scan_sync,
+            path,
+            recursive,
+            output_subdir,
+            output_format,
+            output_dir,
+        )
+
+    async def scan_table(
+        self,
+        path: str,
+        recursive: bool = True,
+        output_subdir: str = "converted",
+        output_format: str = "jpeg",
+        output_dir: Optional[str] = None,
+    ) -> ScanTable:
+        """
+        Scan directory for ARW files into a columnar ScanTable.
+
+        Takes the same arguments as scan_directory; use it when holding
+        large results (paging, summaries) rather than iterating rows.
+        """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            self.executor,
+            self._scan_table_sync,
+            path,
+            recursive,
+            output_subdir,
+            output_format,
+            output_dir,
         )
 
     def _scan_sync(
-        self, path: str, recursive: bool, output_subdir: str
+        self,
+        path: str,
+        recursive: bool,
+        output_subdir: str,
+        output_format: str = "jpeg",
+        output_dir: Optional[str] = None,
     ) -> List[FileInfo]:
         """Synchronous implementation of directory scanning."""
+        return list(
+            self._scan_table_sync(path, recursive, output_subdir, output_format, output_dir)
+        )
+
+    def _scan_table_sync(
+        self,
+        path: str,
+        recursive: bool,
+        output_subdir: str,
+        output_format: str = "jpeg",
+        output_dir: Optional[str] = None,
+    ) -> ScanTable:
         source_dir = Path(path)
 
         if not source_dir.exists():
@@ -60,41 +234,34 @@ class ScannerService:
         if not source_dir.is_dir():
             raise NotADirectoryError(f"Path is not a directory: {path}")
 
-        # Determine glob pattern
-        globber = source_dir.rglob if recursive else source_dir.glob
-
-        # Find all ARW files (case-insensitive)
-        arw_files = []
-        for pattern in ["*.arw", "*.ARW"]:
-            arw_files.extend(globber(pattern))
-
-        # Build FileInfo list with conversion status
-        results = []
-        for arw_file in arw_files:
-            # Skip macOS resource fork files and hidden files
-            if arw_file.name.startswith("._") or arw_file.name.startswith("."):
-                continue
-            # Check if already converted
-            relative_path = arw_file.relative_to(source_dir)
-            output_path = source_dir / output_subdir / relative_path.with_suffix(".jpg")
-
-            try:
-                stat = arw_file.stat()
-                file_info = FileInfo(
-                    path=str(arw_file),
-                    size=stat.st_size,
-                    modified_time=stat.st_mtime,
-                    already_converted=output_path.exists(),
+        output_suffix = output_extension(output_format)
+        output_root = Path(output_dir) if output_dir else source_dir / output_subdir
+
+        # One scandir pass over the source; outputs are checked against a
+        # single listing of each mirrored output folder instead of one
+        # exists() round trip per file.
+        builder = ScanTableBuilder()
+        for folder, entries in _walk_raw_files(source_dir, recursive):
+            relative_dir = folder.relative_to(source_dir)
+            converted = _list_names(output_root / relative_dir)
+            folder_path = str(folder)
+            for entry in entries:
+                try:
+                    stat = entry.stat()
+                except (PermissionError, OSError):
+                    # Skip files we can't access
+                    continue
+                output_name = Path(entry.name).with_suffix(output_suffix).name
+                builder.add(
+                    folder_path, entry.name, stat.st_size, stat.st_mtime, output_name in converted
                 )
-                results.append(file_info)
-            except (PermissionError, OSError):
-                # Skip files we can't access
-                continue
 
-        return results
+        return builder.build()
 
-    def get_summary(self, files: List[FileInfo]) -> dict:
+    def get_summary(self, files: Union[ScanTable, List[FileInfo]]) -> dict:
         """Generate summary statistics for scanned files."""
+        if isinstance(files, ScanTable):
+            return files.summary()
         total = len(files)
         already_converted = sum(1 for f in files if f.already_converted)
         pending = total - already_converted
@@ -107,3 +274,44 @@ class ScannerService:
             "total_size_bytes": total_size,
             "total_size_mb": round(total_size / (1024 * 1024), 2),
         }
+
+
+def _walk_raw_files(root: Path, recursive: bool) -> Iterator[Tuple[Path, List[os.DirEntry]]]:
+    """
+    Yield (folder, ARW entries) for each folder holding ARW files.
+
+    Extensions match case-insensitively; hidden files and macOS resource
+    forks are skipped, and directory symlinks are not followed.
+    """
+    pending = [root]
+    while pending:
+        folder = pending.pop()
+        raw_files = []
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if recursive:
+                                pending.append(Path(entry.path))
+                            continue
+                    except OSError:
+                        continue
+                    if entry.name.startswith(".") or not entry.name.lower().endswith(".arw"):
+                        continue
+                    raw_files.append(entry)
+        except (PermissionError, OSError):
+            if folder == root:
+                raise
+            continue
+        if raw_files:
+            raw_files.sort(key=lambda entry: entry.name)
+            yield folder, raw_files
+
+
+def _list_names(folder: Path) -> Set[str]:
+    """Names in folder, or an empty set when it does not exist."""
+    try:
+        return set(os.listdir(folder))
+    except OSError:
+        return set()
@@ -0,0 +1,142 @@
+"""
+Scheduler Service - Priority classes over one shared worker pool.
+
+Preview renders, metadata lookups and batch conversions compete for the
+same CPU. Work acquires a slot for its priority class before it runs:
+waiting work is admitted most urgent first, and bulk conversion may never
+take the last reserved slots, so the review UI stays responsive while a
+10k-file job is running.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from enum import IntEnum
+import asyncio
+import heapq
+import itertools
+import os
+import threading
+
+from app.utils.resources import worker_plan
+
+
+class Priority(IntEnum):
+    """Priority classes, most urgent first."""
+
+    INTERACTIVE = 0
+    METADATA = 1
+    BULK = 2
+
+
+class PriorityScheduler:
+    """Admission control for CPU-bound work across all requests and jobs."""
+
+    def __init__(self, workers: Optional[int] = None, reserved: Optional[int] = None):
+        """
+        Initialize scheduler.
+
+        Args:
+            workers: Work items allowed to run at once (and threads in the pool)
+            reserved: Slots bulk work may never take, kept for interactive
+                and metadata work
+        """
+        if workers is None:
+            # Sized from cgroup CPU and memory limits (SPECTRUM_SCHEDULER_WORKERS overrides)
+            workers = worker_plan().scheduler
+        if reserved is None:
+            reserved = int(os.getenv("SPECTRUM_INTERACTIVE_RESERVED", "1"))
+        self.workers = max(1, workers)
+        # Bulk work always keeps at least one slot
+        self.reserved = max(0, min(reserved, self.workers - 1))
+        self.executor = ThreadPoolExecutor(max_workers=self.workers)
+        self._lock = threading.Lock()
+        self._running: Dict[Priority, int] = {priority: 0 for priority in Priority}
+        # (priority, sequence, future) min-heap of waiters
+        self._waiting: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+
+    @property
+    def bulk_limit(self) -> int:
+        return self.workers - self.reserved
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority):
+        """Hold one slot of the given class for the duration of the block."""
+        await self._acquire(priority)
+        try:
+            yield
+        finally:
+            self._release(priority)
+
+    async def run(self, priority: Priority, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking function on the shared pool once a slot is free."""
+        async with self.slot(priority):
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(self.executor, fn, *args)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Running and waiting work per class."""
+        with self._lock:
+            waiting = {priority: 0 for priority in Priority}
+            for priority, _, future in self._waiting:
+                if not future.done():
+                    waiting[Priority(priority)] += 1
+            return {
+                priority.name.lower(): {
+                    "running": self._running[priority],
+                    "waiting": waiting[priority],
+                }
+                for priority in Priority
+            }
+
+    async def _acquire(self, priority: Priority) -> None:
+        with self._lock:
+            # Only skip the queue when nothing at least as urgent is waiting
+            if self._can_start(priority) and not any(
+                waiting <= priority and not future.done()
+                for waiting, _, future in self._waiting
+            ):
+                self._running[priority] += 1
+                return
+            future = asyncio.get_event_loop().create_future()
+            heapq.heappush(self._waiting, (int(priority), next(self._sequence), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            # Granted just as we were cancelled: hand the slot back
+            if not future.cancelled():
+                self._release(priority)
+            raise
+
+    def _release(self, priority: Priority) -> None:
+        with self._lock:
+            self._running[priority] -= 1
+            self._dispatch()
+
+    def _can_start(self, priority: Priority) -> bool:
+        if sum(self._running.values()) >= self.workers:
+            return False
+        return priority != Priority.BULK or self._running[Priority.BULK] < self.bulk_limit
+
+    def _dispatch(self) -> None:
+        """Admit waiters in priority order while slots allow (lock held)."""
+        while self._waiting:
+            priority, _, future = self._waiting[0]
+            if future.done():
+                heapq.heappop(self._waiting)
+                continue
+            if not self._can_start(Priority(priority)):
+                return
+            heapq.heappop(self._waiting)
+            try:
+                future.get_loop().call_soon_threadsafe(self._grant, future, Priority(priority))
+            except RuntimeError:
+                continue  # The waiter's event loop is gone
+            self._running[Priority(priority)] += 1
+
+    def _grant(self, future: asyncio.Future, priority: Priority) -> None:
+        if future.cancelled():
+            self._release(priority)
+        else:
+            future.set_result(None)
@@ -0,0 +1,179 @@
+"""
+State Store - Job state shared by all API worker processes.
+
+With `uvicorn --workers N` each process has its own services and its own
+JobRegistry, but a client's next request may land on any process. Every
+process mirrors its jobs into one SQLite file on local disk and reads
+other processes' jobs from it. Pause/resume/cancel for a job owned by
+another process is written as a command that the owning process picks up
+on its next sync.
+"""
+
+from typing import Dict, List, Optional, Tuple
+from pathlib import Path
+import os
+import socket
+import sqlite3
+import threading
+import time
+
+from app.services.jobs import ACTIVE_STATES
+from app.services.render_cache import default_cache_dir
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    state TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    processed INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    finished_at REAL,
+    owner TEXT NOT NULL,
+    command TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_owner ON jobs (owner, command);
+"""
+
+
+def process_owner() -> str:
+    """Id of this API process (host:pid)."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class JobStateStore:
+    """SQLite mirror of job state across API worker processes."""
+
+    def __init__(self, path: Optional[Path] = None, stale_seconds: float = 30.0):
+        """
+        Initialize store.
+
+        Args:
+            path: Database file on local disk (default: <cache dir>/state.db)
+            stale_seconds: Active jobs whose owner has not synced for this
+                long are marked failed (the owning process died)
+        """
+        configured = os.getenv("SPECTRUM_STATE_PATH", "").strip()
+        self.path = Path(path or configured or default_cache_dir() / "state.db")
+        self.stale_seconds = stale_seconds
+        self.owner = process_owner()
+        self._local = threading.local()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=10, isolation_level=None)
+            # Local disk only, so WAL is safe and lets readers skip the writer lock
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def save(self, infos: List[dict]) -> None:
+        """Upsert this process's jobs (JobControl.info() dicts)."""
+        if not infos:
+            return
+        now = time.time()
+        self._connection().executemany(
+            "INSERT INTO jobs (id, kind, state, total, processed, created_at, finished_at, owner, updated_at) "
+            "VALUES (:id, :kind, :state, :total, :processed, :created_at, :finished_at, :owner, :now) "
+            "ON CONFLICT(id) DO UPDATE SET kind = excluded.kind, state = excluded.state, "
+            "total = excluded.total, processed = excluded.processed, created_at = excluded.created_at, "
+            "finished_at = excluded.finished_at, owner = excluded.owner, updated_at = excluded.updated_at, "
+            "command = CASE WHEN jobs.owner = excluded.owner AND jobs.created_at = excluded.created_at "
+            "THEN jobs.command ELSE NULL END",
+            [{**info, "owner": self.owner, "now": now} for info in infos],
+        )
+
+    def get(self, job_id: str) -> Optional[dict]:
+        row = self._connection().execute(
+            "SELECT id, kind, state, total, processed, created_at, finished_at, owner, command "
+            "FROM jobs WHERE id = ?",
+            (job_id,),
+        ).fetchone()
+        return _row_info(row) if row else None
+
+    def list(self, limit: int = 200) -> List[dict]:
+        rows = self._connection().execute(
+            "SELECT id, kind, state, total, processed, created_at, finished_at, owner, command "
+            "FROM jobs ORDER BY created_at DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
+        return [_row_info(row) for row in reversed(rows)]
+
+    def is_active_elsewhere(self, job_id: str) -> bool:
+        """Whether another live process owns an active job with this id."""
+        row = self._connection().execute(
+            "SELECT owner, state, updated_at FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        if row is None or row[0] == self.owner:
+            return False
+        return row[1] in ACTIVE_STATES and row[2] >= time.time() - self.stale_seconds
+
+    def request(self, job_id: str, command: str) -> bool:
+        """Queue a command for an active job's owner. False if the job is not active."""
+        return bool(
+            self._connection().execute(
+                f"UPDATE jobs SET command = ? WHERE id = ? AND state IN {ACTIVE_STATES}",
+                (command, job_id),
+            ).rowcount
+        )
+
+    def take_commands(self) -> List[Tuple[str, str]]:
+        """Commands queued for this process's jobs, cleared as they are taken."""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute(
+                "SELECT id, command FROM jobs WHERE owner = ? AND command IS NOT NULL",
+                (self.owner,),
+            ).fetchall()
+            if rows:
+                conn.execute(
+                    "UPDATE jobs SET command = NULL WHERE owner = ? AND command IS NOT NULL",
+                    (self.owner,),
+                )
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return [(row[0], row[1]) for row in rows]
+
+    def expire(self, keep_finished: int) -> None:
+        """Fail jobs of dead processes and drop all but the newest finished jobs."""
+        now = time.time()
+        conn = self._connection()
+        conn.execute(
+            f"UPDATE jobs SET state = 'failed', finished_at = ?, command = NULL "
+            f"WHERE state IN {ACTIVE_STATES} AND updated_at < ?",
+            (now, now - self.stale_seconds),
+        )
+        conn.execute(
+            f"DELETE FROM jobs WHERE state NOT IN {ACTIVE_STATES} AND id NOT IN ("
+            f"SELECT id FROM jobs WHERE state NOT IN {ACTIVE_STATES} "
+            f"ORDER BY finished_at DESC LIMIT ?)",
+            (keep_finished,),
+        )
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def _row_info(row: tuple) -> Dict:
+    return {
+        "id": row[0],
+        "kind": row[1],
+        "state": row[2],
+        "total": row[3],
+        "processed": row[4],
+        "created_at": row[5],
+        "finished_at": row[6],
+        "owner": row[7],
+        "requested": row[8],
+    }
@@ -0,0 +1,425 @@
+"""
+Task Queue Service - File-level conversion tasks shared by several machines.
+
+One SQLite database on shared storage (next to the photos on the NAS) holds
+a row per file. Workers on any machine claim tasks under a lease and keep
+the lease alive with heartbeats while they convert; a task whose lease runs
+out (its worker crashed, was killed or lost the mount) is claimed again by
+another worker, up to a retry limit. Every state change is one short
+IMMEDIATE transaction, so workers only contend on the database lock for
+milliseconds per file.
+
+The database uses SQLite's rollback journal rather than WAL, which needs
+shared memory and does not work across machines. The shared filesystem
+must support POSIX locks (NFSv4, SMB with locking enabled).
+"""
+
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import asyncio
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+
+from app.utils.resources import worker_plan
+
+TASK_STATES = ("pending", "leased", "done", "failed", "cancelled")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL,
+    src TEXT NOT NULL,
+    dst TEXT NOT NULL,
+    options TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    lease_until REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_claim ON tasks (state, id);
+CREATE INDEX IF NOT EXISTS tasks_job ON tasks (job_id, state);
+CREATE TABLE IF NOT EXISTS workers (
+    id TEXT PRIMARY KEY,
+    host TEXT NOT NULL,
+    pid INTEGER NOT NULL,
+    started_at REAL NOT NULL,
+    heartbeat REAL NOT NULL,
+    completed INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+@dataclass
+class QueuedTask:
+    """One claimed file-level task."""
+
+    id: int
+    job_id: str
+    src: str
+    dst: str
+    options: dict
+    attempts: int
+
+
+def default_worker_id() -> str:
+    """host:pid:random, unique across machines and restarts."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+class SharedTaskQueue:
+    """SQLite-backed task queue with leases, safe across processes and hosts."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        lease_seconds: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+    ):
+        """
+        Initialize queue.
+
+        Args:
+            path: Database file on storage every worker can reach
+            lease_seconds: How long a claim lasts without a heartbeat
+            max_attempts: Claims per task before it is failed instead of re-queued
+        """
+        path = path or os.getenv("SPECTRUM_QUEUE_PATH")
+        if not path:
+            raise ValueError("Queue path not set (SPECTRUM_QUEUE_PATH)")
+        self.path = Path(path)
+        self.lease_seconds = lease_seconds or float(os.getenv("SPECTRUM_QUEUE_LEASE", "60"))
+        self.max_attempts = max_attempts or int(os.getenv("SPECTRUM_QUEUE_MAX_ATTEMPTS", "3"))
+        # Short single-statement transactions; never hold SQLite work on the event loop
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        self._local = threading.local()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread (sqlite3 connections are not shareable)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=DELETE")
+            conn.execute("PRAGMA synchronous=FULL")
+            self._local.conn = conn
+        return conn
+
+    def _transaction(self, work: Callable[[sqlite3.Connection], Any]) -> Any:
+        """Run work inside BEGIN IMMEDIATE, so claims never race."""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            value = work(conn)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return value
+
+    def enqueue(self, job_id: str, files: Iterable[Tuple[str, str]], options: Optional[dict] = None) -> int:
+        """
+        Add (src, dst) tasks for a job.
+
+        Returns:
+            Number of tasks added
+        """
+        encoded = json.dumps(options or {})
+        now = time.time()
+        rows = [(job_id, str(src), str(dst), encoded, now) for src, dst in files]
+
+        def insert(conn: sqlite3.Connection) -> int:
+            conn.executemany(
+                "INSERT INTO tasks (job_id, src, dst, options, updated_at) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            return len(rows)
+
+        return self._transaction(insert)
+
+    def claim(self, worker_id: str, limit: int = 1) -> List[QueuedTask]:
+        """
+        Lease up to limit tasks: pending ones first, then ones whose lease expired.
+
+        Expired tasks that already used max_attempts are failed instead.
+        """
+        now = time.time()
+
+        def take(conn: sqlite3.Connection) -> List[QueuedTask]:
+            conn.execute(
+                "UPDATE tasks SET state = 'failed', worker = NULL, updated_at = ?, result = ? "
+                "WHERE state = 'leased' AND lease_until < ? AND attempts >= ?",
+                (
+                    now,
+                    json.dumps({"status": "failed", "error": "Worker lost the task too many times"}),
+                    now,
+                    self.max_attempts,
+                ),
+            )
+            rows = conn.execute(
+                "SELECT id, job_id, src, dst, options, attempts FROM tasks "
+                "WHERE state = 'pending' OR (state = 'leased' AND lease_until < ?) "
+                "ORDER BY state = 'leased', id LIMIT ?",
+                (now, limit),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE tasks SET state = 'leased', worker = ?, lease_until = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                [(worker_id, now + self.lease_seconds, now, row[0]) for row in rows],
+            )
+            return [
+                QueuedTask(row[0], row[1], row[2], row[3], json.loads(row[4]), row[5] + 1)
+                for row in rows
+            ]
+
+        return self._transaction(take)
+
+    def heartbeat(self, worker_id: str, task_ids: Iterable[int] = ()) -> List[int]:
+        """
+        Extend this worker's leases and record that it is alive.
+
+        Returns:
+            Ids of the given tasks this worker no longer holds
+        """
+        task_ids = list(task_ids)
+        now = time.time()
+        host, pid = _worker_host_pid(worker_id)
+
+        def beat(conn: sqlite3.Connection) -> List[int]:
+            conn.execute(
+                "INSERT INTO workers (id, host, pid, started_at, heartbeat) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET heartbeat = excluded.heartbeat",
+                (worker_id, host, pid, now, now),
+            )
+            lost = []
+            for task_id in task_ids:
+                updated = conn.execute(
+                    "UPDATE tasks SET lease_until = ? WHERE id = ? AND worker = ? AND state = 'leased'",
+                    (now + self.lease_seconds, task_id, worker_id),
+                ).rowcount
+                if not updated:
+                    lost.append(task_id)
+            return lost
+
+        return self._transaction(beat)
+
+    def complete(self, task_id: int, worker_id: str, result: dict) -> bool:
+        """
+        Record a task's outcome.
+
+        Returns:
+            False if the lease was lost (another worker re-claimed the task),
+            in which case the result is discarded
+        """
+        state = "failed" if result.get("status") == "failed" else "done"
+        now = time.time()
+
+        def store(conn: sqlite3.Connection) -> bool:
+            updated = conn.execute(
+                "UPDATE tasks SET state = ?, result = ?, worker = NULL, lease_until = NULL, "
+                "updated_at = ? WHERE id = ? AND worker = ? AND state = 'leased'",
+                (state, json.dumps(result), now, task_id, worker_id),
+            ).rowcount
+            if updated:
+                conn.execute("UPDATE workers SET completed = completed + 1 WHERE id = ?", (worker_id,))
+            return bool(updated)
+
+        return self._transaction(store)
+
+    def release(self, worker_id: str, task_ids: Iterable[int]) -> None:
+        """Hand unfinished tasks back without counting the attempt (clean shutdown)."""
+        now = time.time()
+        self._transaction(
+            lambda conn: conn.executemany(
+                "UPDATE tasks SET state = 'pending', worker = NULL, lease_until = NULL, "
+                "attempts = MAX(attempts - 1, 0), updated_at = ? "
+                "WHERE id = ? AND worker = ? AND state = 'leased'",
+                [(now, task_id, worker_id) for task_id in task_ids],
+            )
+        )
+
+    def cancel(self, job_id: str) -> int:
+        """Drop a job's pending tasks; leased ones finish. Returns tasks cancelled."""
+        now = time.time()
+        return self._transaction(
+            lambda conn: conn.execute(
+                "UPDATE tasks SET state = 'cancelled', updated_at = ? "
+                "WHERE job_id = ? AND state = 'pending'",
+                (now, job_id),
+            ).rowcount
+        )
+
+    def job_status(self, job_id: str, include_results: bool = False) -> Optional[dict]:
+        """Task counts per state for a job (and finished results), or None if unknown."""
+        conn = self._connection()
+        counts = dict(
+            conn.execute(
+                "SELECT state, COUNT(*) FROM tasks WHERE job_id = ? GROUP BY state", (job_id,)
+            ).fetchall()
+        )
+        if not counts:
+            return None
+        status = {
+            "job_id": job_id,
+            "total": sum(counts.values()),
+            **{state: counts.get(state, 0) for state in TASK_STATES},
+        }
+        status["finished"] = not (status["pending"] or status["leased"])
+        if include_results:
+            status["results"] = [
+                json.loads(row[0])
+                for row in conn.execute(
+                    "SELECT result FROM tasks WHERE job_id = ? AND result IS NOT NULL ORDER BY id",
+                    (job_id,),
+                )
+            ]
+        return status
+
+    def stats(self) -> dict:
+        """Tasks per state and workers seen within two lease periods."""
+        conn = self._connection()
+        counts = dict(conn.execute("SELECT state, COUNT(*) FROM tasks GROUP BY state").fetchall())
+        cutoff = time.time() - 2 * self.lease_seconds
+        workers = [
+            {"id": row[0], "host": row[1], "pid": row[2], "heartbeat": row[3], "completed": row[4]}
+            for row in conn.execute(
+                "SELECT id, host, pid, heartbeat, completed FROM workers WHERE heartbeat >= ? ORDER BY id",
+                (cutoff,),
+            )
+        ]
+        return {"tasks": {state: counts.get(state, 0) for state in TASK_STATES}, "workers": workers}
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+        self.executor.shutdown(wait=False)
+
+
+def _worker_host_pid(worker_id: str) -> Tuple[str, int]:
+    host, _, rest = worker_id.partition(":")
+    pid = rest.partition(":")[0]
+    return host, int(pid) if pid.isdigit() else 0
+
+
+TaskHandler = Callable[[QueuedTask], Awaitable[dict]]
+
+
+class QueueWorker:
+    """Claims tasks from a SharedTaskQueue and runs them with a handler."""
+
+    def __init__(
+        self,
+        queue: SharedTaskQueue,
+        handler: TaskHandler,
+        concurrency: Optional[int] = None,
+        worker_id: Optional[str] = None,
+        poll_interval: float = 2.0,
+    ):
+        """
+        Initialize worker.
+
+        Args:
+            queue: Shared queue to pull from
+            handler: Converts one task and returns its result payload
+                (status "failed" marks the task failed)
+            concurrency: Tasks in flight on this worker
+            worker_id: Stable id (default: host:pid:random)
+            poll_interval: Seconds between claims while the queue is empty
+        """
+        self.queue = queue
+        self.handler = handler
+        self.concurrency = max(1, concurrency or int(os.getenv("SPECTRUM_QUEUE_CONCURRENCY", "0")) or worker_plan().scheduler)
+        self.worker_id = worker_id or default_worker_id()
+        self.poll_interval = poll_interval
+        self.completed = 0
+        self._in_flight: Dict[int, QueuedTask] = {}
+        self._stop = asyncio.Event()
+
+    def stop(self) -> None:
+        """Finish the tasks in flight, then return from run()."""
+        self._stop.set()
+
+    async def run(self, drain: bool = False) -> int:
+        """
+        Process tasks until stopped.
+
+        Args:
+            drain: Return once the queue has no claimable tasks (batch runs, tests)
+
+        Returns:
+            Tasks this worker completed
+        """
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(self.queue.executor, self.queue.heartbeat, self.worker_id, [])
+        heartbeat = asyncio.create_task(self._heartbeat_loop())
+        print(f"[QUEUE] Worker {self.worker_id} started ({self.concurrency} slot(s))", flush=True)
+        try:
+            await asyncio.gather(*(self._slot_loop(drain) for _ in range(self.concurrency)))
+        finally:
+            heartbeat.cancel()
+            if self._in_flight:
+                # Interrupted mid-task: let another worker pick these up now
+                await loop.run_in_executor(
+                    self.queue.executor, self.queue.release, self.worker_id, list(self._in_flight)
+                )
+        print(f"[QUEUE] Worker {self.worker_id} stopped after {self.completed} task(s)", flush=True)
+        return self.completed
+
+    async def _slot_loop(self, drain: bool) -> None:
+        loop = asyncio.get_event_loop()
+        while not self._stop.is_set():
+            tasks = await loop.run_in_executor(
+                self.queue.executor, self.queue.claim, self.worker_id, 1
+            )
+            if not tasks:
+                if drain:
+                    return
+                try:
+                    await asyncio.wait_for(self._stop.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._run_task(tasks[0])
+
+    async def _run_task(self, task: QueuedTask) -> None:
+        loop = asyncio.get_event_loop()
+        self._in_flight[task.id] = task
+        try:
+            result = await self.handler(task)
+        except Exception as e:
+            result = {"src": task.src, "dst": task.dst, "status": "failed", "error": str(e)}
+        stored = await loop.run_in_executor(
+            self.queue.executor, self.queue.complete, task.id, self.worker_id, result
+        )
+        del self._in_flight[task.id]
+        if stored:
+            self.completed += 1
+        else:
+            print(f"[QUEUE] Lease lost for {task.src}; result discarded", flush=True)
+
+    async def _heartbeat_loop(self) -> None:
+        loop = asyncio.get_event_loop()
+        interval = self.queue.lease_seconds / 3
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                lost = await loop.run_in_executor(
+                    self.queue.executor, self.queue.heartbeat, self.worker_id, list(self._in_flight)
+                )
+            except sqlite3.Error as e:
+                # Shared storage hiccup: retry next interval, before the lease runs out
+                print(f"[QUEUE] Heartbeat failed: {e}", flush=True)
+                continue
+            for task_id in lost:
+                print(f"[QUEUE] Lease lost for task {task_id}", flush=True)
@@ -0,0 +1,308 @@
+"""
+Volume Service - Cached, timeout-bounded probes for the folder picker.
+
+Listing drives touches every mounted volume, and a sleeping NAS or a dead
+SMB mount can block a stat for many seconds. Probes run on a thread pool
+with a per-mount timeout, and results are kept for a short TTL: a stale
+entry is served immediately while a background thread refreshes it, so one
+unresponsive mount cannot hang the picker.
+"""
+
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures import wait
+import asyncio
+import os
+import threading
+import time
+
+from app.utils.paths import detect_windows_drive_mounts, get_smart_roots
+
+PHOTO_FOLDER_NAMES = {"photos", "pictures", "dcim", "images", "camera", "lightroom", "photography"}
+
+# Stale entries are served (and refreshed in the background) up to this
+# many TTLs old; older ones are reloaded before answering.
+STALE_FACTOR = 10
+
+
+class ProbeTimeout(Exception):
+    """A filesystem probe did not finish within the timeout."""
+
+
+class RefreshingCache:
+    """TTL cache that serves stale values while a background refresh runs."""
+
+    def __init__(self, executor: ThreadPoolExecutor, ttl_seconds: float, max_entries: int = 64):
+        self.executor = executor
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, Future] = {}
+        # Reentrant: a loader that finishes before add_done_callback runs
+        # its callback (and _store) on the thread still holding the lock
+        self._lock = threading.RLock()
+
+    def get(self, key: Hashable, loader: Callable[[], Any], refresh: bool = False) -> Future:
+        """
+        Future for the value of key.
+
+        Fresh entries resolve immediately; stale ones resolve immediately
+        and start a reload; missing, expired or refreshed ones resolve when
+        the reload finishes. Concurrent reloads of one key are shared, and
+        loader errors are passed on without being cached.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not refresh:
+                age = time.monotonic() - entry[0]
+                if age < self.ttl_seconds * STALE_FACTOR:
+                    if age >= self.ttl_seconds:
+                        self._load(key, loader)
+                    self._entries.move_to_end(key)
+                    done: Future = Future()
+                    done.set_result(entry[1])
+                    return done
+            return self._load(key, loader)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _load(self, key: Hashable, loader: Callable[[], Any]) -> Future:
+        future = self._inflight.get(key)
+        if future is None:
+            future = self.executor.submit(loader)
+            self._inflight[key] = future
+            future.add_done_callback(lambda done: self._store(key, done))
+        return future
+
+    def _store(self, key: Hashable, future: Future) -> None:
+        with self._lock:
+            self._inflight.pop(key, None)
+            if future.cancelled() or future.exception() is not None:
+                return
+            self._entries[key] = (time.monotonic(), future.result())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class VolumeService:
+    """Drive discovery and directory listings for the folder picker."""
+
+    def __init__(
+        self,
+        probe_timeout: Optional[float] = None,
+        drives_ttl: Optional[float] = None,
+        browse_ttl: Optional[float] = None,
+        max_workers: Optional[int] = None,
+    ):
+        """
+        Initialize volume service.
+
+        Args:
+            probe_timeout: Seconds to wait for one mount before reporting it unresponsive
+            drives_ttl: Seconds a drive listing stays fresh
+            browse_ttl: Seconds a directory listing stays fresh
+            max_workers: Threads for filesystem probes
+        """
+        self.probe_timeout = (
+            probe_timeout if probe_timeout is not None
+            else float(os.getenv("SPECTRUM_PROBE_TIMEOUT", "2"))
+        )
+        drives_ttl = drives_ttl if drives_ttl is not None else float(
+            os.getenv("SPECTRUM_DRIVES_TTL", "30")
+        )
+        browse_ttl = browse_ttl if browse_ttl is not None else float(
+            os.getenv("SPECTRUM_BROWSE_TTL", "5")
+        )
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers or int(os.getenv("SPECTRUM_PROBE_WORKERS", "8"))
+        )
+        # Drive listings fan probes out to self.executor and wait on them,
+        # so they run on their own thread to avoid starving the probes.
+        self._refresh_executor = ThreadPoolExecutor(max_workers=1)
+        self._drives = RefreshingCache(self._refresh_executor, drives_ttl, max_entries=1)
+        self._roots = RefreshingCache(self.executor, drives_ttl, max_entries=1)
+        self._listings = RefreshingCache(self.executor, browse_ttl)
+        self._probes: Dict[str, Future] = {}
+        self._probes_lock = threading.Lock()
+        self._last_mounts: List[Tuple[Path, str, Optional[str]]] = []
+
+    async def drives(self, refresh: bool = False) -> dict:
+        """Available drives with accessibility and photo folder hints."""
+        return await asyncio.wrap_future(self._drives.get("drives", self._collect_drives, refresh))
+
+    async def smart_roots(self, refresh: bool = False) -> List[dict]:
+        """Top-level starting points for the folder picker."""
+        return await self._await_probe(
+            self._roots.get("roots", get_smart_roots, refresh), "/"
+        )
+
+    async def list_directories(self, target: Path, refresh: bool = False) -> List[dict]:
+        """
+        Visible subdirectories of target, sorted by name.
+
+        Raises:
+            FileNotFoundError: if target does not exist
+            NotADirectoryError: if target is not a directory
+            ProbeTimeout: if the mount does not answer in time
+        """
+        future = self._listings.get(str(target), lambda: list_subdirectories(target), refresh)
+        return await self._await_probe(future, str(target))
+
+    def clear(self) -> None:
+        """Drop cached drive and directory listings."""
+        self._drives.clear()
+        self._roots.clear()
+        self._listings.clear()
+
+    async def _await_probe(self, future: Future, label: str) -> Any:
+        try:
+            return await asyncio.wait_for(
+                asyncio.shield(asyncio.wrap_future(future)), self.probe_timeout
+            )
+        except asyncio.TimeoutError:
+            raise ProbeTimeout(f"Timed out reading {label}")
+
+    def _collect_drives(self) -> dict:
+        """Enumerate mounts and probe them in parallel (runs on a worker thread)."""
+        try:
+            mounts = self._submit_probe("mounts", _list_mounts).result(self.probe_timeout)
+            self._last_mounts = mounts
+        except FutureTimeout:
+            print("[VOLUMES] Mount enumeration timed out; reusing last known mounts", flush=True)
+            mounts = self._last_mounts
+
+        probes = {
+            str(path): self._submit_probe(str(path), lambda path=path: probe_folder(path))
+            for path, _, _ in mounts
+        }
+        wait(probes.values(), timeout=self.probe_timeout)
+
+        drives = []
+        for path, drive_type, letter in mounts:
+            probe = probes[str(path)]
+            timed_out = not probe.done()
+            accessible, photo_hint = (False, None) if timed_out else probe.result()
+            if timed_out:
+                print(f"[VOLUMES] {path} did not answer within {self.probe_timeout}s", flush=True)
+            if drive_type == "home":
+                name = f"Home ({path.name})"
+            else:
+                name = f"{letter}: Drive" if letter else path.name
+            info = {
+                "name": name,
+                "path": str(path),
+                "type": drive_type,
+                "accessible": accessible,
+                "has_photos": photo_hint is not None,
+                "photo_hint": photo_hint,
+                "timed_out": timed_out,
+            }
+            if drive_type != "home":
+                info["letter"] = letter
+            drives.append(info)
+
+        return {"drives": drives, "platform": detect_platform()}
+
+    def _submit_probe(self, key: str, fn: Callable[[], Any]) -> Future:
+        """Run fn on the probe pool, reusing a probe of key that is still running."""
+        with self._probes_lock:
+            future = self._probes.get(key)
+            if future is None or future.done():
+                future = self.executor.submit(fn)
+                self._probes[key] = future
+            return future
+
+
+def probe_folder(path: Path) -> Tuple[bool, Optional[str]]:
+    """
+    Read a folder once.
+
+    Returns:
+        (accessible, photo_hint) where photo_hint is the first child folder
+        with a common photo folder name
+    """
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.name.lower() in PHOTO_FOLDER_NAMES and entry.is_dir():
+                    return True, entry.path
+    except (PermissionError, OSError):
+        return False, None
+    return True, None
+
+
+def list_subdirectories(target: Path) -> List[dict]:
+    """
+    Visible subdirectories of target, sorted by name.
+
+    Raises:
+        FileNotFoundError: if target does not exist
+        NotADirectoryError: if target is not a directory
+    """
+    if not target.exists():
+        raise FileNotFoundError(str(target))
+    if not target.is_dir():
+        raise NotADirectoryError(str(target))
+
+    directories = []
+    try:
+        with os.scandir(target) as entries:
+            for entry in entries:
+                try:
+                    # Filter out hidden folders and focus on directories
+                    if not entry.name.startswith(".") and entry.is_dir():
+                        directories.append({"name": entry.name, "path": entry.path})
+                except (PermissionError, OSError):
+                    continue
+    except (PermissionError, OSError):
+        pass  # Entire directory is unreadable
+
+    directories.sort(key=lambda x: x["name"])
+    return directories
+
+
+def detect_platform() -> str:
+    """Detect if running on Windows or Mac (from inside Docker)."""
+    # Check for Windows Docker mount patterns
+    if Path("/host_mnt").exists() or Path("/mnt/c").exists():
+        return "windows"
+    if Path("/Volumes").exists() and not Path("/mnt/c").exists():
+        return "macos"
+    return "linux"
+
+
+def _list_mounts() -> List[Tuple[Path, str, Optional[str]]]:
+    """(path, type, letter) for volumes, Windows drives and home folders."""
+    mounts: List[Tuple[Path, str, Optional[str]]] = []
+
+    # macOS/Linux mounted volumes
+    mounts.extend((path, "volume", None) for path in _child_folders(Path("/Volumes")))
+
+    # Windows drive mounts
+    for letter, mount_path in detect_windows_drive_mounts().items():
+        mounts.append((mount_path, "windows", letter.upper()))
+
+    # Home directories
+    mounts.extend(
+        (path, "home", None)
+        for path in _child_folders(Path("/Users"))
+        if path.name not in ("Shared", "Guest")
+    )
+    return mounts
+
+
+def _child_folders(root: Path) -> List[Path]:
+    try:
+        with os.scandir(root) as entries:
+            return [
+                Path(entry.path)
+                for entry in entries
+                if not entry.name.startswith(".") and entry.is_dir()
+            ]
+    except (PermissionError, OSError):
+        return []
@@ -0,0 +1,83 @@
+"""
+Warm-up Service - One tiny conversion on every decode thread at startup.
+
+The first conversion in a fresh process pays for importing rawpy and Pillow,
+LibRaw's initialization and first-touch page faults on the thread's
+buffers. With SPECTRUM_WARMUP=1 the API pushes a small synthetic RAW
+through the real decode and encode path on every scheduler thread before it
+starts serving, so the first user file runs at steady-state speed. It
+trades a slower start for that, and loads the libraries startup otherwise
+defers.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Tuple
+import asyncio
+import os
+import tempfile
+import threading
+import time
+
+from app.services.converter import ConverterService
+from app.utils.dng import dng_bytes, synthetic_bayer
+
+# Even sides keep the Bayer pattern whole
+WARMUP_SIZE = (64, 64)
+# Seconds a thread waits for the others to pick up their warm-up task
+BARRIER_TIMEOUT = 10.0
+
+
+def warmup_enabled() -> bool:
+    return os.getenv("SPECTRUM_WARMUP", "0") == "1"
+
+
+async def warm_up(converter: ConverterService, executor: ThreadPoolExecutor, workers: int) -> dict:
+    """
+    Run one tiny conversion on each of the executor's threads.
+
+    Args:
+        converter: Converter whose decode and encode path is warmed
+        executor: Pool to warm (the scheduler's)
+        workers: Threads in the pool
+
+    Returns:
+        Dict with workers, threads actually warmed, succeeded, ms and errors
+    """
+    workers = max(1, workers)
+    data = dng_bytes(synthetic_bayer(*WARMUP_SIZE), model="Warmup")
+    # Each task holds its thread until all have started, so every thread
+    # gets exactly one instead of one fast thread taking them all
+    barrier = threading.Barrier(workers)
+    loop = asyncio.get_event_loop()
+    started = time.perf_counter()
+    with tempfile.TemporaryDirectory(prefix="spectrum-warmup-") as tmp:
+        results = await asyncio.gather(
+            *[
+                loop.run_in_executor(
+                    executor, _warm_thread, converter, barrier, data, Path(tmp) / f"warmup-{index}"
+                )
+                for index in range(workers)
+            ]
+        )
+    errors = sorted({error for _, error in results if error})
+    return {
+        "workers": workers,
+        "threads": len({thread for thread, _ in results}),
+        "succeeded": sum(1 for _, error in results if error is None),
+        "ms": round((time.perf_counter() - started) * 1000, 1),
+        "errors": errors,
+    }
+
+
+def _warm_thread(
+    converter: ConverterService, barrier: threading.Barrier, data: bytes, dst: Path
+) -> Tuple[int, Optional[str]]:
+    try:
+        barrier.wait(BARRIER_TIMEOUT)
+    except threading.BrokenBarrierError:
+        pass  # Fewer free threads than expected; warm this one anyway
+    result = converter._convert_sync(
+        Path("warmup.ARW"), dst.with_suffix(".out"), None, None, source_data=data
+    )
+    return threading.get_ident(), result.error if not result.success else None
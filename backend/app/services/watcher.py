@@ -0,0 +1,443 @@
+"""
+Watcher Service - Convert new ARW files as they land in source folders.
+
+Two ways to notice new files:
+
+- inotify (Linux, local filesystems): the kernel reports created, moved-in
+  and closed-after-write files, so idle folders cost nothing;
+- polling (SMB/NFS and Docker Desktop mounts, where changes made by other
+  machines never raise inotify events): directories are re-listed only
+  when their mtime changed since the last pass, so a quiet tree costs one
+  stat per folder per poll.
+
+Either way a file is only handed on once it is stable - size and mtime
+unchanged for a settle period - because cards are copied over the network
+in chunks. Stable files are debounced into batches so a card dump becomes
+a handful of conversion jobs rather than one per file.
+"""
+
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+import asyncio
+import ctypes
+import ctypes.util
+import errno
+import os
+import struct
+import sys
+import time
+
+RAW_EXTENSIONS = {".arw"}
+
+# Filesystems where inotify does not see changes made by other hosts
+NETWORK_FILESYSTEMS = {
+    "cifs", "smb3", "smbfs", "nfs", "nfs4", "afpfs", "9p", "davfs",
+    "fuse.sshfs", "fuse.grpcfuse", "fakeowner", "virtiofs",
+}
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+_WATCH_MASK = IN_CREATE | IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_DELETE_SELF
+_EVENT_HEADER = struct.Struct("iIII")
+
+Signature = Tuple[int, float]
+
+
+def filesystem_type(path: Path) -> Optional[str]:
+    """Filesystem type of the mount holding path (Linux only)."""
+    try:
+        with open("/proc/self/mounts") as handle:
+            mounts = [line.split() for line in handle]
+    except OSError:
+        return None
+
+    target = str(Path(path).resolve())
+    best, best_type = "", None
+    for fields in mounts:
+        if len(fields) < 3:
+            continue
+        mount_point = fields[1].replace("\\040", " ")
+        if (
+            target == mount_point
+            or target.startswith(mount_point.rstrip("/") + "/")
+        ) and len(mount_point) > len(best):
+            best, best_type = mount_point, fields[2]
+    return best_type
+
+
+def _libc():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1
+        libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+def supports_inotify(paths: Iterable[Path]) -> bool:
+    """True when inotify is available and every path is on a local filesystem."""
+    if _libc() is None:
+        return False
+    for path in paths:
+        fs_type = filesystem_type(path)
+        if fs_type is None or fs_type in NETWORK_FILESYSTEMS:
+            return False
+    return True
+
+
+class _Inotify:
+    """Thin ctypes wrapper over the inotify syscalls."""
+
+    def __init__(self):
+        self._libc = _libc()
+        if self._libc is None:
+            raise OSError(errno.ENOSYS, "inotify not available")
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches: Dict[int, Path] = {}
+
+    def add_watch(self, path: Path) -> None:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(str(path)), _WATCH_MASK)
+        if wd < 0:
+            code = ctypes.get_errno()
+            raise OSError(code, f"inotify_add_watch failed for {path}: {os.strerror(code)}")
+        self.watches[wd] = path
+
+    def read_events(self) -> List[Tuple[Optional[Path], int, str]]:
+        """Drain pending events as (watched dir, mask, name)."""
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(data):
+                wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+                offset += length
+                directory = self.watches.get(wd)
+                if mask & IN_IGNORED:
+                    self.watches.pop(wd, None)
+                events.append((directory, mask, name))
+
+    def close(self) -> None:
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
+
+class DirectoryWatcher:
+    """Watches folders and hands stable new RAW files to a callback in batches."""
+
+    def __init__(
+        self,
+        roots: Iterable[Path],
+        on_batch: Callable[[List[Path]], Awaitable[None]],
+        settle_seconds: Optional[float] = None,
+        batch_window: Optional[float] = None,
+        batch_max: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        mode: Optional[str] = None,
+        exclude: Iterable[Path] = (),
+        include_existing: bool = True,
+    ):
+        """
+        Initialize watcher.
+
+        Args:
+            roots: Folders to watch recursively
+            on_batch: Awaited with each batch of stable files (batches run one at a time)
+            settle_seconds: Size and mtime must be unchanged this long
+            batch_window: Wait this long after the last stable file before emitting a batch
+            batch_max: Emit early once a batch holds this many files
+            poll_interval: Seconds between polling passes
+            mode: "auto", "inotify" or "polling"
+            exclude: Folders to ignore (e.g. the output folder)
+            include_existing: Queue files already present at start (the
+                conversion pipeline skips those already converted)
+        """
+        self.roots = [Path(root).resolve() for root in roots]
+        self.on_batch = on_batch
+        self.settle_seconds = (
+            settle_seconds if settle_seconds is not None
+            else float(os.getenv("SPECTRUM_WATCH_SETTLE", "10"))
+        )
+        self.batch_window = (
+            batch_window if batch_window is not None
+            else float(os.getenv("SPECTRUM_WATCH_BATCH_WINDOW", "5"))
+        )
+        self.batch_max = batch_max or int(os.getenv("SPECTRUM_WATCH_BATCH_MAX", "50"))
+        self.poll_interval = (
+            poll_interval if poll_interval is not None
+            else float(os.getenv("SPECTRUM_WATCH_POLL", "30"))
+        )
+        requested = (mode or os.getenv("SPECTRUM_WATCH_MODE", "auto")).lower()
+        if requested not in {"auto", "inotify", "polling"}:
+            raise ValueError(f"Unknown watch mode: {requested}")
+        if requested == "auto":
+            requested = "inotify" if supports_inotify(self.roots) else "polling"
+        self.mode = requested
+        self.exclude = {Path(path).resolve() for path in exclude}
+        self.include_existing = include_existing
+
+        self.stats = {"files_seen": 0, "files_queued": 0, "batches": 0, "errors": 0}
+        self._candidates: Dict[Path, Tuple[Signature, float]] = {}
+        self._emitted: Dict[Path, Signature] = {}
+        self._ready: List[Path] = []
+        self._last_ready = 0.0
+        self._dirs: Dict[Path, Tuple[float, float]] = {}
+        self._children: Dict[Path, Set[Path]] = {}
+        self._batches: Optional[asyncio.Queue] = None
+        self._stopped: Optional[asyncio.Event] = None
+        self._inotify: Optional[_Inotify] = None
+
+    @property
+    def pending(self) -> int:
+        """Files seen but not yet handed to a batch."""
+        return len(self._candidates) + len(self._ready)
+
+    def stop(self) -> None:
+        """Ask run() to return once the batch in progress has finished."""
+        if self._stopped is not None:
+            self._stopped.set()
+
+    async def run(self) -> None:
+        """Watch until stop() is called."""
+        loop = asyncio.get_event_loop()
+        self._stopped = asyncio.Event()
+        self._batches = asyncio.Queue()
+        consumer = asyncio.create_task(self._consume())
+
+        try:
+            if self.mode == "inotify":
+                try:
+                    self._inotify = _Inotify()
+                    await loop.run_in_executor(None, self._watch_tree_sync)
+                    loop.add_reader(self._inotify.fd, self._on_inotify)
+                except OSError as e:
+                    # e.g. fs.inotify.max_user_watches exhausted
+                    print(f"[WATCH] inotify unavailable ({e}); falling back to polling", flush=True)
+                    self._close_inotify(loop)
+                    self.mode = "polling"
+            if self.mode == "polling":
+                await loop.run_in_executor(None, self._poll_sync, not self.include_existing)
+
+            print(f"[WATCH] Watching {len(self.roots)} folder(s) using {self.mode}", flush=True)
+            tick = max(0.05, min(1.0, self.settle_seconds / 2))
+            next_poll = time.monotonic() + self.poll_interval
+            while not self._stopped.is_set():
+                try:
+                    await asyncio.wait_for(self._stopped.wait(), timeout=tick)
+                except asyncio.TimeoutError:
+                    pass
+                if self.mode == "polling" and time.monotonic() >= next_poll:
+                    await loop.run_in_executor(None, self._poll_sync, False)
+                    next_poll = time.monotonic() + self.poll_interval
+                if self._candidates:
+                    await loop.run_in_executor(None, self._check_stable_sync)
+                self._maybe_emit()
+        finally:
+            self._close_inotify(loop)
+            if self._stopped.is_set():
+                # Graceful stop: let the batch in progress finish
+                self._batches.put_nowait(None)
+            else:
+                consumer.cancel()
+            try:
+                await consumer
+            except asyncio.CancelledError:
+                pass
+
+    def _close_inotify(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self._inotify is not None:
+            try:
+                loop.remove_reader(self._inotify.fd)
+            except (ValueError, OSError):
+                pass
+            self._inotify.close()
+            self._inotify = None
+
+    async def _consume(self) -> None:
+        while True:
+            batch = await self._batches.get()
+            if batch is None:
+                return
+            try:
+                await self.on_batch(batch)
+            except Exception as e:
+                self.stats["errors"] += 1
+                print(f"[WATCH] Batch of {len(batch)} failed: {e}", flush=True)
+
+    def _maybe_emit(self) -> None:
+        if not self._ready:
+            return
+        quiet = time.monotonic() - self._last_ready >= self.batch_window
+        if quiet or len(self._ready) >= self.batch_max:
+            batch, self._ready = self._ready[: self.batch_max], self._ready[self.batch_max:]
+            self.stats["batches"] += 1
+            self.stats["files_queued"] += len(batch)
+            self._batches.put_nowait(batch)
+
+    def _is_candidate(self, path: Path) -> bool:
+        name = path.name
+        return (
+            path.suffix.lower() in RAW_EXTENSIONS
+            and not name.startswith(".")
+        )
+
+    def _is_excluded(self, directory: Path) -> bool:
+        # Paths below the (resolved) roots are built without following
+        # symlinks, so a plain comparison is enough
+        return directory.name.startswith(".") or directory in self.exclude
+
+    def _touch(self, path: Path) -> None:
+        """Start (or restart) the settle clock for a file."""
+        if not self._is_candidate(path) or path in self._candidates:
+            return
+        try:
+            stat = path.stat()
+        except OSError:
+            return
+        signature = (stat.st_size, stat.st_mtime)
+        if self._emitted.get(path) == signature:
+            return
+        self.stats["files_seen"] += 1
+        self._candidates[path] = (signature, time.monotonic())
+
+    def _check_stable_sync(self) -> None:
+        now = time.monotonic()
+        for path, (signature, since) in list(self._candidates.items()):
+            try:
+                stat = path.stat()
+            except OSError:
+                self._candidates.pop(path, None)
+                continue
+            current = (stat.st_size, stat.st_mtime)
+            if current != signature:
+                self._candidates[path] = (current, now)
+            elif now - since >= self.settle_seconds and stat.st_size > 0:
+                self._candidates.pop(path, None)
+                self._emitted[path] = current
+                self._ready.append(path)
+                self._last_ready = now
+
+    # inotify mode
+
+    def _watch_tree_sync(self) -> None:
+        for root in self.roots:
+            self._watch_dir_sync(root, queue_files=self.include_existing)
+
+    def _watch_dir_sync(self, directory: Path, queue_files: bool) -> None:
+        if self._is_excluded(directory):
+            return
+        self._inotify.add_watch(directory)
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            return
+        for entry in entries:
+            path = Path(entry.path)
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            if is_dir:
+                self._watch_dir_sync(path, queue_files)
+            elif queue_files:
+                self._touch(path)
+
+    def _on_inotify(self) -> None:
+        for directory, mask, name in self._inotify.read_events():
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped: re-walk everything (known files are skipped)
+                print("[WATCH] inotify queue overflow; rescanning", flush=True)
+                self._rewatch()
+                continue
+            if directory is None or not name:
+                continue
+            path = directory / name
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    # Files may land before the new folder's watch exists
+                    try:
+                        self._watch_dir_sync(path, queue_files=True)
+                    except OSError as e:
+                        print(f"[WATCH] Cannot watch {path}: {e}", flush=True)
+            else:
+                self._touch(path)
+
+    def _rewatch(self) -> None:
+        try:
+            for root in self.roots:
+                self._watch_dir_sync(root, queue_files=True)
+        except OSError as e:
+            print(f"[WATCH] Rescan failed: {e}", flush=True)
+
+    # polling mode
+
+    def _poll_sync(self, index_only: bool) -> None:
+        """
+        One polling pass. Only folders whose mtime moved are re-listed; a
+        folder modified within 2 s of its last listing is listed again in
+        case the filesystem's mtime granularity hid a later change.
+        """
+        for root in self.roots:
+            self._poll_dir_sync(root, index_only)
+
+    def _poll_dir_sync(self, directory: Path, index_only: bool) -> None:
+        if self._is_excluded(directory):
+            return
+        try:
+            mtime = directory.stat().st_mtime
+        except OSError:
+            self._dirs.pop(directory, None)
+            self._children.pop(directory, None)
+            return
+
+        known = self._dirs.get(directory)
+        if known is None or known[0] != mtime or known[1] - mtime < 2.0:
+            listed_at = time.time()
+            subdirs: Set[Path] = set()
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                return
+            for entry in entries:
+                path = Path(entry.path)
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    continue
+                if is_dir:
+                    subdirs.add(path)
+                elif not self._is_candidate(path):
+                    continue
+                elif index_only:
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    self._emitted[path] = (stat.st_size, stat.st_mtime)
+                else:
+                    self._touch(path)
+            self._dirs[directory] = (mtime, listed_at)
+            self._children[directory] = subdirs
+
+        for subdir in self._children.get(directory, ()):
+            self._poll_dir_sync(subdir, index_only)
@@ -0,0 +1,100 @@
+"""
+Write-Back Service - Local staging with asynchronous upload to the NAS.
+
+Converter workers encode into a fast local staging directory (local disk
+or tmpfs) instead of writing over SMB. A separate writer pool copies each
+staged file to its final destination with the same temp-then-rename
+guarantee, so decoders never block on network writes.
+"""
+
+from pathlib import Path
+from typing import Optional
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import os
+import uuid
+
+from app.utils.fileops import place_copy
+
+
+class WriteBackService:
+    """Stages outputs locally and uploads them with bounded concurrency."""
+
+    def __init__(
+        self,
+        staging_dir: Optional[Path] = None,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+    ):
+        """
+        Initialize write-back.
+
+        Args:
+            staging_dir: Local directory for staged outputs (None disables staging)
+            max_workers: Concurrent uploads to the destination
+            max_pending: Staged files allowed to wait for upload before
+                converters are held back (bounds local disk use)
+        """
+        if staging_dir is None:
+            configured = os.getenv("SPECTRUM_STAGING_DIR", "").strip()
+            staging_dir = Path(configured) if configured else None
+        if max_workers is None:
+            max_workers = int(os.getenv("SPECTRUM_WRITEBACK_WORKERS", "2"))
+        if max_pending is None:
+            max_pending = int(os.getenv("SPECTRUM_WRITEBACK_PENDING", "8"))
+
+        self.staging_dir = staging_dir
+        self.max_workers = max(1, max_workers)
+        self.max_pending = max(1, max_pending)
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.staging_dir is not None
+
+    def staging_path(self, dst: Path) -> Path:
+        """Unique local path to encode dst into."""
+        return self.staging_dir / f"{uuid.uuid4().hex}{dst.suffix}"
+
+    async def reserve(self) -> None:
+        """Wait for a staging slot before starting a conversion."""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+        await self._slots.acquire()
+
+    def release(self) -> None:
+        """Give back a staging slot (upload finished or nothing was staged)."""
+        if self._slots is not None:
+            self._slots.release()
+
+    def discard(self, staged: Path) -> None:
+        """Give back the slot of a staged output that will not be published, removing the file."""
+        self.release()
+        try:
+            staged.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+    async def publish(self, staged: Path, dst: Path) -> None:
+        """
+        Move a staged file to its destination and release its slot.
+
+        The staged file is removed whether or not the upload succeeded.
+        Raises OSError if the upload failed.
+        """
+        loop = asyncio.get_event_loop()
+        try:
+            await loop.run_in_executor(self.executor, self._publish_sync, staged, dst)
+        finally:
+            self.release()
+
+    def _publish_sync(self, staged: Path, dst: Path) -> None:
+        """Synchronous upload: temp file beside dst, then atomic rename."""
+        try:
+            place_copy(staged, dst)
+        finally:
+            try:
+                staged.unlink(missing_ok=True)
+            except OSError:
+                pass
@@ -0,0 +1,96 @@
+"""
+Minimal DNG writer for synthetic RAW files.
+
+Writes an uncompressed 12-bit Bayer (RGGB) DNG that LibRaw decodes like a
+camera file. Used by the benchmark corpus and by the startup warm-up, which
+needs a tiny decodable file without shipping a sample.
+"""
+
+from typing import List, Tuple
+import struct
+
+import numpy as np
+
+# TIFF field types
+_BYTE, _ASCII, _SHORT, _LONG, _RATIONAL, _SRATIONAL = 1, 2, 3, 4, 5, 10
+_TYPE_SIZES = {_BYTE: 1, _ASCII: 1, _SHORT: 2, _LONG: 4, _RATIONAL: 8, _SRATIONAL: 8}
+
+# sRGB D65 -> camera-ish matrix (ColorMatrix1) and a daylight white balance
+_COLOR_MATRIX = (3240, -1038, -347, -4652, 12263, 2604, -770, 1617, 6244)
+_AS_SHOT_NEUTRAL = (500, 1000, 700)
+
+
+def synthetic_bayer(width: int, height: int, seed: int = 0) -> np.ndarray:
+    """12-bit RGGB mosaic with smooth gradients, edges and sensor noise."""
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    phase = rng.uniform(0, 2 * np.pi, size=3)
+    scene = (
+        np.sin(x / (29.0 + seed % 7) + phase[0])
+        + np.cos(y / (17.0 + seed % 5) + phase[1])
+        + 0.5 * np.sign(np.sin((x + y) / 97.0 + phase[2]))
+        + 2.5
+    ) / 5.0
+    mosaic = scene * 3000.0 + 150.0 + rng.normal(0.0, 30.0, size=(height, width))
+    # Scale red/blue sites by the as-shot neutral so the scene renders grey-ish
+    mosaic[0::2, 0::2] *= _AS_SHOT_NEUTRAL[0] / 1000.0
+    mosaic[1::2, 1::2] *= _AS_SHOT_NEUTRAL[2] / 1000.0
+    return np.clip(mosaic, 0, 4095).astype("<u2")
+
+
+def dng_bytes(mosaic: np.ndarray, model: str = "Synthetic") -> bytes:
+    """Encode a 16-bit Bayer mosaic as a minimal uncompressed DNG."""
+    height, width = mosaic.shape
+    data = np.ascontiguousarray(mosaic, dtype="<u2").tobytes()
+
+    def ascii(text: str) -> bytes:
+        return text.encode("ascii") + b"\0"
+
+    entries: List[Tuple[int, int, int, bytes]] = [
+        (254, _LONG, 1, struct.pack("<I", 0)),  # NewSubfileType: main image
+        (256, _LONG, 1, struct.pack("<I", width)),
+        (257, _LONG, 1, struct.pack("<I", height)),
+        (258, _SHORT, 1, struct.pack("<H", 16)),
+        (259, _SHORT, 1, struct.pack("<H", 1)),  # uncompressed
+        (262, _SHORT, 1, struct.pack("<H", 32803)),  # CFA
+        (271, _ASCII, len(ascii("Spectrum")), ascii("Spectrum")),
+        (272, _ASCII, len(ascii(model)), ascii(model)),
+        (273, _LONG, 1, b""),  # StripOffsets, patched below
+        (277, _SHORT, 1, struct.pack("<H", 1)),
+        (278, _LONG, 1, struct.pack("<I", height)),
+        (279, _LONG, 1, struct.pack("<I", len(data))),
+        (284, _SHORT, 1, struct.pack("<H", 1)),
+        (33421, _SHORT, 2, struct.pack("<2H", 2, 2)),  # CFARepeatPatternDim
+        (33422, _BYTE, 4, bytes([0, 1, 1, 2])),  # CFAPattern: RGGB
+        (50706, _BYTE, 4, bytes([1, 4, 0, 0])),  # DNGVersion
+        (50708, _ASCII, len(ascii(f"Spectrum {model}")), ascii(f"Spectrum {model}")),
+        (50717, _SHORT, 1, struct.pack("<H", 4095)),  # WhiteLevel
+        (50721, _SRATIONAL, 9, b"".join(struct.pack("<ii", v, 10000) for v in _COLOR_MATRIX)),
+        (50728, _RATIONAL, 3, b"".join(struct.pack("<II", v, 1000) for v in _AS_SHOT_NEUTRAL)),
+        (50778, _SHORT, 1, struct.pack("<H", 21)),  # CalibrationIlluminant1: D65
+    ]
+
+    ifd_offset = 8
+    blob_offset = ifd_offset + 2 + 12 * len(entries) + 4
+    blobs = bytearray()
+    packed = bytearray()
+    strip_entry = None
+    for tag, field_type, count, value in entries:
+        if tag == 273:
+            strip_entry = len(packed)
+            packed += struct.pack("<HHI", tag, field_type, count) + b"\0\0\0\0"
+            continue
+        if count * _TYPE_SIZES[field_type] <= 4:
+            packed += struct.pack("<HHI", tag, field_type, count) + value.ljust(4, b"\0")
+        else:
+            packed += struct.pack("<HHII", tag, field_type, count, blob_offset + len(blobs))
+            blobs += value
+            if len(blobs) % 2:
+                blobs += b"\0"
+
+    data_offset = blob_offset + len(blobs)
+    packed[strip_entry + 8:strip_entry + 12] = struct.pack("<I", data_offset)
+
+    header = b"II*\0" + struct.pack("<I", ifd_offset)
+    ifd = struct.pack("<H", len(entries)) + bytes(packed) + struct.pack("<I", 0)
+    return header + ifd + bytes(blobs) + data
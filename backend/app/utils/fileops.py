@@ -0,0 +1,71 @@
+"""
+File operations for placing existing outputs at new destinations.
+
+Used when an output can be reused instead of re-rendered (duplicate
+sources, cached renders). Every placement is atomic: the file is built
+under a temporary name in the destination folder and renamed into place.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+# Linux FICLONE ioctl (_IOW(0x94, 9, int)); supported by btrfs, XFS, bcachefs
+FICLONE = 0x40049409
+
+LINK_MODES = ("hardlink", "reflink", "copy")
+
+
+def _try_reflink(src: Path, dst: Path) -> bool:
+    try:
+        with open(src, "rb") as source, open(dst, "wb") as target:
+            fcntl.ioctl(target.fileno(), FICLONE, source.fileno())
+        return True
+    except (OSError, AttributeError):
+        return False
+
+
+def place_copy(src: Path, dst: Path, modes: tuple[str, ...] = LINK_MODES) -> str:
+    """
+    Make dst hold the same bytes as src, as cheaply as the filesystem allows.
+
+    Tries each mode in order: hardlink (same volume, no data written),
+    reflink (copy-on-write clone) and finally a full copy.
+
+    Returns:
+        The mode that succeeded
+    """
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(suffix=dst.suffix, dir=dst.parent, prefix=".tmp_")
+    os.close(fd)
+    temp_path = Path(temp_name)
+
+    try:
+        for mode in modes:
+            if mode == "hardlink":
+                temp_path.unlink(missing_ok=True)
+                try:
+                    os.link(src, temp_path)
+                except OSError:
+                    continue
+            elif mode == "reflink":
+                if not _try_reflink(src, temp_path):
+                    continue
+            elif mode == "copy":
+                shutil.copyfile(src, temp_path)
+            else:
+                raise ValueError(f"Unknown link mode: {mode}")
+
+            os.replace(temp_path, dst)
+            return mode
+
+        raise OSError(f"Could not place {src} at {dst}")
+    finally:
+        try:
+            temp_path.unlink(missing_ok=True)
+        except OSError:
+            pass
@@ -0,0 +1,80 @@
+"""
+Fast JSON encoding for bulk API responses.
+
+Scan, review and convert responses carry tens of thousands of rows built
+by our own code. Running them through response-model validation and
+json.dumps dominates latency at that size, so these endpoints encode
+directly: orjson when it is installed, the stdlib encoder otherwise, and
+large payloads are streamed in chunks instead of built as one string.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Iterable, Iterator
+
+from fastapi.responses import Response, StreamingResponse
+
+try:
+    import orjson
+except ImportError:  # Optional speed-up: pip install orjson
+    orjson = None
+
+JSON_MEDIA_TYPE = "application/json"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Rows encoded per streamed chunk
+CHUNK_ROWS = 1000
+
+
+def dumps(obj: Any) -> bytes:
+    """Compact UTF-8 JSON for trusted, JSON-native data."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def ndjson_line(obj: Any) -> bytes:
+    """One NDJSON record including the trailing newline."""
+    return dumps(obj) + b"\n"
+
+
+def iter_object(head: dict, list_key: str, rows: Iterable[Any], chunk_rows: int = CHUNK_ROWS) -> Iterator[bytes]:
+    """
+    Encode {**head, list_key: [*rows]} incrementally.
+
+    Rows are encoded in chunks of chunk_rows, so a large list is never held
+    as one encoded string.
+    """
+    prefix = dumps(head)
+    if head:
+        yield prefix[:-1] + b"," + dumps(list_key) + b":["
+    else:
+        yield b"{" + dumps(list_key) + b":["
+
+    chunk = []
+    first = True
+    for row in rows:
+        chunk.append(dumps(row))
+        if len(chunk) >= chunk_rows:
+            yield (b"" if first else b",") + b",".join(chunk)
+            first = False
+            chunk = []
+    if chunk:
+        yield (b"" if first else b",") + b",".join(chunk)
+    yield b"]}"
+
+
+def bulk_response(head: dict, list_key: str, rows: Iterable[Any], count: int) -> Response:
+    """
+    JSON response for head fields plus a list of rows, bypassing model validation.
+
+    Payloads above SPECTRUM_JSON_STREAM_ROWS rows are streamed; smaller
+    ones are sent with a Content-Length.
+    """
+    threshold = int(os.getenv("SPECTRUM_JSON_STREAM_ROWS", "5000"))
+    chunks = iter_object(head, list_key, rows)
+    if count > threshold:
+        return StreamingResponse(chunks, media_type=JSON_MEDIA_TYPE)
+    return Response(content=b"".join(chunks), media_type=JSON_MEDIA_TYPE)
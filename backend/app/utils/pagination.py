@@ -0,0 +1,102 @@
+"""
+Cursor pagination over sorted in-memory results.
+
+Cursors are keyset-based: they carry the sort key of the last item served,
+not an offset, so a page boundary stays put when a rescan adds or removes
+files elsewhere in the listing.
+"""
+
+from __future__ import annotations
+
+import base64
+import bisect
+import json
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+SORT_FIELDS = ("name", "mtime", "size")
+
+SortKey = Tuple[Any, str]
+
+
+def sort_key(field: str, path: str, name: str, modified_time: float, size: int) -> SortKey:
+    """Sort key for one file; the path breaks ties so keys are unique."""
+    if field == "name":
+        return (name.lower(), path)
+    if field == "mtime":
+        return (modified_time, path)
+    if field == "size":
+        return (size, path)
+    raise ValueError(f"Unknown sort field: {field}. Choose from {', '.join(SORT_FIELDS)}")
+
+
+def encode_cursor(field: str, descending: bool, key: SortKey) -> str:
+    payload = json.dumps({"s": field, "d": descending, "k": list(key)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, field: str, descending: bool) -> SortKey:
+    """
+    Parse a cursor issued for the same sort.
+
+    Raises:
+        ValueError: if the cursor is malformed or was issued for another sort
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        key = tuple(payload["k"])
+        same_sort = payload["s"] == field and payload["d"] == descending
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not same_sort or len(key) != 2:
+        raise ValueError("Cursor does not match the requested sort")
+    return key
+
+
+def paginate(
+    items: Sequence[Any],
+    keys: Sequence[SortKey],
+    field: str,
+    descending: bool,
+    cursor: Optional[str],
+    limit: Optional[int],
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Return one page of items and the cursor for the next page.
+
+    Args:
+        items: Items sorted ascending by keys
+        keys: Sort key of each item (ascending, unique)
+        field: Sort field the cursor is bound to
+        descending: Serve the listing in descending order
+        cursor: Cursor from the previous page, or None for the first page
+        limit: Page size (None returns everything after the cursor)
+
+    Returns:
+        (page, next_cursor) - next_cursor is None on the last page
+    """
+    after = decode_cursor(cursor, field, descending) if cursor else None
+
+    if not descending:
+        start = bisect.bisect_right(keys, after) if after is not None else 0
+        end = len(items) if limit is None else min(len(items), start + limit)
+        page = list(items[start:end])
+        more = end < len(items)
+        last = keys[end - 1] if page else None
+    else:
+        end = bisect.bisect_left(keys, after) if after is not None else len(items)
+        start = 0 if limit is None else max(0, end - limit)
+        page = list(reversed(items[start:end]))
+        more = start > 0
+        last = keys[start] if page else None
+
+    next_cursor = encode_cursor(field, descending, last) if more and last is not None else None
+    return page, next_cursor
+
+
+def sorted_view(
+    items: Sequence[Any], key_fn: Callable[[Any], SortKey]
+) -> Tuple[List[Any], List[SortKey]]:
+    """Items sorted ascending by key_fn, plus their keys for bisecting."""
+    decorated = sorted(((key_fn(item), item) for item in items), key=lambda pair: pair[0])
+    return [item for _, item in decorated], [key for key, _ in decorated]
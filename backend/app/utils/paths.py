@@ -6,13 +6,24 @@ from __future__ import annotations
 
 import os
 import re
+import threading
+import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Iterable, Optional, Tuple
 
 WINDOWS_PATH_RE = re.compile(r"^[a-zA-Z]:([/\\\\]|$)")
 UNC_PATH_RE = re.compile(r"^\\\\[^\\\\]+\\\\[^\\\\]+")
 
+NEGATIVE_CACHE_ENTRIES = 4096
+
+# Windows prefix ("c:" or "c:/users") -> Linux root it was found under.
+# Once one path under a prefix resolves, siblings map by string without
+# probing; unresolvable paths are remembered for a short TTL.
+_prefix_roots: Dict[str, Path] = {}
+_negative_paths: Dict[str, float] = {}
+_cache_lock = threading.Lock()
+
 
 @dataclass(frozen=True)
 class ResolvedPath:
@@ -59,37 +70,87 @@ def windows_candidate_paths(path: str) -> List[Path]:
         return []
 
     drive, rest = split_windows_path(normalized)
-    candidates: List[Path] = []
+    return [candidate for _, candidate in _windows_candidates(drive, rest)]
+
+
+def _windows_candidates(drive: str, rest: str) -> List[Tuple[Tuple[str, Path], Path]]:
+    """((windows prefix, Linux root), candidate path) pairs in probe order."""
+    candidates: List[Tuple[Tuple[str, Path], Path]] = []
 
     volumes_drive = get_volumes_drive_letter()
+    drive_prefix = f"{drive}:"
 
     for base in (Path("/host_mnt"), Path("/mnt")):
         base_path = base / drive
-        candidates.append(base_path / rest if rest else base_path)
+        candidates.append(((drive_prefix, base_path), base_path / rest if rest else base_path))
 
     if volumes_drive and volumes_drive == drive:
         volume_root = Path("/Volumes")
-        candidates.append(volume_root / rest if rest else volume_root)
+        candidates.append(((drive_prefix, volume_root), volume_root / rest if rest else volume_root))
 
     drive_root = Path(f"/{drive}")
-    candidates.append(drive_root / rest if rest else drive_root)
+    candidates.append(((drive_prefix, drive_root), drive_root / rest if rest else drive_root))
 
     if drive == "c" and rest.lower().startswith("users/"):
         tail = rest.split("/", 1)[1] if "/" in rest else ""
-        candidate = Path("/Users") / tail if tail else Path("/Users")
-        candidates.append(candidate)
+        users_root = Path("/Users")
+        candidate = users_root / tail if tail else users_root
+        candidates.append((("c:/users", users_root), candidate))
 
-    unique: List[Path] = []
+    unique: List[Tuple[Tuple[str, Path], Path]] = []
     seen = set()
-    for candidate in candidates:
+    for prefix, candidate in candidates:
         key = str(candidate)
         if key not in seen:
             seen.add(key)
-            unique.append(candidate)
+            unique.append((prefix, candidate))
 
     return unique
 
 
+def _prefix_tail(prefix: str, drive: str, rest: str) -> Optional[str]:
+    """Part of the path below prefix, or None if the path is not under it."""
+    if prefix == f"{drive}:":
+        return rest
+    if drive == "c" and prefix == "c:/users" and rest.lower().startswith("users/"):
+        return rest.split("/", 1)[1]
+    return None
+
+
+def _mapped_windows_path(drive: str, rest: str) -> Optional[Path]:
+    """Path under an already resolved prefix, without touching the filesystem."""
+    with _cache_lock:
+        for prefix in (f"{drive}:", "c:/users"):
+            root = _prefix_roots.get(prefix)
+            tail = _prefix_tail(prefix, drive, rest) if root is not None else None
+            if tail is not None:
+                return root / tail if tail else root
+    return None
+
+
+def _negative_ttl() -> float:
+    return float(os.getenv("SPECTRUM_RESOLVE_NEGATIVE_TTL", "5"))
+
+
+def _is_negative(key: str) -> bool:
+    """True while key is remembered as unresolvable."""
+    with _cache_lock:
+        missed = _negative_paths.get(key)
+        if missed is None:
+            return False
+        if time.monotonic() - missed < _negative_ttl():
+            return True
+        del _negative_paths[key]
+        return False
+
+
+def clear_resolve_cache() -> None:
+    """Forget learned mount prefixes and unresolvable paths."""
+    with _cache_lock:
+        _prefix_roots.clear()
+        _negative_paths.clear()
+
+
 def resolve_path(path: str) -> ResolvedPath:
     normalized = normalize_input_path(path)
 
@@ -108,9 +169,25 @@ def resolve_path(path: str) -> ResolvedPath:
         )
 
     if is_windows_path(normalized):
-        candidates = windows_candidate_paths(normalized)
-        for candidate in candidates:
+        drive, rest = split_windows_path(normalized)
+        pairs = _windows_candidates(drive, rest)
+        candidates = [candidate for _, candidate in pairs]
+        key = f"{drive}:/{rest}"
+
+        mapped = _mapped_windows_path(drive, rest)
+        if mapped is not None:
+            return ResolvedPath(
+                original=normalized,
+                path=mapped,
+                was_windows=True,
+                is_unc=False,
+                candidates=candidates,
+            )
+
+        for (prefix, root), candidate in ([] if _is_negative(key) else pairs):
             if candidate.exists():
+                with _cache_lock:
+                    _prefix_roots[prefix] = root
                 return ResolvedPath(
                     original=normalized,
                     path=candidate,
@@ -119,6 +196,11 @@ def resolve_path(path: str) -> ResolvedPath:
                     candidates=candidates,
                 )
         if candidates:
+            with _cache_lock:
+                if key not in _negative_paths:
+                    while len(_negative_paths) >= NEGATIVE_CACHE_ENTRIES:
+                        del _negative_paths[next(iter(_negative_paths))]
+                    _negative_paths[key] = time.monotonic()
             return ResolvedPath(
                 original=normalized,
                 path=candidates[0],
@@ -143,6 +225,30 @@ def resolve_path(path: str) -> ResolvedPath:
     )
 
 
+def existing_paths(paths: Iterable[Path]) -> List[bool]:
+    """
+    Whether each path exists, listing each parent folder once instead of
+    stat'ing every file. Names missing from a listing are re-checked with
+    exists() so case-insensitive mounts behave as before.
+    """
+    paths = list(paths)
+    listings: Dict[Path, Optional[set]] = {}
+    found: List[bool] = []
+    for path in paths:
+        parent = path.parent
+        if parent not in listings:
+            try:
+                listings[parent] = set(os.listdir(parent))
+            except OSError:
+                listings[parent] = None
+        names = listings[parent]
+        if names is None:
+            found.append(False)
+        else:
+            found.append(path.name in names or path.exists())
+    return found
+
+
 def get_volumes_drive_letter() -> str | None:
     value = os.getenv("SPECTRUM_VOLUMES_DRIVE", "").strip()
     if not value:
@@ -0,0 +1,177 @@
+"""
+CPU and memory available to this process, and worker pool sizes from them.
+
+os.cpu_count() reports the host's cores even when a container is limited by
+a cgroup CPU quota, and knows nothing of its memory limit. Pools sized from
+it oversubscribe a small container (threads fight over a fraction of a core)
+or get it OOM-killed (each RAW decode holds a few hundred MB). Sizes are
+worked out once from the cgroup limits (v2, then v1), the CPU affinity mask
+and physical memory, split across API processes, and can be overridden per
+pool with environment variables.
+"""
+
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Tuple
+import math
+import os
+
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+
+
+def _read(path: Path) -> Optional[str]:
+    try:
+        return path.read_text().strip()
+    except (OSError, ValueError):
+        return None
+
+
+def cgroup_cpu_quota(root: Path = CGROUP_ROOT) -> Optional[float]:
+    """CPUs allowed by the cgroup quota, or None when unlimited."""
+    # v2: "<quota> <period>" or "max <period>"
+    value = _read(root / "cpu.max")
+    if value is not None:
+        parts = value.split()
+        if len(parts) == 2 and parts[0] != "max" and int(parts[1]) > 0:
+            return int(parts[0]) / int(parts[1])
+        return None
+    # v1: quota is -1 when unlimited
+    quota = _read(root / "cpu" / "cpu.cfs_quota_us") or _read(root / "cpu,cpuacct" / "cpu.cfs_quota_us")
+    period = _read(root / "cpu" / "cpu.cfs_period_us") or _read(root / "cpu,cpuacct" / "cpu.cfs_period_us")
+    if quota and period and int(quota) > 0 and int(period) > 0:
+        return int(quota) / int(period)
+    return None
+
+
+def cgroup_memory_limit(root: Path = CGROUP_ROOT) -> Optional[int]:
+    """Memory limit of the cgroup in bytes, or None when unlimited."""
+    value = _read(root / "memory.max")
+    if value is None:
+        value = _read(root / "memory" / "memory.limit_in_bytes")
+    if not value or value == "max":
+        return None
+    limit = int(value)
+    # v1 reports "unlimited" as a huge page-aligned number
+    return limit if limit < 1 << 60 else None
+
+
+def host_cpus() -> int:
+    """CPUs this process may run on (affinity mask, else all cores)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        return os.cpu_count() or 1
+
+
+def host_memory() -> Optional[int]:
+    """Physical memory in bytes, if the platform reports it."""
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def available_resources(root: Path = CGROUP_ROOT) -> Tuple[float, Optional[int], str]:
+    """
+    CPUs and memory bytes available, whichever of host and cgroup is smaller.
+
+    Returns:
+        (cpus, memory_bytes, source) where source is "cgroup" when a cgroup
+        limit was the tighter one, else "host"
+    """
+    cpus: float = host_cpus()
+    memory = host_memory()
+    source = "host"
+    quota = cgroup_cpu_quota(root)
+    if quota is not None and quota < cpus:
+        cpus, source = quota, "cgroup"
+    limit = cgroup_memory_limit(root)
+    if limit is not None and (memory is None or limit < memory):
+        memory, source = limit, "cgroup"
+    return cpus, memory, source
+
+
+@dataclass(frozen=True)
+class WorkerPlan:
+    """Pool sizes chosen for one API process."""
+
+    cpus: float
+    memory_mb: Optional[int]
+    source: str
+    api_workers: int
+    # Decode/encode threads (the scheduler pool, shared with conversions)
+    scheduler: int
+    # Directory walks and stats; I/O bound
+    scanner: int
+    # Read-ahead of RAW files for batch jobs
+    prefetch: int
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def plan_workers(
+    cpus: float,
+    memory_bytes: Optional[int],
+    api_workers: int = 1,
+    decode_mb: int = 400,
+    source: str = "host",
+) -> WorkerPlan:
+    """
+    Size worker pools for one of api_workers processes sharing the machine.
+
+    Args:
+        cpus: CPUs available to all processes (may be fractional under a quota)
+        memory_bytes: Memory available to all processes (None if unknown)
+        api_workers: API processes splitting cpus and memory
+        decode_mb: Peak memory of one RAW decode and encode
+        source: Where the limits came from, reported as is
+
+    Returns:
+        WorkerPlan; decode threads are capped by memory as well as CPU
+    """
+    api_workers = max(1, api_workers)
+    share = cpus / api_workers
+    # At least two decode threads so one stays free for previews, unless
+    # memory cannot hold two decodes
+    scheduler = max(2, math.ceil(share))
+    memory_mb = None
+    if memory_bytes is not None:
+        memory_mb = memory_bytes // (1024 * 1024)
+        scheduler = min(scheduler, max(1, memory_mb // api_workers // max(1, decode_mb)))
+    return WorkerPlan(
+        cpus=round(cpus, 2),
+        memory_mb=memory_mb,
+        source=source,
+        api_workers=api_workers,
+        scheduler=scheduler,
+        scanner=max(4, min(16, 2 * math.ceil(share))),
+        prefetch=max(2, min(8, scheduler)),
+    )
+
+
+@lru_cache(maxsize=1)
+def worker_plan() -> WorkerPlan:
+    """
+    Pool sizes for this process, computed once.
+
+    SPECTRUM_SCHEDULER_WORKERS, SPECTRUM_SCANNER_WORKERS and
+    SPECTRUM_PREFETCH_WORKERS override single pools; SPECTRUM_DECODE_MB
+    sets the memory budgeted per decode thread.
+    """
+    cpus, memory, source = available_resources()
+    plan = plan_workers(
+        cpus,
+        memory,
+        api_workers=int(os.getenv("SPECTRUM_API_WORKERS", "1")),
+        decode_mb=int(os.getenv("SPECTRUM_DECODE_MB", "400")),
+        source=source,
+    )
+    overrides = {
+        name: int(os.getenv(f"SPECTRUM_{name.upper()}_WORKERS", "0"))
+        for name in ("scheduler", "scanner", "prefetch")
+    }
+    return WorkerPlan(
+        **{**plan.to_dict(), **{name: value for name, value in overrides.items() if value > 0}}
+    )
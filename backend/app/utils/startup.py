@@ -0,0 +1,40 @@
+"""
+Startup timing for the API process.
+
+app.main imports this module before anything else and marks each startup
+phase, so cold container starts can be compared release to release. The
+report also lists which heavy libraries are still unloaded; they are
+imported on first use (first conversion, first preview), not at startup.
+"""
+
+from typing import Dict
+import sys
+import time
+
+STARTED = time.perf_counter()
+
+# Heavy modules that startup should not need
+DEFERRED_MODULES = ("rawpy", "PIL.Image")
+
+_marks: Dict[str, float] = {}
+
+
+def mark(phase: str) -> None:
+    """Record that a startup phase finished (milliseconds since STARTED)."""
+    _marks[phase] = round((time.perf_counter() - STARTED) * 1000, 1)
+
+
+def report() -> dict:
+    return {
+        "phases_ms": dict(_marks),
+        "deferred": [name for name in DEFERRED_MODULES if name not in sys.modules],
+    }
+
+
+def log_report() -> None:
+    phases = ", ".join(f"{phase} {ms:.0f} ms" for phase, ms in _marks.items())
+    deferred = report()["deferred"]
+    print(
+        f"[STARTUP] {phases}; not loaded yet: {', '.join(deferred) or 'none'}",
+        flush=True,
+    )
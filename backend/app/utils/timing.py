@@ -0,0 +1,111 @@
+"""
+Per-stage timing for conversions.
+
+A StageTimer collects wall and CPU time per pipeline stage (read, decode,
+enhance, encode, write, exif, ...) plus bytes moved for a single file;
+summarize_timings() folds many of them into a per-run summary.
+"""
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional
+
+
+class StageTimer:
+    """Wall/CPU time and byte counters for one file."""
+
+    def __init__(self) -> None:
+        self.stages: Dict[str, Dict[str, Optional[float]]] = {}
+        self.bytes_read = 0
+        self.bytes_written = 0
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Time a block. CPU time is the calling thread's, so native code that
+        fans out to other threads (e.g. OpenMP in LibRaw) is undercounted.
+        """
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield
+        finally:
+            self.record(
+                name,
+                time.perf_counter() - wall_start,
+                time.thread_time() - cpu_start,
+            )
+
+    def record(self, name: str, wall_s: float, cpu_s: Optional[float] = None) -> None:
+        """Add time to a stage (repeated stages accumulate)."""
+        entry = self.stages.setdefault(name, {"wall_s": 0.0, "cpu_s": None})
+        entry["wall_s"] = round(entry["wall_s"] + wall_s, 6)
+        if cpu_s is not None:
+            entry["cpu_s"] = round((entry["cpu_s"] or 0.0) + cpu_s, 6)
+
+    def merge(self, stages: Optional[Dict[str, Dict[str, Optional[float]]]]) -> None:
+        """Fold in stages recorded elsewhere (e.g. by the converter thread)."""
+        for name, entry in (stages or {}).items():
+            self.record(name, entry.get("wall_s") or 0.0, entry.get("cpu_s"))
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Linear-interpolated percentile of a list (pct in 0-100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def summarize_timings(results: Iterable[dict], elapsed_s: Optional[float] = None) -> dict:
+    """
+    Aggregate per-file result payloads into a per-run timing summary.
+
+    Args:
+        results: Result payloads carrying "timings", "bytes_read", "bytes_written"
+        elapsed_s: Wall time of the whole run, if known
+
+    Returns:
+        {"files", "elapsed_s", "bytes_read", "bytes_written",
+         "stages": {stage: {"count", "wall_total_s", "cpu_total_s",
+                            "p50_s", "p95_s", "max_s"}}}
+    """
+    walls: Dict[str, List[float]] = {}
+    cpus: Dict[str, float] = {}
+    files = 0
+    bytes_read = 0
+    bytes_written = 0
+
+    for result in results:
+        stages = result.get("timings") or {}
+        if stages:
+            files += 1
+        bytes_read += result.get("bytes_read") or 0
+        bytes_written += result.get("bytes_written") or 0
+        for name, entry in stages.items():
+            walls.setdefault(name, []).append(entry.get("wall_s") or 0.0)
+            if entry.get("cpu_s") is not None:
+                cpus[name] = cpus.get(name, 0.0) + entry["cpu_s"]
+
+    summary = {
+        "files": files,
+        "elapsed_s": round(elapsed_s, 3) if elapsed_s is not None else None,
+        "bytes_read": bytes_read,
+        "bytes_written": bytes_written,
+        "stages": {},
+    }
+    for name, values in walls.items():
+        summary["stages"][name] = {
+            "count": len(values),
+            "wall_total_s": round(sum(values), 6),
+            "cpu_total_s": round(cpus[name], 6) if name in cpus else None,
+            "p50_s": round(percentile(values, 50), 6),
+            "p95_s": round(percentile(values, 95), 6),
+            "max_s": round(max(values), 6),
+        }
+    return summary
@@ -0,0 +1,131 @@
+"""
+Benchmark corpus - Reproducible synthetic RAW files.
+
+Two corpora are generated from a fixed seed:
+
+- a scan tree: thousands of small ARW-named files spread over dated shoot
+  folders, a share of them with an existing converted output, so directory
+  walking and skip-existing checks dominate;
+- a decode set: a few real, decodable RAW files. They are minimal
+  uncompressed DNGs (Bayer RGGB, 12-bit) saved with an .ARW name so they
+  take the same code paths as camera files; LibRaw detects the container
+  from its contents, not the extension.
+
+Real camera samples can be added to the decode set with --samples.
+"""
+
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+import json
+import shutil
+
+import numpy as np
+
+from app.utils.dng import dng_bytes, synthetic_bayer
+
+CORPUS_VERSION = 1
+
+
+def write_synthetic_raw(path: Path, width: int, height: int, seed: int = 0) -> Path:
+    """Write one decodable synthetic RAW file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(dng_bytes(synthetic_bayer(width, height, seed), model=f"S{seed:04d}"))
+    return path
+
+
+def generate_scan_tree(
+    root: Path,
+    files: int,
+    per_folder: int = 250,
+    converted_ratio: float = 0.3,
+    file_bytes: int = 4096,
+    seed: int = 0,
+) -> List[Path]:
+    """
+    Create a dated folder tree of ARW-named placeholder files.
+
+    Layout: root/YYYY-MM-DD/SHOOT_NN/DSC0xxxx.ARW, with converted JPEGs under
+    root/converted mirroring the tree for about converted_ratio of them.
+    """
+    rng = np.random.default_rng(seed)
+    payload = b"II*\0" + bytes(max(0, file_bytes - 4))
+    sources = []
+    for index in range(files):
+        folder = index // per_folder
+        day = f"2024-{1 + folder // 28 % 12:02d}-{1 + folder % 28:02d}"
+        relative = Path(day) / f"SHOOT_{folder % 3:02d}" / f"DSC{index:05d}.ARW"
+        source = root / relative
+        source.parent.mkdir(parents=True, exist_ok=True)
+        source.write_bytes(payload)
+        sources.append(source)
+        if rng.random() < converted_ratio:
+            converted = root / "converted" / relative.with_suffix(".jpg")
+            converted.parent.mkdir(parents=True, exist_ok=True)
+            converted.write_bytes(b"\xff\xd8\xff\xd9")
+    return sources
+
+
+def generate_decode_set(
+    root: Path,
+    files: int,
+    size: Tuple[int, int] = (3000, 2000),
+    samples: Optional[Path] = None,
+) -> List[Path]:
+    """Write synthetic decodable RAWs and link in real samples, if given."""
+    width, height = size
+    paths = [
+        write_synthetic_raw(root / f"SYN{index:04d}.ARW", width, height, seed=index)
+        for index in range(files)
+    ]
+    if samples is not None:
+        for sample in sorted(samples.iterdir()):
+            if sample.suffix.lower() == ".arw" and not sample.name.startswith("."):
+                target = root / f"SAMPLE_{sample.name}"
+                if not target.exists():
+                    shutil.copy2(sample, target)
+                paths.append(target)
+    return paths
+
+
+def ensure_corpus(
+    root: Path,
+    scan_files: int,
+    decode_files: int,
+    size: Sequence[int],
+    samples: Optional[Path] = None,
+) -> dict:
+    """
+    Generate the corpus under root unless an identical one already exists.
+
+    Returns:
+        {"scan_root", "decode_files", "spec"}
+    """
+    spec = {
+        "version": CORPUS_VERSION,
+        "scan_files": scan_files,
+        "decode_files": decode_files,
+        "size": list(size),
+        "samples": str(samples) if samples else None,
+    }
+    manifest = root / "corpus.json"
+    scan_root = root / "scan"
+    decode_root = root / "decode"
+
+    try:
+        current = json.loads(manifest.read_text())
+    except (OSError, ValueError):
+        current = None
+
+    if current is None or current.get("spec") != spec:
+        shutil.rmtree(root, ignore_errors=True)
+        generate_scan_tree(scan_root, scan_files)
+        decode = generate_decode_set(decode_root, decode_files, tuple(size), samples)
+        current = {"spec": spec, "decode_files": [str(path) for path in decode]}
+        root.mkdir(parents=True, exist_ok=True)
+        manifest.write_text(json.dumps(current, indent=2))
+
+    return {
+        "scan_root": str(scan_root),
+        "decode_files": current["decode_files"],
+        "spec": spec,
+    }
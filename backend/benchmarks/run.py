@@ -0,0 +1,443 @@
+"""
+Benchmark runner.
+
+Usage (from backend/):
+    python -m benchmarks.run
+    python -m benchmarks.run --workers 1,2,4 --presets standard,neutral \\
+        --decode-files 8 --raw-size 6000x4000 --output bench.json
+    python -m benchmarks.run --suites memory --raw-size 9504x6336 --format tiff16
+
+Each (suite, preset, workers) case runs in a fresh subprocess so peak RSS
+is per case. Results are printed as a table and written as JSON for
+comparing runs.
+"""
+
+from pathlib import Path
+from typing import Awaitable, Callable, List, Optional
+import argparse
+import asyncio
+import gc
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from benchmarks.corpus import ensure_corpus  # noqa: E402
+
+SUITES = ("scan", "convert", "exif", "preview", "startup", "memory")
+# Fresh interpreters timed per startup case (times --repeat)
+STARTUP_RUNS = 5
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 1)
+
+
+def _summarize(
+    case: dict, latencies: List[float], elapsed_s: float, total_bytes: Optional[int], errors: int
+) -> dict:
+    from app.utils.timing import percentile
+
+    files = len(latencies)
+    return {
+        **case,
+        "files": files,
+        "errors": errors,
+        "elapsed_s": round(elapsed_s, 3),
+        "files_per_s": round(files / elapsed_s, 2) if elapsed_s > 0 else None,
+        "mb_per_s": (
+            round(total_bytes / elapsed_s / (1024 * 1024), 2)
+            if total_bytes is not None and elapsed_s > 0
+            else None
+        ),
+        "p50_s": round(percentile(latencies, 50), 4),
+        "p95_s": round(percentile(latencies, 95), 4),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def _status_mb(field: str) -> Optional[float]:
+    """A memory line of /proc/self/status (VmRSS, VmHWM) in MB; None off Linux."""
+    try:
+        with open("/proc/self/status") as handle:
+            for line in handle:
+                if line.startswith(field + ":"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return None
+
+
+def _reset_peak_rss() -> bool:
+    """Reset the kernel's RSS high-water mark so the next peak is one file's (Linux 4.0+)."""
+    try:
+        with open("/proc/self/clear_refs", "w") as handle:
+            handle.write("5")
+        return True
+    except OSError:
+        return False
+
+
+async def _bounded(
+    items: List, workers: int, run: Callable[[object], Awaitable[bool]]
+) -> tuple:
+    """Run items with at most `workers` in flight; per-item latency excludes queueing."""
+    semaphore = asyncio.Semaphore(workers)
+    latencies: List[float] = []
+    errors = 0
+
+    async def one(item):
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            ok = await run(item)
+            latencies.append(time.perf_counter() - started)
+            if not ok:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(item) for item in items))
+    return latencies, time.perf_counter() - started, errors
+
+
+async def bench_scan(case: dict, corpus: dict) -> dict:
+    from app.services.scanner import ScannerService
+
+    scanner = ScannerService()
+    latencies = []
+    files = 0
+    started = time.perf_counter()
+    for _ in range(case["repeat"]):
+        scan_started = time.perf_counter()
+        found = await scanner.scan_directory(corpus["scan_root"], output_format=case["format"])
+        latencies.append(time.perf_counter() - scan_started)
+        files += len(found)
+    elapsed = time.perf_counter() - started
+
+    result = _summarize(case, latencies, elapsed, None, 0)
+    # Latencies are per walk here, throughput is per discovered file
+    result["files"] = files
+    result["files_per_s"] = round(files / elapsed, 2) if elapsed > 0 else None
+    return result
+
+
+async def bench_convert(case: dict, corpus: dict) -> dict:
+    from app.services.converter import ConverterService
+    from app.services.encoders import output_extension
+    from app.utils.timing import summarize_timings
+
+    sources = [Path(path) for path in corpus["decode_files"]] * case["repeat"]
+    converter = ConverterService(ThreadPoolExecutor(max_workers=case["workers"]))
+    timings = []
+
+    with tempfile.TemporaryDirectory(prefix="spectrum-bench-") as out_dir:
+        async def convert(item):
+            index, src = item
+            dst = Path(out_dir) / f"{index:05d}_{src.stem}{output_extension(case['format'])}"
+            result = await converter.convert_file(
+                src, dst, preset=case["preset"], output_format=case["format"]
+            )
+            timings.append(
+                {
+                    "timings": result.timings,
+                    "bytes_read": result.bytes_read,
+                    "bytes_written": result.bytes_written,
+                }
+            )
+            return result.success
+
+        latencies, elapsed, errors = await _bounded(
+            list(enumerate(sources)), case["workers"], convert
+        )
+
+    total_bytes = sum(Path(src).stat().st_size for src in sources)
+    result = _summarize(case, latencies, elapsed, total_bytes, errors)
+    result["stages"] = summarize_timings(timings)["stages"]
+    return result
+
+
+async def bench_exif(case: dict, corpus: dict) -> dict:
+    from app.services.converter import ConverterService
+    from app.services.exif import ExifService
+
+    exif = ExifService()
+    if not exif._exiftool_path:
+        return {**case, "skipped": "exiftool not installed"}
+
+    sources = [Path(path) for path in corpus["decode_files"]]
+    converter = ConverterService(ThreadPoolExecutor(max_workers=case["workers"]))
+    with tempfile.TemporaryDirectory(prefix="spectrum-bench-") as out_dir:
+        # Untimed setup: one output per source to copy tags into
+        pairs = []
+        for index, src in enumerate(sources * case["repeat"]):
+            dst = Path(out_dir) / f"{index:05d}_{src.stem}.jpg"
+            await converter.convert_file(src, dst, output_format="jpeg")
+            pairs.append((src, dst))
+
+        async def copy(pair):
+            copied, _ = await exif.copy_exif(*pair)
+            return copied
+
+        latencies, elapsed, errors = await _bounded(pairs, case["workers"], copy)
+
+    return _summarize(case, latencies, elapsed, None, errors)
+
+
+async def bench_preview(case: dict, corpus: dict) -> dict:
+    from app.services.preview import render_preview
+
+    sources = [Path(path) for path in corpus["decode_files"]] * case["repeat"]
+    executor = ThreadPoolExecutor(max_workers=case["workers"])
+    loop = asyncio.get_event_loop()
+
+    async def preview(src):
+        data = await loop.run_in_executor(executor, render_preview, src)
+        return bool(data)
+
+    latencies, elapsed, errors = await _bounded(sources, case["workers"], preview)
+    total_bytes = sum(src.stat().st_size for src in sources)
+    return _summarize(case, latencies, elapsed, total_bytes, errors)
+
+
+async def bench_memory(case: dict, corpus: dict) -> dict:
+    """
+    Per-file memory of one conversion at a time.
+
+    traced_peak_mb is the tracemalloc peak (NumPy arrays and Python objects,
+    not Pillow's or LibRaw's own buffers); rss_growth_mb is the process RSS
+    high-water mark above the RSS before the file, which covers everything.
+    """
+    from app.services.converter import ConverterService
+    from app.services.encoders import output_extension
+
+    sources = [Path(path) for path in corpus["decode_files"]] * case["repeat"]
+    converter = ConverterService(ThreadPoolExecutor(max_workers=1))
+    latencies, traced, growth = [], [], []
+    errors = 0
+    started = time.perf_counter()
+    with tempfile.TemporaryDirectory(prefix="spectrum-bench-") as out_dir:
+        for index, src in enumerate(sources):
+            dst = Path(out_dir) / f"{index:05d}{output_extension(case['format'])}"
+            gc.collect()
+            baseline = _status_mb("VmRSS")
+            hwm_reset = _reset_peak_rss()
+            tracemalloc.start()
+            file_started = time.perf_counter()
+            result = converter._convert_sync(
+                src, dst, None, case["preset"], output_format=case["format"]
+            )
+            latencies.append(time.perf_counter() - file_started)
+            traced.append(tracemalloc.get_traced_memory()[1] / (1024 * 1024))
+            tracemalloc.stop()
+            peak = _status_mb("VmHWM")
+            if hwm_reset and baseline is not None and peak is not None:
+                growth.append(peak - baseline)
+            errors += 0 if result.success else 1
+            dst.unlink(missing_ok=True)
+    elapsed = time.perf_counter() - started
+
+    total_bytes = sum(src.stat().st_size for src in sources)
+    result = _summarize(case, latencies, elapsed, total_bytes, errors)
+    result["traced_peak_mb"] = round(max(traced), 1) if traced else None
+    result["rss_growth_mb"] = round(max(growth), 1) if growth else None
+    return result
+
+
+async def bench_startup(case: dict, corpus: dict) -> dict:
+    """Cold `import app.main` in fresh interpreters, as paid by every API worker, CLI run and test session."""
+    code = (
+        "import time; started = time.perf_counter(); import app.main; "
+        "print(time.perf_counter() - started)"
+    )
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(STARTUP_RUNS * case["repeat"]):
+        completed = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=BACKEND_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        latencies.append(float(completed.stdout.strip().splitlines()[-1]))
+    return _summarize(case, latencies, time.perf_counter() - started, None, 0)
+
+
+BENCHES = {
+    "scan": bench_scan,
+    "convert": bench_convert,
+    "exif": bench_exif,
+    "preview": bench_preview,
+    "startup": bench_startup,
+    "memory": bench_memory,
+}
+
+
+def run_case(case: dict, corpus: dict) -> dict:
+    """Run one benchmark case in this process."""
+    return asyncio.run(BENCHES[case["suite"]](case, corpus))
+
+
+def build_cases(args: argparse.Namespace) -> List[dict]:
+    cases = []
+    for suite in args.suites:
+        if suite in ("scan", "startup"):
+            cases.append({"suite": suite, "preset": None, "workers": 1})
+        elif suite in ("convert", "memory"):
+            for preset in args.presets:
+                # Memory is measured one file at a time
+                for workers in args.workers if suite == "convert" else [1]:
+                    cases.append({"suite": suite, "preset": preset, "workers": workers})
+        else:
+            for workers in args.workers:
+                cases.append({"suite": suite, "preset": None, "workers": workers})
+    for case in cases:
+        case["format"] = args.format
+        case["repeat"] = args.repeat
+    return cases
+
+
+def _run_isolated(case: dict, corpus: dict) -> dict:
+    """Run a case in a child interpreter so peak RSS is its own."""
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as handle:
+        result_path = Path(handle.name)
+    try:
+        completed = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "benchmarks.run",
+                "--case",
+                json.dumps({"case": case, "corpus": corpus}),
+                "--result",
+                str(result_path),
+            ],
+            cwd=BACKEND_DIR,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        if completed.returncode != 0:
+            return {**case, "error": completed.stderr.strip().splitlines()[-1:]}
+        return json.loads(result_path.read_text())
+    finally:
+        result_path.unlink(missing_ok=True)
+
+
+def _print_table(results: List[dict]) -> None:
+    header = f"{'suite':<8} {'preset':<10} {'workers':>7} {'files':>7} {'files/s':>9} {'MB/s':>8} {'p50 s':>8} {'p95 s':>8} {'RSS MB':>8}"
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        if "skipped" in result or "error" in result:
+            note = result.get("skipped") or result.get("error")
+            print(f"{result['suite']:<8} {result['preset'] or '-':<10} {result['workers']:>7} {note}")
+            continue
+        print(
+            f"{result['suite']:<8} {result['preset'] or '-':<10} {result['workers']:>7} "
+            f"{result['files']:>7} {result['files_per_s'] or 0:>9.1f} "
+            f"{result['mb_per_s'] if result['mb_per_s'] is not None else '-':>8} "
+            f"{result['p50_s']:>8.3f} {result['p95_s']:>8.3f} {result['peak_rss_mb']:>8.1f}"
+        )
+        if result["suite"] == "memory":
+            print(
+                f"{'':<8} per file: traced peak {result['traced_peak_mb']} MB, "
+                f"RSS growth {result['rss_growth_mb']} MB"
+            )
+
+
+def _csv(value: str) -> List[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _size(value: str) -> List[int]:
+    width, _, height = value.lower().partition("x")
+    return [int(width), int(height)]
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Spectrum throughput benchmarks")
+    parser.add_argument("--corpus", type=Path, default=BACKEND_DIR / ".bench" / "corpus",
+                        help="Corpus directory (regenerated when the spec changes)")
+    parser.add_argument("--scan-files", type=int, default=5000,
+                        help="ARW-named files in the scan tree")
+    parser.add_argument("--decode-files", type=int, default=6,
+                        help="Synthetic decodable RAWs")
+    parser.add_argument("--raw-size", type=_size, default=[3000, 2000],
+                        help="Synthetic RAW dimensions, WIDTHxHEIGHT")
+    parser.add_argument("--samples", type=Path, default=None,
+                        help="Folder of real ARW files to add to the decode set")
+    parser.add_argument("--suites", type=_csv, default=list(SUITES),
+                        help=f"Comma-separated subset of {','.join(SUITES)}")
+    parser.add_argument("--presets", type=_csv, default=["standard"],
+                        help="Comma-separated presets for the convert suite")
+    parser.add_argument("--workers", type=lambda v: [int(w) for w in _csv(v)], default=[1, 2],
+                        help="Comma-separated worker counts")
+    parser.add_argument("--format", default="jpeg", help="Output format")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="Passes over the corpus per case")
+    parser.add_argument("--output", type=Path, default=None,
+                        help="Write the JSON report here")
+    parser.add_argument("--case", help=argparse.SUPPRESS)
+    parser.add_argument("--result", type=Path, help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+
+    if args.case:
+        payload = json.loads(args.case)
+        result = run_case(payload["case"], payload["corpus"])
+        args.result.write_text(json.dumps(result))
+        return 0
+
+    unknown = sorted(set(args.suites) - set(SUITES))
+    if unknown:
+        print(f"Unknown suites: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    print(f"[BENCH] Preparing corpus in {args.corpus}", flush=True)
+    corpus = ensure_corpus(
+        args.corpus, args.scan_files, args.decode_files, args.raw_size, args.samples
+    )
+
+    results = []
+    for case in build_cases(args):
+        print(f"[BENCH] {case['suite']} preset={case['preset']} workers={case['workers']}", flush=True)
+        results.append(_run_isolated(case, corpus))
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "host": {
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+        },
+        "corpus": corpus["spec"],
+        "results": results,
+    }
+
+    print()
+    _print_table(results)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+        print(f"\n[BENCH] Report written to {args.output}", flush=True)
+    return 1 if any("error" in result for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,23 @@
+"""
+Shared pytest configuration.
+
+Points the on-disk caches at a throwaway directory so test runs never read
+or write the developer's real cache, and forgets resolved Windows mount
+prefixes between tests.
+"""
+
+import os
+import tempfile
+
+import pytest
+
+os.environ.setdefault("SPECTRUM_CACHE_DIR", tempfile.mkdtemp(prefix="spectrum-test-cache-"))
+
+
+@pytest.fixture(autouse=True)
+def _clear_resolve_cache():
+    from app.utils.paths import clear_resolve_cache
+
+    clear_resolve_cache()
+    yield
+    clear_resolve_cache()
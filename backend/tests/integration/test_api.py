@@ -44,6 +44,162 @@ class TestHealthEndpoint:
         data = response.json()
         assert data["status"] == "healthy"
 
+    def test_health_reports_startup_phases(self, client):
+        startup = client.get("/health").json()["startup"]
+        assert startup["phases_ms"]["imports"] <= startup["phases_ms"]["services"]
+
+    def test_import_does_not_load_imaging_libraries(self):
+        import subprocess
+
+        code = "import sys, app.main; print(sorted(m for m in ('rawpy', 'PIL.Image') if m in sys.modules))"
+        completed = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=Path(__file__).parent.parent.parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        assert completed.stdout.strip().splitlines()[-1] == "[]"
+
+
+class TestInfoEndpoint:
+    """Tests for /api/info endpoint."""
+
+    def test_reports_pool_sizes_and_limits(self, client):
+        from app.main import scheduler
+
+        data = client.get("/api/info").json()
+        assert data["resources"]["cpus"] > 0
+        assert data["resources"]["source"] in ("host", "cgroup")
+        assert data["workers"]["scheduler"] == scheduler.workers
+        # Conversions share the scheduler's threads
+        assert data["workers"]["converter"] == scheduler.workers
+        assert data["workers"]["scanner"] >= 4
+        assert data["warmup"] is None
+
+    def test_warmup_runs_at_startup_when_enabled(self, monkeypatch):
+        pytest.importorskip("rawpy")
+        import app.main as main
+
+        monkeypatch.setenv("SPECTRUM_WARMUP", "1")
+        monkeypatch.setattr(main, "warmup_report", None)
+        with TestClient(app) as client:
+            data = client.get("/api/info").json()
+
+        assert data["warmup"]["succeeded"] == main.scheduler.workers
+        assert data["warmup"]["threads"] == main.scheduler.workers
+        assert "warmup" in data["startup"]["phases_ms"]
+
+
+class TestMetricsEndpoint:
+    """Tests for /metrics endpoint."""
+
+    def test_metrics_exposes_text_format(self, client):
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "# TYPE spectrum_files_total counter" in response.text
+        assert 'spectrum_executor_queue_depth{pool="converter"}' in response.text
+        assert "spectrum_active_jobs 0" in response.text
+
+    def test_conversion_updates_counters(self, client, tmp_path):
+        from app.main import converter_service
+        from app.services import metrics
+        from app.services.converter import ConversionResult
+
+        source = tmp_path / "DSC001.ARW"
+        source.write_bytes(b"raw")
+
+        async def fake_convert(src, dst, **kwargs):
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            dst.write_bytes(b"jpeg")
+            return ConversionResult(
+                str(src), str(dst), True, size_bytes=4,
+                timings={"decode": {"wall_s": 0.2, "cpu_s": 0.2}},
+                bytes_read=3, bytes_written=4,
+            )
+
+        converted = metrics.FILES_TOTAL.value(status="converted")
+        written = metrics.BYTES_WRITTEN_TOTAL.value()
+        decodes = metrics.STAGE_SECONDS.count(stage="decode")
+
+        with patch.object(converter_service, "convert_file", side_effect=fake_convert):
+            response = client.post(
+                "/api/convert",
+                json={
+                    "files": [str(source)],
+                    "output_dir": str(tmp_path / "converted"),
+                    "preserve_exif": False,
+                }
+            )
+
+        assert response.status_code == 200
+        assert metrics.FILES_TOTAL.value(status="converted") == converted + 1
+        assert metrics.BYTES_WRITTEN_TOTAL.value() == written + 4
+        assert metrics.STAGE_SECONDS.count(stage="decode") == decodes + 1
+        assert metrics.ACTIVE_JOBS.value() == 0
+
+
+class TestWatchEndpoint:
+    """Tests for /api/watch jobs."""
+
+    def test_watch_converts_new_files(self, tmp_path):
+        import time as _time
+        from app.main import converter_service
+        from app.services.converter import ConversionResult
+
+        async def fake_convert(src, dst, **kwargs):
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            dst.write_bytes(b"jpeg")
+            return ConversionResult(str(src), str(dst), True, size_bytes=4)
+
+        with TestClient(app) as client, patch.object(
+            converter_service, "convert_file", side_effect=fake_convert
+        ):
+            response = client.post(
+                "/api/watch",
+                json={
+                    "source_dir": str(tmp_path),
+                    "preserve_exif": False,
+                    "settle_seconds": 0.1,
+                    "batch_window": 0.1,
+                    "poll_interval": 0.05,
+                    "mode": "polling",
+                },
+            )
+            assert response.status_code == 200
+            watch_id = response.json()["id"]
+            assert response.json()["output_dir"] == str(tmp_path / "converted")
+
+            (tmp_path / "DSC001.ARW").write_bytes(b"raw")
+            for _ in range(50):
+                watches = client.get("/api/watch").json()["watches"]
+                if watches[0]["totals"]["converted"]:
+                    break
+                _time.sleep(0.1)
+
+            assert watches[0]["id"] == watch_id
+            assert (tmp_path / "converted" / "DSC001.jpg").exists()
+
+            stopped = client.delete(f"/api/watch/{watch_id}")
+            assert stopped.status_code == 200
+            assert client.get("/api/watch").json()["watches"] == []
+
+    def test_watch_missing_folder_returns_404(self, client):
+        response = client.post("/api/watch", json={"source_dir": "/nonexistent/path/12345"})
+        assert response.status_code == 404
+
+    def test_stop_unknown_watch_returns_404(self, client):
+        assert client.delete("/api/watch/unknown").status_code == 404
+
+    def test_refused_with_several_api_processes(self, client, tmp_path):
+        with patch("app.main.API_WORKERS", 4):
+            response = client.post("/api/watch", json={"source_dir": str(tmp_path)})
+            assert response.status_code == 503
+            assert "single API process" in response.json()["detail"]
+            assert client.get("/api/watch").status_code == 503
+            assert client.delete("/api/watch/unknown").status_code == 503
+
 
 class TestBrowseEndpoint:
     """Tests for browse directory endpoint."""
@@ -79,6 +235,26 @@ class TestBrowseEndpoint:
         assert data["current"] == str(tmp_path)
         assert len(data["directories"]) == 2  # Only directories, not files
 
+    def test_browse_refresh_rereads_cached_listing(self, client, tmp_path):
+        (tmp_path / "first").mkdir()
+        client.get(f"/api/browse?path={tmp_path}")
+        (tmp_path / "second").mkdir()
+
+        cached = client.get(f"/api/browse?path={tmp_path}").json()
+        fresh = client.get(f"/api/browse?path={tmp_path}&refresh=true").json()
+        assert [d["name"] for d in cached["directories"]] == ["first"]
+        assert [d["name"] for d in fresh["directories"]] == ["first", "second"]
+
+    def test_browse_timeout_returns_504(self, client, tmp_path):
+        from app.main import volume_service
+        from app.services.volumes import ProbeTimeout
+
+        with patch.object(
+            volume_service, "list_directories", AsyncMock(side_effect=ProbeTimeout("Timed out"))
+        ):
+            response = client.get(f"/api/browse?path={tmp_path}")
+        assert response.status_code == 504
+
 
 class TestScanEndpoint:
     """Tests for scan directory endpoint."""
@@ -137,6 +313,99 @@ class TestScanEndpoint:
         assert data["already_converted"] == 1
         assert data["pending_conversion"] == 0
 
+    def test_scan_unknown_output_format_returns_400(self, client, tmp_path):
+        response = client.post(
+            "/api/scan",
+            json={"path": str(tmp_path), "output_format": "bmp"}
+        )
+        assert response.status_code == 400
+
+    def test_scan_pages_with_cursor(self, client, tmp_path):
+        for i in range(5):
+            (tmp_path / f"photo{i}.ARW").write_bytes(b"x" * (i + 1))
+
+        seen = []
+        cursor = None
+        for _ in range(5):
+            body = {"path": str(tmp_path), "limit": 2}
+            if cursor:
+                body["cursor"] = cursor
+            data = client.post("/api/scan", json=body).json()
+            assert data["total_files"] == 5
+            seen.extend(Path(f["path"]).name for f in data["files"])
+            cursor = data["next_cursor"]
+            if cursor is None:
+                break
+
+        assert seen == [f"photo{i}.ARW" for i in range(5)]
+
+    def test_scan_sorts_by_size_descending(self, client, tmp_path):
+        (tmp_path / "small.ARW").write_bytes(b"x")
+        (tmp_path / "large.ARW").write_bytes(b"x" * 100)
+        (tmp_path / "medium.ARW").write_bytes(b"x" * 10)
+
+        response = client.post(
+            "/api/scan",
+            json={"path": str(tmp_path), "sort": "size", "order": "desc"}
+        )
+        names = [Path(f["path"]).name for f in response.json()["files"]]
+        assert names == ["large.ARW", "medium.ARW", "small.ARW"]
+
+    def test_scan_filters_status_and_subfolder(self, client, tmp_path):
+        (tmp_path / "a").mkdir()
+        (tmp_path / "b").mkdir()
+        (tmp_path / "a" / "one.ARW").write_bytes(b"x")
+        (tmp_path / "a" / "two.ARW").write_bytes(b"x")
+        (tmp_path / "b" / "three.ARW").write_bytes(b"x")
+        (tmp_path / "converted" / "a").mkdir(parents=True)
+        (tmp_path / "converted" / "a" / "one.jpg").touch()
+
+        pending = client.post(
+            "/api/scan",
+            json={"path": str(tmp_path), "status": "pending"}
+        ).json()
+        assert pending["total_files"] == 3
+        assert pending["matched_files"] == 2
+        assert {Path(f["path"]).name for f in pending["files"]} == {"two.ARW", "three.ARW"}
+
+        folder = client.post(
+            "/api/scan",
+            json={"path": str(tmp_path), "subfolder": "a"}
+        ).json()
+        assert {Path(f["path"]).name for f in folder["files"]} == {"one.ARW", "two.ARW"}
+
+    def test_scan_refresh_sees_new_files(self, client, tmp_path):
+        (tmp_path / "photo1.ARW").write_bytes(b"x")
+        client.post("/api/scan", json={"path": str(tmp_path)})
+        (tmp_path / "photo2.ARW").write_bytes(b"x")
+
+        cached = client.post("/api/scan", json={"path": str(tmp_path)}).json()
+        fresh = client.post(
+            "/api/scan", json={"path": str(tmp_path), "refresh": True}
+        ).json()
+        assert cached["total_files"] == 1
+        assert fresh["total_files"] == 2
+
+    def test_scan_streams_large_listings(self, client, tmp_path):
+        for i in range(5):
+            (tmp_path / f"photo{i}.ARW").write_bytes(b"x")
+
+        with patch.dict("os.environ", {"SPECTRUM_JSON_STREAM_ROWS": "2"}):
+            response = client.post("/api/scan", json={"path": str(tmp_path)})
+        assert response.status_code == 200
+        assert "content-length" not in response.headers
+        data = response.json()
+        assert data["total_files"] == 5
+        assert len(data["files"]) == 5
+
+    def test_scan_invalid_cursor_returns_400(self, client, tmp_path):
+        (tmp_path / "photo.ARW").write_bytes(b"x")
+        response = client.post(
+            "/api/scan",
+            json={"path": str(tmp_path), "limit": 1, "cursor": "not-a-cursor"}
+        )
+        assert response.status_code == 400
+
 
 class TestDrivesEndpoint:
     """Tests for drives detection endpoint."""
@@ -168,6 +437,41 @@ class TestMetadataEndpoint:
         response = client.get(f"/api/metadata?path={tmp_path}")
         assert response.status_code == 400
 
+    def test_batch_reads_new_files_once(self, client, tmp_path, monkeypatch):
+        import app.main as main
+        from app.services.metadata_cache import MetadataCache
+
+        cache = MetadataCache(tmp_path / "metadata.db")
+        monkeypatch.setattr(main, "metadata_cache", cache)
+        read = AsyncMock(
+            side_effect=lambda paths: {str(path): {"Model": path.name} for path in paths}
+        )
+        monkeypatch.setattr(main.exif_service, "get_key_metadata_batch", read)
+        for name in ("a.ARW", "b.ARW"):
+            (tmp_path / name).write_bytes(b"raw")
+        paths = [str(tmp_path / "a.ARW"), str(tmp_path / "b.ARW"), str(tmp_path / "gone.ARW")]
+
+        first = client.post("/api/metadata/batch", json={"paths": paths}).json()
+        second = client.post("/api/metadata/batch", json={"paths": paths[:2]}).json()
+        single = client.get(f"/api/metadata?path={paths[0]}").json()
+
+        assert [entry["metadata"] for entry in first["files"]] == [
+            {"Model": "a.ARW"},
+            {"Model": "b.ARW"},
+            {"error": "File not found"},
+        ]
+        assert first["cached"] == 0
+        assert second["cached"] == 2
+        assert single["metadata"] == {"Model": "a.ARW"}
+        # Both files went to exiftool together, once
+        assert read.await_count == 1
+        assert len(read.await_args.args[0]) == 2
+        cache.close()
+
+    def test_batch_requires_paths(self, client):
+        response = client.post("/api/metadata/batch", json={"paths": []})
+        assert response.status_code == 422
+
 
 class TestConvertEndpoint:
     """Tests for convert endpoint."""
@@ -195,6 +499,214 @@ class TestConvertEndpoint:
         assert response.status_code in (404, 500)
 
 
+class TestConvertDedupe:
+    """Tests for batch deduplication during conversion."""
+
+    def test_duplicate_sources_converted_once(self, client, tmp_path):
+        from app.main import converter_service
+        from app.services.converter import ConversionResult
+
+        (tmp_path / "card1").mkdir()
+        (tmp_path / "card2").mkdir()
+        first = tmp_path / "card1" / "DSC001.ARW"
+        second = tmp_path / "card2" / "DSC001.ARW"
+        first.write_bytes(b"identical raw")
+        second.write_bytes(b"identical raw")
+
+        async def fake_convert(src, dst, **kwargs):
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            dst.write_bytes(b"jpeg")
+            return ConversionResult(str(src), str(dst), True, size_bytes=4)
+
+        with patch.object(converter_service, "convert_file", side_effect=fake_convert) as convert:
+            response = client.post(
+                "/api/convert",
+                json={
+                    "files": [str(first), str(second)],
+                    "output_dir": str(tmp_path / "converted"),
+                    "preserve_exif": False,
+                    "dedupe": True,
+                }
+            )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert convert.call_count == 1
+        assert data["successful"] == 1
+        assert data["deduplicated"] == 1
+        duplicate = data["results"][1]
+        assert duplicate["status"] == "deduplicated"
+        assert duplicate["duplicate_of"] == str(first)
+        assert Path(duplicate["dst"]).read_bytes() == b"jpeg"
+
+
+class TestConvertRenderCache:
+    """Tests for reusing cached renders across output folders."""
+
+    def test_second_output_dir_served_from_cache(self, client, tmp_path):
+        from app.main import converter_service
+        from app.services.converter import ConversionResult
+
+        src = tmp_path / "DSC100.ARW"
+        src.write_bytes(b"unique raw for cache test")
+
+        async def fake_convert(src, dst, **kwargs):
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            dst.write_bytes(b"rendered")
+            return ConversionResult(str(src), str(dst), True, size_bytes=8, quality=95)
+
+        with patch.object(converter_service, "convert_file", side_effect=fake_convert) as convert:
+            for output in ("export-a", "export-b"):
+                response = client.post(
+                    "/api/convert",
+                    json={
+                        "files": [str(src)],
+                        "output_dir": str(tmp_path / output),
+                        "preserve_exif": False,
+                    }
+                )
+                assert response.status_code == 200
+
+        assert convert.call_count == 1
+        data = response.json()
+        assert data["cached"] == 1
+        result = data["results"][0]
+        assert result["status"] == "cached"
+        assert Path(result["dst"]).read_bytes() == b"rendered"
+
+    def test_cached_batch_reads_no_source_bytes(self, client, tmp_path):
+        from app.main import converter_service
+        from app.services import prefetch, render_cache
+        from app.services.converter import ConversionResult
+
+        sources = []
+        for i in range(3):
+            src = tmp_path / f"DSC11{i}.ARW"
+            src.write_bytes(f"unique raw {i} for read test".encode())
+            sources.append(src)
+
+        async def fake_convert(src, dst, **kwargs):
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            dst.write_bytes(b"rendered")
+            return ConversionResult(str(src), str(dst), True, size_bytes=8)
+
+        def convert(output):
+            return client.post(
+                "/api/convert",
+                json={
+                    "files": [str(src) for src in sources],
+                    "output_dir": str(tmp_path / output),
+                    "preserve_exif": False,
+                }
+            )
+
+        with patch.object(converter_service, "convert_file", side_effect=fake_convert):
+            assert convert("export-a").status_code == 200
+            with patch.object(prefetch, "_read_file") as read_ahead, \
+                    patch.object(render_cache, "edge_fingerprint") as edges, \
+                    patch.object(render_cache, "full_fingerprint") as full:
+                response = convert("export-b")
+
+        assert response.json()["cached"] == 3
+        read_ahead.assert_not_called()
+        edges.assert_not_called()
+        full.assert_not_called()
+
+
+class TestConvertWriteBack:
+    """Tests for local staging with write-back to the output folder."""
+
+    def test_outputs_staged_then_published(self, client, tmp_path):
+        from app.main import converter_service, writeback_service
+        from app.services.converter import ConversionResult
+
+        src = tmp_path / "DSC200.ARW"
+        src.write_bytes(b"raw for write-back test")
+        staging = tmp_path / "staging"
+        written_to = []
+
+        async def fake_convert(src, dst, **kwargs):
+            written_to.append(dst)
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            dst.write_bytes(b"staged jpeg")
+            return ConversionResult(str(src), str(dst), True, size_bytes=11)
+
+        with patch.object(converter_service, "convert_file", side_effect=fake_convert), \
+                patch.object(writeback_service, "staging_dir", staging):
+            response = client.post(
+                "/api/convert",
+                json={
+                    "files": [str(src)],
+                    "output_dir": str(tmp_path / "converted"),
+                    "preserve_exif": False,
+                }
+            )
+
+        assert response.status_code == 200
+        result = response.json()["results"][0]
+        assert result["status"] == "converted"
+        assert "upload" in result["timings"]
+        assert response.json()["timing_summary"]["files"] == 1
+        assert written_to[0].parent == staging
+        assert Path(result["dst"]).read_bytes() == b"staged jpeg"
+        assert list(staging.iterdir()) == []
+
+    async def test_cancelled_batch_frees_staging_slots(self, tmp_path):
+        import asyncio
+        import threading
+        from app import main
+        from app.main import ConvertRequest, JobControl, converter_service
+        from app.services.converter import ConversionResult
+        from app.services.writeback import WriteBackService
+
+        sources = []
+        for i in range(3):
+            src = tmp_path / f"DSC{300 + i}.ARW"
+            src.write_bytes(b"raw for cancel test")
+            sources.append(src)
+        staging = tmp_path / "staging"
+        service = WriteBackService(staging_dir=staging, max_pending=2)
+        unblock = threading.Event()
+        converting = asyncio.Event()
+
+        def slow_publish(staged, dst):
+            unblock.wait(5)
+            staged.unlink(missing_ok=True)
+
+        async def fake_convert(src, dst, **kwargs):
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            dst.write_bytes(b"staged jpeg")
+            if src != sources[0]:
+                # Second file: stays in conversion, holding its slot
+                converting.set()
+                await asyncio.Event().wait()
+            return ConversionResult(str(src), str(dst), True, size_bytes=11)
+
+        request = ConvertRequest(
+            files=[str(src) for src in sources],
+            output_dir=str(tmp_path / "converted"),
+            preserve_exif=False,
+        )
+        with patch.object(main, "writeback_service", service), \
+                patch.object(service, "_publish_sync", side_effect=slow_publish), \
+                patch.object(converter_service, "convert_file", side_effect=fake_convert):
+            batch = asyncio.create_task(
+                main._convert_batch(request, None, JobControl("cancel-test"))
+            )
+            await asyncio.wait_for(converting.wait(), timeout=5)
+            batch.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await batch
+            unblock.set()
+        # An upload already in publish() finishes on its thread
+        service.executor.shutdown(wait=True)
+
+        # Both slots are free and nothing is left in staging
+        await asyncio.wait_for(service.reserve(), timeout=1)
+        await asyncio.wait_for(service.reserve(), timeout=1)
+        assert list(staging.iterdir()) == []
+
+
 class TestConvertStreamEndpoint:
     """Tests for streaming convert endpoint."""
 
@@ -213,6 +725,87 @@ class TestConvertStreamEndpoint:
         assert len(lines) >= 1
 
 
+class TestJobsEndpoint:
+    """Tests for pausing and cancelling conversion jobs."""
+
+    def test_unknown_job_returns_404(self, client):
+        assert client.get("/api/jobs/missing").status_code == 404
+        assert client.post("/api/jobs/missing/cancel").status_code == 404
+
+    def test_cancel_stops_admitting_files(self, client, tmp_path):
+        from app.main import converter_service, job_registry
+        from app.services.converter import ConversionResult
+
+        sources = []
+        for i in range(4):
+            src = tmp_path / f"DSC{i:03d}.ARW"
+            src.write_bytes(f"raw for cancel test {i}".encode())
+            sources.append(str(src))
+
+        async def fake_convert(src, dst, **kwargs):
+            # Cancel while the first file is in flight
+            job_registry.get("cancel-test").cancel()
+            assert kwargs["should_abort"]() is True
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            dst.write_bytes(b"jpeg")
+            return ConversionResult(str(src), str(dst), True, size_bytes=4)
+
+        with patch.object(converter_service, "convert_file", side_effect=fake_convert) as convert:
+            response = client.post(
+                "/api/convert",
+                json={
+                    "files": sources,
+                    "output_dir": str(tmp_path / "converted"),
+                    "preserve_exif": False,
+                    "dedupe": False,
+                    "job_id": "cancel-test",
+                }
+            )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert convert.call_count == 1
+        assert data["job_id"] == "cancel-test"
+        assert data["cancelled"] == 3
+
+        job = client.get("/api/jobs/cancel-test").json()
+        assert job["state"] == "cancelled"
+        assert job["processed"] == 1
+        assert "cancel-test" in [j["id"] for j in client.get("/api/jobs").json()["jobs"]]
+        # Finished jobs can no longer be controlled
+        assert client.post("/api/jobs/cancel-test/resume").status_code == 409
+
+
+class TestQueueEndpoint:
+    """Tests for the shared multi-machine queue endpoints."""
+
+    def test_unconfigured_queue_returns_503(self, client):
+        assert client.get("/api/queue").status_code == 503
+
+    def test_enqueue_and_status(self, client, tmp_path):
+        from app.services.taskqueue import SharedTaskQueue
+
+        src = tmp_path / "DSC001.ARW"
+        src.write_bytes(b"raw")
+        queue = SharedTaskQueue(str(tmp_path / "queue.db"))
+        with patch("app.main.task_queue", queue):
+            response = client.post(
+                "/api/queue/convert",
+                json={"files": [str(src)], "output_dir": str(tmp_path / "converted"), "job_id": "nas"},
+            )
+            assert response.status_code == 200
+            assert response.json()["queued"] == 1
+
+            (task,) = queue.claim("worker")
+            assert task.dst == str(tmp_path / "converted" / "DSC001.jpg")
+            assert task.options["output_dir"] == str(tmp_path / "converted")
+
+            status = client.get("/api/queue/nas").json()
+            assert status["leased"] == 1
+            assert client.get("/api/queue/unknown").status_code == 404
+        queue.close()
+
+
 class TestReviewEndpoint:
     """Tests for review endpoint."""
 
@@ -267,6 +860,46 @@ class TestReviewEndpoint:
         assert data["total_converted"] == 1
         assert len(data["pairs"]) == 1
 
+    def test_review_uses_output_format_extension(self, client, tmp_path):
+        (tmp_path / "photo.ARW").touch()
+        converted = tmp_path / "converted"
+        converted.mkdir()
+        (converted / "photo.jpg").touch()
+        (converted / "photo.webp").touch()
+
+        response = client.post(
+            "/api/review",
+            json={
+                "source_path": str(tmp_path),
+                "output_dir": str(converted),
+                "output_format": "webp",
+            }
+        )
+        assert response.status_code == 200
+        pairs = response.json()["pairs"]
+        assert pairs[0]["dst"].endswith("photo.webp")
+
+    def test_review_pages_with_cursor(self, client, tmp_path):
+        converted = tmp_path / "converted"
+        converted.mkdir()
+        for i in range(3):
+            (tmp_path / f"photo{i}.ARW").touch()
+            (converted / f"photo{i}.jpg").touch()
+        (tmp_path / "pending.ARW").touch()
+
+        body = {"source_path": str(tmp_path), "output_dir": str(converted), "limit": 2}
+        first = client.post("/api/review", json=body).json()
+        assert first["total_original"] == 4
+        assert first["total_converted"] == 3
+        assert len(first["pairs"]) == 2
+        assert first["next_cursor"]
+
+        second = client.post(
+            "/api/review", json={**body, "cursor": first["next_cursor"]}
+        ).json()
+        assert len(second["pairs"]) == 1
+        assert second["next_cursor"] is None
+
 
 class TestPreviewEndpoint:
     """Tests for preview endpoint."""
@@ -282,6 +915,19 @@ class TestPreviewEndpoint:
         response = client.get(f"/api/preview?path={test_file}")
         assert response.status_code == 415
 
+    def test_second_preview_served_from_cache(self, client, tmp_path):
+        from PIL import Image
+
+        image = tmp_path / "photo.png"
+        Image.new("RGB", (64, 48), (10, 20, 30)).save(image)
+
+        with patch("app.main.render_preview", return_value=b"jpeg preview") as render:
+            first = client.get(f"/api/preview?path={image}")
+            second = client.get(f"/api/preview?path={image}")
+
+        assert first.content == second.content == b"jpeg preview"
+        assert render.call_count == 1
+
 
 class TestFileEndpoint:
     """Tests for file serving endpoint."""
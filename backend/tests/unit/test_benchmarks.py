@@ -0,0 +1,105 @@
+"""
+Unit tests for the benchmark corpus and runner.
+
+Tests that synthetic RAWs decode and that a small case runs end to end.
+"""
+
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import rawpy
+
+from benchmarks.corpus import ensure_corpus, generate_scan_tree, write_synthetic_raw
+from benchmarks import run as bench_run
+from benchmarks.run import build_cases, parse_args, run_case
+
+
+class TestCorpus:
+    """Tests for corpus generation."""
+
+    def test_synthetic_raw_decodes(self, tmp_path):
+        path = write_synthetic_raw(tmp_path / "SYN0001.ARW", 64, 48, seed=1)
+
+        with rawpy.imread(str(path)) as raw:
+            rgb = raw.postprocess(use_camera_wb=True, no_auto_bright=True, output_bps=8)
+
+        assert rgb.shape == (48, 64, 3)
+        # Mosaic is balanced for the as-shot neutral, so channels stay close
+        means = rgb.reshape(-1, 3).mean(axis=0)
+        assert means.max() - means.min() < 20
+
+    def test_synthetic_raw_is_reproducible(self, tmp_path):
+        first = write_synthetic_raw(tmp_path / "a.ARW", 32, 32, seed=5).read_bytes()
+        second = write_synthetic_raw(tmp_path / "b.ARW", 32, 32, seed=5).read_bytes()
+        assert first == second
+
+    def test_scan_tree_layout(self, tmp_path):
+        sources = generate_scan_tree(tmp_path, files=30, per_folder=10, converted_ratio=1.0)
+
+        assert len(sources) == 30
+        assert len({source.parent for source in sources}) == 3
+        assert len(list((tmp_path / "converted").rglob("*.jpg"))) == 30
+
+    def test_ensure_corpus_reuses_matching_spec(self, tmp_path):
+        first = ensure_corpus(tmp_path, scan_files=5, decode_files=1, size=[32, 32])
+        marker = Path(first["decode_files"][0])
+        mtime = marker.stat().st_mtime_ns
+
+        second = ensure_corpus(tmp_path, scan_files=5, decode_files=1, size=[32, 32])
+
+        assert second["decode_files"] == first["decode_files"]
+        assert marker.stat().st_mtime_ns == mtime
+
+
+class TestRunner:
+    """Tests for case building and in-process runs."""
+
+    def test_build_cases_expands_presets_and_workers(self):
+        args = parse_args(["--suites", "scan,convert", "--presets", "standard,neutral", "--workers", "1,2"])
+        cases = build_cases(args)
+
+        assert [case["suite"] for case in cases].count("scan") == 1
+        assert [case["suite"] for case in cases].count("convert") == 4
+
+    def test_convert_case_reports_throughput(self, tmp_path):
+        corpus = ensure_corpus(tmp_path, scan_files=3, decode_files=2, size=[64, 48])
+        case = {"suite": "convert", "preset": "standard", "workers": 1, "format": "jpeg", "repeat": 1}
+
+        result = run_case(case, corpus)
+
+        assert result["files"] == 2
+        assert result["errors"] == 0
+        assert result["files_per_s"] > 0
+        assert result["mb_per_s"] > 0
+        assert result["peak_rss_mb"] > 0
+        assert "read_decode" in result["stages"]
+
+    def test_scan_case_counts_files(self, tmp_path):
+        corpus = ensure_corpus(tmp_path, scan_files=12, decode_files=1, size=[32, 32])
+        case = {"suite": "scan", "preset": None, "workers": 1, "format": "jpeg", "repeat": 2}
+
+        result = run_case(case, corpus)
+
+        assert result["files"] == 24
+
+    def test_startup_case_times_cold_imports(self, monkeypatch):
+        monkeypatch.setattr(bench_run, "STARTUP_RUNS", 2)
+        case = {"suite": "startup", "preset": None, "workers": 1, "format": "jpeg", "repeat": 1}
+
+        result = run_case(case, {})
+
+        assert result["files"] == 2
+        assert 0 < result["p50_s"] < 30
+
+    def test_memory_case_reports_per_file_peaks(self, tmp_path):
+        corpus = ensure_corpus(tmp_path, scan_files=3, decode_files=2, size=[64, 48])
+        case = {"suite": "memory", "preset": "standard", "workers": 1, "format": "tiff16", "repeat": 1}
+
+        result = run_case(case, corpus)
+
+        assert result["files"] == 2
+        assert result["errors"] == 0
+        assert result["traced_peak_mb"] > 0
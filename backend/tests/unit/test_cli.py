@@ -0,0 +1,172 @@
+"""
+Unit tests for the headless CLI.
+
+Tests planning, resume, exit codes and the JSON report using small
+synthetic RAW files.
+"""
+
+import json
+import pytest
+from io import StringIO
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.cli import (
+    EXIT_FAILED,
+    EXIT_OK,
+    EXIT_USAGE,
+    Progress,
+    jobs_for_files,
+    parse_args,
+    plan_jobs,
+    run_convert,
+    run_enqueue,
+    run_worker,
+)
+from benchmarks.corpus import write_synthetic_raw
+
+
+@pytest.fixture
+def card(tmp_path):
+    """Source folder with two decodable RAWs in a subfolder."""
+    source = tmp_path / "card"
+    for index in range(2):
+        write_synthetic_raw(source / "DCIM" / f"DSC{index:04d}.ARW", 64, 48, seed=index)
+    return source
+
+
+def run(argv, stream=None):
+    return run_convert(parse_args(argv), stream or StringIO())
+
+
+class TestPlanJobs:
+    """Tests for plan_jobs."""
+
+    async def test_mirrors_tree_under_converted(self, card):
+        jobs = await plan_jobs([card], None, "converted", "jpeg", True, True)
+
+        assert [job.dst for job in jobs] == [
+            card / "converted" / "DCIM" / "DSC0000.jpg",
+            card / "converted" / "DCIM" / "DSC0001.jpg",
+        ]
+        assert not any(job.done for job in jobs)
+
+    async def test_output_root_per_source(self, card, tmp_path):
+        other = tmp_path / "other"
+        write_synthetic_raw(other / "A.ARW", 32, 32)
+
+        jobs = await plan_jobs([card, other], tmp_path / "out", "converted", "webp", True, True)
+
+        assert tmp_path / "out" / "other" / "A.webp" in [job.dst for job in jobs]
+        assert tmp_path / "out" / "card" / "DCIM" / "DSC0000.webp" in [job.dst for job in jobs]
+
+    async def test_existing_output_marked_done_unless_no_resume(self, card):
+        existing = card / "converted" / "DCIM" / "DSC0000.jpg"
+        existing.parent.mkdir(parents=True)
+        existing.write_bytes(b"jpeg")
+
+        resumed = await plan_jobs([card], None, "converted", "jpeg", True, True)
+        forced = await plan_jobs([card], None, "converted", "jpeg", True, False)
+
+        assert [job.done for job in resumed] == [True, False]
+        assert [job.done for job in forced] == [False, False]
+
+
+class TestRunConvert:
+    """Tests for the convert command."""
+
+    def test_converts_and_writes_report(self, card, tmp_path):
+        report = tmp_path / "report.json"
+
+        code = run(["convert", str(card), "--no-exif", "-w", "2", "--report", str(report)])
+
+        assert code == EXIT_OK
+        assert (card / "converted" / "DCIM" / "DSC0000.jpg").exists()
+        data = json.loads(report.read_text())
+        assert data["totals"] == {"files": 2, "converted": 2, "skipped": 0, "failed": 0}
+        assert "decode" in data["timing_summary"]["stages"]
+        assert data["interrupted"] is False
+
+    def test_second_run_resumes(self, card, tmp_path):
+        report = tmp_path / "report.json"
+        run(["convert", str(card), "--no-exif"])
+
+        code = run(["convert", str(card), "--no-exif", "--report", str(report)])
+
+        assert code == EXIT_OK
+        assert json.loads(report.read_text())["totals"]["skipped"] == 2
+
+    def test_failed_file_sets_exit_code(self, card):
+        (card / "DCIM" / "BROKEN.ARW").write_bytes(b"not a raw file")
+
+        code = run(["convert", str(card), "--no-exif", "--quiet"])
+
+        assert code == EXIT_FAILED
+        assert (card / "converted" / "DCIM" / "DSC0001.jpg").exists()
+
+    def test_usage_errors(self, card, tmp_path):
+        assert run(["convert", str(tmp_path / "missing")]) == EXIT_USAGE
+        assert run(["convert", str(card), "--format", "gif"]) == EXIT_USAGE
+        assert run(["convert", str(card), "--workers", "0"]) == EXIT_USAGE
+
+
+class TestSharedQueue:
+    """Tests for the enqueue and worker commands."""
+
+    def test_enqueue_then_worker_drains(self, card, tmp_path, capsys):
+        queue = str(tmp_path / "nas" / "queue.db")
+
+        code = run_enqueue(
+            parse_args(["enqueue", str(card), "--no-exif", "--queue", queue, "--job", "shoot"]),
+            StringIO(),
+        )
+        assert code == EXIT_OK
+        assert capsys.readouterr().out.strip() == "shoot"
+
+        code = run_worker(
+            parse_args(["worker", "--queue", queue, "-w", "2", "--drain", "--quiet"]), StringIO()
+        )
+
+        assert code == EXIT_OK
+        assert (card / "converted" / "DCIM" / "DSC0000.jpg").exists()
+        assert (card / "converted" / "DCIM" / "DSC0001.jpg").exists()
+
+        from app.services.taskqueue import SharedTaskQueue
+
+        shared = SharedTaskQueue(queue)
+        assert shared.job_status("shoot")["done"] == 2
+        shared.close()
+
+
+class TestProgress:
+    """Tests for Progress."""
+
+    def test_reports_rate_and_eta(self):
+        stream = StringIO()
+        progress = Progress(total_files=2, total_bytes=200, stream=stream, interval=0)
+
+        progress.update(100, failed=False)
+        progress.update(100, failed=True)
+
+        lines = stream.getvalue().splitlines()
+        assert lines[0].startswith("[1/2]  50.0%")
+        assert "ETA" in lines[0]
+        assert lines[1].endswith("failed 1")
+
+
+class TestJobsForFiles:
+    """Tests for jobs_for_files (watch mode planning)."""
+
+    def test_maps_files_to_their_source(self, card, tmp_path):
+        other = tmp_path / "other"
+        write_synthetic_raw(other / "A.ARW", 32, 32)
+        files = [card / "DCIM" / "DSC0000.ARW", other / "A.ARW", tmp_path / "stray.ARW"]
+
+        jobs = jobs_for_files(files, [card, other], None, "converted", "jpeg", True)
+
+        assert [job.dst for job in jobs] == [
+            (card / "converted" / "DCIM" / "DSC0000.jpg").resolve(),
+            (other / "converted" / "A.jpg").resolve(),
+        ]
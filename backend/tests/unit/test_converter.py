@@ -186,3 +186,87 @@ class TestConversionAsync:
         # check the directory creation attempt happened
         # In this case, error is expected because of invalid file format
         assert isinstance(result, ConversionResult)
+
+    @pytest.mark.asyncio
+    async def test_abort_stops_before_first_stage(self, converter, tmp_path):
+        src = tmp_path / "test.ARW"
+        src.write_bytes(b"raw")
+        dst = tmp_path / "out" / "test.jpg"
+
+        result = await converter.convert_file(src, dst, should_abort=lambda: True)
+
+        assert result.cancelled is True
+        assert result.success is False
+        assert "read_decode" not in result.timings
+        assert not dst.exists()
+        assert not list(dst.parent.glob(".tmp_*"))
+
+
+class TestAdaptiveQuality:
+    """Tests for adaptive quality selection."""
+
+    @pytest.fixture
+    def converter(self):
+        return ConverterService()
+
+    @pytest.fixture
+    def image(self):
+        import numpy as np
+        from PIL import Image
+
+        rng = np.random.default_rng(7)
+        return Image.fromarray(rng.integers(0, 255, (300, 400, 3), dtype=np.uint8))
+
+    def test_size_target_lowers_quality(self, converter, image):
+        full = len(converter._encode_bytes(image, 95))
+        quality = converter._choose_quality(image, 95, full // 2, None)
+        assert quality < 95
+        assert len(converter._encode_bytes(image, quality)) <= full // 2 * 1.05
+
+    def test_quality_never_exceeds_ceiling(self, converter, image):
+        quality = converter._choose_quality(image, 80, 10**9, None)
+        assert quality == 80
+
+
+class TestStageTimings:
+    """Tests for per-stage timings on conversion results."""
+
+    def test_successful_conversion_reports_stages(self, tmp_path):
+        import numpy as np
+
+        class FakeRaw:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *args):
+                return False
+
+            def postprocess(self, **kwargs):
+                return np.full((16, 24, 3), 128, dtype=np.uint8)
+
+        src = tmp_path / "photo.ARW"
+        src.write_bytes(b"raw bytes")
+        dst = tmp_path / "converted" / "photo.jpg"
+
+        with patch("rawpy.imread", return_value=FakeRaw()) as imread:
+            result = ConverterService()._convert_sync(src, dst, 90, "standard")
+
+        assert result.success is True
+        # Without prefetched data LibRaw reads the file by path
+        imread.assert_called_once_with(str(src))
+        assert {"read_decode", "enhance", "encode", "write"} <= set(result.timings)
+        assert result.bytes_read == len(b"raw bytes")
+        assert result.bytes_written == dst.stat().st_size
+
+    def test_prefetched_data_skips_read_stage(self, tmp_path):
+        result = ConverterService()._convert_sync(
+            tmp_path / "missing.ARW",
+            tmp_path / "out.jpg",
+            90,
+            "standard",
+            source_data=b"not a raw file",
+        )
+        assert result.success is False
+        assert "decode" in result.timings
+        assert "read_decode" not in result.timings
+        assert result.bytes_read == len(b"not a raw file")
@@ -0,0 +1,102 @@
+"""
+Unit tests for dedupe service and output placement.
+
+Tests fingerprinting, duplicate grouping, and atomic link/copy placement.
+"""
+
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.services.dedupe import DedupeService, edge_fingerprint, full_fingerprint
+from app.utils.fileops import place_copy
+
+
+class TestFingerprints:
+    """Tests for content fingerprints."""
+
+    def test_identical_files_match(self, tmp_path):
+        a = tmp_path / "a.ARW"
+        b = tmp_path / "b.ARW"
+        a.write_bytes(b"x" * 5000)
+        b.write_bytes(b"x" * 5000)
+        assert edge_fingerprint(a) == edge_fingerprint(b)
+        assert full_fingerprint(a) == full_fingerprint(b)
+
+    def test_middle_difference_needs_full_hash(self, tmp_path):
+        a = tmp_path / "a.ARW"
+        b = tmp_path / "b.ARW"
+        a.write_bytes(b"head" + b"a" * 100 + b"tail")
+        b.write_bytes(b"head" + b"b" * 100 + b"tail")
+        assert edge_fingerprint(a, edge_bytes=4) == edge_fingerprint(b, edge_bytes=4)
+        assert full_fingerprint(a) != full_fingerprint(b)
+
+
+class TestDedupeService:
+    """Tests for duplicate detection."""
+
+    @pytest.fixture
+    def dedupe(self):
+        return DedupeService()
+
+    @pytest.mark.asyncio
+    async def test_maps_duplicates_to_first_copy(self, dedupe, tmp_path):
+        (tmp_path / "card1").mkdir()
+        (tmp_path / "card2").mkdir()
+        first = tmp_path / "card1" / "DSC001.ARW"
+        second = tmp_path / "card2" / "DSC001.ARW"
+        unique = tmp_path / "card1" / "DSC002.ARW"
+        first.write_bytes(b"raw data 1")
+        second.write_bytes(b"raw data 1")
+        unique.write_bytes(b"raw data 2")
+
+        duplicates = await dedupe.find_duplicates([first, unique, second])
+
+        assert duplicates == {second: first}
+
+    @pytest.mark.asyncio
+    async def test_same_size_different_content(self, dedupe, tmp_path):
+        a = tmp_path / "a.ARW"
+        b = tmp_path / "b.ARW"
+        a.write_bytes(b"aaaa")
+        b.write_bytes(b"bbbb")
+
+        assert await dedupe.find_duplicates([a, b]) == {}
+
+    @pytest.mark.asyncio
+    async def test_missing_files_ignored(self, dedupe, tmp_path):
+        a = tmp_path / "a.ARW"
+        a.write_bytes(b"data")
+        assert await dedupe.find_duplicates([a, tmp_path / "gone.ARW"]) == {}
+
+
+class TestPlaceCopy:
+    """Tests for atomic output placement."""
+
+    def test_hardlink_preferred(self, tmp_path):
+        src = tmp_path / "out.jpg"
+        src.write_bytes(b"jpeg")
+        dst = tmp_path / "nested" / "copy.jpg"
+
+        mode = place_copy(src, dst)
+
+        assert mode == "hardlink"
+        assert dst.read_bytes() == b"jpeg"
+        assert dst.stat().st_ino == src.stat().st_ino
+
+    def test_copy_mode(self, tmp_path):
+        src = tmp_path / "out.jpg"
+        src.write_bytes(b"jpeg")
+        dst = tmp_path / "copy.jpg"
+
+        assert place_copy(src, dst, modes=("copy",)) == "copy"
+        assert dst.read_bytes() == b"jpeg"
+        assert dst.stat().st_ino != src.stat().st_ino
+
+    def test_no_temp_files_left(self, tmp_path):
+        src = tmp_path / "out.jpg"
+        src.write_bytes(b"jpeg")
+        place_copy(src, tmp_path / "sub" / "copy.jpg")
+        assert not list((tmp_path / "sub").glob(".tmp_*"))
@@ -0,0 +1,151 @@
+"""
+Unit tests for output encoders and array tone adjustments.
+
+Tests format lookup, 16-bit TIFF writing, and PIL-equivalent tone math.
+"""
+
+import pytest
+import tracemalloc
+from pathlib import Path
+from io import BytesIO
+
+import numpy as np
+from PIL import Image, ImageEnhance
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.services.encoders import (
+    get_encoder,
+    normalize_format,
+    output_extension,
+    write_tiff16,
+)
+from app.services.tone import apply_tone
+
+
+class TestFormatLookup:
+    """Tests for output format normalization."""
+
+    def test_default_is_jpeg(self):
+        assert normalize_format(None) == "jpeg"
+        assert output_extension(None) == ".jpg"
+
+    def test_aliases(self):
+        assert normalize_format("JPG") == "jpeg"
+        assert normalize_format(".tif") == "tiff16"
+        assert normalize_format("tiff") == "tiff16"
+
+    def test_extensions(self):
+        assert output_extension("webp") == ".webp"
+        assert output_extension("avif") == ".avif"
+        assert output_extension("tiff16") == ".tif"
+
+    def test_unknown_format_raises(self):
+        with pytest.raises(ValueError):
+            normalize_format("bmp")
+
+    def test_tiff16_wants_16_bits(self):
+        encoder = get_encoder("tiff16")
+        assert encoder.bits == 16
+        assert encoder.supports_quality is False
+
+
+class TestEncoders:
+    """Tests for encoding through the registry."""
+
+    @pytest.fixture
+    def image(self):
+        rng = np.random.default_rng(1)
+        return Image.fromarray(rng.integers(0, 255, (32, 48, 3), dtype=np.uint8))
+
+    @pytest.mark.parametrize("name,fmt", [("jpeg", "JPEG"), ("webp", "WEBP")])
+    def test_roundtrip(self, image, name, fmt):
+        buffer = BytesIO()
+        get_encoder(name).encode(image, buffer, 90)
+        buffer.seek(0)
+        decoded = Image.open(buffer)
+        assert decoded.format == fmt
+        assert decoded.size == image.size
+
+    def test_tiff16_readable(self):
+        rgb = (np.arange(4 * 6 * 3, dtype=np.uint16) * 1000).reshape(4, 6, 3)
+        buffer = BytesIO()
+        write_tiff16(buffer, rgb)
+        buffer.seek(0)
+        decoded = Image.open(buffer)
+        assert decoded.format == "TIFF"
+        assert decoded.size == (6, 4)
+
+    def test_tiff16_rejects_gray(self):
+        with pytest.raises(ValueError):
+            write_tiff16(BytesIO(), np.zeros((4, 4), dtype=np.uint16))
+
+
+class TestApplyTone:
+    """Tests for array tone adjustments."""
+
+    @pytest.fixture
+    def rgb(self):
+        rng = np.random.default_rng(3)
+        return rng.integers(0, 255, (40, 60, 3), dtype=np.uint8)
+
+    def test_identity_returns_input(self, rgb):
+        assert apply_tone(rgb) is rgb
+
+    def test_preserves_dtype(self):
+        rgb = np.full((4, 4, 3), 30000, dtype=np.uint16)
+        out = apply_tone(rgb, contrast=1.1, color=1.1, brightness=1.1)
+        assert out.dtype == np.uint16
+
+    @pytest.mark.parametrize(
+        "kwargs,enhancer",
+        [
+            ({"contrast": 1.12}, ImageEnhance.Contrast),
+            ({"color": 1.12}, ImageEnhance.Color),
+            ({"brightness": 0.9}, ImageEnhance.Brightness),
+        ],
+    )
+    def test_matches_pil(self, rgb, kwargs, enhancer):
+        factor = next(iter(kwargs.values()))
+        expected = np.asarray(enhancer(Image.fromarray(rgb)).enhance(factor))
+        out = apply_tone(rgb, **kwargs)
+        assert np.abs(out.astype(int) - expected.astype(int)).max() <= 2
+
+    def test_full_chain_close_to_pil(self, rgb):
+        # Each PIL step rounds to 8 bits; the array chain rounds once, so
+        # combined adjustments drift a little further than single ones
+        image = ImageEnhance.Contrast(Image.fromarray(rgb)).enhance(1.15)
+        image = ImageEnhance.Color(image).enhance(1.1)
+        expected = np.asarray(ImageEnhance.Brightness(image).enhance(0.9))
+        out = apply_tone(rgb, contrast=1.15, color=1.1, brightness=0.9)
+        assert np.abs(out.astype(int) - expected.astype(int)).max() <= 3
+
+    def test_copy_leaves_input_untouched(self, rgb):
+        original = rgb.copy()
+        out = apply_tone(rgb, contrast=1.1)
+        assert out is not rgb
+        np.testing.assert_array_equal(rgb, original)
+
+    def test_in_place_matches_copy(self, rgb):
+        expected = apply_tone(rgb, contrast=1.1, color=1.2, brightness=0.95)
+        work = rgb.copy()
+        out = apply_tone(work, contrast=1.1, color=1.2, brightness=0.95, in_place=True)
+        assert out is work
+        np.testing.assert_array_equal(work, expected)
+
+    def test_band_size_does_not_change_result(self, rgb):
+        kwargs = {"contrast": 1.15, "color": 0.9, "brightness": 1.05}
+        whole = apply_tone(rgb, chunk_pixels=rgb.shape[0] * rgb.shape[1], **kwargs)
+        # Bands of 7 rows, the last one partial
+        banded = apply_tone(rgb, chunk_pixels=7 * rgb.shape[1], **kwargs)
+        np.testing.assert_array_equal(banded, whole)
+
+    def test_in_place_needs_no_full_size_scratch(self):
+        rgb = np.random.default_rng(5).integers(0, 65535, (1200, 1600, 3), dtype=np.uint16)
+        tracemalloc.start()
+        apply_tone(rgb, contrast=1.1, color=1.1, brightness=1.1, in_place=True)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        # A float32 copy of the frame alone would be twice the array's size
+        assert peak < rgb.nbytes / 2
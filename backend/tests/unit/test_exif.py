@@ -0,0 +1,84 @@
+"""
+Unit tests for EXIF copies.
+
+Tests result handling and the per-file "exif" stage timing against a
+stand-in exiftool script.
+"""
+
+import asyncio
+import stat
+from pathlib import Path
+
+import pytest
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.services.exif import ExifService
+from app.utils.timing import StageTimer
+
+FAKE_EXIFTOOL = """\
+#!{python}
+# Stand-in for exiftool -TagsFromFile: idles, then reports one updated file
+import sys, time
+time.sleep({sleep})
+print("    1 image files updated")
+sys.exit({code})
+"""
+
+# Another child that burns CPU and exits while a copy is running
+BURN = "import time\nend = time.process_time() + 0.5\nwhile time.process_time() < end: pass"
+
+
+def fake_exif(tmp_path: Path, sleep: float = 0.0, code: int = 0) -> ExifService:
+    script = tmp_path / "exiftool"
+    script.write_text(FAKE_EXIFTOOL.format(python=sys.executable, sleep=sleep, code=code))
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    service = ExifService()
+    service._resolved = True
+    service._path = str(script)
+    return service
+
+
+class TestCopyExif:
+    """Tests for ExifService.copy_exif."""
+
+    async def test_success_records_stage(self, tmp_path):
+        timer = StageTimer()
+        copied, error = await fake_exif(tmp_path).copy_exif(
+            tmp_path / "a.ARW", tmp_path / "a.jpg", timer=timer
+        )
+
+        assert (copied, error) == (True, None)
+        assert timer.stages["exif"]["cpu_s"] > 0
+
+    async def test_error_code_fails(self, tmp_path):
+        copied, error = await fake_exif(tmp_path, code=2).copy_exif(
+            tmp_path / "a.ARW", tmp_path / "a.jpg"
+        )
+        assert copied is False
+        assert "image files updated" in error
+
+    async def test_without_exiftool_has_no_cpu_time(self, tmp_path):
+        exif = ExifService()
+        exif._resolved = True
+        timer = StageTimer()
+        copied, _ = await exif.copy_exif(tmp_path / "a.ARW", tmp_path / "a.jpg", timer=timer)
+
+        assert copied is False
+        assert timer.stages["exif"]["cpu_s"] is None
+
+    async def test_cpu_excludes_other_children(self, tmp_path):
+        exif = fake_exif(tmp_path, sleep=1.0)
+        timer = StageTimer()
+
+        async def burn():
+            process = await asyncio.create_subprocess_exec(sys.executable, "-c", BURN)
+            await process.wait()
+
+        await asyncio.gather(
+            exif.copy_exif(tmp_path / "a.ARW", tmp_path / "a.jpg", timer=timer), burn()
+        )
+
+        # The copy itself only starts an interpreter and sleeps
+        assert timer.stages["exif"]["cpu_s"] < 0.4
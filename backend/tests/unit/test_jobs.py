@@ -0,0 +1,88 @@
+"""
+Unit tests for job control.
+
+Tests pause/resume/cancel checkpoints and the job registry.
+"""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.services.jobs import JobCancelled, JobControl, JobRegistry
+
+
+class TestJobControl:
+    """Tests for JobControl checkpoints."""
+
+    async def test_running_job_passes_checkpoint(self):
+        control = JobControl("job")
+        await control.checkpoint()
+        assert control.state == "running"
+
+    async def test_pause_blocks_until_resume(self):
+        control = JobControl("job")
+        events = []
+
+        async def on_pause():
+            events.append("pause")
+
+        control.pause()
+        waiter = asyncio.create_task(
+            control.checkpoint(on_pause=on_pause, on_resume=lambda: events.append("resume"))
+        )
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+        assert control.state == "paused"
+
+        control.resume()
+        await asyncio.wait_for(waiter, 1)
+        assert events == ["pause", "resume"]
+        assert control.state == "running"
+
+    async def test_cancel_wakes_paused_job(self):
+        control = JobControl("job")
+        control.pause()
+        waiter = asyncio.create_task(control.checkpoint())
+        await asyncio.sleep(0.01)
+
+        control.cancel()
+        with pytest.raises(JobCancelled):
+            await asyncio.wait_for(waiter, 1)
+        assert control.should_abort() is True
+
+    def test_finished_job_ignores_controls(self):
+        control = JobControl("job")
+        control.finish("completed")
+        control.pause()
+        control.cancel()
+        assert control.state == "completed"
+        assert control.should_abort() is False
+
+
+class TestJobRegistry:
+    """Tests for JobRegistry."""
+
+    def test_rejects_duplicate_active_id(self):
+        registry = JobRegistry()
+        registry.create(job_id="batch-1")
+        with pytest.raises(ValueError):
+            registry.create(job_id="batch-1")
+
+    def test_finished_id_can_be_reused(self):
+        registry = JobRegistry()
+        registry.create(job_id="batch-1").finish("completed")
+        assert registry.create(job_id="batch-1").state == "running"
+
+    def test_prunes_oldest_finished(self):
+        registry = JobRegistry(keep_finished=2)
+        jobs = [registry.create() for _ in range(4)]
+        for job in jobs:
+            job.finish("completed")
+        registry.create()
+        ids = [job.id for job in registry.list()]
+        assert jobs[0].id not in ids
+        assert jobs[-1].id in ids
@@ -0,0 +1,64 @@
+"""
+Unit tests for bulk JSON encoding.
+
+Tests incremental object encoding and the streamed/buffered response switch.
+"""
+
+import json
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from fastapi.responses import StreamingResponse
+
+from app.utils import jsonio
+
+
+class TestIterObject:
+    """Tests for incremental encoding."""
+
+    def test_matches_stdlib_encoding(self):
+        rows = [{"path": f"/p/{i}.ARW", "size": i, "ok": i % 2 == 0} for i in range(25)]
+        encoded = b"".join(jsonio.iter_object({"total": 25, "next": None}, "files", rows, chunk_rows=7))
+        assert json.loads(encoded) == {"total": 25, "next": None, "files": rows}
+
+    def test_emits_one_chunk_per_batch(self):
+        chunks = list(jsonio.iter_object({"a": 1}, "rows", range(10), chunk_rows=4))
+        # head, three row chunks, closing bracket
+        assert len(chunks) == 5
+        assert json.loads(b"".join(chunks))["rows"] == list(range(10))
+
+    def test_empty_rows_and_head(self):
+        assert json.loads(b"".join(jsonio.iter_object({}, "rows", []))) == {"rows": []}
+        assert json.loads(b"".join(jsonio.iter_object({"n": 0}, "rows", iter([])))) == {
+            "n": 0,
+            "rows": [],
+        }
+
+    def test_unicode_paths(self):
+        rows = [{"path": "/Fotos/Zürich/東京.ARW"}]
+        encoded = b"".join(jsonio.iter_object({}, "files", rows))
+        assert json.loads(encoded.decode("utf-8"))["files"] == rows
+
+    def test_ndjson_line(self):
+        line = jsonio.ndjson_line({"type": "start", "total": 3})
+        assert line.endswith(b"\n")
+        assert json.loads(line) == {"type": "start", "total": 3}
+
+
+class TestBulkResponse:
+    """Tests for choosing between buffered and streamed responses."""
+
+    def test_small_payload_buffered(self):
+        response = jsonio.bulk_response({"n": 2}, "rows", [1, 2], 2)
+        assert not isinstance(response, StreamingResponse)
+        assert json.loads(response.body) == {"n": 2, "rows": [1, 2]}
+
+    def test_large_payload_streamed(self):
+        with patch.dict(os.environ, {"SPECTRUM_JSON_STREAM_ROWS": "1"}):
+            response = jsonio.bulk_response({"n": 2}, "rows", [1, 2], 2)
+        assert isinstance(response, StreamingResponse)
+        assert response.media_type == jsonio.JSON_MEDIA_TYPE
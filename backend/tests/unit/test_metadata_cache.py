@@ -0,0 +1,169 @@
+"""
+Unit tests for the metadata cache and batch metadata reads.
+
+Tests memory and disk hits, invalidation on size/mtime changes, pruning,
+and the single exiftool call per batch (against a stand-in exiftool script).
+"""
+
+import os
+import stat
+from pathlib import Path
+
+import pytest
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.services.exif import ExifService
+from app.services.metadata_cache import MetadataCache, file_key
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = MetadataCache(tmp_path / "cache" / "metadata.db", max_entries=100)
+    yield cache
+    cache.close()
+
+
+def photo(directory: Path, name: str, content: bytes = b"raw") -> Path:
+    path = directory / name
+    path.write_bytes(content)
+    return path
+
+
+class TestMetadataCache:
+    """Tests for MetadataCache."""
+
+    def test_miss_then_hit(self, cache, tmp_path):
+        a = photo(tmp_path, "a.ARW")
+        hits, misses, missing = cache.lookup([a, tmp_path / "gone.ARW", tmp_path])
+
+        assert hits == {}
+        assert misses == [file_key(a)]
+        # Missing files and directories are never read
+        assert missing == [str(tmp_path / "gone.ARW"), str(tmp_path)]
+
+        cache.store({file_key(a): {"Make": "SONY"}})
+        hits, misses, _ = cache.lookup([a])
+        assert hits == {str(a): {"Make": "SONY"}}
+        assert misses == []
+
+    def test_persists_across_instances(self, cache, tmp_path):
+        a = photo(tmp_path, "a.ARW")
+        cache.store({file_key(a): {"Model": "ILCE-7RM5"}})
+
+        reopened = MetadataCache(cache.path)
+        hits, misses, _ = reopened.lookup([a])
+        assert hits[str(a)] == {"Model": "ILCE-7RM5"}
+        reopened.close()
+
+    def test_changed_file_is_read_again(self, cache, tmp_path):
+        a = photo(tmp_path, "a.ARW")
+        cache.store({file_key(a): {"Make": "SONY"}})
+
+        a.write_bytes(b"replaced with a longer file")
+        os.utime(a, ns=(1, 1))
+        hits, misses, _ = cache.lookup([a])
+        assert hits == {}
+        assert misses == [file_key(a)]
+        # Not served from the on-disk copy either
+        fresh = MetadataCache(cache.path)
+        assert fresh.lookup([a])[0] == {}
+        fresh.close()
+
+    def test_errors_not_cached(self, cache, tmp_path):
+        a = photo(tmp_path, "a.ARW")
+        cache.store({file_key(a): {"error": "File format error"}})
+        assert cache.lookup([a])[0] == {}
+
+    def test_memory_is_bounded(self, tmp_path):
+        cache = MetadataCache(tmp_path / "metadata.db", max_entries=2)
+        paths = [photo(tmp_path, f"{i}.ARW") for i in range(3)]
+        cache.store({file_key(path): {"i": i} for i, path in enumerate(paths)})
+
+        assert len(cache._memory) == 2
+        # The evicted entry still comes from disk
+        assert cache.lookup([paths[0]])[0] == {str(paths[0]): {"i": 0}}
+        cache.close()
+
+    def test_prune_keeps_newest_rows(self, tmp_path):
+        cache = MetadataCache(tmp_path / "metadata.db", max_rows=2)
+        paths = [photo(tmp_path, f"{i}.ARW") for i in range(3)]
+        for i, path in enumerate(paths):
+            cache.store({file_key(path): {"i": i}})
+
+        assert cache.prune() == 1
+        rows = cache._connection().execute("SELECT path FROM metadata").fetchall()
+        assert sorted(row[0] for row in rows) == [str(paths[1]), str(paths[2])]
+        cache.close()
+
+    def test_disabled(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("SPECTRUM_METADATA_CACHE", "0")
+        cache = MetadataCache(tmp_path / "metadata.db")
+        a = photo(tmp_path, "a.ARW")
+        cache.store({file_key(a): {"Make": "SONY"}})
+
+        assert cache.lookup([a])[1] == [file_key(a)]
+        assert not cache.path.exists()
+
+
+FAKE_EXIFTOOL = """\
+#!{python}
+# Stand-in for exiftool -json ... -@ -: one JSON array for all files on stdin
+import json, os, sys
+with open({calls!r}, "a") as log:
+    log.write(" ".join(sys.argv[1:]) + "\\n")
+names = [line.strip() for line in sys.stdin if line.strip()]
+found = [n for n in names if os.path.exists(n)]
+for name in names:
+    if name not in found:
+        print("Error: File not found - " + name, file=sys.stderr)
+entries = [
+    {{"SourceFile": n, "Error": "Unknown file type"}} if n.endswith(".txt")
+    else {{"SourceFile": n, "Make": "SONY", "Model": os.path.basename(n)}}
+    for n in found
+]
+print(json.dumps(entries))
+sys.exit(1 if len(found) < len(names) else 0)
+"""
+
+
+class TestBatchRead:
+    """Tests for ExifService.get_key_metadata_batch."""
+
+    @pytest.fixture
+    def exif(self, tmp_path):
+        script = tmp_path / "exiftool"
+        script.write_text(
+            FAKE_EXIFTOOL.format(python=sys.executable, calls=str(tmp_path / "calls.log"))
+        )
+        script.chmod(script.stat().st_mode | stat.S_IEXEC)
+        service = ExifService()
+        service._resolved = True
+        service._path = str(script)
+        return service
+
+    async def test_one_process_for_many_files(self, exif, tmp_path):
+        paths = [photo(tmp_path, f"DSC{i}.ARW") for i in range(5)]
+        results = await exif.get_key_metadata_batch(paths)
+
+        assert results[str(paths[3])] == {"Make": "SONY", "Model": "DSC3.ARW"}
+        calls = (tmp_path / "calls.log").read_text().splitlines()
+        assert len(calls) == 1
+        assert calls[0].endswith("-@ -")
+
+    async def test_per_file_errors(self, exif, tmp_path):
+        good = photo(tmp_path, "good.ARW")
+        text = photo(tmp_path, "notes.txt")
+        gone = tmp_path / "gone.ARW"
+        results = await exif.get_key_metadata_batch([good, text, gone])
+
+        assert results[str(good)]["Make"] == "SONY"
+        assert results[str(text)] == {"error": "Unknown file type"}
+        assert "File not found" in results[str(gone)]["error"]
+
+    async def test_without_exiftool(self, tmp_path):
+        exif = ExifService()
+        exif._resolved = True
+        results = await exif.get_key_metadata_batch([tmp_path / "a.ARW"])
+        assert results == {str(tmp_path / "a.ARW"): {"error": "exiftool not available"}}
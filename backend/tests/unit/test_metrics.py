@@ -0,0 +1,124 @@
+"""
+Unit tests for in-process metrics.
+
+Tests counters, gauges, histograms and the text exposition format.
+"""
+
+import pytest
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.services.metrics import (
+    MetricsRegistry,
+    executor_queue_depths,
+)
+
+
+class TestCounter:
+    """Tests for Counter."""
+
+    def test_inc_by_label(self):
+        registry = MetricsRegistry()
+        files = registry.counter("files_total", "Files.", ["status"])
+        files.inc(status="converted")
+        files.inc(2, status="converted")
+        files.inc(status="failed")
+
+        assert files.value(status="converted") == 3
+        assert files.value(status="failed") == 1
+        assert files.value(status="skipped") == 0
+
+    def test_rejects_negative_and_wrong_labels(self):
+        registry = MetricsRegistry()
+        files = registry.counter("files_total", "Files.", ["status"])
+        with pytest.raises(ValueError):
+            files.inc(-1, status="converted")
+        with pytest.raises(ValueError):
+            files.inc(stage="decode")
+
+    def test_unlabelled_counter_renders_zero(self):
+        registry = MetricsRegistry()
+        registry.counter("bytes_total", "Bytes.")
+        text = registry.render()
+        assert "# TYPE bytes_total counter" in text
+        assert "bytes_total 0\n" in text
+
+    def test_duplicate_name_rejected(self):
+        registry = MetricsRegistry()
+        registry.counter("files_total", "Files.")
+        with pytest.raises(ValueError):
+            registry.gauge("files_total", "Files.")
+
+
+class TestGauge:
+    """Tests for Gauge."""
+
+    def test_inc_dec(self):
+        registry = MetricsRegistry()
+        jobs = registry.gauge("jobs", "Jobs.")
+        jobs.inc()
+        jobs.inc()
+        jobs.dec()
+        assert jobs.value() == 1
+
+    def test_callback_evaluated_at_render(self):
+        registry = MetricsRegistry()
+        depth = registry.gauge("queue_depth", "Depth.", ["pool"])
+        depth.set_callback(lambda: {("converter",): 3})
+        assert 'queue_depth{pool="converter"} 3' in registry.render()
+
+    def test_failing_callback_does_not_break_render(self):
+        registry = MetricsRegistry()
+        depth = registry.gauge("queue_depth", "Depth.", ["pool"])
+        depth.set_callback(lambda: 1 / 0)
+        assert "# TYPE queue_depth gauge" in registry.render()
+
+
+class TestHistogram:
+    """Tests for Histogram."""
+
+    def test_buckets_are_cumulative(self):
+        registry = MetricsRegistry()
+        stage = registry.histogram("stage_seconds", "Stage.", ["stage"], buckets=(0.1, 1.0))
+        stage.observe(0.05, stage="decode")
+        stage.observe(0.5, stage="decode")
+        stage.observe(5.0, stage="decode")
+
+        text = registry.render()
+        assert 'stage_seconds_bucket{stage="decode",le="0.1"} 1' in text
+        assert 'stage_seconds_bucket{stage="decode",le="1"} 2' in text
+        assert 'stage_seconds_bucket{stage="decode",le="+Inf"} 3' in text
+        assert 'stage_seconds_sum{stage="decode"} 5.55' in text
+        assert 'stage_seconds_count{stage="decode"} 3' in text
+        assert stage.count(stage="decode") == 3
+
+    def test_boundary_value_falls_in_bucket(self):
+        registry = MetricsRegistry()
+        stage = registry.histogram("stage_seconds", "Stage.", buckets=(1.0,))
+        stage.observe(1.0)
+        assert 'stage_seconds_bucket{le="1"} 1' in registry.render()
+
+
+class TestLabels:
+    """Tests for label escaping."""
+
+    def test_label_values_escaped(self):
+        registry = MetricsRegistry()
+        files = registry.counter("files_total", "Files.", ["status"])
+        files.inc(status='a"b\\c')
+        assert 'files_total{status="a\\"b\\\\c"} 1' in registry.render()
+
+
+class TestExecutorQueueDepths:
+    """Tests for executor_queue_depths."""
+
+    def test_reports_each_pool(self):
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            depths = executor_queue_depths({"converter": executor, "other": object()})
+        finally:
+            executor.shutdown()
+        assert depths == {("converter",): 0.0, ("other",): 0.0}
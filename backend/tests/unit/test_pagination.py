@@ -0,0 +1,164 @@
+"""
+Unit tests for cursor pagination and the scan cache.
+
+Tests keyset paging in both directions, filters, and cache reuse and
+invalidation.
+"""
+
+import pytest
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.services.scan_cache import ScanCache, ScanResult, in_subfolder
+from app.services.scanner import FileInfo, ScannerService, ScanTable
+from app.utils.pagination import decode_cursor, encode_cursor, paginate, sort_key, sorted_view
+
+
+def make_files(root: Path, count: int = 5):
+    return [
+        FileInfo(
+            path=str(root / ("A" if index % 2 else "B") / f"DSC{index:03d}.ARW"),
+            size=1000 - index,
+            modified_time=100.0 + index,
+            already_converted=index < 2,
+        )
+        for index in range(count)
+    ]
+
+
+def names(files):
+    return [Path(info.path).name for info in files]
+
+
+class TestPaginate:
+    """Tests for paginate."""
+
+    def setup_method(self):
+        self.items, self.keys = sorted_view(
+            list(range(7)), lambda n: sort_key("size", str(n), str(n), 0.0, n)
+        )
+
+    def test_pages_ascending(self):
+        first, cursor = paginate(self.items, self.keys, "size", False, None, 3)
+        second, cursor = paginate(self.items, self.keys, "size", False, cursor, 3)
+        third, cursor = paginate(self.items, self.keys, "size", False, cursor, 3)
+
+        assert (first, second, third) == ([0, 1, 2], [3, 4, 5], [6])
+        assert cursor is None
+
+    def test_pages_descending(self):
+        first, cursor = paginate(self.items, self.keys, "size", True, None, 4)
+        second, cursor = paginate(self.items, self.keys, "size", True, cursor, 4)
+
+        assert (first, second) == ([6, 5, 4, 3], [2, 1, 0])
+        assert cursor is None
+
+    def test_no_limit_returns_everything(self):
+        page, cursor = paginate(self.items, self.keys, "size", False, None, None)
+        assert page == list(range(7))
+        assert cursor is None
+
+    def test_cursor_survives_inserted_items(self):
+        first, cursor = paginate(self.items, self.keys, "size", False, None, 3)
+        items, keys = sorted_view(
+            [-1] + list(range(7)), lambda n: sort_key("size", str(n), str(n), 0.0, n)
+        )
+
+        second, _ = paginate(items, keys, "size", False, cursor, 3)
+
+        assert second == [3, 4, 5]
+
+    def test_cursor_bound_to_sort(self):
+        cursor = encode_cursor("size", False, (3, "3"))
+        assert decode_cursor(cursor, "size", False) == (3, "3")
+        with pytest.raises(ValueError):
+            decode_cursor(cursor, "name", False)
+        with pytest.raises(ValueError):
+            decode_cursor("not-a-cursor", "size", False)
+
+    def test_unknown_sort_field(self):
+        with pytest.raises(ValueError):
+            sort_key("colour", "a", "a", 0.0, 0)
+
+
+class TestScanResult:
+    """Tests for ScanResult.page filters."""
+
+    def test_status_and_subfolder_filters(self, tmp_path):
+        scan = ScanResult(tmp_path, tmp_path / "converted", ScanTable.from_files(make_files(tmp_path)))
+
+        pending, _, matched = scan.page(status="pending")
+        in_a, _, _ = scan.page(subfolder="A")
+
+        assert names(pending) == ["DSC002.ARW", "DSC003.ARW", "DSC004.ARW"]
+        assert matched == 3
+        assert names(in_a) == ["DSC001.ARW", "DSC003.ARW"]
+
+    def test_sort_by_mtime_descending(self, tmp_path):
+        scan = ScanResult(tmp_path, tmp_path / "converted", ScanTable.from_files(make_files(tmp_path)))
+        page, cursor, _ = scan.page(field="mtime", descending=True, limit=2)
+        assert names(page) == ["DSC004.ARW", "DSC003.ARW"]
+        assert cursor is not None
+
+    def test_unknown_status_rejected(self, tmp_path):
+        scan = ScanResult(tmp_path, tmp_path / "converted", ScanTable.from_files([]))
+        with pytest.raises(ValueError):
+            scan.page(status="maybe")
+
+    def test_in_subfolder(self):
+        assert in_subfolder("2024/A", "2024")
+        assert in_subfolder("2024", "2024/")
+        assert not in_subfolder("20245", "2024")
+
+
+class TestScanCache:
+    """Tests for ScanCache."""
+
+    async def test_reuses_scan_until_refresh(self, tmp_path):
+        scanner = ScannerService()
+        scanner.scan_table = AsyncMock(return_value=ScanTable.from_files(make_files(tmp_path)))
+        cache = ScanCache(scanner, ttl_seconds=60)
+
+        first = await cache.get(tmp_path)
+        second = await cache.get(tmp_path)
+        refreshed = await cache.get(tmp_path, refresh=True)
+
+        assert first is second
+        assert refreshed is not first
+        assert scanner.scan_table.await_count == 2
+
+    async def test_expired_entry_rescanned(self, tmp_path):
+        scanner = ScannerService()
+        scanner.scan_table = AsyncMock(return_value=ScanTable.from_files([]))
+        cache = ScanCache(scanner, ttl_seconds=0)
+
+        await cache.get(tmp_path)
+        await cache.get(tmp_path)
+
+        assert scanner.scan_table.await_count == 2
+
+    async def test_invalidate_output_folder(self, tmp_path):
+        scanner = ScannerService()
+        scanner.scan_table = AsyncMock(return_value=ScanTable.from_files([]))
+        cache = ScanCache(scanner, ttl_seconds=60)
+        other = tmp_path.parent / (tmp_path.name + "_other")
+
+        first = await cache.get(tmp_path)
+        unrelated = await cache.get(other)
+        cache.invalidate(tmp_path / "converted" / "DCIM")
+
+        assert await cache.get(tmp_path) is not first
+        assert await cache.get(other) is unrelated
+
+    async def test_evicts_oldest(self, tmp_path):
+        scanner = ScannerService()
+        scanner.scan_table = AsyncMock(return_value=ScanTable.from_files([]))
+        cache = ScanCache(scanner, ttl_seconds=60, max_entries=1)
+
+        first = await cache.get(tmp_path / "a")
+        await cache.get(tmp_path / "b")
+
+        assert await cache.get(tmp_path / "a") is not first
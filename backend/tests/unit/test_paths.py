@@ -19,6 +19,7 @@ from app.utils.paths import (
     split_windows_path,
     windows_candidate_paths,
     resolve_path,
+    existing_paths,
     get_volumes_drive_letter,
     detect_windows_drive_mounts,
     get_smart_roots,
@@ -141,6 +142,60 @@ class TestResolvePath:
         assert result.was_windows is True
         assert result.is_unc is False
 
+    def test_sibling_paths_reuse_resolved_prefix(self):
+        hit = Path("/mnt/d/Photos/a.ARW")
+
+        with patch.object(Path, "exists", autospec=True, side_effect=lambda p: p == hit):
+            assert resolve_path("D:\\Photos\\a.ARW").path == hit
+
+        with patch.object(Path, "exists", autospec=True) as exists:
+            result = resolve_path("D:\\Photos\\b.ARW")
+        assert result.path == Path("/mnt/d/Photos/b.ARW")
+        assert exists.call_count == 0
+
+    def test_unresolved_path_is_negatively_cached(self):
+        with patch.object(Path, "exists", return_value=False) as exists:
+            first = resolve_path("E:\\missing.ARW")
+            probes = exists.call_count
+            second = resolve_path("E:\\missing.ARW")
+        assert probes > 0
+        assert exists.call_count == probes
+        assert first.path == second.path == first.candidates[0]
+
+    def test_negative_cache_expires(self):
+        with patch.dict(os.environ, {"SPECTRUM_RESOLVE_NEGATIVE_TTL": "0"}):
+            with patch.object(Path, "exists", return_value=False) as exists:
+                resolve_path("E:\\missing.ARW")
+                probes = exists.call_count
+                resolve_path("E:\\missing.ARW")
+        assert exists.call_count == 2 * probes
+
+
+class TestExistingPaths:
+    """Tests for existing_paths function."""
+
+    def test_matches_exists(self, tmp_path):
+        (tmp_path / "a.ARW").touch()
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "b.ARW").touch()
+        paths = [
+            tmp_path / "a.ARW",
+            tmp_path / "missing.ARW",
+            tmp_path / "sub" / "b.ARW",
+            tmp_path / "nope" / "c.ARW",
+        ]
+        assert existing_paths(paths) == [True, False, True, False]
+
+    def test_lists_each_folder_once(self, tmp_path):
+        paths = []
+        for i in range(10):
+            (tmp_path / f"{i}.ARW").touch()
+            paths.append(tmp_path / f"{i}.ARW")
+
+        with patch("app.utils.paths.os.listdir", wraps=os.listdir) as listdir:
+            assert all(existing_paths(paths))
+        assert listdir.call_count == 1
+
 
 class TestGetVolumesDriveLetter:
     """Tests for get_volumes_drive_letter function."""
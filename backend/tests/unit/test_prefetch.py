@@ -0,0 +1,100 @@
+"""
+Unit tests for source prefetching.
+
+Tests read-ahead ordering, file and byte budgets, and discard handling.
+"""
+
+import asyncio
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.services.prefetch import Prefetcher
+
+
+@pytest.fixture
+def sources(tmp_path):
+    paths = []
+    for index in range(5):
+        path = tmp_path / f"DSC{index:03d}.ARW"
+        path.write_bytes(bytes([index]) * 100)
+        paths.append(path)
+    return paths
+
+
+class TestPrefetcher:
+    """Tests for Prefetcher."""
+
+    @pytest.mark.asyncio
+    async def test_returns_file_contents_in_order(self, sources):
+        prefetcher = Prefetcher(sources, max_files=2, max_bytes=10_000)
+        prefetcher.start()
+        for index, path in enumerate(sources):
+            assert await prefetcher.take(path) == bytes([index]) * 100
+        await prefetcher.close()
+
+    @pytest.mark.asyncio
+    async def test_reads_ahead_up_to_max_files(self, sources):
+        prefetcher = Prefetcher(sources, max_files=2, max_bytes=10_000)
+        prefetcher.start()
+        await asyncio.sleep(0.05)
+        assert len(prefetcher._tasks) == 2
+        assert all(task.done() for task in prefetcher._tasks.values())
+        await prefetcher.close()
+
+    @pytest.mark.asyncio
+    async def test_byte_budget_limits_buffered_data(self, sources):
+        prefetcher = Prefetcher(sources, max_files=4, max_bytes=250)
+        prefetcher.start()
+        await asyncio.sleep(0.05)
+        assert prefetcher._buffered_bytes <= 250
+        assert sum(task.done() for task in prefetcher._tasks.values()) == 2
+        assert not prefetcher._tasks[sources[2]].done()
+        await prefetcher.take(sources[0])
+        await asyncio.sleep(0.05)
+        assert prefetcher._tasks[sources[2]].done()
+        assert prefetcher._buffered_bytes <= 250
+        await prefetcher.close()
+
+    @pytest.mark.asyncio
+    async def test_unknown_path_returns_none(self, sources, tmp_path):
+        prefetcher = Prefetcher(sources[:1], max_files=1, max_bytes=10_000)
+        prefetcher.start()
+        assert await prefetcher.take(tmp_path / "other.ARW") is None
+        await prefetcher.close()
+
+    @pytest.mark.asyncio
+    async def test_discard_releases_budget(self, sources):
+        prefetcher = Prefetcher(sources, max_files=1, max_bytes=10_000)
+        prefetcher.start()
+        await asyncio.sleep(0.05)
+        await prefetcher.discard(sources[0])
+        assert prefetcher._buffered_bytes <= 100
+        assert await prefetcher.take(sources[1]) == bytes([1]) * 100
+        await prefetcher.close()
+
+    @pytest.mark.asyncio
+    async def test_disabled_prefetcher_returns_none(self, sources):
+        prefetcher = Prefetcher(sources, max_files=0)
+        prefetcher.start()
+        assert await prefetcher.take(sources[0]) is None
+        await prefetcher.close()
+
+    @pytest.mark.asyncio
+    async def test_suspend_frees_buffers_and_resume_refills(self, sources):
+        prefetcher = Prefetcher(sources, max_files=2, max_bytes=10_000)
+        prefetcher.start()
+        await asyncio.sleep(0.05)
+        assert prefetcher._buffered_bytes == 200
+
+        await prefetcher.suspend()
+        assert prefetcher._buffered_bytes == 0
+        assert not prefetcher._tasks
+        assert list(prefetcher._pending) == sources
+
+        prefetcher.resume()
+        for index, path in enumerate(sources):
+            assert await prefetcher.take(path) == bytes([index]) * 100
+        await prefetcher.close()
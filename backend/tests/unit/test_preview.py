@@ -0,0 +1,65 @@
+"""
+Unit tests for the shared preview cache.
+
+Tests hits, invalidation on source changes, and size-based eviction.
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.services.preview import PreviewCache, render_preview
+
+
+@pytest.fixture
+def image(tmp_path):
+    from PIL import Image
+
+    path = tmp_path / "photo.png"
+    Image.new("RGB", (64, 48), (200, 100, 50)).save(path)
+    return path
+
+
+class TestPreviewCache:
+    """Tests for PreviewCache."""
+
+    def test_hit_after_put(self, image, tmp_path):
+        cache = PreviewCache(tmp_path / "previews")
+        assert cache.get(image, 32, 80) is None
+
+        data = render_preview(image, 32, 80)
+        cache.put(image, 32, 80, data)
+
+        assert cache.get(image, 32, 80) == data
+        # Another process sees the same file
+        assert PreviewCache(tmp_path / "previews").get(image, 32, 80) == data
+        assert cache.get(image, 64, 80) is None
+
+    def test_changed_source_misses(self, image, tmp_path):
+        cache = PreviewCache(tmp_path / "previews")
+        cache.put(image, 32, 80, b"old preview")
+        stat = image.stat()
+        os.utime(image, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert cache.get(image, 32, 80) is None
+
+    def test_evicts_least_recently_used(self, image, tmp_path):
+        cache = PreviewCache(tmp_path / "previews", max_bytes=250)
+        for dim in (10, 20, 30):
+            cache.put(image, dim, 80, b"x" * 100)
+        old = cache._entry(image, 10, 80)
+        os.utime(old, (1, 1))
+
+        assert cache.evict() == 1
+        assert cache.get(image, 10, 80) is None
+        assert cache.get(image, 30, 80) is not None
+
+    def test_disabled_by_env(self, image, tmp_path, monkeypatch):
+        monkeypatch.setenv("SPECTRUM_PREVIEW_CACHE", "0")
+        cache = PreviewCache(tmp_path / "previews")
+        cache.put(image, 32, 80, b"preview")
+        assert cache.get(image, 32, 80) is None
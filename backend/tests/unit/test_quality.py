@@ -0,0 +1,98 @@
+"""
+Unit tests for adaptive quality search.
+
+Tests proxy generation, SSIM scoring, and size/SSIM targeted searches.
+"""
+
+import pytest
+from pathlib import Path
+from io import BytesIO
+
+import numpy as np
+from PIL import Image
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.services.quality import make_proxy, ssim, search_quality
+
+
+def _textured_image(width=800, height=600):
+    rng = np.random.default_rng(42)
+    gradient = np.linspace(0, 200, width, dtype=np.float64)[None, :, None]
+    noise = rng.normal(0, 20, (height, width, 3))
+    pixels = np.clip(gradient + noise + 20, 0, 255).astype(np.uint8)
+    return Image.fromarray(pixels)
+
+
+def _encode(image, quality):
+    buffer = BytesIO()
+    image.save(buffer, format="JPEG", quality=quality, subsampling=0)
+    return buffer.getvalue()
+
+
+class TestMakeProxy:
+    """Tests for proxy downsampling."""
+
+    def test_small_image_unchanged(self):
+        image = _textured_image(100, 100)
+        proxy, ratio = make_proxy(image, 1_000_000)
+        assert proxy is image
+        assert ratio == 1.0
+
+    def test_large_image_within_budget(self):
+        image = _textured_image(800, 600)
+        proxy, ratio = make_proxy(image, 50_000)
+        assert proxy.size[0] * proxy.size[1] <= 50_000
+        assert ratio == pytest.approx(480_000 / (proxy.size[0] * proxy.size[1]))
+
+
+class TestSSIM:
+    """Tests for the SSIM metric."""
+
+    def test_identical_images(self):
+        image = _textured_image(200, 150)
+        assert ssim(image, image) == pytest.approx(1.0)
+
+    def test_lower_quality_scores_lower(self):
+        image = _textured_image(200, 150)
+        high = Image.open(BytesIO(_encode(image, 95)))
+        low = Image.open(BytesIO(_encode(image, 20)))
+        assert ssim(image, high) > ssim(image, low)
+
+
+class TestSearchQuality:
+    """Tests for targeted quality search."""
+
+    def test_no_target_returns_max(self):
+        choice = search_quality(_textured_image(), _encode, max_quality=90)
+        assert choice.quality == 90
+        assert choice.trials == 0
+
+    def test_size_target_fits_budget(self):
+        image = _textured_image()
+        budget = len(_encode(image, 80))
+        choice = search_quality(image, _encode, target_bytes=budget, min_quality=30)
+        assert 30 <= choice.quality < 100
+        assert len(_encode(image, choice.quality)) <= budget * 1.05
+
+    def test_size_target_unreachable_returns_min(self):
+        choice = search_quality(
+            _textured_image(), _encode, target_bytes=100, min_quality=40
+        )
+        assert choice.quality == 40
+
+    def test_ssim_target_picks_lowest_passing_quality(self):
+        image = _textured_image()
+        choice = search_quality(image, _encode, target_ssim=0.9, min_quality=10)
+        assert choice.ssim >= 0.9
+        if choice.quality > 10:
+            below = Image.open(BytesIO(_encode(image, choice.quality - 1)))
+            assert ssim(image, below) < 0.9
+
+    def test_trials_are_bounded(self):
+        choice = search_quality(
+            _textured_image(), _encode, target_bytes=50_000, min_quality=1
+        )
+        # Binary search over 100 values needs at most ~8 distinct encodes
+        assert choice.trials <= 8
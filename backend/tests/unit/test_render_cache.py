@@ -0,0 +1,171 @@
+"""
+Unit tests for the render cache manifest.
+
+Tests hits, stale detection, and persistence across instances.
+"""
+
+import os
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.services.render_cache import RenderCache
+
+PARAMS = {"preset": "standard", "quality": 95, "format": "jpeg"}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return RenderCache(manifest_path=tmp_path / "cache" / "manifest.json")
+
+
+@pytest.fixture
+def rendered(tmp_path):
+    src = tmp_path / "DSC001.ARW"
+    src.write_bytes(b"raw bytes")
+    out = tmp_path / "out" / "DSC001.jpg"
+    out.parent.mkdir()
+    out.write_bytes(b"jpeg bytes")
+    return src, out
+
+
+class TestRenderCache:
+    """Tests for RenderCache lookups."""
+
+    @pytest.mark.asyncio
+    async def test_miss_when_empty(self, cache, rendered):
+        src, _ = rendered
+        assert await cache.lookup(src, PARAMS) is None
+
+    @pytest.mark.asyncio
+    async def test_hit_after_store(self, cache, rendered):
+        src, out = rendered
+        await cache.store(src, PARAMS, out, quality=95, metadata_copied=True)
+
+        entry = await cache.lookup(src, PARAMS)
+
+        assert entry["output"] == str(out)
+        assert entry["quality"] == 95
+        assert entry["metadata_copied"] is True
+
+    @pytest.mark.asyncio
+    async def test_identical_source_elsewhere_hits(self, cache, rendered, tmp_path):
+        src, out = rendered
+        await cache.store(src, PARAMS, out)
+        copy = tmp_path / "other" / "DSC001.ARW"
+        copy.parent.mkdir()
+        copy.write_bytes(src.read_bytes())
+
+        assert await cache.lookup(copy, PARAMS) is not None
+
+    @pytest.mark.asyncio
+    async def test_same_edges_different_middle_misses(self, cache, tmp_path):
+        from app.services.dedupe import EDGE_BYTES
+
+        edge = b"e" * EDGE_BYTES
+        src = tmp_path / "A.ARW"
+        src.write_bytes(edge + b"middle one" + edge)
+        out = tmp_path / "A.jpg"
+        out.write_bytes(b"jpeg bytes")
+        await cache.store(src, PARAMS, out)
+        # Same size, first and last MB; only the middle differs
+        other = tmp_path / "B.ARW"
+        other.write_bytes(edge + b"middle two" + edge)
+
+        assert await cache.lookup(other, PARAMS) is None
+
+    @pytest.mark.asyncio
+    async def test_miss_does_not_read_source_in_full(self, cache, rendered):
+        from app.services import render_cache
+        from app.services.dedupe import data_fingerprint
+
+        src, out = rendered
+        with patch.object(
+            render_cache, "full_fingerprint", side_effect=render_cache.full_fingerprint
+        ) as full:
+            assert await cache.lookup(src, PARAMS) is None
+            # The converter's prefetched buffer supplies the full hash
+            content = await cache.content_hash(src.read_bytes())
+            await cache.store(src, PARAMS, out, content=content)
+            assert await cache.lookup(src, PARAMS) is not None
+
+        assert full.call_count == 0
+        assert content == data_fingerprint(b"raw bytes")
+
+    @pytest.mark.asyncio
+    async def test_candidate_hit_checks_full_hash(self, cache, tmp_path):
+        from app.services.dedupe import EDGE_BYTES
+
+        edge = b"e" * EDGE_BYTES
+        data = edge + b"middle one" + edge
+        src = tmp_path / "A.ARW"
+        src.write_bytes(data)
+        out = tmp_path / "A.jpg"
+        out.write_bytes(b"jpeg bytes")
+        await cache.store(src, PARAMS, out, content=await cache.content_hash(data))
+        other = tmp_path / "B.ARW"
+        other.write_bytes(edge + b"middle two" + edge)
+
+        assert await cache.lookup(other, PARAMS) is None
+        assert await cache.lookup(src, PARAMS) is not None
+
+    @pytest.mark.asyncio
+    async def test_different_params_miss(self, cache, rendered):
+        src, out = rendered
+        await cache.store(src, PARAMS, out)
+        assert await cache.lookup(src, {**PARAMS, "preset": "vivid"}) is None
+
+    @pytest.mark.asyncio
+    async def test_changed_source_is_stale(self, cache, rendered):
+        src, out = rendered
+        await cache.store(src, PARAMS, out)
+        src.write_bytes(b"edited raw bytes")
+        assert await cache.lookup(src, PARAMS) is None
+
+    @pytest.mark.asyncio
+    async def test_modified_output_is_stale(self, cache, rendered):
+        src, out = rendered
+        await cache.store(src, PARAMS, out)
+        out.write_bytes(b"someone overwrote this")
+        assert await cache.lookup(src, PARAMS) is None
+
+    @pytest.mark.asyncio
+    async def test_persists_across_instances(self, cache, rendered):
+        src, out = rendered
+        await cache.store(src, PARAMS, out)
+        await cache.flush()
+
+        reloaded = RenderCache(manifest_path=cache.manifest_path)
+        assert await reloaded.lookup(src, PARAMS) is not None
+
+    @pytest.mark.asyncio
+    async def test_flush_merges_entries_from_other_processes(self, cache, rendered, tmp_path):
+        src, out = rendered
+        other_src = tmp_path / "DSC002.ARW"
+        other_src.write_bytes(b"other raw bytes")
+        other_out = tmp_path / "out" / "DSC002.jpg"
+        other_out.write_bytes(b"other jpeg")
+        # Both loaded the (empty) manifest before either flushed
+        other = RenderCache(manifest_path=cache.manifest_path)
+        assert await other.lookup(other_src, PARAMS) is None
+        assert await cache.lookup(src, PARAMS) is None
+
+        await cache.store(src, PARAMS, out)
+        await cache.flush()
+        await other.store(other_src, PARAMS, other_out)
+        await other.flush()
+
+        reloaded = RenderCache(manifest_path=cache.manifest_path)
+        assert await reloaded.lookup(src, PARAMS) is not None
+        assert await reloaded.lookup(other_src, PARAMS) is not None
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_env(self, tmp_path, rendered, monkeypatch):
+        monkeypatch.setenv("SPECTRUM_RENDER_CACHE", "0")
+        cache = RenderCache(manifest_path=tmp_path / "m.json")
+        src, out = rendered
+        await cache.store(src, PARAMS, out)
+        assert await cache.lookup(src, PARAMS) is None
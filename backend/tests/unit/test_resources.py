@@ -0,0 +1,142 @@
+"""
+Unit tests for resource detection and worker pool sizing.
+
+Tests cgroup v1/v2 limit parsing against fake cgroup trees, how pools are
+sized from CPU and memory, and the startup warm-up.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.services.converter import ConverterService
+from app.services.warmup import warm_up
+from app.utils import resources
+from app.utils.resources import cgroup_cpu_quota, cgroup_memory_limit, plan_workers
+
+GB = 1024 ** 3
+
+
+def write(root: Path, relative: str, text: str) -> None:
+    path = root / relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text + "\n")
+
+
+class TestCgroupLimits:
+    """Tests for reading cgroup CPU and memory limits."""
+
+    def test_v2_limits(self, tmp_path):
+        write(tmp_path, "cpu.max", "150000 100000")
+        write(tmp_path, "memory.max", str(2 * GB))
+
+        assert cgroup_cpu_quota(tmp_path) == 1.5
+        assert cgroup_memory_limit(tmp_path) == 2 * GB
+
+    def test_v2_unlimited(self, tmp_path):
+        write(tmp_path, "cpu.max", "max 100000")
+        write(tmp_path, "memory.max", "max")
+
+        assert cgroup_cpu_quota(tmp_path) is None
+        assert cgroup_memory_limit(tmp_path) is None
+
+    def test_v1_limits(self, tmp_path):
+        write(tmp_path, "cpu/cpu.cfs_quota_us", "200000")
+        write(tmp_path, "cpu/cpu.cfs_period_us", "100000")
+        write(tmp_path, "memory/memory.limit_in_bytes", str(GB))
+
+        assert cgroup_cpu_quota(tmp_path) == 2.0
+        assert cgroup_memory_limit(tmp_path) == GB
+
+    def test_v1_unlimited(self, tmp_path):
+        write(tmp_path, "cpu/cpu.cfs_quota_us", "-1")
+        write(tmp_path, "cpu/cpu.cfs_period_us", "100000")
+        write(tmp_path, "memory/memory.limit_in_bytes", "9223372036854771712")
+
+        assert cgroup_cpu_quota(tmp_path) is None
+        assert cgroup_memory_limit(tmp_path) is None
+
+    def test_no_cgroup(self, tmp_path):
+        assert cgroup_cpu_quota(tmp_path) is None
+        assert cgroup_memory_limit(tmp_path) is None
+
+    def test_cgroup_tighter_than_host(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(resources, "host_cpus", lambda: 16)
+        monkeypatch.setattr(resources, "host_memory", lambda: 64 * GB)
+        write(tmp_path, "cpu.max", "200000 100000")
+        write(tmp_path, "memory.max", str(4 * GB))
+
+        assert resources.available_resources(tmp_path) == (2.0, 4 * GB, "cgroup")
+
+    def test_host_when_no_limit(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(resources, "host_cpus", lambda: 8)
+        monkeypatch.setattr(resources, "host_memory", lambda: 16 * GB)
+
+        assert resources.available_resources(tmp_path) == (8, 16 * GB, "host")
+
+
+class TestPlanWorkers:
+    """Tests for sizing pools from CPU and memory."""
+
+    def test_decode_threads_follow_cpus(self):
+        plan = plan_workers(8, 32 * GB)
+        assert plan.scheduler == 8
+        assert plan.scanner == 16
+        assert plan.prefetch == 8
+
+    def test_fractional_quota_rounds_up_with_floor_of_two(self):
+        assert plan_workers(0.5, None).scheduler == 2
+        assert plan_workers(2.5, None).scheduler == 3
+
+    def test_memory_caps_decode_threads(self):
+        plan = plan_workers(16, 2 * GB, decode_mb=400)
+        assert plan.scheduler == 5
+        assert plan.memory_mb == 2048
+        # A tiny container still gets one decode thread
+        assert plan_workers(4, 256 * 1024 * 1024).scheduler == 1
+
+    def test_split_across_api_workers(self):
+        plan = plan_workers(8, 8 * GB, api_workers=4, decode_mb=400)
+        assert plan.scheduler == 2
+        assert plan.scanner == 4
+        assert plan.api_workers == 4
+
+    def test_environment_overrides(self, monkeypatch):
+        monkeypatch.setenv("SPECTRUM_SCANNER_WORKERS", "3")
+        monkeypatch.setenv("SPECTRUM_SCHEDULER_WORKERS", "5")
+        resources.worker_plan.cache_clear()
+        try:
+            plan = resources.worker_plan()
+            assert plan.scanner == 3
+            assert plan.scheduler == 5
+        finally:
+            resources.worker_plan.cache_clear()
+
+
+class TestWarmUp:
+    """Tests for the startup warm-up."""
+
+    async def test_warms_every_thread(self):
+        pytest.importorskip("rawpy")
+        executor = ThreadPoolExecutor(max_workers=3)
+        report = await warm_up(ConverterService(executor), executor, 3)
+
+        assert report["threads"] == 3
+        assert report["succeeded"] == 3
+        assert report["errors"] == []
+        executor.shutdown()
+
+    async def test_reports_failures(self):
+        executor = ThreadPoolExecutor(max_workers=2)
+        converter = ConverterService(executor)
+        converter.default_format = "no-such-format"
+        report = await warm_up(converter, executor, 2)
+
+        assert report["succeeded"] == 0
+        assert len(report["errors"]) == 1
+        executor.shutdown()
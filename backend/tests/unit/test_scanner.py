@@ -13,7 +13,7 @@ import os
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from app.services.scanner import ScannerService, FileInfo
+from app.services.scanner import ScannerService, FileInfo, ScanTable
 
 
 class TestScannerService:
@@ -101,6 +101,47 @@ class TestScannerSummary:
         assert summary["pending_conversion"] == 0
 
 
+class TestScanTable:
+    """Tests for the columnar scan result."""
+
+    FILES = [
+        FileInfo("/test/a.ARW", 1024 * 1024, 1.0, False),
+        FileInfo("/test/b.ARW", 2 * 1024 * 1024, 2.0, True),
+        FileInfo("/test/day2/c.ARW", 512 * 1024, 3.0, False),
+    ]
+
+    def test_rows_round_trip(self):
+        table = ScanTable.from_files(self.FILES)
+        assert list(table) == self.FILES
+        assert table[-1] == self.FILES[-1]
+        assert table[1:] == self.FILES[1:]
+        with pytest.raises(IndexError):
+            table[3]
+
+    def test_paths_share_folder_prefixes(self):
+        table = ScanTable.from_files(self.FILES)
+        assert table.folders == ["/test", "/test/day2"]
+        assert table.folder_index.tolist() == [0, 0, 1]
+
+    def test_summary_matches_row_summary(self):
+        scanner = ScannerService()
+        table = ScanTable.from_files(self.FILES)
+        assert scanner.get_summary(table) == scanner.get_summary(self.FILES)
+
+    @pytest.mark.asyncio
+    async def test_scan_table_matches_scan_directory(self, tmp_path):
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "a.ARW").write_bytes(b"xx")
+        (tmp_path / "sub" / "b.ARW").write_bytes(b"x")
+        scanner = ScannerService()
+
+        table = await scanner.scan_table(str(tmp_path))
+        files = await scanner.scan_directory(str(tmp_path))
+
+        assert sorted(table, key=lambda f: f.path) == sorted(files, key=lambda f: f.path)
+        assert table.summary()["total_files"] == 2
+
+
 class TestScanDirectoryAsync:
     """Tests for async scan_directory method."""
 
@@ -176,3 +217,53 @@ class TestScanDirectoryAsync:
 
         assert len(files) == 1
         assert files[0].already_converted is True
+
+    @pytest.mark.asyncio
+    async def test_detects_converted_for_output_format(self, scanner, tmp_path):
+        (tmp_path / "photo.ARW").touch()
+        converted = tmp_path / "converted"
+        converted.mkdir()
+        (converted / "photo.jpg").touch()
+
+        files = await scanner.scan_directory(str(tmp_path), output_format="webp")
+        assert files[0].already_converted is False
+
+        (converted / "photo.webp").touch()
+        files = await scanner.scan_directory(str(tmp_path), output_format="webp")
+        assert files[0].already_converted is True
+
+    @pytest.mark.asyncio
+    async def test_mixed_case_extensions_found_once(self, scanner, tmp_path):
+        (tmp_path / "a.ARW").touch()
+        (tmp_path / "b.arw").touch()
+        (tmp_path / "c.Arw").touch()
+        (tmp_path / "._a.ARW").touch()
+
+        files = await scanner.scan_directory(str(tmp_path))
+
+        assert sorted(Path(f.path).name for f in files) == ["a.ARW", "b.arw", "c.Arw"]
+
+    @pytest.mark.asyncio
+    async def test_nested_outputs_use_explicit_output_dir(self, scanner, tmp_path):
+        source = tmp_path / "src"
+        (source / "day1").mkdir(parents=True)
+        (source / "day1" / "done.ARW").touch()
+        (source / "day1" / "todo.ARW").touch()
+        output = tmp_path / "out"
+        (output / "day1").mkdir(parents=True)
+        (output / "day1" / "done.jpg").touch()
+
+        files = await scanner.scan_directory(str(source), output_dir=str(output))
+
+        status = {Path(f.path).name: f.already_converted for f in files}
+        assert status == {"done.ARW": True, "todo.ARW": False}
+
+    @pytest.mark.asyncio
+    async def test_checks_outputs_once_per_folder(self, scanner, tmp_path):
+        for i in range(20):
+            (tmp_path / f"photo{i}.ARW").touch()
+
+        with patch("app.services.scanner.os.listdir", wraps=os.listdir) as listdir:
+            await scanner.scan_directory(str(tmp_path))
+
+        assert listdir.call_count == 1
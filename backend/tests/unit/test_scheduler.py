@@ -0,0 +1,104 @@
+"""
+Unit tests for the priority scheduler.
+
+Tests reserved interactive capacity, priority ordering and cancellation.
+"""
+
+import asyncio
+import threading
+from pathlib import Path
+
+import pytest
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.services.scheduler import Priority, PriorityScheduler
+
+
+class TestPriorityScheduler:
+    """Tests for PriorityScheduler."""
+
+    async def test_bulk_cannot_take_reserved_slots(self):
+        scheduler = PriorityScheduler(workers=3, reserved=1)
+        release = asyncio.Event()
+        started = []
+
+        async def bulk(n):
+            async with scheduler.slot(Priority.BULK):
+                started.append(n)
+                await release.wait()
+
+        tasks = [asyncio.create_task(bulk(n)) for n in range(3)]
+        await asyncio.sleep(0.01)
+        assert len(started) == 2
+        assert scheduler.stats()["bulk"] == {"running": 2, "waiting": 1}
+
+        # Interactive work gets the reserved slot without waiting
+        async with scheduler.slot(Priority.INTERACTIVE):
+            assert scheduler.stats()["interactive"]["running"] == 1
+
+        release.set()
+        await asyncio.gather(*tasks)
+        assert sorted(started) == [0, 1, 2]
+
+    async def test_waiters_admitted_by_priority(self):
+        scheduler = PriorityScheduler(workers=1, reserved=0)
+        order = []
+        holder = asyncio.Event()
+
+        async def hold():
+            async with scheduler.slot(Priority.BULK):
+                await holder.wait()
+
+        async def work(priority, name):
+            async with scheduler.slot(priority):
+                order.append(name)
+
+        first = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        tasks = [
+            asyncio.create_task(work(Priority.BULK, "bulk")),
+            asyncio.create_task(work(Priority.METADATA, "metadata")),
+            asyncio.create_task(work(Priority.INTERACTIVE, "preview")),
+        ]
+        await asyncio.sleep(0.01)
+        holder.set()
+        await asyncio.gather(first, *tasks)
+
+        assert order == ["preview", "metadata", "bulk"]
+
+    async def test_cancelled_waiter_does_not_leak_slot(self):
+        scheduler = PriorityScheduler(workers=1, reserved=0)
+        holder = asyncio.Event()
+
+        async def hold():
+            async with scheduler.slot(Priority.BULK):
+                await holder.wait()
+
+        first = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(scheduler._acquire(Priority.INTERACTIVE))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        holder.set()
+        await first
+
+        assert scheduler.stats()["interactive"] == {"running": 0, "waiting": 0}
+        async with scheduler.slot(Priority.BULK):
+            assert scheduler.stats()["bulk"]["running"] == 1
+
+    async def test_run_uses_shared_pool(self):
+        scheduler = PriorityScheduler(workers=2, reserved=1)
+        main_thread = threading.get_ident()
+
+        thread = await scheduler.run(Priority.INTERACTIVE, threading.get_ident)
+
+        assert thread != main_thread
+        assert scheduler.stats()["interactive"]["running"] == 0
+
+    def test_reserved_never_starves_bulk(self):
+        scheduler = PriorityScheduler(workers=1, reserved=4)
+        assert scheduler.bulk_limit == 1
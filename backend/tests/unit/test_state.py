@@ -0,0 +1,81 @@
+"""
+Unit tests for job state shared between API processes.
+
+Tests visibility, remote commands, duplicate ids and expiry of jobs whose
+process died, using two registries on one store file.
+"""
+
+from pathlib import Path
+
+import pytest
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.services.jobs import JobRegistry
+from app.services.state import JobStateStore
+
+
+@pytest.fixture
+def registries(tmp_path):
+    """Two registries standing in for two uvicorn worker processes."""
+    path = tmp_path / "state.db"
+    first_store, second_store = JobStateStore(path), JobStateStore(path)
+    first_store.owner, second_store.owner = "host:1", "host:2"
+    yield JobRegistry(store=first_store), JobRegistry(store=second_store)
+    first_store.close()
+    second_store.close()
+
+
+class TestSharedJobState:
+    """Tests for JobRegistry with a JobStateStore."""
+
+    def test_job_visible_from_other_process(self, registries):
+        owner, other = registries
+        job = owner.create(total=10, job_id="shoot")
+        job.processed = 4
+        owner.sync()
+
+        info = other.info("shoot")
+        assert info["owner"] == "host:1"
+        assert info["processed"] == 4
+        assert [row["id"] for row in other.list_info()] == ["shoot"]
+
+    def test_remote_cancel_applied_on_owner_sync(self, registries):
+        owner, other = registries
+        job = owner.create(job_id="shoot")
+
+        assert other.command("shoot", "cancel")["requested"] == "cancel"
+        assert not job.cancelled
+        owner.sync()
+
+        assert job.cancelled
+        assert other.info("shoot")["state"] == "cancelling"
+        assert other.info("shoot")["requested"] is None
+
+    def test_duplicate_id_rejected_across_processes(self, registries):
+        owner, other = registries
+        owner.create(job_id="shoot")
+        with pytest.raises(ValueError):
+            other.create(job_id="shoot")
+
+    def test_finished_and_unknown_jobs(self, registries):
+        owner, other = registries
+        owner.create(job_id="shoot").finish("completed")
+        owner.sync()
+
+        with pytest.raises(ValueError):
+            other.command("shoot", "pause")
+        with pytest.raises(KeyError):
+            other.command("missing", "pause")
+        # A finished id can be reused by any process
+        assert other.create(job_id="shoot").state == "running"
+
+    def test_jobs_of_dead_process_expire(self, registries):
+        owner, other = registries
+        owner.create(job_id="orphan")
+        other.store.stale_seconds = 0
+
+        other.sync()
+
+        assert other.info("orphan")["state"] == "failed"
@@ -0,0 +1,191 @@
+"""
+Unit tests for the shared task queue.
+
+Tests leases, heartbeats, re-queuing after a worker dies, and several
+worker processes draining one queue.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+import pytest
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.services.taskqueue import QueueWorker, SharedTaskQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = SharedTaskQueue(str(tmp_path / "shared" / "queue.db"), lease_seconds=60, max_attempts=2)
+    yield queue
+    queue.close()
+
+
+def files(count):
+    return [(f"/src/{i}.ARW", f"/dst/{i}.jpg") for i in range(count)]
+
+
+class TestSharedTaskQueue:
+    """Tests for SharedTaskQueue."""
+
+    def test_claims_each_task_once(self, queue):
+        queue.enqueue("job", files(3), {"quality": 90})
+
+        first = queue.claim("a", limit=2)
+        second = queue.claim("b", limit=2)
+
+        assert [task.src for task in first] == ["/src/0.ARW", "/src/1.ARW"]
+        assert [task.src for task in second] == ["/src/2.ARW"]
+        assert first[0].options == {"quality": 90}
+        assert queue.claim("c") == []
+
+    def test_complete_records_result(self, queue):
+        queue.enqueue("job", files(2))
+        done, failed = queue.claim("a", limit=2)
+
+        assert queue.complete(done.id, "a", {"status": "converted"})
+        assert queue.complete(failed.id, "a", {"status": "failed", "error": "bad"})
+
+        status = queue.job_status("job", include_results=True)
+        assert status["done"] == 1
+        assert status["failed"] == 1
+        assert status["finished"] is True
+        assert [r["status"] for r in status["results"]] == ["converted", "failed"]
+        assert queue.job_status("missing") is None
+
+    def test_expired_lease_requeued_and_stale_result_discarded(self, queue):
+        queue.enqueue("job", files(1))
+        queue.lease_seconds = 0.05
+        (task,) = queue.claim("dead")
+
+        time.sleep(0.1)
+        (retry,) = queue.claim("alive")
+
+        assert retry.id == task.id
+        assert retry.attempts == 2
+        # The original worker came back too late
+        assert queue.complete(task.id, "dead", {"status": "converted"}) is False
+        assert queue.complete(retry.id, "alive", {"status": "converted"}) is True
+
+    def test_task_failed_after_max_attempts(self, queue):
+        queue.enqueue("job", files(1))
+        queue.lease_seconds = 0.01
+        queue.claim("a")
+        time.sleep(0.02)
+        queue.claim("b")
+        time.sleep(0.02)
+
+        assert queue.claim("c") == []
+        assert queue.job_status("job")["failed"] == 1
+
+    def test_heartbeat_extends_lease_and_reports_lost(self, queue):
+        queue.enqueue("job", files(2))
+        queue.lease_seconds = 0.3
+        kept, lost = queue.claim("a", limit=2)
+        time.sleep(0.2)
+        queue.heartbeat("a", [kept.id])
+        time.sleep(0.2)
+
+        # Only the task without a heartbeat expired
+        assert [task.id for task in queue.claim("b", limit=2)] == [lost.id]
+        assert queue.heartbeat("a", [kept.id, lost.id]) == [lost.id]
+
+    def test_release_returns_task_without_counting_attempt(self, queue):
+        queue.enqueue("job", files(1))
+        (task,) = queue.claim("a")
+        queue.release("a", [task.id])
+
+        (again,) = queue.claim("b")
+        assert again.attempts == 1
+
+    def test_cancel_drops_pending_only(self, queue):
+        queue.enqueue("job", files(3))
+        queue.claim("a")
+
+        assert queue.cancel("job") == 2
+        status = queue.job_status("job")
+        assert status["cancelled"] == 2
+        assert status["leased"] == 1
+
+    def test_requires_path(self, monkeypatch):
+        monkeypatch.delenv("SPECTRUM_QUEUE_PATH", raising=False)
+        with pytest.raises(ValueError):
+            SharedTaskQueue()
+
+
+async def _write_output(task):
+    """Handler that logs which process ran the task."""
+    # Slow enough that one process cannot drain the queue before the others start
+    await asyncio.sleep(0.05)
+    with open(Path(task.dst).with_suffix(".log"), "a") as log:
+        log.write(f"{os.getpid()}\n")
+    return {"src": task.src, "dst": task.dst, "status": "converted"}
+
+
+def _worker_process(path: str, name: str) -> None:
+    queue = SharedTaskQueue(path, lease_seconds=5)
+    worker = QueueWorker(queue, _write_output, concurrency=2, worker_id=name, poll_interval=0.05)
+    asyncio.run(worker.run(drain=True))
+    queue.close()
+
+
+def _dying_process(path: str) -> None:
+    queue = SharedTaskQueue(path, lease_seconds=0.2)
+    queue.claim("doomed")
+    os._exit(1)
+
+
+class TestQueueWorkerProcesses:
+    """Tests for several worker processes sharing one queue."""
+
+    def test_processes_share_work_without_duplicates(self, tmp_path):
+        path = str(tmp_path / "queue.db")
+        queue = SharedTaskQueue(path)
+        queue.enqueue("job", [(f"/src/{i}.ARW", str(tmp_path / f"{i}.jpg")) for i in range(40)])
+
+        context = multiprocessing.get_context("spawn")
+        processes = [
+            context.Process(target=_worker_process, args=(path, f"worker-{n}")) for n in range(3)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(30)
+            assert process.exitcode == 0
+
+        status = queue.job_status("job")
+        assert status["done"] == 40
+        # Every task ran exactly once
+        logs = sorted(tmp_path.glob("*.log"))
+        assert len(logs) == 40
+        assert all(len(log.read_text().split()) == 1 for log in logs)
+        pids = {log.read_text().strip() for log in logs}
+        assert len(pids) > 1
+        completed = {worker["id"]: worker["completed"] for worker in queue.stats()["workers"]}
+        assert sum(completed.values()) == 40
+        queue.close()
+
+    def test_task_from_dead_process_is_retried(self, tmp_path):
+        path = str(tmp_path / "queue.db")
+        queue = SharedTaskQueue(path, lease_seconds=0.2)
+        queue.enqueue("job", [("/src/0.ARW", str(tmp_path / "0.jpg"))])
+
+        process = multiprocessing.get_context("spawn").Process(target=_dying_process, args=(path,))
+        process.start()
+        process.join(10)
+        assert process.exitcode == 1
+        assert queue.job_status("job")["leased"] == 1
+
+        time.sleep(0.3)
+        worker = QueueWorker(queue, _write_output, concurrency=1, worker_id="rescuer")
+        assert asyncio.run(worker.run(drain=True)) == 1
+        assert queue.job_status("job")["done"] == 1
+        row = sqlite3.connect(path).execute("SELECT attempts FROM tasks").fetchone()
+        assert row == (2,)
+        queue.close()
@@ -0,0 +1,70 @@
+"""
+Unit tests for per-stage timing helpers.
+
+Tests stage accumulation, percentiles, and run summaries.
+"""
+
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.utils.timing import StageTimer, percentile, summarize_timings
+
+
+class TestStageTimer:
+    """Tests for StageTimer."""
+
+    def test_stage_records_wall_and_cpu(self):
+        timer = StageTimer()
+        with timer.stage("decode"):
+            sum(range(10000))
+        assert timer.stages["decode"]["wall_s"] >= 0
+        assert timer.stages["decode"]["cpu_s"] is not None
+
+    def test_repeated_stage_accumulates(self):
+        timer = StageTimer()
+        timer.record("write", 1.0, 0.1)
+        timer.record("write", 0.5)
+        assert timer.stages["write"] == {"wall_s": 1.5, "cpu_s": 0.1}
+
+    def test_merge(self):
+        timer = StageTimer()
+        timer.record("exif", 0.2)
+        timer.merge({"decode": {"wall_s": 2.0, "cpu_s": 1.9}})
+        assert set(timer.stages) == {"exif", "decode"}
+
+
+class TestPercentile:
+    """Tests for percentile interpolation."""
+
+    def test_empty(self):
+        assert percentile([], 50) == 0.0
+
+    def test_median_and_p95(self):
+        values = [float(v) for v in range(1, 101)]
+        assert percentile(values, 50) == pytest.approx(50.5)
+        assert percentile(values, 95) == pytest.approx(95.05)
+
+
+class TestSummarizeTimings:
+    """Tests for run summaries."""
+
+    def test_aggregates_stages_and_bytes(self):
+        results = [
+            {"timings": {"decode": {"wall_s": 1.0, "cpu_s": 0.9}}, "bytes_read": 10, "bytes_written": 4},
+            {"timings": {"decode": {"wall_s": 3.0, "cpu_s": 2.5}}, "bytes_read": 20, "bytes_written": 6},
+            {"timings": None, "bytes_read": None, "bytes_written": None},
+        ]
+        summary = summarize_timings(results, elapsed_s=5.0)
+
+        assert summary["files"] == 2
+        assert summary["bytes_read"] == 30
+        assert summary["bytes_written"] == 10
+        decode = summary["stages"]["decode"]
+        assert decode["count"] == 2
+        assert decode["wall_total_s"] == 4.0
+        assert decode["cpu_total_s"] == pytest.approx(3.4)
+        assert decode["max_s"] == 3.0
+        assert decode["p50_s"] == 2.0
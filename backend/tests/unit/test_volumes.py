@@ -0,0 +1,168 @@
+"""
+Unit tests for the volume service.
+
+Tests TTL caching with background refresh and per-mount probe timeouts.
+"""
+
+import pytest
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.services.volumes import (
+    ProbeTimeout,
+    RefreshingCache,
+    VolumeService,
+    list_subdirectories,
+    probe_folder,
+)
+
+
+class TestRefreshingCache:
+    """Tests for the stale-while-revalidate cache."""
+
+    def test_fresh_entry_is_not_reloaded(self):
+        cache = RefreshingCache(ThreadPoolExecutor(max_workers=1), ttl_seconds=60)
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return len(calls)
+
+        assert cache.get("k", loader).result() == 1
+        assert cache.get("k", loader).result() == 1
+        assert len(calls) == 1
+
+    def test_stale_entry_served_while_refreshing(self):
+        cache = RefreshingCache(ThreadPoolExecutor(max_workers=1), ttl_seconds=0.05)
+        release = threading.Event()
+        values = iter(["old", "new"])
+
+        def loader():
+            value = next(values)
+            if value == "new":
+                release.wait(5)
+            return value
+
+        assert cache.get("k", loader).result() == "old"
+        time.sleep(0.06)
+
+        # Stale value comes back at once while the reload is blocked
+        assert cache.get("k", loader).result(timeout=1) == "old"
+        release.set()
+        for _ in range(50):
+            if cache.get("k", loader).result() == "new":
+                break
+            time.sleep(0.02)
+        assert cache.get("k", loader).result() == "new"
+
+    def test_refresh_forces_reload(self):
+        cache = RefreshingCache(ThreadPoolExecutor(max_workers=1), ttl_seconds=60)
+        values = iter([1, 2])
+        cache.get("k", lambda: next(values)).result()
+        assert cache.get("k", lambda: next(values), refresh=True).result() == 2
+
+    def test_errors_are_not_cached(self):
+        cache = RefreshingCache(ThreadPoolExecutor(max_workers=1), ttl_seconds=60)
+
+        def failing():
+            raise FileNotFoundError("gone")
+
+        with pytest.raises(FileNotFoundError):
+            cache.get("k", failing).result()
+        assert cache.get("k", lambda: "ok").result() == "ok"
+
+
+class TestProbes:
+    """Tests for single-pass folder probes."""
+
+    def test_probe_finds_photo_folder(self, tmp_path):
+        (tmp_path / "Documents").mkdir()
+        (tmp_path / "Pictures").mkdir()
+        assert probe_folder(tmp_path) == (True, str(tmp_path / "Pictures"))
+
+    def test_probe_without_photos(self, tmp_path):
+        (tmp_path / "Documents").mkdir()
+        assert probe_folder(tmp_path) == (True, None)
+
+    def test_probe_missing_folder(self, tmp_path):
+        assert probe_folder(tmp_path / "missing") == (False, None)
+
+    def test_list_subdirectories_skips_hidden_and_files(self, tmp_path):
+        (tmp_path / "b").mkdir()
+        (tmp_path / "a").mkdir()
+        (tmp_path / ".hidden").mkdir()
+        (tmp_path / "file.txt").touch()
+        names = [d["name"] for d in list_subdirectories(tmp_path)]
+        assert names == ["a", "b"]
+
+    def test_list_subdirectories_rejects_files(self, tmp_path):
+        (tmp_path / "file.txt").touch()
+        with pytest.raises(NotADirectoryError):
+            list_subdirectories(tmp_path / "file.txt")
+        with pytest.raises(FileNotFoundError):
+            list_subdirectories(tmp_path / "missing")
+
+
+class TestVolumeService:
+    """Tests for drive listings with unresponsive mounts."""
+
+    @pytest.mark.asyncio
+    async def test_dead_mount_times_out(self, tmp_path):
+        alive = tmp_path / "alive"
+        (alive / "DCIM").mkdir(parents=True)
+        dead = tmp_path / "dead"
+        release = threading.Event()
+
+        def fake_probe(path):
+            if path == dead:
+                release.wait(5)
+                return False, None
+            return probe_folder(path)
+
+        service = VolumeService(probe_timeout=0.2, drives_ttl=60, browse_ttl=60)
+        mounts = [(alive, "volume", None), (dead, "windows", "Z")]
+        with patch("app.services.volumes._list_mounts", return_value=mounts), patch(
+            "app.services.volumes.probe_folder", side_effect=fake_probe
+        ):
+            started = time.monotonic()
+            result = await service.drives()
+            elapsed = time.monotonic() - started
+        release.set()
+
+        assert elapsed < 2
+        by_path = {d["path"]: d for d in result["drives"]}
+        assert by_path[str(alive)]["accessible"] is True
+        assert by_path[str(alive)]["has_photos"] is True
+        assert by_path[str(dead)]["accessible"] is False
+        assert by_path[str(dead)]["timed_out"] is True
+        assert by_path[str(dead)]["name"] == "Z: Drive"
+
+    @pytest.mark.asyncio
+    async def test_drives_are_cached(self, tmp_path):
+        service = VolumeService(probe_timeout=1, drives_ttl=60, browse_ttl=60)
+        with patch(
+            "app.services.volumes._list_mounts", return_value=[(tmp_path, "volume", None)]
+        ) as list_mounts:
+            await service.drives()
+            await service.drives()
+            assert list_mounts.call_count == 1
+            await service.drives(refresh=True)
+            assert list_mounts.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_hanging_listing_raises_probe_timeout(self, tmp_path):
+        release = threading.Event()
+        service = VolumeService(probe_timeout=0.1, drives_ttl=60, browse_ttl=60)
+        with patch(
+            "app.services.volumes.list_subdirectories",
+            side_effect=lambda target: release.wait(5) or [],
+        ):
+            with pytest.raises(ProbeTimeout):
+                await service.list_directories(tmp_path)
+        release.set()
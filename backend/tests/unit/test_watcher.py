@@ -0,0 +1,128 @@
+"""
+Unit tests for the directory watcher.
+
+Tests stability detection, batching and exclusions in both inotify and
+polling modes.
+"""
+
+import asyncio
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.services.watcher import DirectoryWatcher, filesystem_type, supports_inotify
+
+MODES = ["polling"]
+if supports_inotify([Path(__file__).parent]):
+    MODES.append("inotify")
+
+
+async def watch(tmp_path, mode, action, **kwargs):
+    """Run a watcher around action() and return the batches it emitted."""
+    batches = []
+
+    async def on_batch(files):
+        batches.append(sorted(path.name for path in files))
+
+    options = {"settle_seconds": 0.1, "batch_window": 0.1, "poll_interval": 0.05}
+    options.update(kwargs)
+    watcher = DirectoryWatcher([tmp_path], on_batch, mode=mode, **options)
+    task = asyncio.create_task(watcher.run())
+    await asyncio.sleep(0.1)
+    await action()
+    for _ in range(60):
+        await asyncio.sleep(0.05)
+        if watcher.pending == 0 and batches:
+            break
+    await asyncio.sleep(0.15)
+    watcher.stop()
+    await task
+    return batches, watcher
+
+
+@pytest.mark.parametrize("mode", MODES)
+class TestDirectoryWatcher:
+    """Tests for DirectoryWatcher."""
+
+    async def test_new_files_in_new_folder(self, tmp_path, mode):
+        async def action():
+            (tmp_path / "card1").mkdir()
+            (tmp_path / "card1" / "DSC001.ARW").write_bytes(b"raw")
+            (tmp_path / "card1" / "DSC002.arw").write_bytes(b"raw")
+            (tmp_path / "card1" / "notes.txt").write_text("skip")
+            (tmp_path / "card1" / "._DSC001.ARW").write_bytes(b"fork")
+
+        batches, watcher = await watch(tmp_path, mode, action)
+
+        assert batches == [["DSC001.ARW", "DSC002.arw"]]
+        assert watcher.mode == mode
+
+    async def test_growing_file_waits_until_stable(self, tmp_path, mode):
+        target = tmp_path / "DSC001.ARW"
+        emitted_while_growing = []
+
+        async def action():
+            with open(target, "wb") as handle:
+                for _ in range(6):
+                    handle.write(b"x" * 1024)
+                    handle.flush()
+                    await asyncio.sleep(0.1)
+                    emitted_while_growing.append(target.stat().st_size)
+
+        batches, _ = await watch(tmp_path, mode, action, settle_seconds=0.3)
+
+        assert batches == [["DSC001.ARW"]]
+        assert emitted_while_growing[-1] == 6 * 1024
+
+    async def test_excluded_folder_ignored(self, tmp_path, mode):
+        output = tmp_path / "converted"
+        output.mkdir()
+
+        async def action():
+            (output / "DSC001.ARW").write_bytes(b"raw")
+            (tmp_path / "DSC002.ARW").write_bytes(b"raw")
+
+        batches, _ = await watch(tmp_path, mode, action, exclude=[output])
+
+        assert batches == [["DSC002.ARW"]]
+
+    async def test_existing_files(self, tmp_path, mode):
+        (tmp_path / "OLD.ARW").write_bytes(b"raw")
+
+        async def action():
+            (tmp_path / "NEW.ARW").write_bytes(b"raw")
+
+        with_existing, _ = await watch(tmp_path, mode, action)
+        (tmp_path / "NEW.ARW").unlink()
+        new_only, _ = await watch(tmp_path, mode, action, include_existing=False)
+
+        assert sorted(sum(with_existing, [])) == ["NEW.ARW", "OLD.ARW"]
+        assert new_only == [["NEW.ARW"]]
+
+    async def test_batch_max_splits_batches(self, tmp_path, mode):
+        async def action():
+            for index in range(5):
+                (tmp_path / f"DSC{index:03d}.ARW").write_bytes(b"raw")
+
+        batches, watcher = await watch(tmp_path, mode, action, batch_max=2, batch_window=0.5)
+
+        assert sorted(len(batch) for batch in batches) == [1, 2, 2]
+        assert watcher.stats["files_queued"] == 5
+
+
+class TestWatcherConfig:
+    """Tests for mode selection."""
+
+    def test_unknown_mode_rejected(self, tmp_path):
+        async def on_batch(files):
+            pass
+
+        with pytest.raises(ValueError):
+            DirectoryWatcher([tmp_path], on_batch, mode="magic")
+
+    def test_filesystem_type_of_root(self):
+        if not Path("/proc/self/mounts").exists():
+            pytest.skip("needs /proc")
+        assert filesystem_type(Path("/")) is not None
@@ -0,0 +1,60 @@
+"""
+Unit tests for local staging and write-back.
+
+Tests staging paths, atomic publish, and slot accounting.
+"""
+
+import asyncio
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.services.writeback import WriteBackService
+
+
+class TestWriteBackService:
+    """Tests for WriteBackService."""
+
+    def test_disabled_without_staging_dir(self, monkeypatch):
+        monkeypatch.delenv("SPECTRUM_STAGING_DIR", raising=False)
+        assert WriteBackService().enabled is False
+
+    def test_staging_path_keeps_suffix(self, tmp_path):
+        service = WriteBackService(staging_dir=tmp_path)
+        staged = service.staging_path(Path("/nas/out/DSC001.webp"))
+        assert staged.parent == tmp_path
+        assert staged.suffix == ".webp"
+
+    @pytest.mark.asyncio
+    async def test_publish_moves_staged_file(self, tmp_path):
+        service = WriteBackService(staging_dir=tmp_path / "stage")
+        (tmp_path / "stage").mkdir()
+        staged = service.staging_path(Path("DSC001.jpg"))
+        staged.write_bytes(b"jpeg")
+        dst = tmp_path / "nas" / "converted" / "DSC001.jpg"
+
+        await service.reserve()
+        await service.publish(staged, dst)
+
+        assert dst.read_bytes() == b"jpeg"
+        assert not staged.exists()
+        assert not list(dst.parent.glob(".tmp_*"))
+
+    @pytest.mark.asyncio
+    async def test_failed_publish_raises_and_frees_slot(self, tmp_path):
+        service = WriteBackService(staging_dir=tmp_path, max_pending=1)
+        await service.reserve()
+        with pytest.raises(OSError):
+            await service.publish(tmp_path / "missing.jpg", tmp_path / "out.jpg")
+        await asyncio.wait_for(service.reserve(), timeout=1)
+
+    @pytest.mark.asyncio
+    async def test_pending_slots_apply_backpressure(self, tmp_path):
+        service = WriteBackService(staging_dir=tmp_path, max_pending=1)
+        await service.reserve()
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(service.reserve(), timeout=0.05)
+        service.release()
+        await asyncio.wait_for(service.reserve(), timeout=1)